@@ -210,6 +210,10 @@ export interface GraphSearchSettings {
   maxLlmQueriesForGlobalSearch?: number;
   limits?: Record<string, any>;
   enabled?: boolean;
+  useTraversal?: boolean;
+  traversalSeeds?: number;
+  maxHops?: number;
+  hopDecay?: number;
 }
 
 export interface SearchSettings {
@@ -107,12 +107,16 @@ __all__ = [
     # Run Manager
     "RunManager",
     "manage_run",
+    # Metrics
+    "LatencyTracker",
+    "StreamingRAGTimings",
     ## PARSERS
     # Base parser
     "AsyncParser",
     ## PIPELINE
     # Base pipeline
     "AsyncPipeline",
+    "PipelineRunContext",
     ## PIPES
     "AsyncPipe",
     "AsyncState",
@@ -134,6 +138,7 @@ __all__ = [
     "LimitSettings",
     "DatabaseConfig",
     "DatabaseProvider",
+    "FileConfig",
     # Embedding provider
     "EmbeddingConfig",
     "EmbeddingProvider",
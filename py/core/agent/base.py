@@ -100,13 +100,17 @@ class R2RAgent(Agent, metaclass=CombinedMeta):
                     **kwargs,
                 )
             elif message.tool_calls:
-                for tool_call in message.tool_calls:
-                    await self.handle_function_or_tool_call(
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                        *args,
-                        **kwargs,
-                    )
+                await self.handle_tool_calls(
+                    [
+                        (
+                            tool_call.function.name,
+                            tool_call.function.arguments,
+                        )
+                        for tool_call in message.tool_calls
+                    ],
+                    *args,
+                    **kwargs,
+                )
             else:
                 await self.conversation.add_message(
                     Message(role="assistant", content=message.content)
@@ -160,6 +164,8 @@ class R2RStreamingAgent(R2RAgent):
         function_name = None
         function_arguments = ""
         content_buffer = ""
+        # Streamed tool calls arrive in fragments keyed by their index
+        tool_calls: dict[int, list[str]] = {}
 
         async for chunk in stream:
             delta = chunk.choices[0].delta
@@ -168,28 +174,19 @@ class R2RStreamingAgent(R2RAgent):
                     if not tool_call.function:
                         logger.info("Tool function not found in tool call.")
                         continue
-                    name = tool_call.function.name
-                    if not name:
-                        logger.info("Tool name not found in tool call.")
-                        continue
-                    arguments = tool_call.function.arguments
-                    if not arguments:
-                        logger.info("Tool arguments not found in tool call.")
-                        continue
-
-                    results = await self.handle_function_or_tool_call(
-                        name,
-                        arguments,
-                        # FIXME: tool_call.id,
-                        *args,
-                        **kwargs,
+                    call = tool_calls.setdefault(
+                        tool_call.index or 0, ["", ""]
                     )
+                    if tool_call.function.name:
+                        call[0] = tool_call.function.name
+                    call[1] += tool_call.function.arguments or ""
 
-                    yield "<tool_call>"
-                    yield f"<name>{name}</name>"
-                    yield f"<arguments>{arguments}</arguments>"
-                    yield f"<results>{results.llm_formatted_result}</results>"
-                    yield "</tool_call>"
+            if tool_calls and chunk.choices[0].finish_reason is not None:
+                async for tool_chunk in self._run_tool_calls(
+                    tool_calls, *args, **kwargs
+                ):
+                    yield tool_chunk
+                tool_calls = {}
 
             if delta.function_call:
                 if delta.function_call.name:
@@ -231,6 +228,12 @@ class R2RStreamingAgent(R2RAgent):
                 self._completed = True
                 yield "</completion>"
 
+        if tool_calls:
+            async for tool_chunk in self._run_tool_calls(
+                tool_calls, *args, **kwargs
+            ):
+                yield tool_chunk
+
         # Handle any remaining content after the stream ends
         if content_buffer and not self._completed:
             await self.conversation.add_message(
@@ -238,3 +241,24 @@ class R2RStreamingAgent(R2RAgent):
             )
             self._completed = True
             yield "</completion>"
+
+    async def _run_tool_calls(
+        self, tool_calls: dict[int, list[str]], *args, **kwargs
+    ) -> AsyncGenerator[str, None]:
+        calls = []
+        for _, (name, arguments) in sorted(tool_calls.items()):
+            if not name:
+                logger.info("Tool name not found in tool call.")
+                continue
+            if not arguments:
+                logger.info("Tool arguments not found in tool call.")
+                continue
+            calls.append((name, arguments))
+
+        results = await self.handle_tool_calls(calls, *args, **kwargs)
+        for (name, arguments), result in zip(calls, results):
+            yield "<tool_call>"
+            yield f"<name>{name}</name>"
+            yield f"<arguments>{arguments}</arguments>"
+            yield f"<results>{result.llm_formatted_result}</results>"
+            yield "</tool_call>"
@@ -42,7 +42,7 @@ class RAGAgentMixin:
             name="web_search",
             description="Search for information on the web.",
             results_function=self._web_search,
-            llm_format_function=RAGAgentMixin.format_search_results_for_llm,
+            llm_format_function=self.format_search_results_for_llm,
             stream_function=RAGAgentMixin.format_search_results_for_stream,
             parameters={
                 "type": "object",
@@ -81,7 +81,7 @@ class RAGAgentMixin:
             name="local_search",
             description="Search your local knowledgebase using the R2R AI system",
             results_function=self._local_search,
-            llm_format_function=RAGAgentMixin.format_search_results_for_llm,
+            llm_format_function=self.format_search_results_for_llm,
             stream_function=RAGAgentMixin.format_search_results_for_stream,
             parameters={
                 "type": "object",
@@ -115,11 +115,15 @@ class RAGAgentMixin:
     ) -> str:
         return format_search_results_for_stream(results)
 
-    @staticmethod
     def format_search_results_for_llm(
+        self,
         results: AggregateSearchResult,
     ) -> str:
-        return format_search_results_for_llm(results)
+        return format_search_results_for_llm(
+            results,
+            max_tokens=self.llm_provider.config.max_context_tokens,
+            similarity_threshold=self.llm_provider.config.context_similarity_threshold,
+        )
 
 
 class R2RRAGAgent(RAGAgentMixin, R2RAgent):
@@ -30,6 +30,7 @@ __all__ = [
     "R2RDocumentProcessingError",
     "R2RException",
     # KG abstractions
+    "DEFAULT_MAX_TOKENS_PER_EXTRACTION",
     "Entity",
     "KGExtraction",
     "Relationship",
@@ -80,12 +81,16 @@ __all__ = [
     # Run Manager
     "RunManager",
     "manage_run",
+    # Metrics
+    "LatencyTracker",
+    "StreamingRAGTimings",
     ## PARSERS
     # Base parser
     "AsyncParser",
     ## PIPELINE
     # Base pipeline
     "AsyncPipeline",
+    "PipelineRunContext",
     ## PIPES
     "AsyncPipe",
     "AsyncState",
@@ -107,6 +112,7 @@ __all__ = [
     "LimitSettings",
     "DatabaseConfig",
     "DatabaseProvider",
+    "FileConfig",
     "Handler",
     "PostgresConfigurationSettings",
     # Embedding provider
@@ -124,9 +130,15 @@ __all__ = [
     "RecursiveCharacterTextSplitter",
     "TextSplitter",
     "run_pipeline",
+    "run_bounded",
+    "group_chunks",
+    "scale_group_limit",
     "to_async_generator",
     "format_search_results_for_llm",
     "format_search_results_for_stream",
+    "build_context",
+    "count_tokens",
+    "PackedContext",
     "validate_uuid",
     # ID generation
     "generate_id",
@@ -31,6 +31,7 @@ from shared.abstractions.ingestion import (
     ChunkEnrichmentStrategy,
 )
 from shared.abstractions.kg import (
+    DEFAULT_MAX_TOKENS_PER_EXTRACTION,
     GraphBuildSettings,
     GraphCommunitySettings,
     GraphEntitySettings,
@@ -139,6 +140,7 @@ __all__ = [
     "SearchMode",
     "HybridSearchSettings",
     # KG abstractions
+    "DEFAULT_MAX_TOKENS_PER_EXTRACTION",
     "KGCreationSettings",
     "KGEnrichmentSettings",
     "KGEntityDeduplicationSettings",
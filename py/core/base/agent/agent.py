@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, AsyncGenerator, Optional, Type
+from typing import Any, AsyncGenerator, Literal, Optional, Type
 
 from pydantic import BaseModel
 
@@ -59,6 +59,16 @@ class AgentConfig(BaseModel):
     tool_names: list[str] = ["search"]
     generation_config: GenerationConfig = GenerationConfig()
     stream: bool = False
+    max_concurrent_tool_calls: int = 4
+    tool_call_timeout: Optional[float] = 120.0
+    # "full" replays the whole conversation on every turn. "window" keeps the
+    # last `max_conversation_messages` and a rolling summary of older ones.
+    conversation_memory: Literal["full", "window"] = "full"
+    max_conversation_messages: int = 20
+    conversation_summary_batch_size: int = 20
+    conversation_summary_prompt: str = "conversation_summary"
+    # Defaults to the model in `generation_config`
+    conversation_summary_model: Optional[str] = None
 
     @classmethod
     def create(cls: Type["AgentConfig"], **kwargs: Any) -> "AgentConfig":
@@ -182,14 +192,60 @@ class Agent(ABC):
             stream=stream,
         )
 
-    async def handle_function_or_tool_call(
+    async def execute_tool_call(
         self,
         function_name: str,
         function_arguments: str,
-        tool_id: Optional[str] = None,
         *args,
         **kwargs,
     ) -> ToolResult:
+        """
+        Run a single tool call, bounded by the configured timeout.
+
+        Unknown tools, malformed arguments, timeouts and tool errors are
+        returned as a `ToolResult` describing the error, so one failing call
+        never aborts the others or the conversation.
+        """
+        tool = next((t for t in self.tools if t.name == function_name), None)
+        if not tool:
+            error_message = f"The requested tool '{function_name}' is not available. Available tools: {', '.join(t.name for t in self.tools)}"
+            return ToolResult(
+                raw_result=error_message,
+                llm_formatted_result=error_message,
+            )
+
+        try:
+            merged_kwargs = {**kwargs, **json.loads(function_arguments)}
+            raw_result = await asyncio.wait_for(
+                tool.results_function(*args, **merged_kwargs),
+                timeout=self.config.tool_call_timeout,
+            )
+            tool_result = ToolResult(
+                raw_result=raw_result,
+                llm_formatted_result=tool.llm_format_function(raw_result),
+            )
+            if tool.stream_function:
+                tool_result.stream_result = tool.stream_function(raw_result)
+            return tool_result
+        except asyncio.TimeoutError:
+            error_message = f"The tool '{function_name}' did not finish within {self.config.tool_call_timeout} seconds."
+        except json.JSONDecodeError as e:
+            error_message = f"The arguments for the tool '{function_name}' are not valid JSON: {e}"
+        except Exception as e:
+            error_message = f"The tool '{function_name}' failed: {e}"
+        logger.warning(error_message)
+        return ToolResult(
+            raw_result=error_message,
+            llm_formatted_result=error_message,
+        )
+
+    async def _add_tool_call_messages(
+        self,
+        function_name: str,
+        function_arguments: str,
+        tool_id: Optional[str],
+        tool_result: ToolResult,
+    ) -> None:
         await self.conversation.add_message(
             Message(
                 role="assistant",
@@ -216,26 +272,6 @@ class Agent(ABC):
                 ),
             )
         )
-
-        if tool := next(
-            (t for t in self.tools if t.name == function_name), None
-        ):
-            merged_kwargs = {**kwargs, **json.loads(function_arguments)}
-            raw_result = await tool.results_function(*args, **merged_kwargs)
-            llm_formatted_result = tool.llm_format_function(raw_result)
-            tool_result = ToolResult(
-                raw_result=raw_result,
-                llm_formatted_result=llm_formatted_result,
-            )
-            if tool.stream_function:
-                tool_result.stream_result = tool.stream_function(raw_result)
-        else:
-            error_message = f"The requested tool '{function_name}' is not available. Available tools: {', '.join(t.name for t in self.tools)}"
-            tool_result = ToolResult(
-                raw_result=error_message,
-                llm_formatted_result=error_message,
-            )
-
         await self.conversation.add_message(
             Message(
                 role="tool" if tool_id else "function",
@@ -244,4 +280,50 @@ class Agent(ABC):
             )
         )
 
+    async def handle_function_or_tool_call(
+        self,
+        function_name: str,
+        function_arguments: str,
+        tool_id: Optional[str] = None,
+        *args,
+        **kwargs,
+    ) -> ToolResult:
+        tool_result = await self.execute_tool_call(
+            function_name, function_arguments, *args, **kwargs
+        )
+        await self._add_tool_call_messages(
+            function_name, function_arguments, tool_id, tool_result
+        )
         return tool_result
+
+    async def handle_tool_calls(
+        self,
+        tool_calls: list[tuple[str, str]],
+        *args,
+        **kwargs,
+    ) -> list[ToolResult]:
+        """
+        Run `(name, arguments)` tool calls concurrently, at most
+        `max_concurrent_tool_calls` at a time.
+
+        Calls and results are added to the conversation in the order they
+        were requested, whatever order they finish in.
+        """
+        semaphore = asyncio.Semaphore(
+            max(1, self.config.max_concurrent_tool_calls)
+        )
+
+        async def run(function_name: str, function_arguments: str):
+            async with semaphore:
+                return await self.execute_tool_call(
+                    function_name, function_arguments, *args, **kwargs
+                )
+
+        tool_results = await asyncio.gather(
+            *(run(name, arguments) for name, arguments in tool_calls)
+        )
+        for (name, arguments), tool_result in zip(tool_calls, tool_results):
+            await self._add_tool_call_messages(
+                name, arguments, None, tool_result
+            )
+        return tool_results
@@ -25,8 +25,12 @@ from shared.api.models.graph.responses import (  # TODO: Need to review anything
     WrappedRelationshipsResponse,
 )
 from shared.api.models.ingestion.responses import (
+    BulkIngestionResponse,
+    IngestionJobResponse,
     IngestionResponse,
     UpdateResponse,
+    WrappedBulkIngestionResponse,
+    WrappedIngestionJobResponse,
     WrappedIngestionResponse,
     WrappedListVectorIndicesResponse,
     WrappedMetadataUpdateResponse,
@@ -88,6 +92,10 @@ __all__ = [
     # Ingestion Responses
     "IngestionResponse",
     "WrappedIngestionResponse",
+    "BulkIngestionResponse",
+    "WrappedBulkIngestionResponse",
+    "IngestionJobResponse",
+    "WrappedIngestionJobResponse",
     "WrappedUpdateResponse",
     "WrappedMetadataUpdateResponse",
     "WrappedListVectorIndicesResponse",
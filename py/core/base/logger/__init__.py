@@ -1,4 +1,5 @@
 from .base import RunInfoLog
+from .metrics import LatencyTracker, StreamingRAGTimings
 from .run_manager import RunManager, manage_run
 
 __all__ = [
@@ -7,4 +8,7 @@ __all__ = [
     # Run Manager
     "RunManager",
     "manage_run",
+    # Metrics
+    "LatencyTracker",
+    "StreamingRAGTimings",
 ]
@@ -0,0 +1,84 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class StreamingRAGTimings:
+    """
+    Latencies of a single streaming RAG request, in seconds from its start.
+
+    The streaming RAG pipe marks each stage as it is reached, so the service
+    that started the request can record the timings once the stream ends.
+    """
+
+    start: float = field(default_factory=time.perf_counter)
+    retrieval_time: Optional[float] = None
+    time_to_first_token: Optional[float] = None
+    total_time: Optional[float] = None
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def mark_retrieval_done(self) -> None:
+        if self.retrieval_time is None:
+            self.retrieval_time = self._elapsed()
+
+    def mark_first_token(self) -> None:
+        if self.time_to_first_token is None:
+            self.time_to_first_token = self._elapsed()
+
+    def mark_done(self) -> None:
+        self.total_time = self._elapsed()
+
+    @property
+    def generation_time(self) -> Optional[float]:
+        if self.retrieval_time is None or self.total_time is None:
+            return None
+        return self.total_time - self.retrieval_time
+
+    def as_dict(self) -> dict[str, Optional[float]]:
+        return {
+            "retrieval_time": self.retrieval_time,
+            "time_to_first_token": self.time_to_first_token,
+            "generation_time": self.generation_time,
+            "total_time": self.total_time,
+        }
+
+
+class LatencyTracker:
+    """Keeps the most recent latency samples per metric and summarizes them."""
+
+    def __init__(self, window_size: int = 1_000):
+        self.window_size = window_size
+        self._samples: dict[str, deque[float]] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, metrics: dict[str, Optional[float]]) -> None:
+        for name, value in metrics.items():
+            if value is None:
+                continue
+            self._samples.setdefault(
+                name, deque(maxlen=self.window_size)
+            ).append(value)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Total count and mean, p50, p95 and p99 over the window, per metric."""
+        summary = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            summary[name] = {
+                "count": self._counts[name],
+                "mean": sum(ordered) / len(ordered),
+                "p50": self._percentile(ordered, 50),
+                "p95": self._percentile(ordered, 95),
+                "p99": self._percentile(ordered, 99),
+            }
+        return summary
+
+    @staticmethod
+    def _percentile(ordered: list[float], percentile: float) -> float:
+        index = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[index]
@@ -1,5 +1,6 @@
-from .base_pipeline import AsyncPipeline
+from .base_pipeline import AsyncPipeline, PipelineRunContext
 
 __all__ = [
     "AsyncPipeline",
+    "PipelineRunContext",
 ]
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import traceback
+from dataclasses import dataclass, field
 from typing import Any, AsyncGenerator, Optional
 
 from ..logger.run_manager import RunManager, manage_run
@@ -11,6 +12,20 @@ from ..pipes.base_pipe import AsyncPipe, AsyncState
 logger = logging.getLogger()
 
 
+@dataclass
+class PipelineRunContext:
+    """
+    The state of a single pipeline run.
+
+    Pipelines are built once and shared by every request, so anything a run
+    writes lives here rather than on the pipeline.
+    """
+
+    state: AsyncState
+    run_manager: RunManager
+    futures: dict[str, asyncio.Future] = field(default_factory=dict)
+
+
 class AsyncPipeline:
     """Pipeline class for running a sequence of pipes."""
 
@@ -21,7 +36,6 @@ class AsyncPipeline:
         self.pipes: list[AsyncPipe] = []
         self.upstream_outputs: list[list[dict[str, str]]] = []
         self.run_manager = run_manager or RunManager()
-        self.futures: dict[str, asyncio.Future] = {}
         self.level = 0
 
     def add_pipe(
@@ -47,23 +61,25 @@ class AsyncPipeline:
         **kwargs: Any,
     ):
         """Run the pipeline."""
-        run_manager = run_manager or self.run_manager
-        self.state = state or AsyncState()
+        context = PipelineRunContext(
+            state=state or AsyncState(),
+            run_manager=run_manager or self.run_manager,
+        )
         current_input = input
-        async with manage_run(run_manager):
+        async with manage_run(context.run_manager):
             try:
                 for pipe_num in range(len(self.pipes)):
                     config_name = self.pipes[pipe_num].config.name
-                    self.futures[config_name] = asyncio.Future()
+                    context.futures[config_name] = asyncio.Future()
 
                     current_input = self._run_pipe(
                         pipe_num,
                         current_input,
-                        run_manager,
+                        context,
                         *args,
                         **kwargs,
                     )
-                    self.futures[config_name].set_result(current_input)
+                    context.futures[config_name].set_result(current_input)
 
             except Exception as error:
                 # TODO: improve error handling here
@@ -95,7 +111,7 @@ class AsyncPipeline:
         self,
         pipe_num: int,
         input: Any,
-        run_manager: RunManager,
+        context: PipelineRunContext,
         *args: Any,
         **kwargs: Any,
     ):
@@ -129,13 +145,13 @@ class AsyncPipeline:
                     yield item
 
             temp_results = await resolve_future_output(
-                self.futures[upstream_pipe_name]
+                context.futures[upstream_pipe_name]
             )
             if upstream_pipe_name == self.pipes[pipe_num - 1].config.name:
                 input_dict["message"] = replay_items_as_async_gen(temp_results)
 
             for upstream_input in upstream_inputs:
-                outputs = await self.state.get(upstream_pipe_name, "output")
+                outputs = await context.state.get(upstream_pipe_name, "output")
                 prev_output_field = upstream_input.get(
                     "prev_output_field", None
                 )
@@ -148,8 +164,8 @@ class AsyncPipeline:
                 ]
         async for ele in await pipe.run(
             pipe.Input(**input_dict),
-            self.state,
-            run_manager,
+            context.state,
+            context.run_manager,
             *args,
             **kwargs,
         ):
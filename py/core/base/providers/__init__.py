@@ -5,6 +5,7 @@ from .database import (
     DatabaseConfig,
     DatabaseConnectionManager,
     DatabaseProvider,
+    FileConfig,
     Handler,
     LimitSettings,
     PostgresConfigurationSettings,
@@ -45,6 +46,7 @@ __all__ = [
     "LimitSettings",
     "PostgresConfigurationSettings",
     "DatabaseProvider",
+    "FileConfig",
     "Handler",
     # Embedding provider
     "EmbeddingConfig",
@@ -227,6 +227,27 @@ class DatabaseConfig(ProviderConfig):
         return instance
 
 
+class FileConfig(ProviderConfig):
+    """
+    Configuration for storing original uploaded files.
+
+    `postgres` keeps files as large objects, `filesystem` keeps them in a
+    content-addressed directory tree under `storage_path`.
+    """
+
+    provider: str = "postgres"
+    storage_path: Optional[str] = None
+    shard_depth: int = 2
+
+    def validate_config(self) -> None:
+        if self.provider not in self.supported_providers:
+            raise ValueError(f"Provider '{self.provider}' is not supported.")
+
+    @property
+    def supported_providers(self) -> list[str]:
+        return ["postgres", "filesystem"]
+
+
 class DatabaseProvider(Provider):
     connection_manager: DatabaseConnectionManager
     # documents_handler: DocumentHandler
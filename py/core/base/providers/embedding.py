@@ -1,10 +1,13 @@
 import asyncio
+import hashlib
 import logging
 import random
 import time
 from abc import abstractmethod
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
 
 from litellm import AuthenticationError
 
@@ -33,6 +36,8 @@ class EmbeddingConfig(ProviderConfig):
     max_retries: int = 8
     initial_backoff: float = 1
     max_backoff: float = 64.0
+    rerank_cache_size: int = 100_000
+    rerank_batch_window: float = 0.005
     quantization_settings: VectorQuantizationSettings = (
         VectorQuantizationSettings()
     )
@@ -50,6 +55,104 @@ class EmbeddingConfig(ProviderConfig):
         return ["litellm", "openai", "ollama"]
 
 
+class RerankScoreCache:
+    """An LRU cache of rerank scores for (model, query, chunk) pairs"""
+
+    def __init__(self, max_size: int = 100_000):
+        self._scores: OrderedDict[tuple, float] = OrderedDict()
+        self._max_size = max_size
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def key(
+        self, model: str, query: str, chunk_id: UUID, chunk_text: str
+    ) -> tuple:
+        return (model, self._hash(query), chunk_id, self._hash(chunk_text))
+
+    def get(self, key: tuple) -> Optional[float]:
+        score = self._scores.get(key)
+        if score is not None:
+            self._scores.move_to_end(key)
+        return score
+
+    def set(self, key: tuple, score: float) -> None:
+        if self._max_size <= 0:
+            return
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self._max_size:
+            self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        self._scores.clear()
+
+
+class RerankBatcher:
+    """
+    Coalesces rerank requests issued within a short time window.
+
+    Requests for the same query are merged into a single call to the
+    rerank service, with duplicate texts scored only once.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[str, list[str]], Awaitable[list[float]]],
+        window: float = 0.005,
+    ):
+        self._score_fn = score_fn
+        self._window = window
+        self._pending: dict[str, list[tuple[list[str], asyncio.Future]]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def score(self, query: str, texts: list[str]) -> list[float]:
+        if not texts:
+            return []
+        if self._window <= 0:
+            return await self._score_fn(query, texts)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(query, []).append((texts, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self._window)
+        pending, self._pending = self._pending, {}
+        # Requests arriving while this batch is scored start the next flush
+        self._flush_task = None
+        await asyncio.gather(
+            *(
+                self._score_group(query, requests)
+                for query, requests in pending.items()
+            )
+        )
+
+    async def _score_group(
+        self,
+        query: str,
+        requests: list[tuple[list[str], asyncio.Future]],
+    ) -> None:
+        unique_texts = list(
+            dict.fromkeys(text for texts, _ in requests for text in texts)
+        )
+        try:
+            scores = await self._score_fn(query, unique_texts)
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        score_by_text = dict(zip(unique_texts, scores))
+        for texts, future in requests:
+            if not future.done():
+                future.set_result([score_by_text[text] for text in texts])
+
+
 class EmbeddingProvider(Provider):
     class PipeStage(Enum):
         BASE = 1
@@ -66,6 +169,7 @@ class EmbeddingProvider(Provider):
         self.config: EmbeddingConfig = config
         self.semaphore = asyncio.Semaphore(config.concurrent_request_limit)
         self.current_requests = 0
+        self.rerank_cache = RerankScoreCache(config.rerank_cache_size)
 
     async def _execute_with_backoff_async(self, task: dict[str, Any]):
         retries = 0
@@ -1,4 +1,6 @@
 import asyncio
+import hashlib
+import json
 import logging
 import random
 import time
@@ -7,6 +9,7 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Any, AsyncGenerator, Generator, Optional
 
 from litellm import AuthenticationError
+from pydantic import BaseModel
 
 from core.base.abstractions import (
     GenerationConfig,
@@ -18,6 +21,25 @@ from .base import Provider, ProviderConfig
 
 logger = logging.getLogger()
 
+# Trim the completion cache after this many writes
+CACHE_EVICTION_INTERVAL = 1_000
+
+
+def _canonicalize(value: Any) -> Any:
+    """
+    Convert a completion request into plain JSON values for cache keys.
+    Raises `TypeError` for values without a stable representation.
+    """
+    if isinstance(value, BaseModel):
+        return _canonicalize(value.model_dump(mode="json"))
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
 
 class CompletionConfig(ProviderConfig):
     provider: Optional[str] = None
@@ -26,6 +48,18 @@ class CompletionConfig(ProviderConfig):
     max_retries: int = 8
     initial_backoff: float = 1.0
     max_backoff: float = 64.0
+    # Completions are cached only for callers that opt in with `use_cache`
+    cache_enabled: bool = True
+    cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    cache_max_entries: int = 100_000
+    # Retrieved context is packed into this many tokens for RAG and agents
+    max_context_tokens: Optional[int] = 8_192
+    context_similarity_threshold: float = 0.9
+    # RAG answers are reused for queries this similar over unchanged collections
+    rag_cache_enabled: bool = False
+    rag_cache_similarity_threshold: float = 0.97
+    rag_cache_ttl_seconds: int = 24 * 60 * 60
+    rag_cache_max_entries: int = 10_000
 
     def validate_config(self) -> None:
         if not self.provider:
@@ -51,6 +85,9 @@ class CompletionProvider(Provider):
         self.thread_pool = ThreadPoolExecutor(
             max_workers=config.concurrent_request_limit
         )
+        # Set from the database provider when the providers are assembled
+        self.cache: Optional[Any] = None
+        self._cache_writes = 0
 
     async def _execute_with_backoff_async(self, task: dict[str, Any]):
         retries = 0
@@ -137,12 +174,72 @@ class CompletionProvider(Provider):
     def _execute_task_sync(self, task: dict[str, Any]):
         pass
 
+    def _cache_key(
+        self,
+        messages: list[dict],
+        generation_config: GenerationConfig,
+        kwargs: dict,
+    ) -> str:
+        payload = json.dumps(
+            _canonicalize(
+                {
+                    "messages": messages,
+                    "generation_config": generation_config.model_dump(
+                        exclude={"stream", "api_base"}
+                    ),
+                    "kwargs": kwargs,
+                }
+            ),
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _cache_completion(self, key: str, model: str, response: dict):
+        try:
+            await self.cache.set_completion(  # type: ignore
+                key, model, response, self.config.cache_ttl_seconds
+            )
+            self._cache_writes += 1
+            if self._cache_writes % CACHE_EVICTION_INTERVAL == 0:
+                await self.cache.evict(self.config.cache_max_entries)  # type: ignore
+        except Exception as e:
+            logger.warning(f"Failed to cache completion: {e}")
+
     async def aget_completion(
         self,
         messages: list[dict],
         generation_config: GenerationConfig,
+        use_cache: bool = False,
+        refresh_cache: bool = False,
         **kwargs,
     ) -> LLMChatCompletion:
+        """
+        Get a completion, served from the completion cache when possible.
+
+        The cache only applies when `use_cache` is set, which internal
+        pipelines such as graph extraction and summaries do. `refresh_cache`
+        skips the lookup but still stores the new completion, for callers
+        retrying after a bad response.
+        """
+        cache_key = None
+        if use_cache and self.cache and self.config.cache_enabled:
+            try:
+                cache_key = self._cache_key(
+                    messages, generation_config, kwargs
+                )
+            except TypeError as e:
+                logger.debug(f"Skipping completion cache: {e}")
+            if cache_key and not refresh_cache:
+                try:
+                    cached = await self.cache.get_completion(cache_key)
+                except Exception as e:
+                    logger.warning(f"Failed to read completion cache: {e}")
+                    cached = None
+                if cached is not None:
+                    return LLMChatCompletion(**cached)
+
         task = {
             "messages": messages,
             "generation_config": generation_config,
@@ -151,7 +248,12 @@ class CompletionProvider(Provider):
         if modalities := kwargs.get("modalities"):
             task["modalities"] = modalities
         response = await self._execute_with_backoff_async(task)
-        return LLMChatCompletion(**response.dict())
+        completion = response.dict()
+        if cache_key:
+            await self._cache_completion(
+                cache_key, generation_config.model, completion
+            )
+        return LLMChatCompletion(**completion)
 
     async def aget_completion_stream(
         self,
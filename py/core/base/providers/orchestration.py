@@ -17,6 +17,14 @@ class OrchestrationConfig(ProviderConfig):
     ingestion_concurrency_limit: int = 16
     kg_concurrency_limit: int = 4
 
+    # Durable job queue for the `simple` provider
+    queue_workflows: bool = False
+    queue_workers: dict[str, int] = {}
+    queue_max_attempts: int = 3
+    queue_retry_backoff_seconds: float = 10.0
+    queue_visibility_timeout_seconds: float = 1_800.0
+    queue_poll_interval_seconds: float = 1.0
+
     def validate_config(self) -> None:
         if self.provider not in self.supported_providers:
             raise ValueError(f"Provider {self.provider} is not supported.")
@@ -36,6 +44,10 @@ class OrchestrationProvider(Provider):
     async def start_worker(self):
         pass
 
+    async def stop_worker(self) -> None:
+        """Stop any work the provider runs in this process."""
+        pass
+
     @abstractmethod
     def get_worker(self, name: str, max_runs: int) -> Any:
         pass
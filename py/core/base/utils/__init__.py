@@ -1,8 +1,11 @@
 from shared.utils import (
+    PackedContext,
     RecursiveCharacterTextSplitter,
     TextSplitter,
     _decorate_vector_type,
     _get_str_estimation_output,
+    build_context,
+    count_tokens,
     decrement_version,
     deep_update,
     format_search_results_for_llm,
@@ -13,9 +16,12 @@ from shared.utils import (
     generate_extraction_id,
     generate_id,
     generate_user_id,
+    group_chunks,
     increment_version,
     llm_cost_per_million_tokens,
+    run_bounded,
     run_pipeline,
+    scale_group_limit,
     to_async_generator,
     validate_uuid,
 )
@@ -23,11 +29,17 @@ from shared.utils import (
 __all__ = [
     "format_search_results_for_stream",
     "format_search_results_for_llm",
+    "build_context",
+    "count_tokens",
+    "PackedContext",
     "generate_id",
     "generate_default_user_collection_id",
     "increment_version",
     "decrement_version",
     "run_pipeline",
+    "run_bounded",
+    "group_chunks",
+    "scale_group_limit",
     "to_async_generator",
     "generate_document_id",
     "generate_extraction_id",
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import textwrap
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Callable, Optional
 
 import asyncpg
 
@@ -25,6 +25,17 @@ class SemaphoreConnectionPool:
             self.semaphore = asyncio.Semaphore(
                 int(self.postgres_configuration_settings.max_connections * 0.9)
             )
+            # Part of the remaining headroom, for connections opened outside
+            # the pool by `get_dedicated_connection`
+            self.dedicated_semaphore = asyncio.Semaphore(
+                max(
+                    1,
+                    int(
+                        self.postgres_configuration_settings.max_connections
+                        * 0.05
+                    ),
+                )
+            )
 
             self.pool = await asyncpg.create_pool(
                 self.connection_string,
@@ -46,6 +57,26 @@ class SemaphoreConnectionPool:
             async with self.pool.acquire() as conn:
                 yield conn
 
+    @asynccontextmanager
+    async def get_dedicated_connection(
+        self, server_settings: Optional[dict[str, str]] = None
+    ):
+        """
+        Open a connection outside the pool for reads that last as long as a
+        client download, so slow clients never hold pooled connections. The
+        number open at once is bounded.
+        """
+        async with self.dedicated_semaphore:
+            conn = await asyncpg.connect(
+                self.connection_string,
+                statement_cache_size=self.postgres_configuration_settings.statement_cache_size,
+                server_settings=server_settings,
+            )
+            try:
+                yield conn
+            finally:
+                await conn.close()
+
     async def close(self):
         await self.pool.close()
 
@@ -110,10 +141,98 @@ class PostgresConnectionManager(DatabaseConnectionManager):
 
     def __init__(self):
         self.pool: Optional[SemaphoreConnectionPool] = None
+        self._listeners: dict[str, list[Callable[[Optional[str]], None]]] = {}
+        self._listener_connection: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
 
     async def initialize(self, pool: SemaphoreConnectionPool):
         self.pool = pool
 
+    async def listen(
+        self, channel: str, callback: Callable[[Optional[str]], None]
+    ) -> None:
+        """
+        Call `callback` with the payload of every notification sent on
+        `channel`, by this process or any other.
+
+        Notifications arrive on a dedicated connection outside the pool. If
+        that connection drops it is re-established, and `callback` is called
+        with `None` since notifications may have been missed in between.
+        """
+        if not self.pool:
+            raise ValueError("PostgresConnectionManager is not initialized.")
+        self._listeners.setdefault(channel, []).append(callback)
+        if self._listener_connection is None:
+            await self._connect_listener()
+        elif len(self._listeners[channel]) == 1:
+            await self._listener_connection.add_listener(
+                channel, self._dispatch_notification
+            )
+
+    async def notify(self, channel: str, payload: str) -> None:
+        await self.execute_query(
+            "SELECT pg_notify($1, $2)", [channel, payload]
+        )
+
+    async def close(self) -> None:
+        self._listeners.clear()
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        connection, self._listener_connection = (
+            self._listener_connection,
+            None,
+        )
+        if connection:
+            await connection.close()
+
+    async def _connect_listener(self) -> None:
+        connection = await asyncpg.connect(self.pool.connection_string)  # type: ignore
+        connection.add_termination_listener(self._on_listener_terminated)
+        for channel in self._listeners:
+            await connection.add_listener(channel, self._dispatch_notification)
+        self._listener_connection = connection
+
+    def _dispatch_notification(
+        self,
+        connection: asyncpg.Connection,
+        pid: int,
+        channel: str,
+        payload: Optional[str],
+    ) -> None:
+        for callback in self._listeners.get(channel, []):
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(
+                    f"Error handling notification on channel {channel}: {str(e)}"
+                )
+
+    def _on_listener_terminated(self, connection: asyncpg.Connection) -> None:
+        if connection is not self._listener_connection:
+            return
+        logger.warning("Lost the Postgres notification connection.")
+        self._listener_connection = None
+        self._reconnect_task = asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self) -> None:
+        delay = 1.0
+        while self._listeners:
+            try:
+                await self._connect_listener()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to reconnect for notifications, retrying in {delay:.0f}s: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+                continue
+
+            for channel in self._listeners:
+                self._dispatch_notification(
+                    self._listener_connection, 0, channel, None  # type: ignore
+                )
+            return
+
     async def execute_query(self, query, params=None, isolation_level=None):
         if not self.pool:
             raise ValueError("PostgresConnectionManager is not initialized.")
@@ -3,7 +3,7 @@ import json
 import logging
 import time
 import uuid
-from typing import Any, Optional, TypedDict
+from typing import Any, AsyncGenerator, Optional, TypedDict
 from uuid import UUID
 
 import numpy as np
@@ -618,6 +618,18 @@ class PostgresChunksHandler(Handler):
         )
         return result
 
+    async def assign_documents_chunks_to_collection(
+        self, document_ids: list[UUID], collection_id: UUID
+    ) -> None:
+        query = f"""
+        UPDATE {self._get_table_name(PostgresChunksHandler.TABLE_NAME)}
+        SET collection_ids = array_append(collection_ids, $1)
+        WHERE document_id = ANY($2) AND NOT ($1 = ANY(collection_ids));
+        """
+        await self.connection_manager.execute_query(
+            query, (collection_id, document_ids)
+        )
+
     async def remove_document_from_collection_vector(
         self, document_id: UUID, collection_id: UUID
     ) -> None:
@@ -692,6 +704,46 @@ class PostgresChunksHandler(Handler):
 
         return {"results": chunks, "total_entries": total}
 
+    async def iterate_document_chunks(
+        self, document_id: UUID, batch_size: int = 1_000
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Yield every chunk of a document in chunk order.
+
+        Pages are read with keyset pagination on `(chunk_order, id)`, so each
+        page costs the same however deep into the document it is, and no
+        connection is held between pages.
+        """
+        chunk_order = (
+            "COALESCE((metadata->>'chunk_order')::integer, 2147483647)"
+        )
+        query = f"""
+        SELECT id, document_id, owner_id, collection_ids, text, metadata,
+            {chunk_order} AS chunk_order
+        FROM {self._get_table_name(PostgresChunksHandler.TABLE_NAME)}
+        WHERE document_id = $1 AND ({chunk_order}, id) > ($2, $3)
+        ORDER BY {chunk_order}, id
+        LIMIT $4;
+        """
+
+        last_order, last_id = -1, UUID(int=0)
+        while True:
+            results = await self.connection_manager.fetch_query(
+                query, [document_id, last_order, last_id, batch_size]
+            )
+            for result in results:
+                yield {
+                    "id": result["id"],
+                    "document_id": result["document_id"],
+                    "owner_id": result["owner_id"],
+                    "collection_ids": result["collection_ids"],
+                    "text": result["text"],
+                    "metadata": json.loads(result["metadata"]),
+                }
+            if len(results) < batch_size:
+                return
+            last_order, last_id = results[-1]["chunk_order"], results[-1]["id"]
+
     async def get_chunk(self, id: UUID) -> dict:
         query = f"""
         SELECT id, document_id, owner_id, collection_ids, text, metadata
@@ -779,11 +831,18 @@ class PostgresChunksHandler(Handler):
                 f"{self.project_name}.{VectorTableName.GRAPHS_ENTITIES}"
             )
             col_name = "description_embedding"
+        elif table_name == VectorTableName.GRAPHS_RELATIONSHIPS:
+            table_name_str = (
+                f"{self.project_name}.{VectorTableName.GRAPHS_RELATIONSHIPS}"
+            )
+            col_name = "description_embedding"
         elif table_name == VectorTableName.COMMUNITIES:
             table_name_str = (
                 f"{self.project_name}.{VectorTableName.COMMUNITIES}"
             )
-            col_name = "embedding"
+            # Community embeddings live in `description_embedding`; the
+            # table has no `embedding` column, so indexes on it always failed
+            col_name = "description_embedding"
         else:
             raise ArgError("invalid table name")
 
@@ -990,6 +1049,11 @@ class PostgresChunksHandler(Handler):
                 f"{self.project_name}.{VectorTableName.GRAPHS_ENTITIES}"
             )
             col_name = "description_embedding"
+        elif table_name == VectorTableName.GRAPHS_RELATIONSHIPS:
+            table_name_str = (
+                f"{self.project_name}.{VectorTableName.GRAPHS_RELATIONSHIPS}"
+            )
+            col_name = "description_embedding"
         elif table_name == VectorTableName.COMMUNITIES:
             table_name_str = (
                 f"{self.project_name}.{VectorTableName.COMMUNITIES}"
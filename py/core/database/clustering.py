@@ -0,0 +1,333 @@
+"""
+Array-backed graph representation used for community clustering.
+
+Relationships are interned into a node table and stored as parallel NumPy
+arrays, so memory scales with the number of edges rather than with the
+number of Python objects. Leiden clustering runs in a separate process so the
+event loop stays responsive while large collections are clustered.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger()
+
+DEFAULT_LEIDEN_SEED = 7272
+
+
+@dataclass
+class GraphEdges:
+    """An undirected, integer-encoded edge list with its node table."""
+
+    nodes: list[str]
+    sources: np.ndarray  # int32 indices into `nodes`
+    targets: np.ndarray  # int32 indices into `nodes`
+    weights: np.ndarray  # float32
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def connected_components(self) -> np.ndarray:
+        """Label every node with the smallest node index in its component."""
+        labels = np.arange(len(self.nodes), dtype=np.int32)
+        while True:
+            # Pull both endpoints down to the smaller label, then shortcut
+            # chains of labels so long paths converge quickly
+            low = np.minimum(labels[self.sources], labels[self.targets])
+            updated = labels.copy()
+            np.minimum.at(updated, self.sources, low)
+            np.minimum.at(updated, self.targets, low)
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                return labels
+            labels = updated
+
+    def subgraph(self, node_mask: np.ndarray) -> "GraphEdges":
+        """Keep only the edges whose endpoints are both selected."""
+        keep = node_mask[self.sources] & node_mask[self.targets]
+        return GraphEdges(
+            nodes=self.nodes,
+            sources=self.sources[keep],
+            targets=self.targets[keep],
+            weights=self.weights[keep],
+        )
+
+
+@dataclass
+class GraphAdjacency:
+    """
+    Compressed sparse row (CSR) adjacency of an undirected graph, used for
+    multi-hop traversal. The neighbours of node `i` are
+    `indices[indptr[i]:indptr[i + 1]]`.
+    """
+
+    nodes: list[str]
+    node_ids: dict[str, int]
+    indptr: np.ndarray  # int64
+    indices: np.ndarray  # int32 indices into `nodes`
+    weights: np.ndarray  # float32, scaled into [0, 1] by the largest weight
+
+    @classmethod
+    def from_edges(cls, edges: GraphEdges) -> "GraphAdjacency":
+        num_nodes = len(edges.nodes)
+        sources = np.concatenate([edges.sources, edges.targets])
+        targets = np.concatenate([edges.targets, edges.sources])
+        weights = np.concatenate([edges.weights, edges.weights])
+
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+
+        max_weight = float(weights.max()) if len(weights) else 0.0
+        if max_weight > 0:
+            weights = np.clip(weights / max_weight, 0.0, 1.0)
+        else:
+            weights = np.ones_like(weights)
+
+        return cls(
+            nodes=edges.nodes,
+            node_ids={name: i for i, name in enumerate(edges.nodes)},
+            indptr=indptr,
+            indices=targets[order].astype(np.int32, copy=False),
+            weights=weights[order].astype(np.float32, copy=False),
+        )
+
+    def expand(
+        self, seeds: dict[str, float], max_hops: int, hop_decay: float
+    ) -> list[tuple[str, float, int]]:
+        """
+        Spread seed scores up to `max_hops` hops over the graph.
+
+        A neighbour scores `score * hop_decay * weight` through each edge and
+        keeps its best path. Returns `(name, score, hops)` for every reached
+        node, best first.
+        """
+        scores = np.zeros(len(self.nodes), dtype=np.float64)
+        hops = np.full(len(self.nodes), -1, dtype=np.int32)
+        for name, score in seeds.items():
+            node_id = self.node_ids.get(name)
+            if node_id is not None:
+                scores[node_id] = max(scores[node_id], score, 0.0)
+                hops[node_id] = 0
+
+        frontier = np.flatnonzero(hops == 0)
+        for hop in range(1, max_hops + 1):
+            if not len(frontier):
+                break
+            # Gather the CSR rows of the frontier into flat edge positions
+            counts = self.indptr[frontier + 1] - self.indptr[frontier]
+            positions = np.repeat(self.indptr[frontier], counts) + (
+                np.arange(int(counts.sum()))
+                - np.repeat(np.cumsum(counts) - counts, counts)
+            )
+            neighbours = self.indices[positions]
+            candidates = (
+                np.repeat(scores[frontier], counts)
+                * hop_decay
+                * self.weights[positions]
+            )
+
+            updated = scores.copy()
+            np.maximum.at(updated, neighbours, candidates)
+            touched = np.zeros(len(self.nodes), dtype=bool)
+            touched[neighbours] = True
+            improved = np.flatnonzero(
+                (updated > scores) | (touched & (hops < 0))
+            )
+            hops[improved] = hop
+            scores = updated
+            frontier = improved
+
+        reached = np.flatnonzero(hops >= 0)
+        reached = reached[np.argsort(-scores[reached], kind="stable")]
+        return [
+            (self.nodes[i], float(scores[i]), int(hops[i]))
+            for i in reached.tolist()
+        ]
+
+
+class GraphEdgesBuilder:
+    """Accumulates edges into compact typed buffers while interning node names."""
+
+    def __init__(self):
+        self._node_ids: dict[str, int] = {}
+        self._nodes: list[str] = []
+        self._sources = array("i")
+        self._targets = array("i")
+        self._weights = array("f")
+
+    def _intern(self, name: str) -> int:
+        node_id = self._node_ids.get(name)
+        if node_id is None:
+            node_id = len(self._nodes)
+            self._node_ids[name] = node_id
+            self._nodes.append(name)
+        return node_id
+
+    def add_edge(
+        self, subject: str, object: str, weight: Optional[float] = None
+    ) -> None:
+        self._sources.append(self._intern(subject))
+        self._targets.append(self._intern(object))
+        self._weights.append(1.0 if weight is None else weight)
+
+    def build(self) -> GraphEdges:
+        sources = np.frombuffer(self._sources, dtype=np.int32)
+        targets = np.frombuffer(self._targets, dtype=np.int32)
+        weights = np.frombuffer(self._weights, dtype=np.float32)
+
+        # Collapse repeated and reversed pairs the way an undirected graph
+        # would, keeping the weight of the last occurrence.
+        low = np.minimum(sources, targets).astype(np.int64)
+        high = np.maximum(sources, targets).astype(np.int64)
+        keys = (low << 32) | high
+        _, reversed_index = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(len(keys) - 1 - reversed_index)
+
+        return GraphEdges(
+            nodes=self._nodes,
+            sources=sources[keep].copy(),
+            targets=targets[keep].copy(),
+            weights=weights[keep].copy(),
+        )
+
+
+@dataclass
+class CommunityAssignments:
+    """Flat hierarchical cluster assignments, one row per node and level."""
+
+    nodes: list[str]
+    node: np.ndarray  # int32 indices into `nodes`
+    cluster: np.ndarray  # int32
+    level: np.ndarray  # int32
+
+    def __len__(self) -> int:
+        return len(self.node)
+
+    @property
+    def num_communities(self) -> int:
+        return int(self.cluster.max()) + 1 if len(self.cluster) else 0
+
+    def clusters(self) -> list[tuple[int, list[str]]]:
+        """List the `(level, node names)` of every cluster."""
+        grouped: dict[int, tuple[int, list[str]]] = {}
+        for node_id, cluster_id, level in zip(
+            self.node.tolist(), self.cluster.tolist(), self.level.tolist()
+        ):
+            grouped.setdefault(cluster_id, (level, []))[1].append(
+                self.nodes[node_id]
+            )
+        return list(grouped.values())
+
+
+def hierarchical_leiden_arrays(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    leiden_params: dict[str, Any],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run hierarchical Leiden over an integer edge list.
+
+    Returns `(node, cluster, level)` int32 arrays. This function is executed
+    in a worker process, so it only takes and returns plain arrays.
+    """
+    try:
+        from graspologic.partition import hierarchical_leiden
+    except ImportError as e:
+        raise ImportError("Please install the graspologic package.") from e
+
+    leiden_params = {"random_seed": DEFAULT_LEIDEN_SEED, **leiden_params}
+    edges = list(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+    partitions = hierarchical_leiden(edges, **leiden_params)
+
+    count = len(partitions)
+    return (
+        np.fromiter(
+            (int(p.node) for p in partitions), dtype=np.int32, count=count
+        ),
+        np.fromiter((p.cluster for p in partitions), np.int32, count=count),
+        np.fromiter((p.level for p in partitions), np.int32, count=count),
+    )
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # `spawn` avoids forking a process that holds event loop and pool threads
+        _executor = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def cluster_graph_edges(
+    edges: GraphEdges, leiden_params: dict[str, Any]
+) -> CommunityAssignments:
+    """Cluster a graph in the process pool without blocking the event loop."""
+    if not len(edges):
+        empty = np.empty(0, dtype=np.int32)
+        return CommunityAssignments(edges.nodes, empty, empty, empty)
+
+    loop = asyncio.get_running_loop()
+    node, cluster, level = await loop.run_in_executor(
+        _get_executor(),
+        hierarchical_leiden_arrays,
+        edges.sources,
+        edges.targets,
+        edges.weights,
+        leiden_params,
+    )
+    return CommunityAssignments(
+        nodes=edges.nodes, node=node, cluster=cluster, level=level
+    )
+
+
+def encode_graph_edges(
+    edges: GraphEdges, leiden_params: dict[str, Any]
+) -> bytes:
+    """
+    Serialize a graph for the remote clustering service.
+
+    The body is a compressed `.npz` archive holding little-endian int32
+    `sources`/`targets`, float32 `weights`, the node count and the Leiden
+    parameters as UTF-8 JSON. Node names never leave the server; results
+    refer back to them by index.
+    """
+    buffer = BytesIO()
+    np.savez_compressed(
+        buffer,
+        num_nodes=np.array([len(edges.nodes)], dtype="<i4"),
+        sources=edges.sources.astype("<i4", copy=False),
+        targets=edges.targets.astype("<i4", copy=False),
+        weights=edges.weights.astype("<f4", copy=False),
+        leiden_params=np.frombuffer(
+            json.dumps(leiden_params).encode("utf-8"), dtype=np.uint8
+        ),
+    )
+    return buffer.getvalue()
+
+
+def decode_community_assignments(
+    payload: bytes, nodes: list[str]
+) -> CommunityAssignments:
+    """Decode a clustering service result against the node table it was built from."""
+    with np.load(BytesIO(payload), allow_pickle=False) as data:
+        return CommunityAssignments(
+            nodes=nodes,
+            node=data["node"].astype(np.int32, copy=False),
+            cluster=data["cluster"].astype(np.int32, copy=False),
+            level=data["level"].astype(np.int32, copy=False),
+        )
@@ -28,6 +28,9 @@ logger = logging.getLogger()
 
 class PostgresCollectionsHandler(Handler):
     TABLE_NAME = "collections"
+    VERSIONS_TABLE_NAME = "collection_versions"
+    # Bumped along with every collection, for callers that can see them all
+    GLOBAL_VERSION_ID = UUID(int=0)
 
     def __init__(
         self,
@@ -52,9 +55,57 @@ class PostgresCollectionsHandler(Handler):
             user_count INT DEFAULT 0,
             document_count INT DEFAULT 0
         );
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresCollectionsHandler.VERSIONS_TABLE_NAME)} (
+            collection_id UUID PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
         """
         await self.connection_manager.execute_query(query)
 
+    def _increment_versions_query(self, collection_ids_sql: str) -> str:
+        # Rows are locked in id order so concurrent bumps cannot deadlock
+        versions_table = self._get_table_name(
+            PostgresCollectionsHandler.VERSIONS_TABLE_NAME
+        )
+        return f"""
+            INSERT INTO {versions_table} (collection_id, version)
+            SELECT id, 1 FROM (
+                {collection_ids_sql}
+                UNION SELECT '{PostgresCollectionsHandler.GLOBAL_VERSION_ID}'::uuid
+            ) ids
+            ORDER BY id
+            ON CONFLICT (collection_id) DO UPDATE SET
+                version = {versions_table}.version + 1,
+                updated_at = NOW()
+        """
+
+    async def increment_collection_versions(
+        self, collection_ids: list[UUID]
+    ) -> None:
+        """
+        Bump the content version of collections whose searchable documents
+        changed, along with the global version. Caches keyed on these
+        versions stop matching entries written before the change.
+        """
+        query = self._increment_versions_query(
+            "SELECT unnest($1::uuid[]) AS id"
+        )
+        await self.connection_manager.execute_query(query, [collection_ids])
+
+    async def increment_document_collection_versions(
+        self, document_ids: list[UUID]
+    ) -> None:
+        """Bump the content version of every collection holding the given documents."""
+        query = self._increment_versions_query(
+            f"""
+            SELECT unnest(collection_ids) AS id
+            FROM {self._get_table_name('documents')}
+            WHERE id = ANY($1::uuid[])
+            """
+        )
+        await self.connection_manager.execute_query(query, [document_ids])
+
     async def collection_exists(self, collection_id: UUID) -> bool:
         """Check if a collection exists."""
         query = f"""
@@ -230,6 +281,8 @@ class PostgresCollectionsHandler(Handler):
         if not deleted:
             raise R2RException(status_code=404, message="Collection not found")
 
+        await self.increment_collection_versions([collection_id])
+
     async def documents_in_collection(
         self, collection_id: UUID, offset: int, limit: int
     ) -> dict[str, list[DocumentResponse] | int]:
@@ -426,6 +479,7 @@ class PostgresCollectionsHandler(Handler):
             await self.connection_manager.execute_query(
                 query=update_collection_query, params=[collection_id]
             )
+            await self.increment_collection_versions([collection_id])
 
             return collection_id
 
@@ -438,6 +492,43 @@ class PostgresCollectionsHandler(Handler):
                 detail=f"An error '{e}' occurred while assigning the document to the collection",
             )
 
+    async def assign_documents_to_collection_relational(
+        self,
+        document_ids: list[UUID],
+        collection_id: UUID,
+    ) -> list[UUID]:
+        """
+        Assign many documents to a collection with a single update.
+
+        Documents that are missing or already assigned are skipped rather than
+        raising, and the collection's document count is bumped once.
+
+        Returns:
+            list[UUID]: The IDs of the documents that were newly assigned.
+        """
+        if not await self.collection_exists(collection_id):
+            raise R2RException(status_code=404, message="Collection not found")
+
+        query = f"""
+            WITH assigned AS (
+                UPDATE {self._get_table_name('documents')}
+                SET collection_ids = array_append(collection_ids, $1)
+                WHERE id = ANY($2) AND NOT ($1 = ANY(collection_ids))
+                RETURNING id
+            ), counted AS (
+                UPDATE {self._get_table_name('collections')}
+                SET document_count = document_count + (SELECT COUNT(*) FROM assigned)
+                WHERE id = $1
+            )
+            SELECT id FROM assigned
+        """
+        results = await self.connection_manager.fetch_query(
+            query, [collection_id, document_ids]
+        )
+        if results:
+            await self.increment_collection_versions([collection_id])
+        return [row["id"] for row in results]
+
     async def remove_document_from_collection_relational(
         self, document_id: UUID, collection_id: UUID
     ) -> None:
@@ -469,3 +560,5 @@ class PostgresCollectionsHandler(Handler):
                 status_code=404,
                 message="Document not found in the specified collection",
             )
+
+        await self.increment_collection_versions([collection_id])
@@ -0,0 +1,94 @@
+import json
+import logging
+from typing import Optional
+
+from core.base import Handler
+
+from .base import PostgresConnectionManager
+
+logger = logging.getLogger()
+
+
+class PostgresCompletionCacheHandler(Handler):
+    """
+    Stores LLM completions keyed by a hash of the model, messages and
+    generation parameters, so deterministic prompts are not paid for twice.
+
+    Entries expire after their TTL and the table is trimmed back to a maximum
+    number of entries, least recently used first.
+    """
+
+    TABLE_NAME = "completion_cache"
+
+    def __init__(
+        self,
+        project_name: str,
+        connection_manager: PostgresConnectionManager,
+    ):
+        super().__init__(project_name, connection_manager)
+
+    async def create_tables(self):
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresCompletionCacheHandler.TABLE_NAME)} (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response JSONB NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            last_used_at TIMESTAMPTZ DEFAULT NOW(),
+            expires_at TIMESTAMPTZ NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_completion_cache_last_used_{self.project_name}
+        ON {self._get_table_name(PostgresCompletionCacheHandler.TABLE_NAME)} (last_used_at);
+        """
+        await self.connection_manager.execute_query(query)
+
+    async def get_completion(self, key: str) -> Optional[dict]:
+        """Return a cached completion and mark it as recently used."""
+        query = f"""
+        UPDATE {self._get_table_name(PostgresCompletionCacheHandler.TABLE_NAME)}
+        SET last_used_at = NOW()
+        WHERE key = $1 AND expires_at > NOW()
+        RETURNING response
+        """
+        result = await self.connection_manager.fetchrow_query(query, [key])
+        return json.loads(result["response"]) if result else None
+
+    async def set_completion(
+        self, key: str, model: str, response: dict, ttl_seconds: float
+    ) -> None:
+        query = f"""
+        INSERT INTO {self._get_table_name(PostgresCompletionCacheHandler.TABLE_NAME)}
+        (key, model, response, expires_at)
+        VALUES ($1, $2, $3, NOW() + make_interval(secs => $4))
+        ON CONFLICT (key) DO UPDATE SET
+            response = EXCLUDED.response,
+            last_used_at = NOW(),
+            expires_at = EXCLUDED.expires_at
+        """
+        await self.connection_manager.execute_query(
+            query,
+            [
+                key,
+                model,
+                json.dumps(response, default=str),
+                float(ttl_seconds),
+            ],
+        )
+
+    async def evict(self, max_entries: int) -> None:
+        """Drop expired entries, then the least recently used beyond `max_entries`."""
+        table_name = self._get_table_name(
+            PostgresCompletionCacheHandler.TABLE_NAME
+        )
+        query = f"""
+        WITH expired AS (
+            DELETE FROM {table_name} WHERE expires_at <= NOW()
+        )
+        DELETE FROM {table_name}
+        WHERE key IN (
+            SELECT key FROM {table_name}
+            ORDER BY last_used_at DESC
+            OFFSET $1
+        )
+        """
+        await self.connection_manager.execute_query(query, [max_entries])
@@ -26,8 +26,13 @@ class PostgresConversationsHandler(Handler):
             id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
             user_id UUID,
             created_at TIMESTAMPTZ DEFAULT NOW(),
-            name TEXT
+            name TEXT,
+            summary TEXT,
+            summary_message_id UUID
         );
+        ALTER TABLE {self._get_table_name("conversations")}
+        ADD COLUMN IF NOT EXISTS summary TEXT,
+        ADD COLUMN IF NOT EXISTS summary_message_id UUID;
         """
 
         create_messages_query = f"""
@@ -42,8 +47,16 @@ class PostgresConversationsHandler(Handler):
             FOREIGN KEY (parent_id) REFERENCES {self._get_table_name("messages")}(id)
         );
         """
+        # Supports keyset reads of the most recent messages of a conversation
+        create_messages_index_query = f"""
+        CREATE INDEX IF NOT EXISTS idx_messages_conversation_created_{self.project_name}
+        ON {self._get_table_name("messages")} (conversation_id, created_at, id);
+        """
         await self.connection_manager.execute_query(create_conversations_query)
         await self.connection_manager.execute_query(create_messages_query)
+        await self.connection_manager.execute_query(
+            create_messages_index_query
+        )
 
     async def create_conversation(
         self,
@@ -281,6 +294,23 @@ class PostgresConversationsHandler(Handler):
                 status_code=500, message="Failed to update message."
             )
 
+        # A summary that covers the edited message no longer reflects it
+        reset_summary_query = f"""
+            UPDATE {self._get_table_name("conversations")} c
+            SET summary = NULL, summary_message_id = NULL
+            WHERE c.id = $1
+                AND c.summary_message_id IS NOT NULL
+                AND ($2::timestamptz, $3::uuid) <= (
+                    SELECT created_at, id
+                    FROM {self._get_table_name("messages")}
+                    WHERE id = c.summary_message_id
+                )
+        """
+        await self.connection_manager.execute_query(
+            reset_summary_query,
+            [row["conversation_id"], row["created_at"], message_id],
+        )
+
         return {
             "id": str(message_id),
             "message": (
@@ -371,6 +401,149 @@ class PostgresConversationsHandler(Handler):
             for row in results
         ]
 
+    async def get_conversation_window(
+        self,
+        conversation_id: UUID,
+        max_messages: int,
+        max_pending: int,
+    ) -> dict[str, Any]:
+        """
+        Fetch the last `max_messages` messages of a conversation along with
+        its rolling summary of the ones before them.
+
+        `pending` holds the oldest messages that precede the window but are
+        not yet covered by the summary, at most `max_pending` of them, for
+        the summary to be extended with. `recent` holds the last
+        `max_pending` of those unsummarized messages, which lead into the
+        window, and `omitted` counts the unsummarized messages before
+        `recent`. All lists are in chronological order.
+        """
+        conv_query = f"""
+            SELECT summary, summary_message_id
+            FROM {self._get_table_name("conversations")}
+            WHERE id = $1
+        """
+        conv_row = await self.connection_manager.fetchrow_query(
+            conv_query, [conversation_id]
+        )
+        if not conv_row:
+            raise R2RException(
+                status_code=404,
+                message=f"Conversation {conversation_id} not found.",
+            )
+
+        window_query = f"""
+            SELECT id, content, metadata
+            FROM {self._get_table_name("messages")}
+            WHERE conversation_id = $1
+            ORDER BY created_at DESC, id DESC
+            LIMIT $2
+        """
+        window_rows = await self.connection_manager.fetch_query(
+            window_query, [conversation_id, max_messages]
+        )
+        window = [self._message_response(row) for row in reversed(window_rows)]
+
+        pending: list[MessageResponse] = []
+        recent: list[MessageResponse] = []
+        omitted = 0
+        if len(window) == max_messages and max_pending > 0:
+            unsummarized_query = f"""
+                SELECT m.id, m.content, m.metadata, COUNT(*) OVER () AS total
+                FROM {self._get_table_name("messages")} m
+                WHERE m.conversation_id = $1
+                    AND (m.created_at, m.id) < (
+                        SELECT created_at, id
+                        FROM {self._get_table_name("messages")}
+                        WHERE id = $2
+                    )
+                    AND (
+                        $3::uuid IS NULL
+                        OR (m.created_at, m.id) > (
+                            SELECT created_at, id
+                            FROM {self._get_table_name("messages")}
+                            WHERE id = $3
+                        )
+                    )
+                ORDER BY m.created_at {{direction}}, m.id {{direction}}
+                LIMIT $4
+            """
+            params = [
+                conversation_id,
+                window[0].id,
+                conv_row["summary_message_id"],
+                max_pending,
+            ]
+            pending_rows = await self.connection_manager.fetch_query(
+                unsummarized_query.format(direction="ASC"), params
+            )
+            pending = [self._message_response(row) for row in pending_rows]
+            recent = pending
+            total = pending_rows[0]["total"] if pending_rows else 0
+            if total > max_pending:
+                # More messages are unsummarized than fit in one batch, so the
+                # ones leading into the window are loaded separately
+                recent_rows = await self.connection_manager.fetch_query(
+                    unsummarized_query.format(direction="DESC"), params
+                )
+                recent = [
+                    self._message_response(row)
+                    for row in reversed(recent_rows)
+                ]
+                omitted = total - len(recent)
+
+        return {
+            "summary": conv_row["summary"],
+            "pending": pending,
+            "recent": recent,
+            "omitted": omitted,
+            "messages": window,
+        }
+
+    async def update_conversation_summary(
+        self,
+        conversation_id: UUID,
+        summary: str,
+        summary_message_id: UUID,
+    ) -> bool:
+        """
+        Store `summary` as covering the conversation up to and including
+        `summary_message_id`.
+
+        The update is skipped if the stored summary already reaches at least
+        as far, e.g. because a concurrent turn summarized the same messages.
+        """
+        query = f"""
+            UPDATE {self._get_table_name("conversations")} c
+            SET summary = $2, summary_message_id = $3
+            WHERE c.id = $1
+                AND (
+                    c.summary_message_id IS NULL
+                    OR (
+                        SELECT created_at, id
+                        FROM {self._get_table_name("messages")}
+                        WHERE id = $3
+                    ) > (
+                        SELECT created_at, id
+                        FROM {self._get_table_name("messages")}
+                        WHERE id = c.summary_message_id
+                    )
+                )
+            RETURNING c.id
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [conversation_id, summary, summary_message_id]
+        )
+        return result is not None
+
+    @staticmethod
+    def _message_response(row) -> MessageResponse:
+        return MessageResponse(
+            id=row["id"],
+            message=Message(**json.loads(row["content"])),
+            metadata=json.loads(row["metadata"]),
+        )
+
     async def update_conversation(
         self, conversation_id: UUID, name: str
     ) -> ConversationResponse:
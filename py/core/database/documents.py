@@ -27,6 +27,7 @@ logger = logging.getLogger()
 
 class PostgresDocumentsHandler(Handler):
     TABLE_NAME = "documents"
+    JOBS_TABLE_NAME = "ingestion_jobs"
 
     def __init__(
         self,
@@ -77,6 +78,16 @@ class PostgresDocumentsHandler(Handler):
         except Exception as e:
             logger.warning(f"Error {e} when creating document table.")
 
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresDocumentsHandler.JOBS_TABLE_NAME)} (
+            id UUID PRIMARY KEY,
+            owner_id UUID,
+            document_ids UUID[] NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        """
+        await self.connection_manager.execute_query(query)
+
     async def upsert_documents_overview(
         self, documents_overview: DocumentResponse | list[DocumentResponse]
     ) -> None:
@@ -194,6 +205,194 @@ class PostgresDocumentsHandler(Handler):
                         wait_time = 0.1 * (2**retries)  # Exponential backoff
                         await asyncio.sleep(wait_time)
 
+    async def insert_documents_overview_bulk(
+        self,
+        documents_overview: list[DocumentResponse],
+        overwrite_existing: bool = False,
+    ) -> list[UUID]:
+        """
+        Register many documents with a single set-based statement.
+
+        Rows are unnested from column arrays so the whole batch is written in
+        one round trip. Unless `overwrite_existing` is set, documents that
+        already exist are only replaced when their previous ingestion failed.
+
+        Args:
+            documents_overview (list[DocumentResponse]): The documents to write.
+            overwrite_existing (bool): Replace existing rows regardless of their status.
+
+        Returns:
+            list[UUID]: The IDs of the rows that were inserted or replaced.
+        """
+        if not documents_overview:
+            return []
+
+        # A statement may only touch each conflicting row once
+        unique_documents = list(
+            {document.id: document for document in documents_overview}.values()
+        )
+        db_entries = [doc.convert_to_db_entry() for doc in unique_documents]
+
+        table_name = self._get_table_name(PostgresDocumentsHandler.TABLE_NAME)
+        conflict_filter = (
+            ""
+            if overwrite_existing
+            else f"WHERE {table_name}.ingestion_status = '{IngestionStatus.FAILED.value}'"
+        )
+        query = f"""
+        INSERT INTO {table_name}
+        (id, collection_ids, owner_id, type, metadata, title, version,
+        size_in_bytes, ingestion_status, extraction_status, summary, summary_embedding)
+        SELECT d.id, '{{}}'::uuid[], d.owner_id, d.type, d.metadata, d.title, d.version,
+            d.size_in_bytes, d.ingestion_status, d.extraction_status, d.summary,
+            d.summary_embedding::vector
+        FROM unnest(
+            $1::uuid[], $2::uuid[], $3::text[], $4::jsonb[], $5::text[],
+            $6::text[], $7::int[], $8::text[], $9::text[], $10::text[], $11::text[]
+        ) AS d(id, owner_id, type, metadata, title, version, size_in_bytes,
+            ingestion_status, extraction_status, summary, summary_embedding)
+        ON CONFLICT (id) DO UPDATE SET
+            owner_id = EXCLUDED.owner_id,
+            type = EXCLUDED.type,
+            metadata = EXCLUDED.metadata,
+            title = EXCLUDED.title,
+            version = EXCLUDED.version,
+            size_in_bytes = EXCLUDED.size_in_bytes,
+            ingestion_status = EXCLUDED.ingestion_status,
+            extraction_status = EXCLUDED.extraction_status,
+            summary = EXCLUDED.summary,
+            summary_embedding = EXCLUDED.summary_embedding,
+            updated_at = NOW()
+        {conflict_filter}
+        RETURNING id
+        """
+        params = [
+            [entry["id"] for entry in db_entries],
+            [entry["owner_id"] for entry in db_entries],
+            [entry["document_type"] for entry in db_entries],
+            [entry["metadata"] for entry in db_entries],
+            [entry["title"] for entry in db_entries],
+            [entry["version"] for entry in db_entries],
+            [entry["size_in_bytes"] for entry in db_entries],
+            [entry["ingestion_status"] for entry in db_entries],
+            [entry["extraction_status"] for entry in db_entries],
+            [entry["summary"] for entry in db_entries],
+            [entry["summary_embedding"] for entry in db_entries],
+        ]
+        results = await self.connection_manager.fetch_query(query, params)
+        return [row["id"] for row in results]
+
+    async def update_documents_summary_bulk(
+        self, documents_overview: list[DocumentResponse]
+    ) -> None:
+        """Write the summaries and summary embeddings of many documents at once."""
+        documents_overview = [
+            doc for doc in documents_overview if doc.summary is not None
+        ]
+        if not documents_overview:
+            return
+
+        db_entries = [doc.convert_to_db_entry() for doc in documents_overview]
+        query = f"""
+        UPDATE {self._get_table_name(PostgresDocumentsHandler.TABLE_NAME)} AS doc
+        SET summary = d.summary,
+            summary_embedding = d.summary_embedding::vector,
+            updated_at = NOW()
+        FROM unnest($1::uuid[], $2::text[], $3::text[])
+            AS d(id, summary, summary_embedding)
+        WHERE doc.id = d.id
+        """
+        await self.connection_manager.execute_query(
+            query,
+            [
+                [entry["id"] for entry in db_entries],
+                [entry["summary"] for entry in db_entries],
+                [entry["summary_embedding"] for entry in db_entries],
+            ],
+        )
+
+    async def set_ingestion_status_bulk(
+        self, ids: list[UUID], status: IngestionStatus
+    ) -> None:
+        """
+        Move many documents to the same ingestion status in one statement.
+
+        Mirrors `upsert_documents_overview` by bumping the attempt number when
+        a document transitions to `success`.
+        """
+        if not ids:
+            return
+
+        query = f"""
+        UPDATE {self._get_table_name(PostgresDocumentsHandler.TABLE_NAME)}
+        SET ingestion_status = $1,
+            ingestion_attempt_number = CASE
+                WHEN $1 = '{IngestionStatus.SUCCESS.value}'
+                    AND ingestion_status <> '{IngestionStatus.SUCCESS.value}'
+                THEN ingestion_attempt_number + 1
+                ELSE ingestion_attempt_number
+            END,
+            updated_at = NOW()
+        WHERE id = ANY($2)
+        """
+        await self.connection_manager.execute_query(
+            query, [status.value, list(ids)]
+        )
+
+    async def create_ingestion_job(
+        self, job_id: UUID, owner_id: UUID, document_ids: list[UUID]
+    ) -> None:
+        query = f"""
+        INSERT INTO {self._get_table_name(PostgresDocumentsHandler.JOBS_TABLE_NAME)}
+        (id, owner_id, document_ids)
+        VALUES ($1, $2, $3)
+        """
+        await self.connection_manager.execute_query(
+            query, [job_id, owner_id, document_ids]
+        )
+
+    async def get_ingestion_job(self, job_id: UUID) -> Optional[dict]:
+        """
+        Fetch a bulk ingestion job along with the current status of each file.
+
+        Progress is derived from the documents table, so it never drifts from
+        the per-document ingestion status.
+        """
+        query = f"""
+        SELECT j.id, j.owner_id, j.created_at, u.document_id, u.ord,
+            d.title, d.ingestion_status
+        FROM {self._get_table_name(PostgresDocumentsHandler.JOBS_TABLE_NAME)} j
+        CROSS JOIN LATERAL unnest(j.document_ids) WITH ORDINALITY AS u(document_id, ord)
+        LEFT JOIN {self._get_table_name(PostgresDocumentsHandler.TABLE_NAME)} d
+            ON d.id = u.document_id
+        WHERE j.id = $1
+        ORDER BY u.ord
+        """
+        results = await self.connection_manager.fetch_query(query, [job_id])
+        if not results:
+            return None
+
+        documents = [
+            {
+                "document_id": row["document_id"],
+                "title": row["title"],
+                "ingestion_status": row["ingestion_status"] or "deleted",
+            }
+            for row in results
+        ]
+        status_counts: dict[str, int] = {}
+        for document in documents:
+            status = document["ingestion_status"]
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+        return {
+            "job_id": results[0]["id"],
+            "owner_id": results[0]["owner_id"],
+            "created_at": results[0]["created_at"],
+            "status_counts": status_counts,
+            "documents": documents,
+        }
+
     async def delete(
         self, document_id: UUID, version: Optional[str] = None
     ) -> None:
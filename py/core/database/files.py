@@ -1,6 +1,10 @@
+import asyncio
+import hashlib
 import io
 import logging
-from typing import BinaryIO, Optional, Union
+import os
+import tempfile
+from typing import AsyncGenerator, BinaryIO, Optional, Union
 from uuid import UUID
 
 import asyncpg
@@ -12,6 +16,9 @@ from .base import PostgresConnectionManager
 
 logger = logging.getLogger()
 
+# Size of each read when streaming file contents back to clients
+STREAM_CHUNK_SIZE = 512 * 1024
+
 
 class PostgresFilesHandler(Handler):
     """PostgreSQL implementation of the FileHandler."""
@@ -80,39 +87,42 @@ class PostgresFilesHandler(Handler):
         self,
         document_id: UUID,
         file_name: str,
-        file_content: io.BytesIO,
+        file_content: BinaryIO,
         file_type: Optional[str] = None,
     ) -> None:
         """Store a new file in the database."""
-        size = file_content.getbuffer().nbytes
-
         async with (  # type: ignore
             self.connection_manager.pool.get_connection() as conn
         ):
             async with conn.transaction():
                 oid = await conn.fetchval("SELECT lo_create(0)")
-                await self._write_lobject(conn, oid, file_content)
+                size = await self._write_lobject(conn, oid, file_content)
                 await self.upsert_file(
                     document_id, file_name, oid, size, file_type
                 )
 
     async def _write_lobject(
-        self, conn, oid: int, file_content: io.BytesIO
-    ) -> None:
-        """Write content to a large object."""
+        self, conn, oid: int, file_content: BinaryIO
+    ) -> int:
+        """Write content to a large object, returning its size."""
         lobject = await conn.fetchval("SELECT lo_open($1, $2)", oid, 0x20000)
 
         try:
-            chunk_size = 8192  # 8 KB chunks
+            chunk_size = STREAM_CHUNK_SIZE
+            size = 0
             while True:
-                if chunk := file_content.read(chunk_size):
+                if chunk := await asyncio.to_thread(
+                    file_content.read, chunk_size
+                ):
                     await conn.execute(
                         "SELECT lowrite($1, $2)", lobject, chunk
                     )
+                    size += len(chunk)
                 else:
                     break
 
             await conn.execute("SELECT lo_close($1)", lobject)
+            return size
 
         except Exception as e:
             await conn.execute("SELECT lo_unlink($1)", oid)
@@ -153,7 +163,7 @@ class PostgresFilesHandler(Handler):
     async def _read_lobject(self, conn, oid: int) -> bytes:
         """Read content from a large object."""
         file_data = io.BytesIO()
-        chunk_size = 8192
+        chunk_size = STREAM_CHUNK_SIZE
 
         async with conn.transaction():
             try:
@@ -194,6 +204,81 @@ class PostgresFilesHandler(Handler):
 
         return file_data.getvalue()
 
+    async def retrieve_file_info(self, document_id: UUID) -> tuple[str, int]:
+        """Retrieve the name and size of a stored file."""
+        query = f"""
+        SELECT name, size
+        FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [document_id]
+        )
+        if not result:
+            raise R2RException(
+                status_code=404,
+                message=f"File for document {document_id} not found",
+            )
+        return result["name"], result["size"]
+
+    async def retrieve_file_stream(
+        self,
+        document_id: UUID,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Stream the bytes `[start, end)` of a file without buffering it.
+
+        The large object is read in `chunk_size` pieces inside a single
+        read-only transaction, so memory use is constant in the file size.
+        The transaction lasts as long as the client's download, so it runs
+        on a dedicated connection rather than one from the pool.
+        """
+        query = f"""
+        SELECT oid FROM {self._get_table_name(PostgresFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        """
+
+        async with self.connection_manager.pool.get_dedicated_connection() as conn:  # type: ignore
+            async with conn.transaction(
+                isolation="repeatable_read", readonly=True
+            ):
+                oid = await conn.fetchval(query, document_id)
+                if not oid:
+                    raise R2RException(
+                        status_code=404,
+                        message=f"File for document {document_id} not found",
+                    )
+
+                lobject = await conn.fetchval(
+                    "SELECT lo_open($1, 262144)", oid
+                )
+                try:
+                    if start:
+                        await conn.execute(
+                            "SELECT lo_lseek64($1, $2, 0)", lobject, start
+                        )
+
+                    remaining = None if end is None else end - start
+                    while remaining is None or remaining > 0:
+                        read_size = (
+                            chunk_size
+                            if remaining is None
+                            else min(chunk_size, remaining)
+                        )
+                        chunk = await conn.fetchval(
+                            "SELECT loread($1, $2)", lobject, read_size
+                        )
+                        if not chunk:
+                            break
+                        if remaining is not None:
+                            remaining -= len(chunk)
+                        yield chunk
+                finally:
+                    await conn.execute("SELECT lo_close($1)", lobject)
+
     async def delete_file(self, document_id: UUID) -> bool:
         """Delete a file from storage."""
         query = f"""
@@ -273,3 +358,376 @@ class PostgresFilesHandler(Handler):
             }
             for row in results
         ]
+
+
+class FilesystemFilesHandler(Handler):
+    """
+    Content-addressed local disk implementation of the FileHandler.
+
+    File metadata lives in Postgres while file contents are written once per
+    unique SHA-256 digest to a sharded directory tree, e.g.
+    `<storage_path>/ab/cd/abcd...`. Identical uploads share a single blob,
+    which is removed when the last document referencing it is deleted.
+    """
+
+    TABLE_NAME = "files_filesystem"
+
+    connection_manager: PostgresConnectionManager
+
+    def __init__(
+        self,
+        project_name: str,
+        connection_manager: PostgresConnectionManager,
+        storage_path: str,
+        shard_depth: int = 2,
+    ):
+        super().__init__(project_name, connection_manager)
+        self.storage_path = os.path.join(storage_path, project_name)
+        self.shard_depth = shard_depth
+
+    async def create_tables(self) -> None:
+        """Create the metadata table and the storage directory."""
+        os.makedirs(os.path.join(self.storage_path, "tmp"), exist_ok=True)
+
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)} (
+            document_id UUID PRIMARY KEY,
+            name TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            size BIGINT NOT NULL,
+            type TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        CREATE INDEX IF NOT EXISTS files_filesystem_content_hash_idx
+        ON {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)} (content_hash);
+        """
+        await self.connection_manager.execute_query(query)
+
+    def _blob_path(self, content_hash: str) -> str:
+        shards = [
+            content_hash[2 * i : 2 * i + 2] for i in range(self.shard_depth)
+        ]
+        return os.path.join(self.storage_path, *shards, content_hash)
+
+    def _write_temp(self, file_content: BinaryIO) -> tuple[str, str, int]:
+        """Stream content to a temporary file, hashing it along the way."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.join(self.storage_path, "tmp")
+        )
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                while chunk := file_content.read(1024 * 1024):
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+                    size += len(chunk)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+    def _commit_blob(self, tmp_path: str, content_hash: str) -> bool:
+        """
+        Move a temporary file into place, unless the blob already exists.
+        Returns whether a new blob was created.
+        """
+        blob_path = self._blob_path(content_hash)
+        if os.path.exists(blob_path):
+            # Identical content is already stored, drop the duplicate
+            os.unlink(tmp_path)
+            return False
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(tmp_path, blob_path)
+        return True
+
+    def _remove_blob(self, content_hash: str) -> None:
+        try:
+            os.unlink(self._blob_path(content_hash))
+        except FileNotFoundError:
+            pass
+
+    async def _collect_garbage(self, conn, content_hash: str) -> None:
+        """Remove a blob once no document references it anymore."""
+        still_referenced = await conn.fetchval(
+            f"""
+            SELECT EXISTS(
+                SELECT 1 FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+                WHERE content_hash = $1
+            )
+            """,
+            content_hash,
+        )
+        if not still_referenced:
+            await asyncio.to_thread(self._remove_blob, content_hash)
+
+    async def store_file(
+        self,
+        document_id: UUID,
+        file_name: str,
+        file_content: BinaryIO,
+        file_type: Optional[str] = None,
+    ) -> None:
+        """Store a new file on disk, deduplicating identical content."""
+        tmp_path, content_hash, size = await asyncio.to_thread(
+            self._write_temp, file_content
+        )
+
+        query = f"""
+        WITH previous AS (
+            SELECT content_hash
+            FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+            WHERE document_id = $1
+        )
+        INSERT INTO {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+        (document_id, name, content_hash, size, type)
+        VALUES ($1, $2, $3, $4, $5)
+        ON CONFLICT (document_id) DO UPDATE SET
+            name = EXCLUDED.name,
+            content_hash = EXCLUDED.content_hash,
+            size = EXCLUDED.size,
+            type = EXCLUDED.type,
+            updated_at = NOW()
+        RETURNING (SELECT content_hash FROM previous) AS previous_hash;
+        """
+
+        created_blob = False
+        try:
+            async with (  # type: ignore
+                self.connection_manager.pool.get_connection() as conn
+            ):
+                async with conn.transaction():
+                    # Lock the row first so the previous hash stays stable
+                    # until the upsert below
+                    expected_hash = await conn.fetchval(
+                        f"""
+                        SELECT content_hash
+                        FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+                        WHERE document_id = $1
+                        FOR UPDATE
+                        """,
+                        document_id,
+                    )
+                    # Serialize writers and deleters of the same blobs, always
+                    # locking in hash order so concurrent uploads that swap
+                    # contents cannot deadlock
+                    locked = sorted({content_hash, expected_hash} - {None})
+                    for locked_hash in locked:
+                        await conn.execute(
+                            "SELECT pg_advisory_xact_lock(hashtext($1))",
+                            locked_hash,
+                        )
+                    created_blob = await asyncio.to_thread(
+                        self._commit_blob, tmp_path, content_hash
+                    )
+                    previous_hash = await conn.fetchval(
+                        query,
+                        document_id,
+                        file_name,
+                        content_hash,
+                        size,
+                        file_type,
+                    )
+                    if previous_hash and previous_hash != content_hash:
+                        if previous_hash not in locked:
+                            # Only reachable when another upload created the
+                            # same document concurrently
+                            await conn.execute(
+                                "SELECT pg_advisory_xact_lock(hashtext($1))",
+                                previous_hash,
+                            )
+                        await self._collect_garbage(conn, previous_hash)
+        except BaseException:
+            if created_blob:
+                # The blob was moved into place inside the rolled back
+                # transaction, so nothing may reference it
+                await self._discard_blob(content_hash)
+            raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    async def _discard_blob(self, content_hash: str) -> None:
+        """Remove a blob left behind by a failed upload if it is unused."""
+        try:
+            async with (  # type: ignore
+                self.connection_manager.pool.get_connection() as conn
+            ):
+                async with conn.transaction():
+                    await conn.execute(
+                        "SELECT pg_advisory_xact_lock(hashtext($1))",
+                        content_hash,
+                    )
+                    await self._collect_garbage(conn, content_hash)
+        except Exception as e:
+            logger.warning(
+                f"Failed to remove orphaned blob {content_hash}: {e}"
+            )
+
+    async def retrieve_file(
+        self, document_id: UUID
+    ) -> Optional[tuple[str, BinaryIO, int]]:
+        """Retrieve a file from storage."""
+        query = f"""
+        SELECT name, content_hash, size
+        FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        """
+
+        result = await self.connection_manager.fetchrow_query(
+            query, [document_id]
+        )
+        if not result:
+            raise R2RException(
+                status_code=404,
+                message=f"File for document {document_id} not found",
+            )
+
+        blob_path = self._blob_path(result["content_hash"])
+        try:
+            # The caller owns the returned file and is responsible for
+            # closing it
+            file_content = await asyncio.to_thread(open, blob_path, "rb")
+        except FileNotFoundError:
+            raise R2RException(
+                status_code=404,
+                message=f"File content for document {document_id} is missing from storage.",
+            )
+        return result["name"], file_content, result["size"]
+
+    async def retrieve_file_info(self, document_id: UUID) -> tuple[str, int]:
+        """Retrieve the name and size of a stored file."""
+        query = f"""
+        SELECT name, size
+        FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [document_id]
+        )
+        if not result:
+            raise R2RException(
+                status_code=404,
+                message=f"File for document {document_id} not found",
+            )
+        return result["name"], result["size"]
+
+    async def retrieve_file_stream(
+        self,
+        document_id: UUID,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream the bytes `[start, end)` of a file without buffering it."""
+        query = f"""
+        SELECT content_hash
+        FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [document_id]
+        )
+        if not result:
+            raise R2RException(
+                status_code=404,
+                message=f"File for document {document_id} not found",
+            )
+
+        f = await asyncio.to_thread(
+            open, self._blob_path(result["content_hash"]), "rb"
+        )
+        try:
+            await asyncio.to_thread(f.seek, start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                read_size = (
+                    chunk_size
+                    if remaining is None
+                    else min(chunk_size, remaining)
+                )
+                chunk = await asyncio.to_thread(f.read, read_size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def delete_file(self, document_id: UUID) -> bool:
+        """Delete a file from storage."""
+        query = f"""
+        DELETE FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+        WHERE document_id = $1
+        RETURNING content_hash
+        """
+
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                content_hash = await conn.fetchval(query, document_id)
+                if not content_hash:
+                    raise R2RException(
+                        status_code=404,
+                        message=f"File for document {document_id} not found",
+                    )
+
+                await conn.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext($1))", content_hash
+                )
+                await self._collect_garbage(conn, content_hash)
+
+        return True
+
+    async def get_files_overview(
+        self,
+        offset: int,
+        limit: int,
+        filter_document_ids: Optional[list[UUID]] = None,
+        filter_file_names: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """Get an overview of stored files."""
+        conditions = []
+        params: list[Union[str, list[str], int]] = []
+        query = f"""
+        SELECT document_id, name, content_hash, size, type, created_at, updated_at
+        FROM {self._get_table_name(FilesystemFilesHandler.TABLE_NAME)}
+        """
+
+        if filter_document_ids:
+            conditions.append(f"document_id = ANY(${len(params) + 1})")
+            params.append([str(doc_id) for doc_id in filter_document_ids])
+
+        if filter_file_names:
+            conditions.append(f"name = ANY(${len(params) + 1})")
+            params.append(filter_file_names)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += f" ORDER BY created_at DESC OFFSET ${len(params) + 1} LIMIT ${len(params) + 2}"
+        params.extend([offset, limit])
+
+        results = await self.connection_manager.fetch_query(query, params)
+
+        if not results:
+            raise R2RException(
+                status_code=404,
+                message="No files found with the given filters",
+            )
+
+        return [
+            {
+                "document_id": row["document_id"],
+                "file_name": row["name"],
+                "file_content_hash": row["content_hash"],
+                "file_size": row["size"],
+                "file_type": row["type"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+            }
+            for row in results
+        ]
@@ -5,12 +5,14 @@ import json
 import logging
 import os
 import time
+from collections import OrderedDict
 from enum import Enum
 from typing import Any, AsyncGenerator, Optional, Tuple
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import asyncpg
 import httpx
+import numpy as np
 from asyncpg.exceptions import UndefinedTableError, UniqueViolationError
 from fastapi import HTTPException
 
@@ -35,6 +37,15 @@ from core.base.utils import (
 )
 
 from .base import PostgresConnectionManager
+from .clustering import (
+    CommunityAssignments,
+    GraphAdjacency,
+    GraphEdges,
+    GraphEdgesBuilder,
+    cluster_graph_edges,
+    decode_community_assignments,
+    encode_graph_edges,
+)
 from .collections import PostgresCollectionsHandler
 
 
@@ -45,6 +56,72 @@ class StoreType(str, Enum):
 
 logger = logging.getLogger()
 
+# Overall deadline for a remote clustering job, in seconds
+CLUSTERING_JOB_TIMEOUT = 6 * 60 * 60
+
+# Number of graph adjacencies kept in memory for traversal, and the largest
+# graph (in relationships) that is cached rather than walked in SQL
+ADJACENCY_CACHE_MAX_GRAPHS = 8
+ADJACENCY_CACHE_MAX_EDGES = 5_000_000
+
+# Number of entities merged per statement during deduplication
+ENTITY_MERGE_BATCH_SIZE = 10_000
+
+# An export runs on its own connection, outside the pool, and is aborted by
+# the server once the client stops reading for this long
+GRAPH_EXPORT_IDLE_TIMEOUT = datetime.timedelta(minutes=10)
+
+# Tables that can be exported from a graph, with the column holding the
+# graph id and the exported `(column, type)` pairs
+GRAPH_EXPORT_TABLES: dict[str, tuple[str, str, list[tuple[str, str]]]] = {
+    "entities": (
+        "graphs_entities",
+        "parent_id",
+        [
+            ("id", "text"),
+            ("name", "text"),
+            ("category", "text"),
+            ("description", "text"),
+            ("parent_id", "text"),
+            ("chunk_ids", "text[]"),
+            ("metadata", "json"),
+        ],
+    ),
+    "relationships": (
+        "graphs_relationships",
+        "parent_id",
+        [
+            ("id", "text"),
+            ("subject", "text"),
+            ("predicate", "text"),
+            ("object", "text"),
+            ("description", "text"),
+            ("subject_id", "text"),
+            ("object_id", "text"),
+            ("weight", "float"),
+            ("chunk_ids", "text[]"),
+            ("parent_id", "text"),
+            ("metadata", "json"),
+        ],
+    ),
+    "communities": (
+        "graphs_communities",
+        "collection_id",
+        [
+            ("id", "text"),
+            ("community_id", "text"),
+            ("collection_id", "text"),
+            ("level", "int"),
+            ("name", "text"),
+            ("summary", "text"),
+            ("findings", "text[]"),
+            ("rating", "float"),
+            ("rating_explanation", "text"),
+            ("metadata", "json"),
+        ],
+    ),
+}
+
 
 class PostgresEntitiesHandler(Handler):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -166,6 +243,75 @@ class PostgresEntitiesHandler(Handler):
             metadata=result["metadata"],
         )
 
+    async def create_bulk(
+        self,
+        entities: list[Entity],
+        store_type: StoreType,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list[UUID]:
+        """
+        Insert a batch of entities with a single statement.
+
+        IDs are assigned up front for entities that do not carry one, so the
+        caller can resolve relationship endpoints without another round trip.
+        Pass `conn` to run the insert inside the caller's transaction.
+        """
+        if not entities:
+            return []
+        for entity in entities:
+            if entity.parent_id is None:
+                raise R2RException(
+                    status_code=400,
+                    message=f"Entity {entity.name} has no parent_id.",
+                )
+
+        table_name = self._get_entity_table_for_store(store_type)
+        vector_column_str = _decorate_vector_type(
+            f"({self.dimension})", self.quantization_type
+        )
+
+        rows = []
+        for entity in entities:
+            if entity.id is None:
+                entity.id = uuid4()
+            metadata = entity.metadata
+            if isinstance(metadata, str):
+                with contextlib.suppress(json.JSONDecodeError):
+                    metadata = json.loads(metadata)
+            description_embedding = entity.description_embedding
+            if isinstance(description_embedding, list):
+                description_embedding = str(description_embedding)
+            rows.append(
+                {
+                    "id": str(entity.id),
+                    "name": entity.name,
+                    "category": entity.category,
+                    "description": entity.description,
+                    "parent_id": str(entity.parent_id),
+                    "description_embedding": description_embedding,
+                    "chunk_ids": [str(cid) for cid in entity.chunk_ids or []],
+                    "metadata": metadata or None,
+                }
+            )
+
+        query = f"""
+            INSERT INTO {self._get_table_name(table_name)}
+            (id, name, category, description, parent_id, description_embedding, chunk_ids, metadata)
+            SELECT id, name, category, description, parent_id,
+                description_embedding::{vector_column_str}, chunk_ids, metadata
+            FROM jsonb_to_recordset($1::jsonb) AS d(
+                id UUID, name TEXT, category TEXT, description TEXT, parent_id UUID,
+                description_embedding TEXT, chunk_ids UUID[], metadata JSONB
+            )
+            RETURNING id
+        """
+        params = [json.dumps(rows, default=str)]
+        if conn is not None:
+            results = await conn.fetch(query, *params)
+        else:
+            results = await self.connection_manager.fetch_query(query, params)
+        return [row["id"] for row in results]
+
     async def get(
         self,
         parent_id: UUID,
@@ -450,8 +596,110 @@ class PostgresRelationshipsHandler(Handler):
                     ON {self._get_table_name(table_name)} (subject_id);
                 CREATE INDEX IF NOT EXISTS {table_name}_object_id_idx
                     ON {self._get_table_name(table_name)} (object_id);
+                CREATE INDEX IF NOT EXISTS {table_name}_parent_id_subject_idx
+                    ON {self._get_table_name(table_name)} (parent_id, subject);
+                CREATE INDEX IF NOT EXISTS {table_name}_parent_id_object_idx
+                    ON {self._get_table_name(table_name)} (parent_id, object);
             """
             await self.connection_manager.execute_query(QUERY)
+        await self._create_graph_versions_table()
+
+    async def _create_graph_versions_table(self) -> None:
+        """
+        Track a version and relationship count per graph.
+
+        Statement-level triggers bump the version of every graph whose
+        relationships are inserted, updated or deleted, so cached graph
+        structures are validated with a single primary key lookup instead of
+        a scan. Existing relationships are counted once, when the table is
+        first created.
+
+        Every write to a graph's relationships updates that graph's row, so
+        concurrent transactions writing to the same graph queue on it until
+        they commit. Writers should insert relationships in batches, one
+        statement per batch, rather than row by row in long transactions.
+        """
+        relationships_table = self._get_table_name("graphs_relationships")
+        versions_table = self._get_table_name("graphs_relationships_versions")
+        QUERY = f"""
+            CREATE TABLE IF NOT EXISTS {versions_table} (
+                parent_id UUID PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                relationship_count BIGINT NOT NULL DEFAULT 0
+            );
+
+            CREATE OR REPLACE FUNCTION {self.project_name}.bump_graphs_relationships_version()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO {versions_table} AS v
+                        (parent_id, version, relationship_count)
+                    SELECT parent_id, 1, COUNT(*)
+                    FROM new_rows GROUP BY parent_id
+                    ON CONFLICT (parent_id) DO UPDATE SET
+                        version = v.version + 1,
+                        relationship_count =
+                            v.relationship_count + EXCLUDED.relationship_count;
+                ELSIF TG_OP = 'DELETE' THEN
+                    INSERT INTO {versions_table} AS v
+                        (parent_id, version, relationship_count)
+                    SELECT parent_id, 1, -COUNT(*)
+                    FROM old_rows GROUP BY parent_id
+                    ON CONFLICT (parent_id) DO UPDATE SET
+                        version = v.version + 1,
+                        relationship_count =
+                            v.relationship_count + EXCLUDED.relationship_count;
+                ELSE
+                    INSERT INTO {versions_table} AS v
+                        (parent_id, version, relationship_count)
+                    SELECT parent_id, 1, SUM(delta)
+                    FROM (
+                        SELECT parent_id, 1 AS delta FROM new_rows
+                        UNION ALL
+                        SELECT parent_id, -1 AS delta FROM old_rows
+                    ) changes
+                    GROUP BY parent_id
+                    ON CONFLICT (parent_id) DO UPDATE SET
+                        version = v.version + 1,
+                        relationship_count =
+                            v.relationship_count + EXCLUDED.relationship_count;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS graphs_relationships_version_insert
+            ON {relationships_table};
+            CREATE TRIGGER graphs_relationships_version_insert
+                AFTER INSERT ON {relationships_table}
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION {self.project_name}.bump_graphs_relationships_version();
+
+            DROP TRIGGER IF EXISTS graphs_relationships_version_update
+            ON {relationships_table};
+            CREATE TRIGGER graphs_relationships_version_update
+                AFTER UPDATE ON {relationships_table}
+                REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION {self.project_name}.bump_graphs_relationships_version();
+
+            DROP TRIGGER IF EXISTS graphs_relationships_version_delete
+            ON {relationships_table};
+            CREATE TRIGGER graphs_relationships_version_delete
+                AFTER DELETE ON {relationships_table}
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION {self.project_name}.bump_graphs_relationships_version();
+
+            INSERT INTO {versions_table} (parent_id, relationship_count)
+            SELECT parent_id, COUNT(*)
+            FROM {relationships_table}
+            WHERE NOT EXISTS (SELECT 1 FROM {versions_table})
+            GROUP BY parent_id
+            ON CONFLICT (parent_id) DO NOTHING;
+        """
+        await self.connection_manager.execute_query(QUERY)
 
     async def create(
         self,
@@ -519,6 +767,87 @@ class PostgresRelationshipsHandler(Handler):
             metadata=result["metadata"],
         )
 
+    async def create_bulk(
+        self,
+        relationships: list[Relationship],
+        store_type: StoreType,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> list[UUID]:
+        """
+        Insert a batch of relationships with a single statement.
+
+        Pass `conn` to run the insert inside the caller's transaction.
+        """
+        if not relationships:
+            return []
+        for relationship in relationships:
+            if relationship.parent_id is None:
+                raise R2RException(
+                    status_code=400,
+                    message=f"Relationship {relationship.subject} {relationship.predicate} {relationship.object} has no parent_id.",
+                )
+
+        table_name = self._get_relationship_table_for_store(store_type)
+        vector_column_str = _decorate_vector_type(
+            f"({self.dimension})", self.quantization_type
+        )
+
+        rows = []
+        for relationship in relationships:
+            metadata = relationship.metadata
+            if isinstance(metadata, str):
+                with contextlib.suppress(json.JSONDecodeError):
+                    metadata = json.loads(metadata)
+            description_embedding = relationship.description_embedding
+            if isinstance(description_embedding, list):
+                description_embedding = str(description_embedding)
+            rows.append(
+                {
+                    "subject": relationship.subject,
+                    "predicate": relationship.predicate,
+                    "object": relationship.object,
+                    "description": relationship.description,
+                    "subject_id": (
+                        str(relationship.subject_id)
+                        if relationship.subject_id
+                        else None
+                    ),
+                    "object_id": (
+                        str(relationship.object_id)
+                        if relationship.object_id
+                        else None
+                    ),
+                    "weight": relationship.weight,
+                    "chunk_ids": [
+                        str(cid) for cid in relationship.chunk_ids or []
+                    ],
+                    "parent_id": str(relationship.parent_id),
+                    "description_embedding": description_embedding,
+                    "metadata": metadata or None,
+                }
+            )
+
+        query = f"""
+            INSERT INTO {self._get_table_name(table_name)}
+            (subject, predicate, object, description, subject_id, object_id,
+             weight, chunk_ids, parent_id, description_embedding, metadata)
+            SELECT subject, predicate, object, description, subject_id, object_id,
+                COALESCE(weight, 1.0), chunk_ids, parent_id,
+                description_embedding::{vector_column_str}, metadata
+            FROM jsonb_to_recordset($1::jsonb) AS d(
+                subject TEXT, predicate TEXT, object TEXT, description TEXT,
+                subject_id UUID, object_id UUID, weight FLOAT, chunk_ids UUID[],
+                parent_id UUID, description_embedding TEXT, metadata JSONB
+            )
+            RETURNING id
+        """
+        params = [json.dumps(rows, default=str)]
+        if conn is not None:
+            results = await conn.fetch(query, *params)
+        else:
+            results = await self.connection_manager.fetch_query(query, params)
+        return [row["id"] for row in results]
+
     async def get(
         self,
         parent_id: UUID,
@@ -805,7 +1134,23 @@ class PostgresCommunitiesHandler(Handler):
             updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
             metadata JSONB,
             UNIQUE (community_id, level, collection_id)
-        );"""
+        );
+
+        CREATE TABLE IF NOT EXISTS {self._get_table_name("graphs_community_clusters")} (
+            collection_id UUID NOT NULL,
+            community_id UUID NOT NULL,
+            level INT NOT NULL,
+            nodes TEXT[] NOT NULL,
+            summary_rank INT,
+            clustered_at TIMESTAMPTZ NOT NULL,
+            PRIMARY KEY (collection_id, community_id)
+        );
+        CREATE INDEX IF NOT EXISTS graphs_community_clusters_nodes_idx
+            ON {self._get_table_name("graphs_community_clusters")} USING GIN (nodes);
+        CREATE INDEX IF NOT EXISTS graphs_community_clusters_rank_idx
+            ON {self._get_table_name("graphs_community_clusters")} (collection_id, summary_rank)
+            WHERE summary_rank IS NOT NULL;
+        """
 
         await self.connection_manager.execute_query(query)
 
@@ -978,6 +1323,10 @@ class PostgresCommunitiesHandler(Handler):
 
         # Delete all communities for the parent_id
         query = f"""
+            WITH deleted_clusters AS (
+                DELETE FROM {self._get_table_name("graphs_community_clusters")}
+                WHERE collection_id = $1
+            )
             DELETE FROM {self._get_table_name(table_name)}
             WHERE collection_id = $1
         """
@@ -990,6 +1339,130 @@ class PostgresCommunitiesHandler(Handler):
                 detail=f"An error occurred while deleting communities: {e}",
             )
 
+    async def get_clustering_watermark(
+        self, collection_id: UUID
+    ) -> Optional[datetime.datetime]:
+        """Return when the graph of a collection was last clustered, if ever."""
+        QUERY = f"""
+            SELECT MAX(clustered_at) AS clustered_at
+            FROM {self._get_table_name("graphs_community_clusters")}
+            WHERE collection_id = $1
+        """
+        result = await self.connection_manager.fetchrow_query(
+            QUERY, [collection_id]
+        )
+        return result["clustered_at"] if result else None
+
+    async def get_community_clusters(
+        self,
+        collection_id: UUID,
+        nodes: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """
+        Get the stored cluster memberships of a collection, optionally only
+        those containing at least one of `nodes`.
+        """
+        conditions = ["collection_id = $1"]
+        params: list[Any] = [collection_id]
+        if nodes is not None:
+            conditions.append("nodes && $2::text[]")
+            params.append(nodes)
+
+        QUERY = f"""
+            SELECT community_id, level, nodes
+            FROM {self._get_table_name("graphs_community_clusters")}
+            WHERE {' AND '.join(conditions)}
+        """
+        rows = await self.connection_manager.fetch_query(QUERY, params)
+        return [dict(row) for row in rows]
+
+    async def get_community_clusters_to_summarize(
+        self, collection_id: UUID, offset: int, limit: int
+    ) -> list[dict]:
+        """
+        Get the clusters produced by the latest clustering run that still need
+        a summary, in the stable order assigned when they were stored.
+        """
+        QUERY = f"""
+            SELECT community_id, level, nodes
+            FROM {self._get_table_name("graphs_community_clusters")}
+            WHERE collection_id = $1
+            AND summary_rank >= $2 AND summary_rank < $2 + $3
+            ORDER BY summary_rank
+        """
+        rows = await self.connection_manager.fetch_query(
+            QUERY, [collection_id, offset, limit]
+        )
+        return [dict(row) for row in rows]
+
+    async def replace_community_clusters(
+        self,
+        collection_id: UUID,
+        new_clusters: list[dict],
+        kept_community_ids: list[UUID],
+        stale_community_ids: list[UUID],
+        clustered_at: datetime.datetime,
+    ) -> None:
+        """
+        Apply the outcome of a clustering run in one transaction.
+
+        Stale clusters are removed together with their summaries, clusters
+        whose membership did not change are marked as seen by this run, and
+        new clusters are inserted with the rank used to page through them
+        when summarizing.
+        """
+        clusters_table = self._get_table_name("graphs_community_clusters")
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                await conn.execute(
+                    f"""
+                    WITH deleted_clusters AS (
+                        DELETE FROM {clusters_table}
+                        WHERE collection_id = $1 AND community_id = ANY($2)
+                    )
+                    DELETE FROM {self._get_table_name("graphs_communities")}
+                    WHERE collection_id = $1 AND community_id = ANY($2)
+                    """,
+                    collection_id,
+                    stale_community_ids,
+                )
+                await conn.execute(
+                    f"""
+                    UPDATE {clusters_table}
+                    SET summary_rank = NULL,
+                        clustered_at = CASE
+                            WHEN community_id = ANY($2) THEN $3
+                            ELSE clustered_at
+                        END
+                    WHERE collection_id = $1
+                    """,
+                    collection_id,
+                    kept_community_ids,
+                    clustered_at,
+                )
+                await conn.execute(
+                    f"""
+                    INSERT INTO {clusters_table}
+                    (collection_id, community_id, level, nodes, summary_rank, clustered_at)
+                    SELECT $1, community_id, level, nodes, summary_rank, $3
+                    FROM jsonb_to_recordset($2::jsonb) AS x(
+                        community_id UUID,
+                        level INT,
+                        nodes TEXT[],
+                        summary_rank INT
+                    )
+                    """,
+                    collection_id,
+                    json.dumps(
+                        [
+                            {**cluster, "summary_rank": rank}
+                            for rank, cluster in enumerate(new_clusters)
+                        ],
+                        default=str,
+                    ),
+                    clustered_at,
+                )
+
     async def get(
         self,
         parent_id: UUID,
@@ -1089,9 +1562,10 @@ class PostgresGraphsHandler(Handler):
             self.communities,
         ]
 
-        import networkx as nx
-
-        self.nx = nx
+        self._adjacency_cache: OrderedDict[
+            UUID, tuple[int, GraphAdjacency]
+        ] = OrderedDict()
+        self._adjacency_locks: dict[UUID, asyncio.Lock] = {}
 
     async def create_tables(self) -> None:
         """Create the graph tables with mandatory collection_id support."""
@@ -1177,6 +1651,7 @@ class PostgresGraphsHandler(Handler):
             parent_id=parent_id, store_type=StoreType.GRAPHS
         )
         await self.communities.delete_all_communities(parent_id=parent_id)
+        self._adjacency_cache.pop(parent_id, None)
         return
 
     async def list_graphs(
@@ -1303,36 +1778,42 @@ class PostgresGraphsHandler(Handler):
         """
         Add documents to the graph by copying their entities and relationships.
         """
-        # Copy entities from document_entity to graphs_entities
-        ENTITY_COPY_QUERY = f"""
-            INSERT INTO {self._get_table_name("graphs_entities")} (
-                name, category, description, parent_id, description_embedding,
-                chunk_ids, metadata
+        # Copy entities and relationships to the graph in one statement, so
+        # relationship endpoints are remapped onto the new graph entity ids
+        COPY_QUERY = f"""
+            WITH source_entities AS MATERIALIZED (
+                SELECT
+                    id AS document_entity_id, uuid_generate_v4() AS id,
+                    name, category, description, description_embedding,
+                    chunk_ids, metadata
+                FROM {self._get_table_name("documents_entities")}
+                WHERE parent_id = ANY($2)
+            ),
+            copied_entities AS (
+                INSERT INTO {self._get_table_name("graphs_entities")} (
+                    id, name, category, description, parent_id,
+                    description_embedding, chunk_ids, metadata
+                )
+                SELECT
+                    id, name, category, description, $1,
+                    description_embedding, chunk_ids, metadata
+                FROM source_entities
             )
-            SELECT
-                name, category, description, $1, description_embedding,
-                chunk_ids, metadata
-            FROM {self._get_table_name("documents_entities")}
-            WHERE parent_id = ANY($2)
-        """
-        await self.connection_manager.execute_query(
-            ENTITY_COPY_QUERY, [id, document_ids]
-        )
-
-        # Copy relationships from documents_relationships to graphs_relationships
-        RELATIONSHIP_COPY_QUERY = f"""
             INSERT INTO {self._get_table_name("graphs_relationships")} (
                 subject, predicate, object, description, subject_id, object_id,
                 weight, chunk_ids, parent_id, metadata, description_embedding
             )
             SELECT
-                subject, predicate, object, description, subject_id, object_id,
-                weight, chunk_ids, $1, metadata, description_embedding
-            FROM {self._get_table_name("documents_relationships")}
-            WHERE parent_id = ANY($2)
+                r.subject, r.predicate, r.object, r.description,
+                se.id, oe.id, r.weight, r.chunk_ids, $1, r.metadata,
+                r.description_embedding
+            FROM {self._get_table_name("documents_relationships")} r
+            LEFT JOIN source_entities se ON se.document_entity_id = r.subject_id
+            LEFT JOIN source_entities oe ON oe.document_entity_id = r.object_id
+            WHERE r.parent_id = ANY($2)
         """
         await self.connection_manager.execute_query(
-            RELATIONSHIP_COPY_QUERY, [id, document_ids]
+            COPY_QUERY, [id, document_ids]
         )
 
         # Add document_ids to the graph
@@ -1736,6 +2217,7 @@ class PostgresGraphsHandler(Handler):
         limit: int,
         relationship_ids: Optional[list[UUID]] = None,
         relationship_types: Optional[list[str]] = None,
+        entity_names: Optional[list[str]] = None,
         include_embeddings: bool = False,
     ) -> tuple[list[Relationship], int]:
         """
@@ -1747,6 +2229,7 @@ class PostgresGraphsHandler(Handler):
             limit: Maximum number of records to return (-1 for no limit)
             relationship_ids: Optional list of relationship IDs to filter by
             relationship_types: Optional list of relationship types to filter by
+            entity_names: Optional list of entity names both endpoints must be in
             include_metadata: Whether to include metadata in the response
 
         Returns:
@@ -1766,6 +2249,13 @@ class PostgresGraphsHandler(Handler):
             params.append(relationship_types)
             param_index += 1
 
+        if entity_names:
+            conditions.append(
+                f"subject = ANY(${param_index}) AND object = ANY(${param_index})"
+            )
+            params.append(entity_names)
+            param_index += 1
+
         # Count query - uses the same conditions but without offset/limit
         COUNT_QUERY = f"""
             SELECT COUNT(*)
@@ -1813,6 +2303,25 @@ class PostgresGraphsHandler(Handler):
 
         return relationships, count
 
+    async def create_extractions_bulk(
+        self,
+        entities: list[Entity],
+        relationships: list[Relationship],
+        store_type: StoreType,
+    ) -> None:
+        """
+        Insert extracted entities and relationships in one transaction, so a
+        failure never leaves entities without their relationships.
+        """
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                await self.entities.create_bulk(
+                    entities, store_type=store_type, conn=conn
+                )
+                await self.relationships.create_bulk(
+                    relationships, store_type=store_type, conn=conn
+                )
+
     async def add_entities(
         self,
         entities: list[Entity],
@@ -2050,138 +2559,597 @@ class PostgresGraphsHandler(Handler):
         collection_id: UUID,
         leiden_params: dict[str, Any],
         clustering_mode: str,
+        incremental: bool = False,
     ) -> Tuple[int, Any]:
         """
-        Calls the external clustering service to cluster the KG.
+        Clusters the graph of a collection and stores the resulting
+        memberships. Returns the number of communities that need a summary
+        along with the number of node assignments computed.
+
+        In incremental mode only the connected components touched by
+        relationships created or updated since the last run are reclustered.
+        Communities whose membership is unchanged keep their summaries. A full
+        rebuild replaces every community, so all of them are summarized again.
         """
+        clustered_at = (
+            await self.connection_manager.fetchrow_query("SELECT NOW()")
+        )["now"]
+        edges = await self.get_graph_edges(collection_id)
 
-        offset = 0
-        page_size = 1000
-        all_relationships = []
-        while True:
-            relationships, count = await self.relationships.get(
-                parent_id=collection_id,
-                store_type=StoreType.GRAPHS,
-                offset=offset,
-                limit=page_size,
+        watermark = (
+            await self.communities.get_clustering_watermark(collection_id)
+            if incremental
+            else None
+        )
+        stale_community_ids: list[UUID] = []
+        if watermark is None:
+            subgraph = edges
+            stale_community_ids = [
+                cluster["community_id"]
+                for cluster in await self.communities.get_community_clusters(
+                    collection_id
+                )
+            ]
+            previous_clusters = []
+        else:
+            subgraph, previous_clusters = await self._get_changed_subgraph(
+                collection_id, edges, watermark
             )
+            if not len(subgraph):
+                logger.info(
+                    f"No relationships changed in {collection_id} since {watermark}, skipping clustering."
+                )
+                return 0, 0
 
-            if not relationships:
-                break
+        logger.info(
+            f"Clustering over {len(subgraph)} of {len(edges)} relationships for {collection_id} with settings: {leiden_params}"
+        )
+
+        _, assignments = await self._cluster_and_add_community_info(
+            edges=subgraph,
+            leiden_params=leiden_params,
+            collection_id=collection_id,
+            clustering_mode=clustering_mode,
+        )
 
-            all_relationships.extend(relationships)
-            offset += len(relationships)
+        previous_by_members = {
+            (cluster["level"], frozenset(cluster["nodes"])): cluster[
+                "community_id"
+            ]
+            for cluster in previous_clusters
+        }
+        kept_community_ids = []
+        new_clusters = []
+        for level, nodes in assignments.clusters():
+            community_id = previous_by_members.pop(
+                (level, frozenset(nodes)), None
+            )
+            if community_id is not None:
+                kept_community_ids.append(community_id)
+            else:
+                new_clusters.append(
+                    {"community_id": uuid4(), "level": level, "nodes": nodes}
+                )
 
-            if offset >= count:
-                break
+        stale_community_ids.extend(previous_by_members.values())
 
-        relationship_ids_cache = await self._get_relationship_ids_cache(
-            all_relationships
+        await self.communities.replace_community_clusters(
+            collection_id=collection_id,
+            new_clusters=new_clusters,
+            kept_community_ids=kept_community_ids,
+            stale_community_ids=stale_community_ids,
+            clustered_at=clustered_at,
         )
-
         logger.info(
-            f"Clustering over {len(all_relationships)} relationships for {collection_id} with settings: {leiden_params}"
+            f"Clustering for {collection_id} kept {len(kept_community_ids)} communities, added {len(new_clusters)} and removed {len(stale_community_ids)}."
         )
+        return len(new_clusters), len(assignments)
 
-        return await self._cluster_and_add_community_info(
-            relationships=all_relationships,
-            relationship_ids_cache=relationship_ids_cache,
-            leiden_params=leiden_params,
-            collection_id=collection_id,
-            clustering_mode=clustering_mode,
+    async def _get_changed_subgraph(
+        self,
+        collection_id: UUID,
+        edges: GraphEdges,
+        watermark: datetime.datetime,
+    ) -> Tuple[GraphEdges, list[dict]]:
+        """
+        Select the connected components containing relationships changed
+        since `watermark`, along with the stored clusters that overlap them.
+        """
+        QUERY = f"""
+            SELECT DISTINCT unnest(ARRAY[subject, object]) AS name
+            FROM {self._get_table_name("graphs_relationships")}
+            WHERE parent_id = $1
+            AND GREATEST(created_at, updated_at) > $2
+        """
+        rows = await self.connection_manager.fetch_query(
+            QUERY, [collection_id, watermark]
         )
+        node_ids = {name: i for i, name in enumerate(edges.nodes)}
+        seeds = [
+            node_ids[row["name"]] for row in rows if row["name"] in node_ids
+        ]
 
-    async def _call_clustering_service(
-        self, relationships: list[Relationship], leiden_params: dict[str, Any]
-    ) -> list[dict]:
+        labels = edges.connected_components()
+        affected = np.isin(labels, labels[seeds])
+        previous_clusters = await self.communities.get_community_clusters(
+            collection_id,
+            nodes=[edges.nodes[i] for i in np.flatnonzero(affected)],
+        )
+
+        # A previous community may reach into components that did not change;
+        # recluster those too so no node is left without a community
+        extra = [
+            node_ids[node]
+            for cluster in previous_clusters
+            for node in cluster["nodes"]
+            if node in node_ids and not affected[node_ids[node]]
+        ]
+        if extra:
+            affected |= np.isin(labels, labels[extra])
+            previous_clusters = await self.communities.get_community_clusters(
+                collection_id,
+                nodes=[edges.nodes[i] for i in np.flatnonzero(affected)],
+            )
+
+        return edges.subgraph(affected), previous_clusters
+
+    async def get_graph_edges(self, collection_id: UUID) -> GraphEdges:
         """
-        Calls the external Graspologic clustering service, sending relationships and parameters.
-        Expects a response with 'communities' field.
+        Load the relationships of a graph as integer-encoded edge arrays.
+
+        Only the endpoints and weights are read, through a server-side cursor,
+        so no `Relationship` objects are materialized.
         """
-        # Convert relationships to a JSON-friendly format
-        rel_data = []
-        for r in relationships:
-            rel_data.append(
+        QUERY = f"""
+            SELECT subject, object, weight
+            FROM {self._get_table_name("graphs_relationships")}
+            WHERE parent_id = $1
+        """
+        builder = GraphEdgesBuilder()
+        async with self.connection_manager.pool.get_connection() as conn:  # type: ignore
+            async with conn.transaction():
+                async for record in conn.cursor(
+                    QUERY, collection_id, prefetch=10_000
+                ):
+                    builder.add_edge(record[0], record[1], record[2])
+        return builder.build()
+
+    def get_export_columns(
+        self, export_type: str, include_embeddings: bool = False
+    ) -> list[tuple[str, str]]:
+        """List the `(column, type)` pairs written by `export_graph`."""
+        if export_type not in GRAPH_EXPORT_TABLES:
+            raise R2RException(
+                f"Invalid export type '{export_type}', expected one of {', '.join(GRAPH_EXPORT_TABLES)}.",
+                400,
+            )
+        columns = list(GRAPH_EXPORT_TABLES[export_type][2])
+        if include_embeddings:
+            columns.append(("embedding", "vector"))
+        return columns
+
+    async def export_graph(
+        self,
+        collection_id: UUID,
+        export_type: str,
+        include_embeddings: bool = False,
+        batch_size: int = 10_000,
+    ) -> AsyncGenerator[list[dict], None]:
+        """
+        Stream the entities, relationships or communities of a graph in
+        batches, read through a server-side cursor in a single snapshot.
+
+        The cursor lives as long as the client's download, so it runs on one
+        of the pool's bounded dedicated connections rather than holding a
+        pooled one, and the server ends the transaction after
+        `GRAPH_EXPORT_IDLE_TIMEOUT` without a fetch.
+
+        Ids are returned as text, metadata as JSON text and embeddings as
+        lists of floats.
+        """
+        table_name, parent_column, _ = GRAPH_EXPORT_TABLES[export_type]
+        casts = {
+            "text": "text",
+            "json": "text",
+            "text[]": "text[]",
+            "float": "float8",
+            "int": "int8",
+        }
+        select_fields = [
+            f"{column}::{casts[column_type]} AS {column}"
+            for column, column_type in self.get_export_columns(export_type)
+        ]
+        if include_embeddings:
+            select_fields.append("description_embedding::real[] AS embedding")
+
+        QUERY = f"""
+            SELECT {", ".join(select_fields)}
+            FROM {self._get_table_name(table_name)}
+            WHERE {parent_column} = $1
+        """
+        idle_timeout_ms = int(GRAPH_EXPORT_IDLE_TIMEOUT.total_seconds() * 1000)
+        async with self.connection_manager.pool.get_dedicated_connection(  # type: ignore
+            server_settings={
+                "idle_in_transaction_session_timeout": str(idle_timeout_ms)
+            }
+        ) as conn:
+            async with conn.transaction(
+                isolation="repeatable_read", readonly=True
+            ):
+                batch: list[dict] = []
+                async for record in conn.cursor(
+                    QUERY, collection_id, prefetch=batch_size
+                ):
+                    batch.append(dict(record))
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+
+    async def get_graph_adjacency(
+        self, collection_id: UUID
+    ) -> Optional[GraphAdjacency]:
+        """
+        Return the CSR adjacency of a graph, building it on first use.
+
+        Cached adjacencies are keyed by the graph's relationships version,
+        which triggers bump on every relationship write, so checking a cached
+        adjacency is a single primary key lookup. Returns None for graphs too
+        large to hold in memory.
+        """
+        QUERY = f"""
+            SELECT version, relationship_count
+            FROM {self._get_table_name("graphs_relationships_versions")}
+            WHERE parent_id = $1
+        """
+        row = await self.connection_manager.fetchrow_query(
+            QUERY, [collection_id]
+        )
+        # Graphs without a row have never had a relationship written.
+        version, count = (
+            (row["version"], row["relationship_count"]) if row else (0, 0)
+        )
+        if count > ADJACENCY_CACHE_MAX_EDGES:
+            return None
+
+        lock = self._adjacency_locks.setdefault(collection_id, asyncio.Lock())
+        async with lock:
+            cached = self._adjacency_cache.get(collection_id)
+            if cached is not None and cached[0] == version:
+                self._adjacency_cache.move_to_end(collection_id)
+                return cached[1]
+
+            adjacency = GraphAdjacency.from_edges(
+                await self.get_graph_edges(collection_id)
+            )
+            self._adjacency_cache[collection_id] = (version, adjacency)
+            self._adjacency_cache.move_to_end(collection_id)
+            while len(self._adjacency_cache) > ADJACENCY_CACHE_MAX_GRAPHS:
+                evicted, _ = self._adjacency_cache.popitem(last=False)
+                self._adjacency_locks.pop(evicted, None)
+            return adjacency
+
+    async def _expand_with_recursive_query(
+        self,
+        collection_id: UUID,
+        seeds: dict[str, float],
+        max_hops: int,
+        hop_decay: float,
+        limit: int,
+    ) -> list[tuple[str, float, int]]:
+        """
+        Same expansion as `GraphAdjacency.expand`, walked one hop per query
+        for graphs too large to cache.
+
+        Each hop only looks up the edges of the frontier through the
+        `(parent_id, subject)` and `(parent_id, object)` indexes, and keeps
+        the best score per reached name.
+        """
+        relationships_table = self._get_table_name("graphs_relationships")
+        max_weight_row = await self.connection_manager.fetchrow_query(
+            f"""
+            SELECT MAX(GREATEST(COALESCE(weight, 1.0), 0)) AS max_weight
+            FROM {relationships_table}
+            WHERE parent_id = $1
+            """,
+            [collection_id],
+        )
+        max_weight = max_weight_row["max_weight"] if max_weight_row else None
+        HOP_QUERY = f"""
+            WITH frontier AS (
+                SELECT name, score
+                FROM unnest($2::text[], $3::float8[]) AS f(name, score)
+            ),
+            candidates AS (
+                SELECT r.object AS name, f.score, r.weight
+                FROM frontier f
+                JOIN {relationships_table} r
+                    ON r.parent_id = $1 AND r.subject = f.name
+                UNION ALL
+                SELECT r.subject, f.score, r.weight
+                FROM frontier f
+                JOIN {relationships_table} r
+                    ON r.parent_id = $1 AND r.object = f.name
+            )
+            SELECT
+                name,
+                MAX(
+                    score * $4 * COALESCE(
+                        GREATEST(COALESCE(weight, 1.0), 0)
+                        / NULLIF($5::float8, 0),
+                        1.0
+                    )
+                ) AS score
+            FROM candidates
+            GROUP BY name
+        """
+
+        scores = {name: max(score, 0.0) for name, score in seeds.items()}
+        hops = {name: 0 for name in seeds}
+        frontier = dict(scores)
+        for hop in range(1, max_hops + 1):
+            if not frontier:
+                break
+            rows = await self.connection_manager.fetch_query(
+                HOP_QUERY,
+                [
+                    collection_id,
+                    list(frontier.keys()),
+                    list(frontier.values()),
+                    hop_decay,
+                    max_weight,
+                ],
+            )
+            improved = {}
+            for row in rows:
+                name, score = row["name"], max(float(row["score"]), 0.0)
+                if name not in hops or score > scores[name]:
+                    scores[name] = max(score, scores.get(name, 0.0))
+                    hops[name] = hop
+                    improved[name] = scores[name]
+            frontier = improved
+
+        reached = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(name, score, hops[name]) for name, score in reached]
+
+    async def graph_traversal_search(
+        self,
+        query_embedding: list[float],
+        num_seeds: int = 10,
+        max_hops: int = 2,
+        hop_decay: float = 0.5,
+        entity_limit: int = 10,
+        relationship_limit: int = 10,
+        filters: Optional[dict] = None,
+    ) -> Tuple[list[dict], list[dict]]:
+        """
+        Seed with the entities nearest to the query and expand them over
+        relationships for up to `max_hops` hops.
+
+        Entities are ranked by their seed similarity decayed through the
+        (normalized) weights of the edges walked. Relationships between the
+        returned entities are ranked by their weaker endpoint.
+        """
+        seeds_by_graph: dict[UUID, dict[str, float]] = {}
+        async for seed in self.graph_search(
+            "",
+            search_type="entities",
+            query_embedding=query_embedding,
+            limit=num_seeds,
+            property_names=["name", "parent_id"],
+            filters=filters or {},
+        ):
+            graph_seeds = seeds_by_graph.setdefault(seed["parent_id"], {})
+            graph_seeds[seed["name"]] = max(
+                seed["similarity_score"],
+                graph_seeds.get(seed["name"], float("-inf")),
+            )
+
+        reached: list[tuple[UUID, str, float, int]] = []
+        for parent_id, seeds in seeds_by_graph.items():
+            adjacency = await self.get_graph_adjacency(parent_id)
+            if adjacency is not None:
+                expanded = adjacency.expand(seeds, max_hops, hop_decay)
+            else:
+                expanded = await self._expand_with_recursive_query(
+                    parent_id, seeds, max_hops, hop_decay, entity_limit
+                )
+            # Seeds without relationships are still results in their own right
+            found = {name for name, _, _ in expanded}
+            expanded.extend(
+                (name, max(score, 0.0), 0)
+                for name, score in seeds.items()
+                if name not in found
+            )
+            reached.extend(
+                (parent_id, name, score, hops)
+                for name, score, hops in expanded
+            )
+
+        reached.sort(key=lambda r: r[2], reverse=True)
+        reached = reached[:entity_limit]
+        if not reached:
+            return [], []
+
+        params = [
+            [parent_id for parent_id, _, _, _ in reached],
+            [name for _, name, _, _ in reached],
+            [score for _, _, score, _ in reached],
+        ]
+        QUERY = f"""
+            SELECT DISTINCT ON (e.parent_id, e.name)
+                e.parent_id, e.name, e.description, e.metadata
+            FROM {self._get_table_name("graphs_entities")} e
+            JOIN unnest($1::uuid[], $2::text[]) AS r(parent_id, name)
+                ON e.parent_id = r.parent_id AND e.name = r.name
+        """
+        rows = await self.connection_manager.fetch_query(QUERY, params[:2])
+        entity_rows = {(row["parent_id"], row["name"]): row for row in rows}
+
+        entities = []
+        for parent_id, name, score, hops in reached:
+            row = entity_rows.get((parent_id, name))
+            if row is None:
+                continue
+            metadata = row["metadata"]
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            entities.append(
                 {
-                    "id": str(r.id),
-                    "subject": r.subject,
-                    "object": r.object,
-                    "weight": r.weight if r.weight is not None else 1.0,
+                    "name": name,
+                    "description": row["description"],
+                    "metadata": metadata,
+                    "similarity_score": score,
+                    "hops": hops,
                 }
             )
 
+        QUERY = f"""
+            WITH reached AS (
+                SELECT *
+                FROM unnest($1::uuid[], $2::text[], $3::float8[])
+                    AS r(parent_id, name, score)
+            )
+            SELECT
+                rel.subject, rel.predicate, rel.object, rel.description,
+                rel.metadata, LEAST(s.score, o.score) AS score
+            FROM {self._get_table_name("graphs_relationships")} rel
+            JOIN reached s
+                ON rel.parent_id = s.parent_id AND rel.subject = s.name
+            JOIN reached o
+                ON rel.parent_id = o.parent_id AND rel.object = o.name
+            ORDER BY LEAST(s.score, o.score) DESC, rel.weight DESC NULLS LAST
+            LIMIT $4
+        """
+        rows = await self.connection_manager.fetch_query(
+            QUERY, params + [relationship_limit]
+        )
+        relationships = []
+        for row in rows:
+            metadata = row["metadata"]
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            relationships.append(
+                {
+                    "subject": row["subject"],
+                    "predicate": row["predicate"],
+                    "object": row["object"],
+                    "description": row["description"],
+                    "metadata": metadata,
+                    "similarity_score": float(row["score"]),
+                }
+            )
+
+        return entities, relationships
+
+    async def _call_clustering_service(
+        self, edges: GraphEdges, leiden_params: dict[str, Any]
+    ) -> CommunityAssignments:
+        """
+        Submits a graph to the external Graspologic clustering service and
+        polls the job until the community assignments are ready.
+        """
         endpoint = os.environ.get("CLUSTERING_SERVICE_URL")
         if not endpoint:
             raise ValueError("CLUSTERING_SERVICE_URL not set.")
 
-        url = f"{endpoint}/cluster"
+        job_timeout = float(
+            os.environ.get(
+                "CLUSTERING_SERVICE_JOB_TIMEOUT", CLUSTERING_JOB_TIMEOUT
+            )
+        )
+        payload = encode_graph_edges(edges, leiden_params)
+        logger.info(
+            f"Submitting {len(edges)} edges ({len(payload)} bytes) to the clustering service."
+        )
 
-        payload = {"relationships": rel_data, "leiden_params": leiden_params}
+        async with httpx.AsyncClient(timeout=300) as client:
+            response = await client.post(
+                f"{endpoint}/jobs",
+                content=payload,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            response.raise_for_status()
+            job_id = response.json()["job_id"]
+
+            deadline = time.monotonic() + job_timeout
+            poll_interval = 1.0
+            try:
+                while True:
+                    response = await client.get(f"{endpoint}/jobs/{job_id}")
+                    if response.status_code == 404:
+                        # Job state is held in the service's memory
+                        raise ValueError(
+                            f"Clustering job {job_id} was lost; the clustering service restarted or is running more than one process."
+                        )
+                    response.raise_for_status()
+                    job = response.json()
+                    if job["status"] == "completed":
+                        break
+                    if job["status"] == "failed":
+                        raise ValueError(
+                            f"Clustering job {job_id} failed: {job.get('error')}"
+                        )
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(
+                            f"Clustering job {job_id} did not finish within {job_timeout} seconds."
+                        )
+                    await asyncio.sleep(poll_interval)
+                    poll_interval = min(poll_interval * 2, 30.0)
+            except (TimeoutError, asyncio.CancelledError):
+                # Free the service's worker for other graphs
+                try:
+                    await client.delete(f"{endpoint}/jobs/{job_id}")
+                except httpx.HTTPError as e:
+                    logger.warning(
+                        f"Failed to cancel clustering job {job_id}: {e}"
+                    )
+                raise
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, timeout=3600)
+            response = await client.get(f"{endpoint}/jobs/{job_id}/result")
             response.raise_for_status()
 
-        data = response.json()
-        communities = data.get("communities", [])
-        return communities
+        return decode_community_assignments(response.content, edges.nodes)
 
     async def _create_graph_and_cluster(
         self,
-        relationships: list[Relationship],
+        edges: GraphEdges,
         leiden_params: dict[str, Any],
         clustering_mode: str = "remote",
-    ) -> Any:
+    ) -> CommunityAssignments:
         """
-        Create a graph and cluster it. If clustering_mode='local', use hierarchical_leiden locally.
+        Cluster a graph. If clustering_mode='local', run hierarchical_leiden in a worker process.
         If clustering_mode='remote', call the external service.
         """
 
         if clustering_mode == "remote":
             logger.info("Sending request to external clustering service...")
             communities = await self._call_clustering_service(
-                relationships, leiden_params
+                edges, leiden_params
             )
             logger.info("Received communities from clustering service.")
             return communities
         else:
-            # Local mode: run hierarchical_leiden directly
-            G = self.nx.Graph()
-            for relationship in relationships:
-                G.add_edge(
-                    relationship.subject,
-                    relationship.object,
-                    weight=relationship.weight,
-                    id=relationship.id,
-                )
-
             logger.info(
-                f"Graph has {len(G.nodes)} nodes and {len(G.edges)} edges"
+                f"Graph has {len(edges.nodes)} nodes and {len(edges)} edges"
             )
-            return await self._compute_leiden_communities(G, leiden_params)
+            return await self._compute_leiden_communities(edges, leiden_params)
 
     async def _cluster_and_add_community_info(
         self,
-        relationships: list[Relationship],
-        relationship_ids_cache: dict[str, list[int]],
+        edges: GraphEdges,
         leiden_params: dict[str, Any],
         collection_id: Optional[UUID] = None,
         clustering_mode: str = "local",
-    ) -> Tuple[int, Any]:
-
-        # clear if there is any old information
-        conditions = []
-        if collection_id is not None:
-            conditions.append("collection_id = $1")
-
-        await asyncio.sleep(0.1)
+    ) -> Tuple[int, CommunityAssignments]:
 
         start_time = time.time()
 
         logger.info(f"Creating graph and clustering for {collection_id}")
 
         hierarchical_communities = await self._create_graph_and_cluster(
-            relationships=relationships,
+            edges=edges,
             leiden_params=leiden_params,
             clustering_mode=clustering_mode,
         )
@@ -2190,34 +3158,7 @@ class PostgresGraphsHandler(Handler):
             f"Computing Leiden communities completed, time {time.time() - start_time:.2f} seconds."
         )
 
-        def relationship_ids(node: str) -> list[int]:
-            return relationship_ids_cache.get(node, [])
-
-        logger.info(
-            f"Cached {len(relationship_ids_cache)} relationship ids, time {time.time() - start_time:.2f} seconds."
-        )
-
-        # If remote: hierarchical_communities is a list of dicts like:
-        # [{"node": str, "cluster": int, "level": int}, ...]
-        # If local: hierarchical_communities is the returned structure from hierarchical_leiden (list of named tuples)
-
-        if clustering_mode == "remote":
-            if not hierarchical_communities:
-                num_communities = 0
-            else:
-                num_communities = (
-                    max(item["cluster"] for item in hierarchical_communities)
-                    + 1
-                )
-        else:
-            # Local mode: hierarchical_communities returned by hierarchical_leiden
-            # According to the original code, it's likely a list of items with .cluster attribute
-            if not hierarchical_communities:
-                num_communities = 0
-            else:
-                num_communities = (
-                    max(item.cluster for item in hierarchical_communities) + 1
-                )
+        num_communities = hierarchical_communities.num_communities
 
         logger.info(
             f"Generated {num_communities} communities, time {time.time() - start_time:.2f} seconds."
@@ -2225,26 +3166,6 @@ class PostgresGraphsHandler(Handler):
 
         return num_communities, hierarchical_communities
 
-    async def _get_relationship_ids_cache(
-        self, relationships: list[Relationship]
-    ) -> dict[str, list[int]]:
-        relationship_ids_cache: dict[str, list[int]] = {}
-        for relationship in relationships:
-            if relationship.subject is not None:
-                relationship_ids_cache.setdefault(relationship.subject, [])
-                if relationship.id is not None:
-                    relationship_ids_cache[relationship.subject].append(
-                        relationship.id
-                    )
-            if relationship.object is not None:
-                relationship_ids_cache.setdefault(relationship.object, [])
-                if relationship.id is not None:
-                    relationship_ids_cache[relationship.object].append(
-                        relationship.id
-                    )
-
-        return relationship_ids_cache
-
     async def get_entity_map(
         self, offset: int, limit: int, document_id: UUID
     ) -> dict[str, dict[str, list[dict[str, Any]]]]:
@@ -2508,32 +3429,19 @@ class PostgresGraphsHandler(Handler):
 
     async def _compute_leiden_communities(
         self,
-        graph: Any,
+        edges: GraphEdges,
         leiden_params: dict[str, Any],
-    ) -> Any:
-        """Compute Leiden communities."""
-        try:
-            from graspologic.partition import hierarchical_leiden
-
-            if "random_seed" not in leiden_params:
-                leiden_params["random_seed"] = (
-                    7272  # add seed to control randomness
-                )
-
-            start_time = time.time()
-            logger.info(
-                f"Running Leiden clustering with params: {leiden_params}"
-            )
+    ) -> CommunityAssignments:
+        """Compute Leiden communities off the event loop."""
+        start_time = time.time()
+        logger.info(f"Running Leiden clustering with params: {leiden_params}")
 
-            community_mapping = hierarchical_leiden(graph, **leiden_params)
+        community_mapping = await cluster_graph_edges(edges, leiden_params)
 
-            logger.info(
-                f"Leiden clustering completed in {time.time() - start_time:.2f} seconds."
-            )
-            return community_mapping
-
-        except ImportError as e:
-            raise ImportError("Please install the graspologic package.") from e
+        logger.info(
+            f"Leiden clustering completed in {time.time() - start_time:.2f} seconds."
+        )
+        return community_mapping
 
     async def get_existing_document_entity_chunk_ids(
         self, document_id: UUID
@@ -2575,6 +3483,252 @@ class PostgresGraphsHandler(Handler):
             "count"
         ]
 
+    async def _merge_entities(
+        self, parent_id: UUID, membership: str, params: list[Any]
+    ) -> tuple[int, int]:
+        """
+        Collapse every group of entities into its longest-named member.
+
+        `membership` is a query yielding `(id, group_key)` rows. The kept
+        entity takes the union of the group's chunk ids, its five longest
+        distinct descriptions and the other names as `aliases`. Relationships
+        pointing at the other members are moved onto it, by entity id, or by
+        name for relationships whose id is not one of the graph's entities,
+        and the rest of the group is deleted. Returns
+        `(groups merged, entities removed)`.
+        """
+        entities_table = self._get_table_name("graphs_entities")
+        QUERY = f"""
+            WITH membership AS (
+                {membership}
+            ),
+            members AS (
+                SELECT e.id, e.name, e.description, e.chunk_ids, m.group_key,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY m.group_key
+                        ORDER BY length(e.name) DESC, e.created_at, e.id
+                    ) AS rank
+                FROM {entities_table} e
+                JOIN membership m ON e.id = m.id
+                WHERE e.parent_id = $1
+            ),
+            merged AS (
+                SELECT
+                    group_key,
+                    (array_agg(id ORDER BY rank))[1] AS keep_id,
+                    (array_agg(name ORDER BY rank))[1] AS name,
+                    array_agg(DISTINCT name) AS aliases
+                FROM members
+                GROUP BY group_key
+                HAVING COUNT(*) > 1
+            ),
+            chunks AS (
+                SELECT m.group_key, array_agg(DISTINCT chunk_id) AS chunk_ids
+                FROM members m
+                JOIN merged USING (group_key)
+                CROSS JOIN LATERAL unnest(m.chunk_ids) AS chunk_id
+                GROUP BY m.group_key
+            ),
+            descriptions AS (
+                SELECT group_key, string_agg(
+                    description, E'\\n' ORDER BY length(description) DESC
+                ) AS description
+                FROM (
+                    SELECT group_key, description, ROW_NUMBER() OVER (
+                        PARTITION BY group_key
+                        ORDER BY length(description) DESC
+                    ) AS n
+                    FROM (
+                        SELECT DISTINCT m.group_key, m.description
+                        FROM members m
+                        JOIN merged USING (group_key)
+                        WHERE m.description IS NOT NULL
+                    ) distinct_descriptions
+                ) ranked
+                WHERE n <= 5
+                GROUP BY group_key
+            ),
+            kept AS (
+                UPDATE {entities_table} e
+                SET
+                    chunk_ids = COALESCE(c.chunk_ids, e.chunk_ids),
+                    description = COALESCE(d.description, e.description),
+                    metadata = COALESCE(e.metadata, '{{}}'::jsonb)
+                        || jsonb_build_object('aliases', to_jsonb(g.aliases)),
+                    updated_at = NOW()
+                FROM merged g
+                LEFT JOIN chunks c USING (group_key)
+                LEFT JOIN descriptions d USING (group_key)
+                WHERE e.id = g.keep_id
+            ),
+            moved AS (
+                SELECT m.id, m.name AS alias, g.name AS canonical, g.keep_id
+                FROM members m
+                JOIN merged g USING (group_key)
+                WHERE m.id <> g.keep_id
+            ),
+            renames AS (
+                SELECT DISTINCT ON (alias) alias, canonical, keep_id
+                FROM moved
+                WHERE alias <> canonical
+                ORDER BY alias, keep_id
+            ),
+            relinked AS (
+                UPDATE {self._get_table_name("graphs_relationships")} r
+                SET
+                    subject = COALESCE(
+                        si.canonical, sn.canonical, r.subject
+                    ),
+                    subject_id = COALESCE(
+                        si.keep_id, sn.keep_id, r.subject_id
+                    ),
+                    object = COALESCE(oi.canonical, onm.canonical, r.object),
+                    object_id = COALESCE(
+                        oi.keep_id, onm.keep_id, r.object_id
+                    ),
+                    updated_at = NOW()
+                FROM {self._get_table_name("graphs_relationships")} r2
+                LEFT JOIN moved si ON si.id = r2.subject_id
+                -- Names are not unique within a graph, so relationships are
+                -- matched by name only when they carry no id of an entity in
+                -- this graph (graphs pulled before ids were remapped kept
+                -- their document entity ids)
+                LEFT JOIN renames sn
+                    ON sn.alias = r2.subject
+                    AND NOT EXISTS (
+                        SELECT 1 FROM {entities_table} se
+                        WHERE se.id = r2.subject_id AND se.parent_id = $1
+                    )
+                LEFT JOIN moved oi ON oi.id = r2.object_id
+                LEFT JOIN renames onm
+                    ON onm.alias = r2.object
+                    AND NOT EXISTS (
+                        SELECT 1 FROM {entities_table} oe
+                        WHERE oe.id = r2.object_id AND oe.parent_id = $1
+                    )
+                WHERE r.id = r2.id
+                AND r2.parent_id = $1
+                AND COALESCE(si.id, sn.keep_id, oi.id, onm.keep_id)
+                    IS NOT NULL
+            ),
+            removed AS (
+                DELETE FROM {entities_table} e
+                USING members m
+                JOIN merged g USING (group_key)
+                WHERE e.id = m.id AND m.id <> g.keep_id
+                RETURNING e.id
+            )
+            SELECT
+                (SELECT COUNT(*) FROM merged) AS groups,
+                (SELECT COUNT(*) FROM removed) AS removed
+        """
+        result = await self.connection_manager.fetchrow_query(
+            QUERY, [parent_id] + params
+        )
+        return result["groups"], result["removed"]
+
+    async def merge_entities_by_name(self, parent_id: UUID) -> tuple[int, int]:
+        """Merge the entities of a graph that share a name."""
+        return await self._merge_entities(
+            parent_id,
+            f"""
+                SELECT id, name AS group_key
+                FROM {self._get_table_name("graphs_entities")}
+                WHERE parent_id = $1 AND name IN (
+                    SELECT name
+                    FROM {self._get_table_name("graphs_entities")}
+                    WHERE parent_id = $1
+                    GROUP BY name
+                    HAVING COUNT(*) > 1
+                )
+            """,
+            [],
+        )
+
+    async def merge_entity_groups(
+        self, parent_id: UUID, groups: list[list[UUID]]
+    ) -> tuple[int, int]:
+        """Merge each group of entity ids into a single entity."""
+        total_groups, total_removed = 0, 0
+        batch_ids: list[UUID] = []
+        batch_keys: list[int] = []
+        for group_key, group in enumerate(groups):
+            batch_ids.extend(group)
+            batch_keys.extend([group_key] * len(group))
+            if (
+                len(batch_ids) >= ENTITY_MERGE_BATCH_SIZE
+                or group_key == len(groups) - 1
+            ):
+                num_groups, num_removed = await self._merge_entities(
+                    parent_id,
+                    "SELECT * FROM unnest($2::uuid[], $3::int[]) AS m(id, group_key)",
+                    [batch_ids, batch_keys],
+                )
+                total_groups += num_groups
+                total_removed += num_removed
+                batch_ids, batch_keys = [], []
+        return total_groups, total_removed
+
+    async def get_similar_entity_pairs(
+        self,
+        parent_id: UUID,
+        similarity_threshold: float,
+        max_neighbors: int,
+        batch_size: int = 1_000,
+    ) -> AsyncGenerator[list[tuple[UUID, UUID]], None]:
+        """
+        Yield batches of entity pairs whose description embeddings have a
+        cosine similarity of at least `similarity_threshold`.
+
+        Each entity is compared against its `max_neighbors` nearest
+        neighbours only, so a vector index on `graphs_entities` keeps this
+        far below quadratic.
+        """
+        BATCH_QUERY = f"""
+            SELECT id
+            FROM {self._get_table_name("graphs_entities")}
+            WHERE parent_id = $1
+            AND description_embedding IS NOT NULL
+            AND ($2::uuid IS NULL OR id > $2)
+            ORDER BY id
+            LIMIT $3
+        """
+        QUERY = f"""
+            SELECT e.id AS source, n.id AS target
+            FROM {self._get_table_name("graphs_entities")} e
+            CROSS JOIN LATERAL (
+                SELECT id
+                FROM {self._get_table_name("graphs_entities")} candidate
+                WHERE candidate.parent_id = $1
+                AND candidate.id <> e.id
+                AND (candidate.description_embedding <=> e.description_embedding) <= $3
+                ORDER BY candidate.description_embedding <=> e.description_embedding
+                LIMIT $4
+            ) n
+            WHERE e.id = ANY($2::uuid[])
+        """
+        last_id: Optional[UUID] = None
+        while True:
+            batch = await self.connection_manager.fetch_query(
+                BATCH_QUERY, [parent_id, last_id, batch_size]
+            )
+            if not batch:
+                return
+            batch_ids = [row["id"] for row in batch]
+            last_id = batch_ids[-1]
+
+            rows = await self.connection_manager.fetch_query(
+                QUERY,
+                [
+                    parent_id,
+                    batch_ids,
+                    1 - similarity_threshold,
+                    max_neighbors,
+                ],
+            )
+            if rows:
+                yield [(row["source"], row["target"]) for row in rows]
+
     async def update_entity_descriptions(self, entities: list[Entity]):
 
         query = f"""
@@ -2628,13 +3782,19 @@ async def _add_objects(
     # Serialize the list of objects to JSON
     json_data = json.dumps(cleaned_objects, default=_json_serialize)
 
-    # Prepare the column definitions for jsonb_to_recordset
+    # Prepare the column definitions for jsonb_to_recordset from every key in
+    # the batch, since None values were dropped per object. Keys missing from
+    # an object are read back as NULL.
+    samples: dict[str, Any] = {}
+    for cleaned_obj in cleaned_objects:
+        for col, value in cleaned_obj.items():
+            samples.setdefault(col, value)
 
-    columns = cleaned_objects[0].keys()
+    columns = samples.keys()
     column_defs = []
     for col in columns:
         # Map Python types to PostgreSQL types
-        sample_value = cleaned_objects[0][col]
+        sample_value = samples[col]
         if "embedding" in col:
             pg_type = "vector"
         elif "chunk_ids" in col or "document_ids" in col or "graph_ids" in col:
@@ -0,0 +1,172 @@
+import json
+import logging
+from typing import Optional
+from uuid import UUID, uuid4
+
+from core.base import Handler
+
+from .base import PostgresConnectionManager
+
+logger = logging.getLogger()
+
+
+class PostgresJobsHandler(Handler):
+    """
+    A durable workflow queue for the simple orchestrator.
+
+    Jobs are leased with `FOR UPDATE SKIP LOCKED`, so any number of workers
+    across replicas can poll the same table without handing out a job twice.
+    A lease expires after its visibility timeout, at which point the job can
+    be picked up again by another worker.
+    """
+
+    TABLE_NAME = "workflow_jobs"
+
+    def __init__(
+        self,
+        project_name: str,
+        connection_manager: PostgresConnectionManager,
+    ):
+        super().__init__(project_name, connection_manager)
+
+    async def create_tables(self):
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresJobsHandler.TABLE_NAME)} (
+            id UUID PRIMARY KEY,
+            workflow_type TEXT NOT NULL,
+            workflow_name TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INT NOT NULL DEFAULT 0,
+            max_attempts INT NOT NULL,
+            run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            leased_until TIMESTAMPTZ,
+            worker_id TEXT,
+            last_error TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        CREATE INDEX IF NOT EXISTS idx_workflow_jobs_pending_{self.project_name}
+        ON {self._get_table_name(PostgresJobsHandler.TABLE_NAME)} (workflow_type, run_after)
+        WHERE status IN ('queued', 'running');
+        """
+        await self.connection_manager.execute_query(query)
+
+    async def enqueue_job(
+        self,
+        workflow_type: str,
+        workflow_name: str,
+        payload: dict,
+        max_attempts: int,
+    ) -> UUID:
+        job_id = uuid4()
+        query = f"""
+        INSERT INTO {self._get_table_name(PostgresJobsHandler.TABLE_NAME)}
+        (id, workflow_type, workflow_name, payload, max_attempts)
+        VALUES ($1, $2, $3, $4, $5)
+        """
+        await self.connection_manager.execute_query(
+            query,
+            [
+                job_id,
+                workflow_type,
+                workflow_name,
+                json.dumps(payload, default=str),
+                max_attempts,
+            ],
+        )
+        return job_id
+
+    async def lease_job(
+        self,
+        workflow_type: str,
+        worker_id: str,
+        visibility_timeout: float,
+    ) -> Optional[dict]:
+        """
+        Claim the next runnable job of a workflow type.
+
+        A job is runnable when it is queued and due, or when it is running but
+        its lease has expired because the worker holding it went away.
+        """
+        table_name = self._get_table_name(PostgresJobsHandler.TABLE_NAME)
+        query = f"""
+        UPDATE {table_name}
+        SET status = 'running',
+            attempts = attempts + 1,
+            leased_until = NOW() + make_interval(secs => $3),
+            worker_id = $2,
+            updated_at = NOW()
+        WHERE id = (
+            SELECT id FROM {table_name}
+            WHERE workflow_type = $1
+            AND (
+                (status = 'queued' AND run_after <= NOW())
+                OR (status = 'running' AND leased_until < NOW())
+            )
+            ORDER BY run_after
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id, workflow_name, payload, attempts, max_attempts
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [workflow_type, worker_id, float(visibility_timeout)]
+        )
+        if not result:
+            return None
+
+        return {
+            "id": result["id"],
+            "workflow_name": result["workflow_name"],
+            "payload": json.loads(result["payload"]),
+            "attempts": result["attempts"],
+            "max_attempts": result["max_attempts"],
+        }
+
+    async def extend_lease(
+        self, job_id: UUID, worker_id: str, visibility_timeout: float
+    ) -> bool:
+        """Push back the lease of a job that is still being worked on."""
+        query = f"""
+        UPDATE {self._get_table_name(PostgresJobsHandler.TABLE_NAME)}
+        SET leased_until = NOW() + make_interval(secs => $3), updated_at = NOW()
+        WHERE id = $1 AND worker_id = $2 AND status = 'running'
+        RETURNING id
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query, [job_id, worker_id, float(visibility_timeout)]
+        )
+        return result is not None
+
+    async def complete_job(self, job_id: UUID, worker_id: str) -> None:
+        query = f"""
+        UPDATE {self._get_table_name(PostgresJobsHandler.TABLE_NAME)}
+        SET status = 'succeeded', leased_until = NULL, updated_at = NOW()
+        WHERE id = $1 AND worker_id = $2
+        """
+        await self.connection_manager.execute_query(query, [job_id, worker_id])
+
+    async def fail_job(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        error: str,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Record a failed attempt, either requeueing the job after `retry_after`
+        seconds or marking it as permanently failed.
+        """
+        query = f"""
+        UPDATE {self._get_table_name(PostgresJobsHandler.TABLE_NAME)}
+        SET status = CASE WHEN $4::float8 IS NULL THEN 'failed' ELSE 'queued' END,
+            run_after = NOW() + make_interval(secs => COALESCE($4::float8, 0)),
+            leased_until = NULL,
+            last_error = $3,
+            updated_at = NOW()
+        WHERE id = $1 AND worker_id = $2
+        """
+        await self.connection_manager.execute_query(
+            query, [job_id, worker_id, error, retry_after]
+        )
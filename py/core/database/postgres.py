@@ -8,22 +8,26 @@ from ..base.abstractions import VectorQuantizationType
 from ..base.providers import (
     DatabaseConfig,
     DatabaseProvider,
+    FileConfig,
     PostgresConfigurationSettings,
 )
 from .base import PostgresConnectionManager, SemaphoreConnectionPool
 from .chunks import PostgresChunksHandler
 from .collections import PostgresCollectionsHandler
+from .completion_cache import PostgresCompletionCacheHandler
 from .conversations import PostgresConversationsHandler
 from .documents import PostgresDocumentsHandler
-from .files import PostgresFilesHandler
+from .files import FilesystemFilesHandler, PostgresFilesHandler
 from .graphs import (
     PostgresCommunitiesHandler,
     PostgresEntitiesHandler,
     PostgresGraphsHandler,
     PostgresRelationshipsHandler,
 )
+from .jobs import PostgresJobsHandler
 from .limits import PostgresLimitsHandler
 from .prompts_handler import PostgresPromptsHandler
+from .rag_cache import PostgresRAGCacheHandler
 from .tokens import PostgresTokensHandler
 from .users import PostgresUserHandler
 
@@ -73,9 +77,12 @@ class PostgresDatabaseProvider(DatabaseProvider):
     relationships_handler: PostgresRelationshipsHandler
     graphs_handler: PostgresGraphsHandler
     prompts_handler: PostgresPromptsHandler
-    files_handler: PostgresFilesHandler
+    files_handler: PostgresFilesHandler | FilesystemFilesHandler
     conversations_handler: PostgresConversationsHandler
     limits_handler: PostgresLimitsHandler
+    jobs_handler: PostgresJobsHandler
+    completion_cache_handler: PostgresCompletionCacheHandler
+    rag_cache_handler: PostgresRAGCacheHandler
 
     def __init__(
         self,
@@ -83,6 +90,7 @@ class PostgresDatabaseProvider(DatabaseProvider):
         dimension: int,
         crypto_provider: "NaClCryptoProvider",
         quantization_type: VectorQuantizationType = VectorQuantizationType.FP32,
+        file_config: Optional[FileConfig] = None,
         *args,
         **kwargs,
     ):
@@ -196,15 +204,45 @@ class PostgresDatabaseProvider(DatabaseProvider):
         self.prompts_handler = PostgresPromptsHandler(
             self.project_name, self.connection_manager
         )
-        self.files_handler = PostgresFilesHandler(
-            self.project_name, self.connection_manager
-        )
+        self.files_handler = self._create_files_handler(file_config)
 
         self.limits_handler = PostgresLimitsHandler(
             project_name=self.project_name,
             connection_manager=self.connection_manager,
             config=self.config,
         )
+        self.jobs_handler = PostgresJobsHandler(
+            self.project_name, self.connection_manager
+        )
+        self.completion_cache_handler = PostgresCompletionCacheHandler(
+            self.project_name, self.connection_manager
+        )
+        self.rag_cache_handler = PostgresRAGCacheHandler(
+            self.project_name, self.connection_manager, self.dimension
+        )
+
+    def _create_files_handler(
+        self, file_config: Optional[FileConfig]
+    ) -> PostgresFilesHandler | FilesystemFilesHandler:
+        if file_config is None or file_config.provider == "postgres":
+            return PostgresFilesHandler(
+                self.project_name, self.connection_manager
+            )
+
+        storage_path = file_config.storage_path or os.getenv(
+            "R2R_FILE_STORAGE_PATH"
+        )
+        if not storage_path:
+            raise ValueError(
+                "Error, please set a valid R2R_FILE_STORAGE_PATH environment variable or set a 'storage_path' in the 'file' settings of your `r2r.toml`."
+            )
+        logger.info(f"Storing files on the local filesystem at {storage_path}")
+        return FilesystemFilesHandler(
+            self.project_name,
+            self.connection_manager,
+            storage_path=storage_path,
+            shard_depth=file_config.shard_depth,
+        )
 
     async def initialize(self):
         logger.info("Initializing `PostgresDatabaseProvider`.")
@@ -238,6 +276,9 @@ class PostgresDatabaseProvider(DatabaseProvider):
         await self.relationships_handler.create_tables()
         await self.conversations_handler.create_tables()
         await self.limits_handler.create_tables()
+        await self.jobs_handler.create_tables()
+        await self.completion_cache_handler.create_tables()
+        await self.rag_cache_handler.create_tables()
 
     def _get_postgres_configuration_settings(
         self, config: DatabaseConfig
@@ -284,6 +325,7 @@ class PostgresDatabaseProvider(DatabaseProvider):
         return settings
 
     async def close(self):
+        await self.connection_manager.close()
         if self.pool:
             await self.pool.close()
 
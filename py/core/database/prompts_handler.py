@@ -1,7 +1,10 @@
+import asyncio
 import json
 import logging
 import os
+import uuid
 from abc import abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -29,48 +32,50 @@ class CacheEntry(Generic[T]):
 
 
 class Cache(Generic[T]):
-    """A generic cache implementation with TTL and LRU-like features"""
+    """
+    A generic LRU cache with a TTL.
+
+    Entries are kept in recency order, so lookups, inserts and evictions are
+    all O(1). Expired entries are dropped when they are next looked up, or
+    evicted like any other once they become the least recently used.
+    """
 
     def __init__(
         self,
         ttl: Optional[timedelta] = None,
         max_size: Optional[int] = 1000,
-        cleanup_interval: timedelta = timedelta(hours=1),
     ):
-        self._cache: dict[str, CacheEntry[T]] = {}
+        self._cache: OrderedDict[str, CacheEntry[T]] = OrderedDict()
         self._ttl = ttl
         self._max_size = max_size
-        self._cleanup_interval = cleanup_interval
-        self._last_cleanup = datetime.now()
 
     def get(self, key: str) -> Optional[T]:
         """Retrieve an item from cache"""
-        self._maybe_cleanup()
-
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
 
-        entry = self._cache[key]
-
-        if self._ttl and datetime.now() - entry.created_at > self._ttl:
+        now = datetime.now()
+        if self._ttl and now - entry.created_at > self._ttl:
             del self._cache[key]
             return None
 
-        entry.last_accessed = datetime.now()
+        self._cache.move_to_end(key)
+        entry.last_accessed = now
         entry.access_count += 1
         return entry.value
 
     def set(self, key: str, value: T) -> None:
-        """Store an item in cache"""
-        self._maybe_cleanup()
-
+        """Store an item in cache, evicting the least recently used if full"""
         now = datetime.now()
         self._cache[key] = CacheEntry(
             value=value, created_at=now, last_accessed=now
         )
+        self._cache.move_to_end(key)
 
-        if self._max_size and len(self._cache) > self._max_size:
-            self._evict_lru()
+        if self._max_size:
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
 
     def invalidate(self, key: str) -> None:
         """Remove an item from cache"""
@@ -80,48 +85,34 @@ class Cache(Generic[T]):
         """Clear all cached items"""
         self._cache.clear()
 
-    def _maybe_cleanup(self) -> None:
-        """Periodically clean up expired entries"""
-        now = datetime.now()
-        if now - self._last_cleanup > self._cleanup_interval:
-            self._cleanup()
-            self._last_cleanup = now
-
-    def _cleanup(self) -> None:
-        """Remove expired entries"""
-        if not self._ttl:
-            return
-
-        now = datetime.now()
-        expired = [
-            k for k, v in self._cache.items() if now - v.created_at > self._ttl
-        ]
-        for k in expired:
-            del self._cache[k]
-
-    def _evict_lru(self) -> None:
-        """Remove least recently used item"""
-        if not self._cache:
-            return
-
-        lru_key = min(
-            self._cache.keys(), key=lambda k: self._cache[k].last_accessed
-        )
-        del self._cache[lru_key]
-
 
 class CacheablePromptHandler(Handler):
     """Abstract base class that adds caching capabilities to prompt handlers"""
 
     def __init__(
         self,
-        cache_ttl: Optional[timedelta] = timedelta(hours=1),
+        cache_ttl: Optional[timedelta] = timedelta(days=1),
         max_cache_size: Optional[int] = 1000,
     ):
         self._prompt_cache = Cache[str](ttl=cache_ttl, max_size=max_cache_size)
         self._template_cache = Cache[dict](
             ttl=cache_ttl, max_size=max_cache_size
         )
+        # Bumped on every invalidation, so a read that fetched a prompt
+        # before it was invalidated does not write the stale copy back
+        self._generations: dict[str, int] = {}
+        self._cache_generation = 0
+
+    def _generation(self, name: str) -> tuple[int, int]:
+        return self._cache_generation, self._generations.get(name, 0)
+
+    def _invalidate_prompt(self, name: str) -> None:
+        """Drop the template of a prompt and every prompt formatted from it"""
+        self._generations[name] = self._generations.get(name, 0) + 1
+        self._template_cache.invalidate(name)
+        for key in list(self._prompt_cache._cache.keys()):
+            if key == name or key.startswith(f"{name}:"):
+                self._prompt_cache.invalidate(key)
 
     def _cache_key(
         self, prompt_name: str, inputs: Optional[dict] = None
@@ -157,10 +148,18 @@ class CacheablePromptHandler(Handler):
                 logger.debug(f"Cache hit for prompt: {cache_key}")
                 return cached
 
+        generation = self._generation(prompt_name)
         result = await self._get_prompt_impl(prompt_name, inputs)
-        self._prompt_cache.set(cache_key, result)
+        if self._generation(prompt_name) == generation:
+            self._prompt_cache.set(cache_key, result)
         return result
 
+    async def preload_prompts(self, prompt_names: list[str]) -> None:
+        """Warm the template cache, e.g. while a request is still retrieving context"""
+        await asyncio.gather(
+            *(self._get_template_info(name) for name in prompt_names)
+        )
+
     async def get_prompt(  # type: ignore
         self,
         name: str,
@@ -205,14 +204,7 @@ class CacheablePromptHandler(Handler):
     ) -> None:
         """Public method to update a prompt with proper cache invalidation"""
         # First invalidate all caches for this prompt
-        self._template_cache.invalidate(name)
-        cache_keys_to_invalidate = [
-            key
-            for key in self._prompt_cache._cache.keys()
-            if key.startswith(f"{name}:") or key == name
-        ]
-        for key in cache_keys_to_invalidate:
-            self._prompt_cache.invalidate(key)
+        self._invalidate_prompt(name)
 
         # Perform the update
         await self._update_prompt_impl(name, template, input_types)
@@ -255,6 +247,8 @@ class PostgresPromptsHandler(CacheablePromptHandler):
         self.connection_manager = connection_manager
         self.project_name = project_name
         self.prompts: dict[str, dict[str, str | dict[str, str]]] = {}
+        # Identifies this handler's own invalidations when they are echoed back
+        self._instance_id = str(uuid.uuid4())
 
     async def _load_prompts(self) -> None:
         """Load prompts from both database and YAML files."""
@@ -385,6 +379,7 @@ class PostgresPromptsHandler(CacheablePromptHandler):
         WHERE name = $1;
         """
 
+        generation = self._generation(prompt_name)
         result = await self.connection_manager.fetchrow_query(
             query, [prompt_name]
         )
@@ -399,7 +394,8 @@ class PostgresPromptsHandler(CacheablePromptHandler):
                 "template": result["template"],
                 "input_types": input_types,
             }
-            self._template_cache.set(prompt_name, template_info)
+            if self._generation(prompt_name) == generation:
+                self._template_cache.set(prompt_name, template_info)
             return template_info
 
         return None
@@ -414,12 +410,6 @@ class PostgresPromptsHandler(CacheablePromptHandler):
         if not template and not input_types:
             return
 
-        # Clear caches first
-        self._template_cache.invalidate(name)
-        for key in list(self._prompt_cache._cache.keys()):
-            if key.startswith(f"{name}:"):
-                self._prompt_cache.invalidate(key)
-
         # Build update query
         set_clauses = []
         params = [name]  # First parameter is always the name
@@ -465,6 +455,11 @@ class PostgresPromptsHandler(CacheablePromptHandler):
             logger.error(f"Failed to update prompt {name}: {str(e)}")
             raise
 
+        # Invalidate once the new version is written, so reads that raced
+        # with the update cannot cache the old one
+        self._invalidate_prompt(name)
+        await self._broadcast_invalidation(name)
+
     async def create_tables(self):
         """Create the necessary tables for storing prompts."""
         query = f"""
@@ -496,6 +491,44 @@ class PostgresPromptsHandler(CacheablePromptHandler):
         await self.connection_manager.execute_query(query)
         await self._load_prompts()
 
+        try:
+            await self.connection_manager.listen(
+                self._invalidation_channel, self._on_invalidation
+            )
+        except Exception as e:
+            # e.g. behind a transaction pooler, which does not support LISTEN
+            logger.warning(
+                f"Prompt cache invalidation will not be shared with other workers: {str(e)}"
+            )
+
+    @property
+    def _invalidation_channel(self) -> str:
+        return f"{self.project_name}_prompt_invalidation"
+
+    async def _broadcast_invalidation(self, name: str) -> None:
+        """Tell the other workers to drop their cached copies of a prompt"""
+        try:
+            await self.connection_manager.notify(
+                self._invalidation_channel,
+                json.dumps({"name": name, "origin": self._instance_id}),
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to broadcast invalidation of prompt {name}: {str(e)}"
+            )
+
+    def _on_invalidation(self, payload: Optional[str]) -> None:
+        if payload is None:
+            # Invalidations may have been missed while disconnected
+            self._cache_generation += 1
+            self._template_cache.clear()
+            self._prompt_cache.clear()
+            return
+
+        message = json.loads(payload)
+        if message["origin"] != self._instance_id:
+            self._invalidate_prompt(message["name"])
+
     async def add_prompt(
         self,
         name: str,
@@ -538,7 +571,8 @@ class PostgresPromptsHandler(CacheablePromptHandler):
             "updated_at": result["updated_at"],
         }
 
-        # Update template cache
+        # Drop cached formatted prompts and reads of the previous version
+        self._invalidate_prompt(name)
         self._template_cache.set(
             name,
             {
@@ -548,10 +582,7 @@ class PostgresPromptsHandler(CacheablePromptHandler):
             },  # Store as dict in cache
         )
 
-        # Invalidate any cached formatted prompts
-        for key in list(self._prompt_cache._cache.keys()):
-            if key.startswith(f"{name}:"):
-                self._prompt_cache.invalidate(key)
+        await self._broadcast_invalidation(name)
 
     async def get_all_prompts(self) -> dict[str, Any]:
         """Retrieve all stored prompts."""
@@ -595,10 +626,8 @@ class PostgresPromptsHandler(CacheablePromptHandler):
             raise ValueError(f"Prompt template '{name}' not found")
 
         # Invalidate caches
-        self._template_cache.invalidate(name)
-        for key in list(self._prompt_cache._cache.keys()):
-            if key.startswith(f"{name}:"):
-                self._prompt_cache.invalidate(key)
+        self._invalidate_prompt(name)
+        await self._broadcast_invalidation(name)
 
     async def get_message_payload(
         self,
@@ -0,0 +1,156 @@
+import json
+import logging
+from typing import Optional
+from uuid import UUID
+
+from core.base import Handler
+
+from .base import PostgresConnectionManager
+from .collections import PostgresCollectionsHandler
+
+logger = logging.getLogger()
+
+
+class PostgresRAGCacheHandler(Handler):
+    """
+    Stores RAG responses keyed by the embedding of their query, so a question
+    close enough to one already answered is served without searching or
+    calling the LLM again.
+
+    Entries are scoped by a hash of everything else that shapes the answer
+    and record the versions of the collections they were answered from. A
+    bump to any of those versions makes the entry unreachable, and it is
+    eventually evicted like any other stale entry.
+    """
+
+    TABLE_NAME = "rag_cache"
+
+    def __init__(
+        self,
+        project_name: str,
+        connection_manager: PostgresConnectionManager,
+        dimension: int,
+    ):
+        super().__init__(project_name, connection_manager)
+        self.dimension = dimension
+
+    async def create_tables(self):
+        query = f"""
+        CREATE TABLE IF NOT EXISTS {self._get_table_name(PostgresRAGCacheHandler.TABLE_NAME)} (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            scope_key TEXT NOT NULL,
+            query TEXT NOT NULL,
+            query_embedding vector({self.dimension}) NOT NULL,
+            collection_versions JSONB NOT NULL,
+            response JSONB NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            last_used_at TIMESTAMPTZ DEFAULT NOW(),
+            expires_at TIMESTAMPTZ NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_rag_cache_scope_{self.project_name}
+        ON {self._get_table_name(PostgresRAGCacheHandler.TABLE_NAME)} (scope_key);
+        CREATE INDEX IF NOT EXISTS idx_rag_cache_last_used_{self.project_name}
+        ON {self._get_table_name(PostgresRAGCacheHandler.TABLE_NAME)} (last_used_at);
+        """
+        await self.connection_manager.execute_query(query)
+
+    async def get_response(
+        self,
+        scope_key: str,
+        collection_ids: list[UUID],
+        query_embedding: list[float],
+        similarity_threshold: float,
+    ) -> tuple[Optional[dict], str]:
+        """
+        Find the closest cached response within `similarity_threshold`.
+
+        Returns the response, if any, together with the current versions of
+        `collection_ids`. A response computed after this lookup should be
+        stored against those versions, so that changes made while it was
+        generated invalidate it.
+        """
+        table_name = self._get_table_name(PostgresRAGCacheHandler.TABLE_NAME)
+        query = f"""
+        WITH versions AS (
+            SELECT COALESCE(
+                jsonb_object_agg(collection_id::text, version), '{{}}'::jsonb
+            ) AS versions
+            FROM {self._get_table_name(PostgresCollectionsHandler.VERSIONS_TABLE_NAME)}
+            WHERE collection_id = ANY($2::uuid[])
+        ), hit AS (
+            SELECT cache.id
+            FROM {table_name} cache, versions
+            WHERE cache.scope_key = $1
+                AND cache.collection_versions = versions.versions
+                AND cache.expires_at > NOW()
+                AND cache.query_embedding <=> $3::vector({self.dimension}) <= $4
+            ORDER BY cache.query_embedding <=> $3::vector({self.dimension})
+            LIMIT 1
+        ), touched AS (
+            UPDATE {table_name} cache
+            SET last_used_at = NOW()
+            FROM hit
+            WHERE cache.id = hit.id
+            RETURNING cache.response
+        )
+        SELECT versions.versions, (SELECT response FROM touched) AS response
+        FROM versions
+        """
+        result = await self.connection_manager.fetchrow_query(
+            query,
+            [
+                scope_key,
+                collection_ids,
+                str(query_embedding),
+                1 - similarity_threshold,
+            ],
+        )
+        response = (
+            json.loads(result["response"]) if result["response"] else None
+        )
+        return response, result["versions"]
+
+    async def set_response(
+        self,
+        scope_key: str,
+        collection_versions: str,
+        query: str,
+        query_embedding: list[float],
+        response: dict,
+        ttl_seconds: float,
+    ) -> None:
+        query_sql = f"""
+        INSERT INTO {self._get_table_name(PostgresRAGCacheHandler.TABLE_NAME)}
+        (scope_key, collection_versions, query, query_embedding, response, expires_at)
+        VALUES (
+            $1, $2::jsonb, $3, $4::vector({self.dimension}), $5,
+            NOW() + make_interval(secs => $6)
+        )
+        """
+        await self.connection_manager.execute_query(
+            query_sql,
+            [
+                scope_key,
+                collection_versions,
+                query,
+                str(query_embedding),
+                json.dumps(response, default=str),
+                float(ttl_seconds),
+            ],
+        )
+
+    async def evict(self, max_entries: int) -> None:
+        """Drop expired entries, then the least recently used beyond `max_entries`."""
+        table_name = self._get_table_name(PostgresRAGCacheHandler.TABLE_NAME)
+        query = f"""
+        WITH expired AS (
+            DELETE FROM {table_name} WHERE expires_at <= NOW()
+        )
+        DELETE FROM {table_name}
+        WHERE id IN (
+            SELECT id FROM {table_name}
+            ORDER BY last_used_at DESC
+            OFFSET $1
+        )
+        """
+        await self.connection_manager.execute_query(query, [max_entries])
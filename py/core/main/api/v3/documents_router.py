@@ -1,13 +1,15 @@
+import asyncio
 import base64
 import json
 import logging
 import mimetypes
+import os
 import textwrap
 from io import BytesIO
 from typing import Any, Optional
 from uuid import UUID
 
-from fastapi import Body, Depends, File, Form, Path, Query, UploadFile
+from fastapi import Body, Depends, File, Form, Header, Path, Query, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import Json
 
@@ -27,12 +29,14 @@ from core.base.abstractions import KGCreationSettings, KGRunType
 from core.base.api.models import (
     GenericBooleanResponse,
     WrappedBooleanResponse,
+    WrappedBulkIngestionResponse,
     WrappedChunksResponse,
     WrappedCollectionsResponse,
     WrappedDocumentResponse,
     WrappedDocumentsResponse,
     WrappedEntitiesResponse,
     WrappedGenericMessageResponse,
+    WrappedIngestionJobResponse,
     WrappedIngestionResponse,
     WrappedRelationshipsResponse,
 )
@@ -43,6 +47,16 @@ from .base_router import BaseRouterV3
 
 logger = logging.getLogger()
 MAX_CHUNKS_PER_REQUEST = 1024 * 100
+MAX_FILES_PER_BULK_REQUEST = 1_000
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file, measured on its spooled copy if unknown."""
+    if file.size is not None:
+        return file.size
+    size = file.file.seek(0, os.SEEK_END)
+    file.file.seek(0)
+    return size
 
 
 def merge_search_settings(
@@ -73,6 +87,43 @@ def merge_ingestion_config(
     return IngestionConfig(**base_dict)
 
 
+def parse_range_header(
+    range_header: Optional[str], file_size: int
+) -> Optional[tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into an inclusive (start, end) pair.
+
+    Returns None when the header is absent or not a single byte range, in
+    which case the whole file should be served.
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes=") :].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    start_str, end_str = (part.strip() for part in spec.split("-", 1))
+    try:
+        if not start_str:
+            # Suffix range, e.g. `bytes=-500` for the last 500 bytes
+            suffix_length = int(end_str)
+            if suffix_length <= 0:
+                raise ValueError
+            start, end = max(file_size - suffix_length, 0), file_size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else file_size - 1
+    except ValueError:
+        return None
+
+    if start >= file_size or end < start:
+        raise R2RException(
+            status_code=416,
+            message=f"Requested range not satisfiable for a file of {file_size} bytes.",
+        )
+    return start, min(end, file_size - 1)
+
+
 class DocumentsRouter(BaseRouterV3):
     def __init__(
         self,
@@ -546,6 +597,351 @@ class DocumentsRouter(BaseRouterV3):
                     "task_id": None,
                 }
 
+        @self.router.post(
+            "/documents/bulk",
+            dependencies=[Depends(self.rate_limit_dependency)],
+            status_code=202,
+            summary="Create many documents at once",
+            openapi_extra={
+                "x-codeSamples": [
+                    {
+                        "lang": "Python",
+                        "source": textwrap.dedent(
+                            """
+                            from r2r import R2RClient
+
+                            client = R2RClient("http://localhost:7272")
+                            # when using auth, do client.login(...)
+
+                            response = client.documents.create_bulk(
+                                file_paths=["pg_essay_1.html", "pg_essay_2.html"],
+                                metadatas=[{"batch": 1}, {"batch": 1}],
+                            )
+                            job = client.documents.bulk_status(response["results"]["job_id"])
+                            """
+                        ),
+                    },
+                    {
+                        "lang": "cURL",
+                        "source": textwrap.dedent(
+                            """
+                            curl -X POST "https://api.example.com/v3/documents/bulk" \\
+                            -H "Content-Type: multipart/form-data" \\
+                            -H "Authorization: Bearer YOUR_API_KEY" \\
+                            -F "files=@pg_essay_1.html;type=text/html" \\
+                            -F "files=@pg_essay_2.html;type=text/html" \\
+                            -F 'manifest=[{"raw_text": "Some text", "metadata": {"title": "note"}}]'
+                            """
+                        ),
+                    },
+                ]
+            },
+        )
+        @self.base_endpoint
+        async def create_documents_bulk(
+            files: Optional[list[UploadFile]] = File(
+                None,
+                description="The files to ingest.",
+            ),
+            manifest: Optional[Json[list[dict]]] = Form(
+                None,
+                description="Text documents to ingest, each as an object with `raw_text` and optional `id` and `metadata`.",
+            ),
+            ids: Optional[Json[list[UUID]]] = Form(
+                None,
+                description="Document IDs for the uploaded files, in the same order. If not provided, IDs are generated.",
+            ),
+            metadatas: Optional[Json[list[dict]]] = Form(
+                None,
+                description="Metadata for the uploaded files, in the same order.",
+            ),
+            collection_ids: Optional[Json[list[UUID]]] = Form(
+                None,
+                description="Collection IDs to associate with every document. If none are provided, the documents will be assigned to the user's default collection.",
+            ),
+            ingestion_mode: IngestionMode = Form(
+                default=IngestionMode.custom,
+                description="The ingestion mode applied to every document, see `POST /documents`.",
+            ),
+            ingestion_config: Optional[Json[IngestionConfig]] = Form(
+                None,
+                description="An optional dictionary to override the default chunking configuration for every document.",
+            ),
+            auth_user=Depends(self.providers.auth.auth_wrapper()),
+        ) -> WrappedBulkIngestionResponse:
+            """
+            Creates many documents in one request from uploaded files and/or a manifest of raw texts.
+
+            All document records are registered in a single statement and the files are then ingested
+            in the background with bounded concurrency. Files that cannot be accepted (for example an
+            unsupported type or an ID that already exists) are listed under `rejected` while the rest
+            of the batch proceeds.
+
+            The returned `job_id` can be polled with `GET /documents/bulk/{job_id}` to follow the
+            progress of each file.
+            """
+            files = files or []
+            manifest = manifest or []
+            if not files and not manifest:
+                raise R2RException(
+                    status_code=422,
+                    message="Either `files` or a `manifest` must be provided.",
+                )
+            if len(files) + len(manifest) > MAX_FILES_PER_BULK_REQUEST:
+                raise R2RException(
+                    status_code=413,
+                    message=f"Maximum of {MAX_FILES_PER_BULK_REQUEST} documents per bulk request.",
+                )
+            if ids and len(ids) != len(files):
+                raise R2RException(
+                    status_code=422,
+                    message="Number of ids does not match number of files.",
+                )
+            if metadatas and len(metadatas) != len(files):
+                raise R2RException(
+                    status_code=422,
+                    message="Number of metadatas does not match number of files.",
+                )
+
+            if not auth_user.is_superuser:
+                user_document_count = (
+                    await self.services.management.documents_overview(
+                        user_ids=[auth_user.id],
+                        offset=0,
+                        limit=1,
+                    )
+                )["total_entries"]
+                user_max_documents = (
+                    await self.services.management.get_user_max_documents(
+                        auth_user.id
+                    )
+                )
+                if (
+                    user_document_count + len(files) + len(manifest)
+                    > user_max_documents
+                ):
+                    raise R2RException(
+                        status_code=403,
+                        message=f"This request would exceed the maximum number of documents allowed ({user_max_documents}).",
+                    )
+
+            effective_ingestion_config = self._prepare_ingestion_config(
+                ingestion_mode=ingestion_mode,
+                ingestion_config=ingestion_config,
+            )
+
+            # Uploads are already spooled to disk past a small size, so each
+            # one is handed to the files handler as a stream rather than read
+            # into memory
+            entries = []
+            for i, file in enumerate(files):
+                entries.append(
+                    {
+                        "file_data": {
+                            "filename": file.filename,
+                            "content_type": file.content_type,
+                        },
+                        "document_id": (
+                            ids[i]
+                            if ids
+                            else generate_document_id(
+                                file.filename, auth_user.id
+                            )
+                        ),
+                        "metadata": metadatas[i] if metadatas else {},
+                        "size_in_bytes": await asyncio.to_thread(
+                            _upload_size, file
+                        ),
+                        "file": file.file,
+                    }
+                )
+            for item in manifest:
+                raw_text = item.get("raw_text")
+                if not raw_text:
+                    raise R2RException(
+                        status_code=422,
+                        message="Every manifest entry must provide `raw_text`.",
+                    )
+                content = raw_text.encode("utf-8")
+                entries.append(
+                    {
+                        "file_data": {
+                            "filename": "N/A",
+                            "content_type": "text/plain",
+                        },
+                        "document_id": (
+                            UUID(str(item["id"]))
+                            if item.get("id")
+                            else generate_document_id(raw_text, auth_user.id)
+                        ),
+                        "metadata": item.get("metadata") or {},
+                        "size_in_bytes": len(content),
+                        "file": BytesIO(content),
+                    }
+                )
+
+            ingress_result = (
+                await self.services.ingestion.ingest_files_bulk_ingress(
+                    files=entries, user=auth_user
+                )
+            )
+            document_infos = ingress_result["infos"]
+            rejected = ingress_result["rejected"]
+            if not document_infos:
+                return {  # type: ignore
+                    "message": "No documents were accepted for ingestion.",
+                    "job_id": None,
+                    "document_ids": [],
+                    "rejected": rejected,
+                }
+
+            entries_by_id = {entry["document_id"]: entry for entry in entries}
+            store_semaphore = asyncio.Semaphore(
+                self.providers.orchestration.config.ingestion_concurrency_limit
+            )
+
+            async def store_entry_file(document_id: UUID) -> None:
+                entry = entries_by_id[document_id]
+                async with store_semaphore:
+                    await self.providers.database.files_handler.store_file(
+                        document_id,
+                        entry["file_data"]["filename"],
+                        entry.pop("file"),
+                        entry["file_data"]["content_type"],
+                    )
+
+            await asyncio.gather(
+                *(
+                    store_entry_file(document_info.id)
+                    for document_info in document_infos
+                )
+            )
+
+            document_ids = [
+                document_info.id for document_info in document_infos
+            ]
+            job_id = await self.services.ingestion.create_ingestion_job(
+                owner_id=auth_user.id, document_ids=document_ids
+            )
+            serialized_collection_ids = (
+                [str(cid) for cid in collection_ids]
+                if collection_ids
+                else None
+            )
+
+            orchestration_config = self.providers.orchestration.config
+            if orchestration_config.provider == "simple":
+                bulk_input = {
+                    "user": auth_user.model_dump_json(),
+                    "document_infos": [
+                        document_info.model_dump(mode="json")
+                        for document_info in document_infos
+                    ],
+                    "collection_ids": serialized_collection_ids,
+                    "ingestion_config": effective_ingestion_config.model_dump(
+                        mode="json"
+                    ),
+                }
+                if orchestration_config.queue_workflows:
+                    await self.providers.orchestration.run_workflow(
+                        "ingest-files-bulk",
+                        {"request": bulk_input},
+                        options={},
+                    )
+                else:
+                    # The simple orchestrator runs inline, so detach the batch
+                    # from the request and let the job handle report progress.
+                    self.providers.orchestration.run_workflow_detached(  # type: ignore
+                        "ingest-files-bulk", {"request": bulk_input}
+                    )
+            else:
+                for document_info in document_infos:
+                    entry = entries_by_id[document_info.id]
+                    await self.providers.orchestration.run_workflow(
+                        "ingest-files",
+                        {
+                            "request": {
+                                "file_data": entry["file_data"],
+                                "document_id": str(document_info.id),
+                                "collection_ids": serialized_collection_ids,
+                                "metadata": entry["metadata"],
+                                "ingestion_config": effective_ingestion_config.model_dump(
+                                    mode="json"
+                                ),
+                                "user": auth_user.model_dump_json(),
+                                "size_in_bytes": entry["size_in_bytes"],
+                                "registered": True,
+                            }
+                        },
+                        options={
+                            "additional_metadata": {
+                                "document_id": str(document_info.id),
+                                "job_id": str(job_id),
+                            }
+                        },
+                    )
+
+            return {  # type: ignore
+                "message": "Bulk ingestion task queued successfully.",
+                "job_id": job_id,
+                "document_ids": document_ids,
+                "rejected": rejected,
+            }
+
+        @self.router.get(
+            "/documents/bulk/{job_id}",
+            dependencies=[Depends(self.rate_limit_dependency)],
+            summary="Get bulk ingestion progress",
+            openapi_extra={
+                "x-codeSamples": [
+                    {
+                        "lang": "Python",
+                        "source": textwrap.dedent(
+                            """
+                            from r2r import R2RClient
+
+                            client = R2RClient("http://localhost:7272")
+                            # when using auth, do client.login(...)
+
+                            response = client.documents.bulk_status(
+                                job_id="c68dc72e-fc23-5452-8f49-d7bd46088a96"
+                            )
+                            """
+                        ),
+                    },
+                    {
+                        "lang": "cURL",
+                        "source": textwrap.dedent(
+                            """
+                            curl -X GET "https://api.example.com/v3/documents/bulk/c68dc72e-fc23-5452-8f49-d7bd46088a96" \\
+                            -H "Authorization: Bearer YOUR_API_KEY"
+                            """
+                        ),
+                    },
+                ]
+            },
+        )
+        @self.base_endpoint
+        async def get_bulk_ingestion_job(
+            job_id: UUID = Path(
+                ...,
+                description="The job ID returned by `POST /documents/bulk`.",
+            ),
+            auth_user=Depends(self.providers.auth.auth_wrapper()),
+        ) -> WrappedIngestionJobResponse:
+            """
+            Returns the ingestion status of every file in a bulk ingestion job, along with a count of
+            files per status. Only the user that submitted the job or a superuser may view it.
+            """
+            job = await self.services.ingestion.get_ingestion_job(job_id)
+            if job is None or (
+                not auth_user.is_superuser and job["owner_id"] != auth_user.id
+            ):
+                raise R2RException(
+                    status_code=404, message="Ingestion job not found."
+                )
+            return job  # type: ignore
+
         @self.router.get(
             "/documents",
             dependencies=[Depends(self.rate_limit_dependency)],
@@ -952,6 +1348,11 @@ class DocumentsRouter(BaseRouterV3):
         @self.base_endpoint
         async def get_document_file(
             id: str = Path(..., description="Document ID"),
+            range_header: Optional[str] = Header(
+                None,
+                alias="Range",
+                description="Optional byte range, e.g. `bytes=0-1023`, for partial or resumed downloads.",
+            ),
             auth_user=Depends(self.providers.auth.auth_wrapper()),
         ) -> StreamingResponse:
             """
@@ -960,6 +1361,12 @@ class DocumentsRouter(BaseRouterV3):
             For uploaded files, returns the original file with its proper MIME type.
             For text-only documents, returns the content as plain text.
 
+            A single byte range may be requested through the `Range` header,
+            in which case only that part of the file is returned with a 206
+            status code. The file is streamed in chunks as it is read. If
+            reading fails part way through, the connection is aborted so a
+            short body is never mistaken for a complete one.
+
             Users can only download documents they own or have access to through collections.
             """
             try:
@@ -1013,33 +1420,50 @@ class DocumentsRouter(BaseRouterV3):
                         "Not authorized to access this document.", 403
                     )
 
-            file_tuple = await self.services.management.download_file(
-                document_uuid
+            file_name, file_size = (
+                await self.services.management.download_file_info(
+                    document_uuid
+                )
             )
-            if not file_tuple:
-                raise R2RException(status_code=404, message="File not found.")
-
-            file_name, file_content, file_size = file_tuple
 
             mime_type, _ = mimetypes.guess_type(file_name)
             if not mime_type:
                 mime_type = "application/octet-stream"
 
-            async def file_stream():
-                chunk_size = 1024 * 1024  # 1MB
-                while True:
-                    data = file_content.read(chunk_size)
-                    if not data:
-                        break
-                    yield data
+            headers = {
+                "Content-Disposition": f'inline; filename="{file_name}"',
+                "Accept-Ranges": "bytes",
+            }
+            status_code = 200
+            start, end = 0, file_size - 1
+            if byte_range := parse_range_header(range_header, file_size):
+                start, end = byte_range
+                status_code = 206
+                headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+            headers["Content-Length"] = str(max(end - start + 1, 0))
+
+            async def stream_file():
+                try:
+                    async for (
+                        chunk
+                    ) in self.services.management.download_file_stream(
+                        document_uuid, start, end + 1
+                    ):
+                        yield chunk
+                except Exception as e:
+                    # Headers are already sent, so re-raising is what makes
+                    # the server abort the connection instead of ending a
+                    # truncated body cleanly
+                    logger.error(
+                        f"Download of document {document_uuid} failed after the response started: {e}"
+                    )
+                    raise
 
             return StreamingResponse(
-                file_stream(),
+                stream_file(),
+                status_code=status_code,
                 media_type=mime_type,
-                headers={
-                    "Content-Disposition": f'inline; filename="{file_name}"',
-                    "Content-Length": str(file_size),
-                },
+                headers=headers,
             )
 
         @self.router.delete(
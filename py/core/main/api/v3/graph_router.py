@@ -4,6 +4,7 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import Body, Depends, Path, Query
+from fastapi.responses import StreamingResponse
 
 from core.base import KGEnrichmentStatus, R2RException, Workflow
 from core.base.abstractions import KGRunType
@@ -961,6 +962,99 @@ class GraphRouter(BaseRouterV3):
 
             return GenericBooleanResponse(success=True)  # type: ignore
 
+        @self.router.get(
+            "/graphs/{collection_id}/export",
+            dependencies=[Depends(self.rate_limit_dependency)],
+            response_class=StreamingResponse,
+            summary="Export a graph",
+            openapi_extra={
+                "x-codeSamples": [
+                    {
+                        "lang": "Python",
+                        "source": textwrap.dedent(
+                            """
+                            from r2r import R2RClient
+
+                            client = R2RClient("http://localhost:7272")
+                            # when using auth, do client.login(...)
+
+                            client.graphs.export(
+                                collection_id="d09dedb1-b2ab-48a5-b950-6e1f464d83e7",
+                                output_path="relationships.ndjson",
+                                export_type="relationships",
+                            )
+                            """
+                        ),
+                    },
+                    {
+                        "lang": "cURL",
+                        "source": textwrap.dedent(
+                            """
+                            curl -X GET "https://api.example.com/v3/graphs/d09dedb1-b2ab-48a5-b950-6e1f464d83e7/export?export_type=relationships&format=ndjson" \\
+                            -H "Authorization: Bearer YOUR_API_KEY" \\
+                            -o relationships.ndjson
+                            """
+                        ),
+                    },
+                ]
+            },
+        )
+        @self.base_endpoint
+        async def export_graph(
+            collection_id: UUID = Path(
+                ...,
+                description="The collection ID corresponding to the graph to export.",
+            ),
+            export_type: str = Query(
+                "relationships",
+                description="What to export: `entities`, `relationships` or `communities`.",
+            ),
+            format: str = Query(
+                "ndjson",
+                description="The output format: `ndjson` for newline-delimited JSON or `arrow` for an Arrow IPC stream.",
+            ),
+            include_embeddings: bool = Query(
+                False,
+                description="Whether to include description embeddings, as little-endian float32 bytes (base64 encoded in NDJSON).",
+            ),
+            auth_user=Depends(self.providers.auth.auth_wrapper()),
+        ) -> StreamingResponse:
+            """
+            Streams the entities, relationships or communities of a graph.
+
+            Rows are read through a server-side cursor and written out in
+            batches as they are read, so exports of any size run in constant
+            memory on both ends. Use this instead of paging through the list
+            endpoints when the whole graph is needed.
+            """
+            if (
+                # not auth_user.is_superuser
+                collection_id
+                not in auth_user.collection_ids
+            ):
+                raise R2RException(
+                    "The currently authenticated user does not have access to the collection associated with the given graph.",
+                    403,
+                )
+
+            stream = await self.services.graph.export_graph(
+                collection_id=collection_id,
+                export_type=export_type,
+                format=format,
+                include_embeddings=include_embeddings,
+            )
+            media_type, extension = {
+                "ndjson": ("application/x-ndjson", "ndjson"),
+                "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+            }[format]
+            return StreamingResponse(
+                stream,
+                media_type=media_type,
+                headers={
+                    "Content-Disposition": f'attachment; filename="{collection_id}_{export_type}.{extension}"'
+                },
+            )
+
         @self.router.get(
             "/graphs/{collection_id}/relationships",
             dependencies=[Depends(self.rate_limit_dependency)],
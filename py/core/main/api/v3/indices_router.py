@@ -175,8 +175,8 @@ class IndicesRouter(BaseRouterV3):
             auth_user=Depends(self.providers.auth.auth_wrapper()),
         ) -> WrappedGenericMessageResponse:
             """
-            Create a new vector similarity search index in over the target table. Allowed tables include 'vectors', 'entity', 'document_collections'.
-            Vectors correspond to the chunks of text that are indexed for similarity search, whereas entity and document_collections are created during knowledge graph construction.
+            Create a new vector similarity search index in over the target table. Allowed tables include 'chunks', 'documents_entities', 'graphs_entities', 'graphs_relationships' and 'graphs_communities'.
+            Chunks correspond to the text that is indexed for similarity search, whereas the entity, relationship and community tables are created during knowledge graph construction and back graph search.
 
             This endpoint creates a database index optimized for efficient similarity search over vector embeddings.
             It supports two main indexing methods:
@@ -432,6 +432,11 @@ class RetrievalRouterV3(BaseRouterV3):
                 query=query,
                 search_settings=effective_settings,
                 rag_generation_config=rag_generation_config,
+                collection_ids=(
+                    None
+                    if auth_user.is_superuser
+                    else auth_user.collection_ids
+                ),
                 task_prompt_override=task_prompt_override,
                 include_title_if_available=include_title_if_available,
             )
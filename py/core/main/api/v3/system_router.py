@@ -224,4 +224,5 @@ class SystemRouter(BaseRouterV3):
                 ).total_seconds(),
                 "cpu_usage": psutil.cpu_percent(),
                 "memory_usage": psutil.virtual_memory().percent,
+                "streaming_rag_latency": self.services.retrieval.streaming_rag_latency.summary(),
             }
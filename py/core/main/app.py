@@ -117,4 +117,7 @@ class R2RApp:
             log_config=None,
         )
         server = uvicorn.Server(config)
-        await server.serve()
+        try:
+            await server.serve()
+        finally:
+            await self.orchestration_provider.stop_worker()
@@ -43,6 +43,7 @@ async def lifespan(app: FastAPI):
     yield
 
     # # Shutdown
+    await r2r_app.orchestration_provider.stop_worker()
     scheduler.shutdown()
 
 
@@ -179,6 +179,7 @@ class R2RProviderFactory:
                 dimension,
                 crypto_provider=crypto_provider,
                 quantization_type=quantization_type,
+                file_config=self.config.file,
             )
             await database_provider.initialize()
             return database_provider
@@ -315,6 +316,8 @@ class R2RProviderFactory:
             )
         )
 
+        llm_provider.cache = database_provider.completion_cache_handler
+
         ingestion_provider = (
             ingestion_provider_override
             or self.create_ingestion_provider(
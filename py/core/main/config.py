@@ -11,7 +11,7 @@ from ..base.agent.agent import AgentConfig
 from ..base.providers import AppConfig
 from ..base.providers.auth import AuthConfig
 from ..base.providers.crypto import CryptoConfig
-from ..base.providers.database import DatabaseConfig
+from ..base.providers.database import DatabaseConfig, FileConfig
 from ..base.providers.email import EmailConfig
 from ..base.providers.embedding import EmbeddingConfig
 from ..base.providers.ingestion import IngestionConfig
@@ -54,6 +54,7 @@ class R2RConfig:
         "ingestion": ["provider"],
         "logging": ["provider", "log_table"],
         "database": ["provider"],
+        "file": ["provider"],
         "agent": ["generation_config"],
         "orchestration": ["provider"],
     }
@@ -65,6 +66,7 @@ class R2RConfig:
     database: DatabaseConfig
     embedding: EmbeddingConfig
     email: EmailConfig
+    file: FileConfig
     ingestion: IngestionConfig
     agent: AgentConfig
     orchestration: OrchestrationConfig
@@ -111,6 +113,7 @@ class R2RConfig:
         self.email = EmailConfig.create(**self.email, app=self.app)  # type: ignore
         self.database = DatabaseConfig.create(**self.database, app=self.app)  # type: ignore
         self.embedding = EmbeddingConfig.create(**self.embedding, app=self.app)  # type: ignore
+        self.file = FileConfig.create(**self.file, app=self.app)  # type: ignore
         self.ingestion = IngestionConfig.create(**self.ingestion, app=self.app)  # type: ignore
         self.agent = AgentConfig.create(**self.agent, app=self.app)  # type: ignore
         self.orchestration = OrchestrationConfig.create(**self.orchestration, app=self.app)  # type: ignore
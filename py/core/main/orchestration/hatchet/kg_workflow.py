@@ -504,13 +504,20 @@ def hatchet_kg_factory(
             collection_id = input_data.get("collection_id", None)
             graph_id = input_data.get("graph_id", None)
 
+            incremental = input_data["graph_enrichment_settings"].get(
+                "incremental_clustering", False
+            )
+
             # Check current workflow status
             workflow_status = await self.kg_service.providers.database.documents_handler.get_workflow_status(
                 id=collection_id,
                 status_type="graph_cluster_status",
             )
 
-            if workflow_status == KGEnrichmentStatus.SUCCESS:
+            if (
+                workflow_status == KGEnrichmentStatus.SUCCESS
+                and not incremental
+            ):
                 raise R2RException(
                     "Communities have already been built for this collection. To build communities again, first reset the graph.",
                     400,
@@ -526,7 +533,7 @@ def hatchet_kg_factory(
 
                 num_communities = kg_clustering_results[0]["num_communities"]
 
-                if num_communities == 0:
+                if num_communities[0] == 0 and not incremental:
                     raise R2RException("No communities found", 400)
 
                 logger.info(
@@ -558,8 +565,8 @@ def hatchet_kg_factory(
                 "kg_clustering"
             ][0]["num_communities"]
 
-            # Calculate batching
-            parallel_communities = min(100, num_communities[0])
+            # Calculate batching; an incremental run may have nothing to summarize
+            parallel_communities = max(1, min(100, num_communities[0]))
             total_workflows = math.ceil(
                 num_communities[0] / parallel_communities
             )
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -19,9 +20,72 @@ from core.utils import (
 from ...services import IngestionService
 
 logger = logging.getLogger()
+BULK_INGESTION_WINDOW_SIZE = 64
 
 
 def simple_ingestion_factory(service: IngestionService):
+    async def assign_documents_to_collections(
+        owner_id: UUID,
+        document_ids: list[UUID],
+        collection_ids: Optional[list[UUID]],
+        description: str,
+    ) -> None:
+        """
+        Assign ingested documents to the requested collections, creating
+        them if needed, or to the owner's default collection, and mark the
+        collections' graphs as outdated.
+        """
+        create_collections = bool(collection_ids)
+        if not collection_ids:
+            # TODO: Move logic onto the `management service`
+            collection_ids = [generate_default_user_collection_id(owner_id)]
+
+        for collection_id in collection_ids:
+            try:
+                if create_collections:
+                    try:
+                        # FIXME: Right now we just throw a warning if the collection already exists, but we should probably handle this more gracefully
+                        name = "My Collection"
+                        await service.providers.database.collections_handler.create_collection(
+                            owner_id=owner_id,
+                            name=name,
+                            description=description,
+                            collection_id=collection_id,
+                        )
+                        await service.providers.database.graphs_handler.create(
+                            collection_id=collection_id,
+                            name=name,
+                            description=description,
+                            graph_id=collection_id,
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Warning, could not create collection with error: {str(e)}"
+                        )
+
+                await service.providers.database.collections_handler.assign_documents_to_collection_relational(
+                    document_ids=document_ids,
+                    collection_id=collection_id,
+                )
+                await service.providers.database.chunks_handler.assign_documents_chunks_to_collection(
+                    document_ids=document_ids,
+                    collection_id=collection_id,
+                )
+                await service.providers.database.documents_handler.set_workflow_status(
+                    id=collection_id,
+                    status_type="graph_sync_status",
+                    status=KGEnrichmentStatus.OUTDATED,
+                )
+                await service.providers.database.documents_handler.set_workflow_status(
+                    id=collection_id,
+                    status_type="graph_cluster_status",
+                    status=KGEnrichmentStatus.OUTDATED,  # NOTE - we should actually check that cluster has been made first, if not it should be PENDING still
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error during assigning documents to collection: {str(e)}"
+                )
+
     async def ingest_files(input_data):
         document_info = None
         try:
@@ -74,81 +138,12 @@ def simple_ingestion_factory(service: IngestionService):
                 document_info, status=IngestionStatus.SUCCESS
             )
 
-            collection_ids = parsed_data.get("collection_ids")
-
-            try:
-                if not collection_ids:
-                    # TODO: Move logic onto the `management service`
-                    collection_id = generate_default_user_collection_id(
-                        document_info.owner_id
-                    )
-                    await service.providers.database.collections_handler.assign_document_to_collection_relational(
-                        document_id=document_info.id,
-                        collection_id=collection_id,
-                    )
-                    await service.providers.database.chunks_handler.assign_document_chunks_to_collection(
-                        document_id=document_info.id,
-                        collection_id=collection_id,
-                    )
-                    await service.providers.database.documents_handler.set_workflow_status(
-                        id=collection_id,
-                        status_type="graph_sync_status",
-                        status=KGEnrichmentStatus.OUTDATED,
-                    )
-                    await service.providers.database.documents_handler.set_workflow_status(
-                        id=collection_id,
-                        status_type="graph_cluster_status",
-                        status=KGEnrichmentStatus.OUTDATED,  # NOTE - we should actually check that cluster has been made first, if not it should be PENDING still
-                    )
-                else:
-
-                    for collection_id in collection_ids:
-                        try:
-                            # FIXME: Right now we just throw a warning if the collection already exists, but we should probably handle this more gracefully
-                            name = "My Collection"
-                            description = f"A collection started during {document_info.title} ingestion"
-
-                            await service.providers.database.collections_handler.create_collection(
-                                owner_id=document_info.owner_id,
-                                name=name,
-                                description=description,
-                                collection_id=collection_id,
-                            )
-                            await service.providers.database.graphs_handler.create(
-                                collection_id=collection_id,
-                                name=name,
-                                description=description,
-                                graph_id=collection_id,
-                            )
-                        except Exception as e:
-                            logger.warning(
-                                f"Warning, could not create collection with error: {str(e)}"
-                            )
-
-                        await service.providers.database.collections_handler.assign_document_to_collection_relational(
-                            document_id=document_info.id,
-                            collection_id=collection_id,
-                        )
-
-                        await service.providers.database.chunks_handler.assign_document_chunks_to_collection(
-                            document_id=document_info.id,
-                            collection_id=collection_id,
-                        )
-                        await service.providers.database.documents_handler.set_workflow_status(
-                            id=collection_id,
-                            status_type="graph_sync_status",
-                            status=KGEnrichmentStatus.OUTDATED,
-                        )
-                        await service.providers.database.documents_handler.set_workflow_status(
-                            id=collection_id,
-                            status_type="graph_cluster_status",
-                            status=KGEnrichmentStatus.OUTDATED,  # NOTE - we should actually check that cluster has been made first, if not it should be PENDING still
-                        )
-
-            except Exception as e:
-                logger.error(
-                    f"Error during assigning document to collection: {str(e)}"
-                )
+            await assign_documents_to_collections(
+                owner_id=document_info.owner_id,
+                document_ids=[document_info.id],
+                collection_ids=parsed_data.get("collection_ids"),
+                description=f"A collection started during {document_info.title} ingestion",
+            )
 
         except AuthenticationError as e:
             if document_info is not None:
@@ -168,6 +163,134 @@ def simple_ingestion_factory(service: IngestionService):
                 status_code=500, detail=f"Error during ingestion: {str(e)}"
             )
 
+    async def ingest_files_bulk(input_data):
+        from core.base import IngestionStatus
+        from core.main import IngestionServiceAdapter
+
+        parsed_data = IngestionServiceAdapter.parse_ingest_files_bulk_input(
+            input_data
+        )
+        document_infos = parsed_data["document_infos"]
+        ingestion_config = parsed_data["ingestion_config"]
+        semaphore = asyncio.Semaphore(
+            service.providers.orchestration.config.ingestion_concurrency_limit
+        )
+
+        async def run_stage(stage_documents, status, step):
+            # One status write per stage, then a bounded fan-out over the files
+            await service.update_documents_status_bulk(stage_documents, status)
+
+            async def run_step(document_info):
+                async with semaphore:
+                    try:
+                        await step(document_info)
+                        return True
+                    except Exception as e:
+                        logger.error(
+                            f"Error during bulk ingestion of document {document_info.id}: {str(e)}"
+                        )
+                        return False
+
+            outcomes = await asyncio.gather(
+                *(run_step(document_info) for document_info in stage_documents)
+            )
+            failed = [
+                document_info
+                for document_info, ok in zip(stage_documents, outcomes)
+                if not ok
+            ]
+            await service.update_documents_status_bulk(
+                failed, IngestionStatus.FAILED
+            )
+            return [
+                document_info
+                for document_info, ok in zip(stage_documents, outcomes)
+                if ok
+            ]
+
+        succeeded_ids: list[UUID] = []
+        try:
+            for i in range(0, len(document_infos), BULK_INGESTION_WINDOW_SIZE):
+                window = document_infos[i : i + BULK_INGESTION_WINDOW_SIZE]
+                extractions: dict[UUID, list[dict]] = {}
+                embeddings: dict[UUID, list[dict]] = {}
+
+                async def parse(document_info):
+                    extractions_generator = await service.parse_file(
+                        document_info, ingestion_config
+                    )
+                    extractions[document_info.id] = [
+                        extraction.model_dump()
+                        async for extraction in extractions_generator
+                    ]
+
+                async def augment(document_info):
+                    await service.augment_document_info(
+                        document_info, extractions[document_info.id]
+                    )
+
+                async def embed(document_info):
+                    embedding_generator = await service.embed_document(
+                        extractions.pop(document_info.id)
+                    )
+                    embeddings[document_info.id] = [
+                        embedding.model_dump()
+                        async for embedding in embedding_generator
+                    ]
+
+                async def store(document_info):
+                    storage_generator = await service.store_embeddings(
+                        embeddings.pop(document_info.id)
+                    )
+                    async for _ in storage_generator:
+                        pass
+                    await service.finalize_ingestion(document_info)
+
+                window = await run_stage(
+                    window, IngestionStatus.PARSING, parse
+                )
+                window = await run_stage(
+                    window, IngestionStatus.AUGMENTING, augment
+                )
+                await service.providers.database.documents_handler.update_documents_summary_bulk(
+                    window
+                )
+                window = await run_stage(
+                    window, IngestionStatus.EMBEDDING, embed
+                )
+                window = await run_stage(
+                    window, IngestionStatus.STORING, store
+                )
+
+                await service.update_documents_status_bulk(
+                    window, IngestionStatus.SUCCESS
+                )
+                succeeded_ids.extend(
+                    document_info.id for document_info in window
+                )
+        except asyncio.CancelledError:
+            # The worker is stopping; don't leave documents mid-ingestion
+            unfinished = [
+                document_info
+                for document_info in document_infos
+                if document_info.id not in succeeded_ids
+                and document_info.ingestion_status != IngestionStatus.FAILED
+            ]
+            await service.update_documents_status_bulk(
+                unfinished, IngestionStatus.FAILED
+            )
+            raise
+
+        if not succeeded_ids:
+            return
+
+        await assign_documents_to_collections(
+            owner_id=parsed_data["user"].id,
+            document_ids=succeeded_ids,
+            collection_ids=parsed_data["collection_ids"],
+            description="A collection started during bulk ingestion",
+        )
+
     async def update_files(input_data):
         from core.main import IngestionServiceAdapter
 
@@ -495,6 +618,7 @@ def simple_ingestion_factory(service: IngestionService):
 
     return {
         "ingest-files": ingest_files,
+        "ingest-files-bulk": ingest_files_bulk,
         "update-files": update_files,
         "ingest-chunks": ingest_chunks,
         "update-chunk": update_chunk,
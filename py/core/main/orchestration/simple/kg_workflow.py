@@ -107,11 +107,14 @@ def simple_kg_factory(service: GraphService):
     async def enrich_graph(input_data):
 
         input_data = get_input_data_dict(input_data)
+        incremental = input_data["graph_enrichment_settings"].get(
+            "incremental_clustering", False
+        )
         workflow_status = await service.providers.database.documents_handler.get_workflow_status(
             id=input_data.get("collection_id", None),
             status_type="graph_cluster_status",
         )
-        if workflow_status == KGEnrichmentStatus.SUCCESS:
+        if workflow_status == KGEnrichmentStatus.SUCCESS and not incremental:
             raise R2RException(
                 "Communities have already been built for this collection. To build communities again, first submit a POST request to `graphs/{collection_id}/reset` to erase the previously built communities.",
                 400,
@@ -127,10 +130,11 @@ def simple_kg_factory(service: GraphService):
             # TODO - Do not hardcode the number of parallel communities,
             # make it a configurable parameter at runtime & add server-side defaults
 
-            if num_communities == 0:
+            if num_communities[0] == 0 and not incremental:
                 raise R2RException("No communities found", 400)
 
-            parallel_communities = min(100, num_communities[0])
+            # An incremental run with no changed communities has nothing to summarize
+            parallel_communities = max(1, min(100, num_communities[0]))
 
             total_workflows = math.ceil(
                 num_communities[0] / parallel_communities
@@ -1,11 +1,15 @@
 import asyncio
+import base64
 import json
 import logging
 import math
 import re
 import time
+from io import BytesIO
 from typing import Any, AsyncGenerator, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
+
+import numpy as np
 
 from core.base import (
     DocumentChunk,
@@ -15,6 +19,7 @@ from core.base import (
     RunManager,
 )
 from core.base.abstractions import (
+    DEFAULT_MAX_TOKENS_PER_EXTRACTION,
     Community,
     Entity,
     GenerationConfig,
@@ -27,6 +32,7 @@ from core.base.abstractions import (
     Relationship,
 )
 from core.base.api.models import GraphResponse
+from core.base.utils import group_chunks, run_bounded, scale_group_limit
 from core.telemetry.telemetry_decorator import telemetry_event
 
 from ..abstractions import R2RAgents, R2RPipelines, R2RPipes, R2RProviders
@@ -46,6 +52,66 @@ async def _collect_results(result_gen: AsyncGenerator) -> list[dict]:
     return results
 
 
+def _embedding_bytes(embedding: Optional[list[float]]) -> Optional[bytes]:
+    """Pack an embedding as little-endian float32 bytes."""
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype="<f4").tobytes()
+
+
+async def _ndjson_export_stream(
+    batches: AsyncGenerator[list[dict], None],
+    columns: list[tuple[str, str]],
+) -> AsyncGenerator[bytes, None]:
+    json_columns = [name for name, type in columns if type == "json"]
+    async for batch in batches:
+        lines = []
+        for record in batch:
+            for name in json_columns:
+                if record[name] is not None:
+                    record[name] = json.loads(record[name])
+            if "embedding" in record:
+                embedding = _embedding_bytes(record["embedding"])
+                record["embedding"] = (
+                    base64.b64encode(embedding).decode("ascii")
+                    if embedding is not None
+                    else None
+                )
+            lines.append(json.dumps(record))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def _arrow_export_stream(
+    batches: AsyncGenerator[list[dict], None],
+    columns: list[tuple[str, str]],
+) -> AsyncGenerator[bytes, None]:
+    import pyarrow as pa
+
+    types = {
+        "text": pa.string(),
+        "json": pa.string(),
+        "text[]": pa.list_(pa.string()),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "vector": pa.binary(),
+    }
+    schema = pa.schema([(name, types[type]) for name, type in columns])
+
+    sink = BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        async for batch in batches:
+            if "embedding" in schema.names:
+                for record in batch:
+                    record["embedding"] = _embedding_bytes(record["embedding"])
+            writer.write_batch(
+                pa.RecordBatch.from_pylist(batch, schema=schema)
+            )
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
 # TODO - Fix naming convention to read `KGService` instead of `GraphService`
 # this will require a minor change in how services are registered.
 class GraphService(Service):
@@ -96,6 +162,13 @@ class GraphService(Service):
                         "document_id": document_id,
                         "generation_config": generation_config,
                         "chunk_merge_count": chunk_merge_count,
+                        "max_tokens_per_extraction": kwargs.get(
+                            "max_tokens_per_extraction",
+                            DEFAULT_MAX_TOKENS_PER_EXTRACTION,
+                        ),
+                        "max_concurrent_extractions": kwargs.get(
+                            "max_concurrent_extractions", 16
+                        ),
                         "max_knowledge_relationships": max_knowledge_relationships,
                         "entity_types": entity_types,
                         "relation_types": relation_types,
@@ -313,6 +386,45 @@ class GraphService(Service):
             entity_names=entity_names,
         )
 
+    @telemetry_event("export_graph")
+    async def export_graph(
+        self,
+        collection_id: UUID,
+        export_type: str,
+        format: str = "ndjson",
+        include_embeddings: bool = False,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Stream a graph's entities, relationships or communities as NDJSON
+        lines or as an Arrow IPC stream. Embeddings, when included, are
+        little-endian float32 bytes (base64 encoded in NDJSON).
+        """
+        columns = self.providers.database.graphs_handler.get_export_columns(
+            export_type, include_embeddings
+        )
+        if format == "ndjson":
+            serialize = _ndjson_export_stream
+        elif format == "arrow":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise R2RException(
+                    "Arrow exports require the pyarrow package to be installed on the server.",
+                    400,
+                )
+            serialize = _arrow_export_stream
+        else:
+            raise R2RException(
+                f"Invalid export format '{format}', expected 'ndjson' or 'arrow'.",
+                400,
+            )
+        batches = self.providers.database.graphs_handler.export_graph(
+            collection_id=collection_id,
+            export_type=export_type,
+            include_embeddings=include_embeddings,
+        )
+        return serialize(batches, columns)
+
     @telemetry_event("create_community")
     async def create_community(
         self,
@@ -566,6 +678,7 @@ class GraphService(Service):
         # graph_id: UUID,
         generation_config: GenerationConfig,
         leiden_params: dict,
+        incremental_clustering: bool = False,
         **kwargs,
     ):
 
@@ -579,6 +692,7 @@ class GraphService(Service):
                     "collection_id": collection_id,
                     "generation_config": generation_config,
                     "leiden_params": leiden_params,
+                    "incremental": incremental_clustering,
                     "logger": logger,
                     "clustering_mode": self.config.database.graph_creation_settings.clustering_mode,
                 }
@@ -761,6 +875,8 @@ class GraphService(Service):
         relation_types: list[str],
         chunk_merge_count: int,
         filter_out_existing_chunks: bool = True,
+        max_tokens_per_extraction: int = DEFAULT_MAX_TOKENS_PER_EXTRACTION,
+        max_concurrent_extractions: int = 16,
         total_tasks: Optional[int] = None,
         *args: Any,
         **kwargs: Any,
@@ -771,106 +887,71 @@ class GraphService(Service):
             f"GraphExtractionPipe: Processing document {document_id} for KG extraction",
         )
 
-        # Then create the extractions from the results
-        limit = 100
-        offset = 0
-        chunks = []
-        while True:
-            chunk_req = await self.providers.database.chunks_handler.list_document_chunks(  # FIXME: This was using the pagination defaults from before... We need to review if this is as intended.
-                document_id=document_id,
-                offset=offset,
-                limit=limit,
-            )
-
-            chunks.extend(
-                [
-                    DocumentChunk(
-                        id=chunk["id"],
-                        document_id=chunk["document_id"],
-                        owner_id=chunk["owner_id"],
-                        collection_ids=chunk["collection_ids"],
-                        data=chunk["text"],
-                        metadata=chunk["metadata"],
-                    )
-                    for chunk in chunk_req["results"]
-                ]
-            )
-            if len(chunk_req["results"]) < limit:
-                break
-            offset += limit
-
-        logger.info(f"Found {len(chunks)} chunks for document {document_id}")
-        if len(chunks) == 0:
-            logger.info(f"No chunks found for document {document_id}")
-            raise R2RException(
-                message="No chunks found for document",
-                status_code=404,
-            )
-
+        existing_chunk_ids: set = set()
         if filter_out_existing_chunks:
-            existing_chunk_ids = await self.providers.database.graphs_handler.get_existing_document_entity_chunk_ids(
-                document_id=document_id
-            )
-            chunks = [
-                chunk for chunk in chunks if chunk.id not in existing_chunk_ids
-            ]
-            logger.info(
-                f"Filtered out {len(existing_chunk_ids)} existing chunks, remaining {len(chunks)} chunks for document {document_id}"
+            existing_chunk_ids = set(
+                await self.providers.database.graphs_handler.get_existing_document_entity_chunk_ids(
+                    document_id=document_id
+                )
             )
 
-            if len(chunks) == 0:
-                logger.info(f"No extractions left for document {document_id}")
-                return
+        chunk_counts = {"total": 0, "remaining": 0}
 
-        logger.info(
-            f"GraphExtractionPipe: Obtained {len(chunks)} chunks to process, time from start: {time.time() - start_time:.2f} seconds",
-        )
-
-        # sort the extractions accroding to chunk_order field in metadata in ascending order
-        chunks = sorted(
-            chunks,
-            key=lambda x: x.metadata.get("chunk_order", float("inf")),
-        )
-
-        # group these extractions into groups of chunk_merge_count
-        grouped_chunks = [
-            chunks[i : i + chunk_merge_count]
-            for i in range(0, len(chunks), chunk_merge_count)
-        ]
-
-        logger.info(
-            f"GraphExtractionPipe: Extracting KG Relationships for document and created {len(grouped_chunks)} tasks, time from start: {time.time() - start_time:.2f} seconds",
-        )
-
-        tasks = [
-            asyncio.create_task(
-                self._extract_kg(
-                    chunks=chunk_group,
-                    generation_config=generation_config,
-                    max_knowledge_relationships=max_knowledge_relationships,
-                    entity_types=entity_types,
-                    relation_types=relation_types,
-                    task_id=task_id,
-                    total_tasks=len(grouped_chunks),
+        async def stream_chunks():
+            async for (
+                chunk
+            ) in self.providers.database.chunks_handler.iterate_document_chunks(
+                document_id=document_id
+            ):
+                chunk_counts["total"] += 1
+                if chunk["id"] in existing_chunk_ids:
+                    continue
+                chunk_counts["remaining"] += 1
+                yield DocumentChunk(
+                    id=chunk["id"],
+                    document_id=chunk["document_id"],
+                    owner_id=chunk["owner_id"],
+                    collection_ids=chunk["collection_ids"],
+                    data=chunk["text"],
+                    metadata=chunk["metadata"],
                 )
-            )
-            for task_id, chunk_group in enumerate(grouped_chunks)
-        ]
 
-        completed_tasks = 0
-        total_tasks = len(tasks)
+        async def extract_group(task_id, chunk_group):
+            return await self._extract_kg(
+                chunks=chunk_group,
+                generation_config=generation_config,
+                max_knowledge_relationships=scale_group_limit(
+                    max_knowledge_relationships,
+                    len(chunk_group),
+                    chunk_merge_count,
+                ),
+                entity_types=entity_types,
+                relation_types=relation_types,
+                task_id=task_id,
+            )
 
         logger.info(
-            f"GraphExtractionPipe: Waiting for {total_tasks} KG extraction tasks to complete",
+            f"GraphExtractionPipe: Extracting KG Relationships for document {document_id} with up to {max_concurrent_extractions} concurrent tasks",
         )
 
-        for completed_task in asyncio.as_completed(tasks):
+        # Chunks are streamed, grouped and extracted as workers free up, so
+        # memory stays bounded by the number of in-flight groups
+        completed_tasks = 0
+        async for completed_task in run_bounded(
+            group_chunks(
+                stream_chunks(),
+                max_tokens=max_tokens_per_extraction,
+                max_chunks=chunk_merge_count,
+            ),
+            extract_group,
+            limit=max_concurrent_extractions,
+        ):
             try:
-                yield await completed_task
+                yield completed_task.result()
                 completed_tasks += 1
                 if completed_tasks % 100 == 0:
                     logger.info(
-                        f"GraphExtractionPipe: Completed {completed_tasks}/{total_tasks} KG extraction tasks",
+                        f"GraphExtractionPipe: Completed {completed_tasks} KG extraction tasks",
                     )
             except Exception as e:
                 logger.error(f"Error in Extracting KG Relationships: {e}")
@@ -879,8 +960,17 @@ class GraphService(Service):
                     error_message=str(e),
                 )
 
+        if chunk_counts["total"] == 0:
+            logger.info(f"No chunks found for document {document_id}")
+            raise R2RException(
+                message="No chunks found for document",
+                status_code=404,
+            )
+        if chunk_counts["remaining"] == 0:
+            logger.info(f"No extractions left for document {document_id}")
+
         logger.info(
-            f"GraphExtractionPipe: Completed {completed_tasks}/{total_tasks} KG extraction tasks, time from start: {time.time() - start_time:.2f} seconds",
+            f"GraphExtractionPipe: Completed {completed_tasks} KG extraction tasks for {chunk_counts['remaining']} of {chunk_counts['total']} chunks, time from start: {time.time() - start_time:.2f} seconds",
         )
 
     async def _extract_kg(
@@ -927,6 +1017,8 @@ class GraphService(Service):
                 response = await self.providers.llm.aget_completion(
                     messages,
                     generation_config=generation_config,
+                    use_cache=True,
+                    refresh_cache=attempt > 0,
                 )
 
                 kg_extraction = response.choices[0].message.content
@@ -1032,7 +1124,7 @@ class GraphService(Service):
                     )
 
         logger.info(
-            f"GraphExtractionPipe: Completed task number {task_id} of {total_tasks} for document {chunks[0].document_id}",
+            f"GraphExtractionPipe: Completed task number {task_id} for document {chunks[0].document_id}",
         )
 
         return KGExtraction(
@@ -1048,34 +1140,25 @@ class GraphService(Service):
         Stores a batch of knowledge graph extractions in the graph database.
         """
 
+        # Names only resolve within the extraction they were produced by
+        entities: list[Entity] = []
+        relationships: list[Relationship] = []
         for extraction in kg_extractions:
             entities_id_map = {}
             for entity in extraction.entities:
-                result = await self.providers.database.graphs_handler.entities.create(
-                    name=entity.name,
-                    parent_id=entity.parent_id,
-                    store_type="documents",  # type: ignore
-                    category=entity.category,
-                    description=entity.description,
-                    description_embedding=entity.description_embedding,
-                    chunk_ids=entity.chunk_ids,
-                    metadata=entity.metadata,
+                entity.id = uuid4()
+                entities_id_map[entity.name] = entity.id
+                entities.append(entity)
+
+            for relationship in extraction.relationships:
+                relationship.subject_id = entities_id_map.get(
+                    relationship.subject
                 )
-                entities_id_map[entity.name] = result.id
-
-            if extraction.relationships:
-
-                for relationship in extraction.relationships:
-                    await self.providers.database.graphs_handler.relationships.create(
-                        subject=relationship.subject,
-                        subject_id=entities_id_map.get(relationship.subject),
-                        predicate=relationship.predicate,
-                        object=relationship.object,
-                        object_id=entities_id_map.get(relationship.object),
-                        parent_id=relationship.parent_id,
-                        description=relationship.description,
-                        description_embedding=relationship.description_embedding,
-                        weight=relationship.weight,
-                        metadata=relationship.metadata,
-                        store_type="documents",  # type: ignore
-                    )
+                relationship.object_id = entities_id_map.get(
+                    relationship.object
+                )
+                relationships.append(relationship)
+
+        await self.providers.database.graphs_handler.create_extractions_bulk(
+            entities, relationships, store_type="documents"  # type: ignore
+        )
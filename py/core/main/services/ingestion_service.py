@@ -74,6 +74,7 @@ class IngestionService(Service):
         metadata: Optional[dict] = None,
         version: Optional[str] = None,
         collection_ids: Optional[list[UUID]] = None,
+        registered: bool = False,
         *args: Any,
         **kwargs: Any,
     ) -> dict:
@@ -100,6 +101,12 @@ class IngestionService(Service):
                 size_in_bytes,
             )
 
+            if registered:
+                # Already written by `ingest_files_bulk_ingress`
+                return {
+                    "info": document_info,
+                }
+
             existing_document_info = (
                 await self.providers.database.documents_handler.get_documents_overview(  # FIXME: This was using the pagination defaults from before... We need to review if this is as intended.
                     offset=0,
@@ -137,6 +144,84 @@ class IngestionService(Service):
                 status_code=500, detail=f"Error during ingestion: {str(e)}"
             )
 
+    @telemetry_event("IngestFilesBulk")
+    async def ingest_files_bulk_ingress(
+        self,
+        files: list[dict],
+        user: User,
+        version: Optional[str] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        Register many files for ingestion with a single set-based write.
+
+        Each entry in `files` carries `file_data`, `document_id`, `metadata`
+        and `size_in_bytes`. Files with an unsupported type, or whose document
+        already exists and has not failed, are returned under `rejected`
+        instead of aborting the whole batch.
+        """
+        if not files:
+            raise R2RException(
+                status_code=400, message="No files provided for ingestion."
+            )
+
+        version = version or STARTING_VERSION
+        document_infos: list[DocumentResponse] = []
+        rejected: list[dict] = []
+        for file in files:
+            try:
+                if not file["file_data"].get("filename"):
+                    raise R2RException(
+                        status_code=400, message="File name not provided."
+                    )
+                document_infos.append(
+                    self._create_document_info_from_file(
+                        file["document_id"],
+                        user,
+                        file["file_data"]["filename"],
+                        file.get("metadata") or {},
+                        version,
+                        file["size_in_bytes"],
+                    )
+                )
+            except R2RException as e:
+                rejected.append(
+                    {
+                        "document_id": file["document_id"],
+                        "filename": file["file_data"].get("filename"),
+                        "status_code": e.status_code,
+                        "message": e.message,
+                    }
+                )
+
+        registered_ids = set(
+            await self.providers.database.documents_handler.insert_documents_overview_bulk(
+                document_infos
+            )
+        )
+
+        accepted = []
+        for document_info in document_infos:
+            if document_info.id in registered_ids:
+                accepted.append(document_info)
+                # Guard against the same id appearing twice in one request
+                registered_ids.discard(document_info.id)
+            else:
+                rejected.append(
+                    {
+                        "document_id": document_info.id,
+                        "filename": document_info.title,
+                        "status_code": 409,
+                        "message": f"Document {document_info.id} already exists or is currently ingesting.",
+                    }
+                )
+
+        return {
+            "infos": accepted,
+            "rejected": rejected,
+        }
+
     def _create_document_info_from_file(
         self,
         document_id: UUID,
@@ -250,6 +335,7 @@ class IngestionService(Service):
                 generation_config=GenerationConfig(
                     model=self.config.ingestion.document_summary_model
                 ),
+                use_cache=True,
             )
 
             document_info.summary = response.choices[0].message.content  # type: ignore
@@ -313,6 +399,47 @@ class IngestionService(Service):
     ) -> None:
         document_info.ingestion_status = status
         await self._update_document_status_in_db(document_info)
+        if status == IngestionStatus.SUCCESS:
+            await self.providers.database.collections_handler.increment_document_collection_versions(
+                [document_info.id]
+            )
+
+    async def create_ingestion_job(
+        self, owner_id: UUID, document_ids: list[UUID]
+    ) -> UUID:
+        job_id = uuid.uuid4()
+        await self.providers.database.documents_handler.create_ingestion_job(
+            job_id=job_id, owner_id=owner_id, document_ids=document_ids
+        )
+        return job_id
+
+    async def get_ingestion_job(self, job_id: UUID) -> Optional[dict]:
+        return (
+            await self.providers.database.documents_handler.get_ingestion_job(
+                job_id
+            )
+        )
+
+    async def update_documents_status_bulk(
+        self,
+        document_infos: list[DocumentResponse],
+        status: IngestionStatus,
+    ) -> None:
+        for document_info in document_infos:
+            document_info.ingestion_status = status
+        try:
+            await self.providers.database.documents_handler.set_ingestion_status_bulk(
+                [document_info.id for document_info in document_infos],
+                status,
+            )
+            if status == IngestionStatus.SUCCESS:
+                await self.providers.database.collections_handler.increment_document_collection_versions(
+                    [document_info.id for document_info in document_infos]
+                )
+        except Exception as e:
+            logger.error(
+                f"Failed to update status of {len(document_infos)} documents. Error: {str(e)}"
+            )
 
     async def _update_document_status_in_db(
         self, document_info: DocumentResponse
@@ -454,6 +581,9 @@ class IngestionService(Service):
         storage_generator = await self.store_embeddings(embeddings)
         async for _ in storage_generator:
             pass
+        await self.providers.database.collections_handler.increment_document_collection_versions(
+            [document_id]
+        )
 
         return extraction
 
@@ -540,6 +670,7 @@ class IngestionService(Service):
                             },
                         ),
                         generation_config=chunk_enrichment_settings.generation_config,
+                        use_cache=True,
                     )
                 )
                 .choices[0]
@@ -635,6 +766,9 @@ class IngestionService(Service):
         await self.providers.database.chunks_handler.upsert_entries(
             new_vector_entries
         )
+        await self.providers.database.collections_handler.increment_document_collection_versions(
+            [document_id]
+        )
 
         return len(new_vector_entries)
 
@@ -740,6 +874,22 @@ class IngestionServiceAdapter:
             "file_data": data["file_data"],
             "size_in_bytes": data["size_in_bytes"],
             "collection_ids": data.get("collection_ids", []),
+            "registered": data.get("registered", False),
+        }
+
+    @staticmethod
+    def parse_ingest_files_bulk_input(data: dict) -> dict:
+        return {
+            "user": IngestionServiceAdapter._parse_user_data(data["user"]),
+            "document_infos": [
+                DocumentResponse(**document_info)
+                for document_info in data["document_infos"]
+            ],
+            "ingestion_config": data["ingestion_config"] or {},
+            "collection_ids": [
+                UUID(collection_id)
+                for collection_id in data.get("collection_ids") or []
+            ],
         }
 
     @staticmethod
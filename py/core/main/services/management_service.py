@@ -1,7 +1,7 @@
 import logging
 import os
 from collections import defaultdict
-from typing import Any, BinaryIO, Optional, Tuple
+from typing import Any, AsyncGenerator, BinaryIO, Optional, Tuple
 from uuid import UUID
 
 import toml
@@ -171,6 +171,10 @@ class ManagementService(Service):
             if info.get("document_id")
         }
 
+        await self.providers.database.collections_handler.increment_document_collection_versions(
+            list(affected_doc_ids)
+        )
+
         # 6. For each affected document, check if the document still has any chunks left.
         docs_to_delete = []
         for doc_id in affected_doc_ids:
@@ -218,6 +222,23 @@ class ManagementService(Service):
             return result
         return None
 
+    @telemetry_event("DownloadFileInfo")
+    async def download_file_info(self, document_id: UUID) -> Tuple[str, int]:
+        return await self.providers.database.files_handler.retrieve_file_info(
+            document_id
+        )
+
+    def download_file_stream(
+        self,
+        document_id: UUID,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Lazily stream the bytes `[start, end)` of a stored file."""
+        return self.providers.database.files_handler.retrieve_file_stream(
+            document_id, start, end
+        )
+
     @telemetry_event("DocumentsOverview")
     async def documents_overview(
         self,
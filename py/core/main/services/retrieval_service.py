@@ -1,7 +1,10 @@
+import asyncio
+import hashlib
 import json
 import logging
 import time
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Optional
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -10,10 +13,13 @@ from core import R2RStreamingRAGAgent
 from core.base import (
     DocumentResponse,
     GenerationConfig,
+    LatencyTracker,
     Message,
+    MessageType,
     R2RException,
     RunManager,
     SearchSettings,
+    StreamingRAGTimings,
     manage_run,
     to_async_generator,
 )
@@ -27,6 +33,20 @@ from .base import Service
 
 logger = logging.getLogger()
 
+# Trim the RAG cache after this many writes
+RAG_CACHE_EVICTION_INTERVAL = 1_000
+RAG_CACHE_STREAM_CHUNK_SIZE = 1_024
+
+
+@dataclass
+class RAGCacheEntry:
+    """The outcome of a RAG cache lookup, kept to store the answer on a miss."""
+
+    scope_key: str
+    collection_versions: str
+    query_embedding: list[float]
+    response: Optional[dict]
+
 
 class RetrievalService(Service):
     def __init__(
@@ -46,6 +66,14 @@ class RetrievalService(Service):
             agents,
             run_manager,
         )
+        self._rag_cache_writes = 0
+        # Retrieval time, time to first token and generation time of recent
+        # streaming RAG requests
+        self.streaming_rag_latency = LatencyTracker()
+        # Conversations whose rolling summary is being updated, and the tasks
+        # doing so
+        self._summarizing_conversations: set[UUID] = set()
+        self._background_tasks: set[asyncio.Task] = set()
 
     @telemetry_event("Search")
     async def search(  # TODO - rename to 'search_chunks'
@@ -142,9 +170,22 @@ class RetrievalService(Service):
         query: str,
         rag_generation_config: GenerationConfig,
         search_settings: SearchSettings = SearchSettings(),
+        collection_ids: Optional[list[UUID]] = None,
         *args,
         **kwargs,
     ) -> RAGResponse:
+        """
+        Answer `query` from retrieved context.
+
+        With the RAG cache enabled, an answer to a similar enough query over
+        the same `collection_ids` and settings is returned instead, as long
+        as none of the collections changed since. `None` stands for every
+        collection, as seen by superusers.
+        """
+        # Server side time to first token counts from here, cache lookup included
+        timings = (
+            StreamingRAGTimings() if rag_generation_config.stream else None
+        )
         async with manage_run(self.run_manager) as run_id:
             try:
                 # TODO - Remove these transforms once we have a better way to handle this
@@ -155,12 +196,28 @@ class RetrievalService(Service):
                     if isinstance(value, UUID):
                         search_settings.filters[filter] = str(value)
 
+                cache_entry = await self._get_rag_cache_entry(
+                    query,
+                    rag_generation_config,
+                    search_settings,
+                    collection_ids,
+                    kwargs,
+                )
+                if cache_entry and cache_entry.response is not None:
+                    if rag_generation_config.stream:
+                        return self._stream_cached_rag_response(
+                            cache_entry.response["stream"]
+                        )
+                    return RAGResponse(**cache_entry.response)
+
                 if rag_generation_config.stream:
                     return await self.stream_rag_response(
                         query,
                         rag_generation_config,
                         search_settings,
                         *args,
+                        cache_entry=cache_entry,
+                        timings=timings,
                         **kwargs,
                     )
 
@@ -187,6 +244,15 @@ class RetrievalService(Service):
                         f"Multiple results found for query: {query}"
                     )
 
+                if cache_entry:
+                    await self._set_rag_cache_entry(
+                        cache_entry,
+                        query,
+                        RAGResponse.model_validate(
+                            results[0], from_attributes=True
+                        ).model_dump(mode="json"),
+                    )
+
                 # unpack the first result
                 return results[0]
 
@@ -207,8 +273,12 @@ class RetrievalService(Service):
         rag_generation_config,
         search_settings,
         *args,
+        cache_entry: Optional[RAGCacheEntry] = None,
+        timings: Optional[StreamingRAGTimings] = None,
         **kwargs,
     ):
+        timings = timings or StreamingRAGTimings()
+
         async def stream_response():
             async with manage_run(self.run_manager, "rag"):
                 merged_kwargs = {
@@ -217,19 +287,134 @@ class RetrievalService(Service):
                     "run_manager": self.run_manager,
                     "search_settings": search_settings,
                     "rag_generation_config": rag_generation_config,
+                    "rag_timings": timings,
                     **kwargs,
                 }
 
+                chunks: list[str] = []
                 async for (
                     chunk
                 ) in await self.pipelines.streaming_rag_pipeline.run(
                     *args,
                     **merged_kwargs,
                 ):
+                    if cache_entry:
+                        chunks.append(chunk)
                     yield chunk
 
+                metrics = timings.as_dict()
+                self.streaming_rag_latency.record(metrics)
+                logger.info(
+                    "Streaming RAG latency: "
+                    + ", ".join(
+                        f"{name}={value:.3f}s"
+                        for name, value in metrics.items()
+                        if value is not None
+                    )
+                )
+
+                if cache_entry:
+                    await self._set_rag_cache_entry(
+                        cache_entry, query, {"stream": "".join(chunks)}
+                    )
+
+        return stream_response()
+
+    def _stream_cached_rag_response(
+        self, stream: str
+    ) -> AsyncGenerator[str, None]:
+        async def stream_response():
+            for i in range(0, len(stream), RAG_CACHE_STREAM_CHUNK_SIZE):
+                yield stream[i : i + RAG_CACHE_STREAM_CHUNK_SIZE]
+
         return stream_response()
 
+    def _rag_cache_scope_key(
+        self,
+        rag_generation_config: GenerationConfig,
+        search_settings: SearchSettings,
+        collection_ids: list[UUID],
+        kwargs: dict[str, Any],
+    ) -> str:
+        payload = json.dumps(
+            {
+                "collection_ids": sorted(str(id) for id in collection_ids),
+                "search_settings": search_settings.model_dump(mode="json"),
+                "generation_config": rag_generation_config.model_dump(
+                    mode="json"
+                ),
+                "task_prompt_override": kwargs.get("task_prompt_override"),
+                "include_title_if_available": kwargs.get(
+                    "include_title_if_available"
+                ),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _get_rag_cache_entry(
+        self,
+        query: str,
+        rag_generation_config: GenerationConfig,
+        search_settings: SearchSettings,
+        collection_ids: Optional[list[UUID]],
+        kwargs: dict[str, Any],
+    ) -> Optional[RAGCacheEntry]:
+        config = self.providers.llm.config
+        if not config.rag_cache_enabled:
+            return None
+
+        database = self.providers.database
+        collection_ids = collection_ids or [
+            database.collections_handler.GLOBAL_VERSION_ID
+        ]
+        try:
+            query_embedding = (
+                await self.providers.embedding.async_get_embedding(query)
+            )
+            scope_key = self._rag_cache_scope_key(
+                rag_generation_config, search_settings, collection_ids, kwargs
+            )
+            response, collection_versions = (
+                await database.rag_cache_handler.get_response(
+                    scope_key,
+                    collection_ids,
+                    query_embedding,
+                    config.rag_cache_similarity_threshold,
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read RAG cache: {e}")
+            return None
+
+        return RAGCacheEntry(
+            scope_key=scope_key,
+            collection_versions=collection_versions,
+            query_embedding=query_embedding,
+            response=response,
+        )
+
+    async def _set_rag_cache_entry(
+        self, cache_entry: RAGCacheEntry, query: str, response: dict
+    ) -> None:
+        config = self.providers.llm.config
+        rag_cache_handler = self.providers.database.rag_cache_handler
+        try:
+            await rag_cache_handler.set_response(
+                cache_entry.scope_key,
+                cache_entry.collection_versions,
+                query,
+                cache_entry.query_embedding,
+                response,
+                config.rag_cache_ttl_seconds,
+            )
+            self._rag_cache_writes += 1
+            if self._rag_cache_writes % RAG_CACHE_EVICTION_INTERVAL == 0:
+                await rag_cache_handler.evict(config.rag_cache_max_entries)
+        except Exception as e:
+            logger.warning(f"Failed to cache RAG response: {e}")
+
     @telemetry_event("Agent")
     async def agent(
         self,
@@ -302,10 +487,18 @@ class RetrievalService(Service):
                 ids = []
 
                 if conversation_id:  # Fetch the existing conversation
+                    summary_message: Optional[Message] = None
                     try:
-                        conversation_messages = await self.providers.database.conversations_handler.get_conversation(
-                            conversation_id=conversation_id,
-                        )
+                        if self.config.agent.conversation_memory == "window":
+                            conversation_messages, summary_message = (
+                                await self._get_conversation_window(
+                                    conversation_id
+                                )
+                            )
+                        else:
+                            conversation_messages = await self.providers.database.conversations_handler.get_conversation(
+                                conversation_id=conversation_id,
+                            )
                     except Exception as e:
                         logger.error(f"Error fetching conversation: {str(e)}")
 
@@ -322,6 +515,8 @@ class RetrievalService(Service):
                                     f"Unexpected type in conversation found: {type(message_response)}\n{message_response}"
                                 )
                         messages = messages_from_conversation + messages
+                        if summary_message:
+                            messages.insert(0, summary_message)
                 else:  # Create new conversation
                     conversation_response = (
                         await self.providers.database.conversations_handler.create_conversation()
@@ -417,6 +612,100 @@ class RetrievalService(Service):
                     detail=f"Internal Server Error - {str(e)}",
                 )
 
+    async def _get_conversation_window(
+        self, conversation_id: UUID
+    ) -> tuple[list[MessageResponse], Optional[Message]]:
+        """
+        Load the recent messages of a conversation and a system message
+        carrying the summary of the older ones.
+
+        Older messages that the summary does not cover yet are folded into it
+        in the background for the following turns. Up to a batch of them is
+        passed on directly, and a marker notes how many were left out. The
+        window never starts with a tool result whose call was cut off.
+        """
+        window = await self.providers.database.conversations_handler.get_conversation_window(
+            conversation_id=conversation_id,
+            max_messages=self.config.agent.max_conversation_messages,
+            max_pending=self.config.agent.conversation_summary_batch_size,
+        )
+        if (
+            window["pending"]
+            and conversation_id not in self._summarizing_conversations
+        ):
+            self._summarizing_conversations.add(conversation_id)
+            task = asyncio.create_task(
+                self._update_conversation_summary(
+                    conversation_id, window["summary"], window["pending"]
+                )
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        conversation_messages = window["recent"] + window["messages"]
+        omitted = window["omitted"]
+        while conversation_messages and str(
+            conversation_messages[0].message.role
+        ) in (MessageType.TOOL.value, MessageType.FUNCTION.value):
+            conversation_messages.pop(0)
+            omitted += 1
+
+        context = []
+        if window["summary"]:
+            context.append(
+                f"Summary of the earlier conversation:\n{window['summary']}"
+            )
+        if omitted:
+            context.append(f"[{omitted} earlier messages omitted]")
+        summary_message = (
+            Message(role="system", content="\n\n".join(context))
+            if context
+            else None
+        )
+        return conversation_messages, summary_message
+
+    async def _update_conversation_summary(
+        self,
+        conversation_id: UUID,
+        summary: Optional[str],
+        pending: list[MessageResponse],
+    ) -> None:
+        try:
+            transcript = "\n\n".join(
+                f"{message_response.message.role}: {message_response.message.content}"
+                for message_response in pending
+                if message_response.message.content
+            )
+            messages = await self.providers.database.prompts_handler.get_message_payload(
+                task_prompt_name=self.config.agent.conversation_summary_prompt,
+                task_inputs={
+                    "summary": summary or "The conversation has just started.",
+                    "messages": transcript,
+                },
+            )
+            response = await self.providers.llm.aget_completion(
+                messages=messages,
+                generation_config=GenerationConfig(
+                    model=self.config.agent.conversation_summary_model
+                    or self.config.agent.generation_config.model
+                ),
+            )
+            new_summary = response.choices[0].message.content
+            if not new_summary:
+                raise ValueError("Expected a generated response.")
+
+            await self.providers.database.conversations_handler.update_conversation_summary(
+                conversation_id=conversation_id,
+                summary=new_summary,
+                summary_message_id=pending[-1].id,
+            )
+        except Exception as e:
+            logger.error(
+                f"Error summarizing conversation {conversation_id}: {str(e)}"
+            )
+        finally:
+            self._summarizing_conversations.discard(conversation_id)
+
 
 class RetrievalServiceAdapter:
     @staticmethod
@@ -40,7 +40,7 @@ class RAGPipeline(AsyncPipeline):
             raise ValueError(
                 "`_rag_pipeline` must be set before running the RAG pipeline"
             )
-        self.state = state or AsyncState()
+        request_state = state or AsyncState()
         # TODO - This feels anti-pattern.
         run_manager = run_manager or self.run_manager or RunManager()
         async with manage_run(run_manager):
@@ -59,7 +59,7 @@ class RAGPipeline(AsyncPipeline):
                     task = asyncio.create_task(
                         self._search_pipeline.run(
                             to_async_generator([query]),
-                            state,
+                            request_state,
                             False,
                             run_manager,
                             *args,
@@ -78,7 +78,7 @@ class RAGPipeline(AsyncPipeline):
 
             rag_results = await self._rag_pipeline.run(
                 multi_query_generator(input),
-                state,
+                request_state,
                 rag_generation_config.stream,
                 run_manager,
                 *args,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from abc import abstractmethod
 from typing import Any, AsyncGenerator, Optional, Union
@@ -39,6 +40,25 @@ class SearchPipe(AsyncPipe[ChunkSearchResult]):
     ) -> AsyncGenerator[ChunkSearchResult, None]:
         pass
 
+    async def search_batch(
+        self,
+        queries: list[str],
+        search_settings: Any,
+        *args: Any,
+        **kwargs: Any,
+    ) -> list[list[ChunkSearchResult]]:
+        """Run `search` for each query concurrently, returning the results in query order."""
+
+        async def collect(query: str) -> list[ChunkSearchResult]:
+            return [
+                result
+                async for result in self.search(
+                    query, search_settings, *args, **kwargs
+                )
+            ]
+
+        return list(await asyncio.gather(*(collect(q) for q in queries)))
+
     @abstractmethod
     async def _run_logic(
         self,
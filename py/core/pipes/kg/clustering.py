@@ -44,6 +44,7 @@ class GraphClusteringPipe(AsyncPipe):
         collection_id: UUID,
         leiden_params: dict,
         clustering_mode: str,
+        incremental: bool = False,
     ):
         """
         Clusters the knowledge graph relationships into communities using hierarchical Leiden algorithm. Uses graspologic library.
@@ -53,6 +54,7 @@ class GraphClusteringPipe(AsyncPipe):
             collection_id=collection_id,
             leiden_params=leiden_params,
             clustering_mode=clustering_mode,
+            incremental=incremental,
         )
 
         return {
@@ -74,9 +76,11 @@ class GraphClusteringPipe(AsyncPipe):
         collection_id = input.message.get("collection_id", None)
         leiden_params = input.message["leiden_params"]
         clustering_mode = input.message["clustering_mode"]
+        incremental = input.message.get("incremental", False)
 
         yield await self.cluster_kg(
             collection_id=collection_id,
             leiden_params=leiden_params,
             clustering_mode=clustering_mode,
+            incremental=incremental,
         )
@@ -3,8 +3,8 @@ import json
 import logging
 import random
 import time
-from typing import Any, AsyncGenerator
-from uuid import UUID, uuid4
+from typing import Any, AsyncGenerator, Optional
+from uuid import UUID
 
 from core.base import (
     AsyncPipe,
@@ -80,8 +80,11 @@ class GraphCommunitySummaryPipe(AsyncPipe):
             entities: list, max_count: int = 100
         ):
             # randomly sample max_count entities if there are duplicates. This will become a map reduce job later.
+            # The seed keeps the prompt, and so its completion cache key, stable.
             sampled_entities = (
-                random.sample(entities, max_count)
+                random.Random(
+                    ",".join(str(entity.id) for entity in entities)
+                ).sample(entities, max_count)
                 if len(entities) > max_count
                 else entities
             )
@@ -94,7 +97,11 @@ class GraphCommunitySummaryPipe(AsyncPipe):
             relationships: list, max_count: int = 100
         ):
             sampled_relationships = (
-                random.sample(relationships, max_count)
+                random.Random(
+                    ",".join(
+                        str(relationship.id) for relationship in relationships
+                    )
+                ).sample(relationships, max_count)
                 if len(relationships) > max_count
                 else relationships
             )
@@ -136,28 +143,28 @@ class GraphCommunitySummaryPipe(AsyncPipe):
         max_summary_input_length: int,
         generation_config: GenerationConfig,
         collection_id: UUID,
+        level: int,
         nodes: list[str],
-        all_entities: list[Entity],
-        all_relationships: list[Relationship],
+        entities_by_name: dict[str, list[Entity]],
+        relationships_by_subject: dict[str, list[Relationship]],
+        collection_description: Optional[str] = None,
     ) -> dict:
         """
         Process a community by summarizing it and creating a summary embedding and storing it to a database.
         """
 
-        response = await self.database_provider.collections_handler.get_collections_overview(  # type: ignore
-            offset=0,
-            limit=1,
-            filter_collection_ids=[collection_id],
-        )
-        collection_description = (
-            response["results"][0].description if response["results"] else None  # type: ignore
-        )
-
-        entities = [entity for entity in all_entities if entity.name in nodes]
+        # Ordered de-duplication keeps the prompt stable across runs
+        node_set = dict.fromkeys(nodes)
+        entities = [
+            entity
+            for node in node_set
+            for entity in entities_by_name.get(node, [])
+        ]
         relationships = [
             relationship
-            for relationship in all_relationships
-            if relationship.subject in nodes and relationship.object in nodes
+            for node in node_set
+            for relationship in relationships_by_subject.get(node, [])
+            if relationship.object in node_set
         ]
 
         if not entities and not relationships:
@@ -184,6 +191,8 @@ class GraphCommunitySummaryPipe(AsyncPipe):
                             },
                         ),
                         generation_config=generation_config,
+                        use_cache=True,
+                        refresh_cache=attempt > 0,
                     )
                 )
                 .choices[0]
@@ -220,6 +229,7 @@ class GraphCommunitySummaryPipe(AsyncPipe):
         community = Community(
             community_id=community_id,
             collection_id=collection_id,
+            level=level,
             name=name,
             summary=summary,
             rating=rating,
@@ -259,67 +269,72 @@ class GraphCommunitySummaryPipe(AsyncPipe):
         generation_config = input.message["generation_config"]
         max_summary_input_length = input.message["max_summary_input_length"]
         collection_id = input.message.get("collection_id", None)
-        clustering_mode = input.message.get("clustering_mode", None)
         community_summary_jobs = []
         logger = input.message.get("logger", logging.getLogger())
 
-        # check which community summaries exist and don't run them again
+        # Clustering stores the communities that need a summary, ranked, so
+        # each batch only loads the graph around its own communities
         logger.info(
-            f"GraphCommunitySummaryPipe: Checking if community summaries exist for communities {offset} to {offset + limit}"
+            f"GraphCommunitySummaryPipe: Summarizing communities {offset} to {offset + limit}"
+        )
+        clusters = await self.database_provider.graphs_handler.communities.get_community_clusters_to_summarize(
+            collection_id=collection_id,
+            offset=offset,
+            limit=limit,
+        )
+        names = list(
+            {node for cluster in clusters for node in cluster["nodes"]}
         )
 
-        all_entities, _ = (
+        batch_entities, _ = (
             await self.database_provider.graphs_handler.get_entities(
                 parent_id=collection_id,
                 offset=0,
                 limit=-1,
+                entity_names=names,
                 include_embeddings=False,
             )
         )
 
-        all_relationships, _ = (
+        batch_relationships, _ = (
             await self.database_provider.graphs_handler.get_relationships(
                 parent_id=collection_id,
                 offset=0,
                 limit=-1,
+                entity_names=names,
                 include_embeddings=False,
             )
         )
 
-        # Perform clustering
-        leiden_params = input.message.get("leiden_params", {})
-        _, community_clusters = (
-            await self.database_provider.graphs_handler._cluster_and_add_community_info(
-                relationships=all_relationships,
-                relationship_ids_cache={},
-                leiden_params=leiden_params,
-                collection_id=collection_id,
-                clustering_mode=clustering_mode,
-            )
-        )
+        # Index once so each community only touches its own nodes
+        entities_by_name: dict[str, list[Entity]] = {}
+        for entity in batch_entities:
+            entities_by_name.setdefault(entity.name, []).append(entity)
 
-        # Organize clusters
-        clusters: dict[Any] = {}
-        for item in community_clusters:
-            cluster_id = (
-                item["cluster"]
-                if clustering_mode == "remote"
-                else item.cluster
-            )
-            if cluster_id not in clusters:
-                clusters[cluster_id] = []
-            clusters[cluster_id].append(
-                item["node"] if clustering_mode == "remote" else item.node
-            )
+        relationships_by_subject: dict[str, list[Relationship]] = {}
+        for relationship in batch_relationships:
+            relationships_by_subject.setdefault(
+                relationship.subject, []
+            ).append(relationship)
+
+        response = await self.database_provider.collections_handler.get_collections_overview(  # type: ignore
+            offset=0,
+            limit=1,
+            filter_collection_ids=[collection_id],
+        )
+        collection_description = (
+            response["results"][0].description if response["results"] else None  # type: ignore
+        )
 
-        # Now, process the clusters
-        for _, nodes in clusters.items():
+        for cluster in clusters:
             community_summary_jobs.append(
                 self.process_community(
-                    community_id=uuid4(),
-                    nodes=nodes,
-                    all_entities=all_entities,
-                    all_relationships=all_relationships,
+                    community_id=cluster["community_id"],
+                    level=cluster["level"],
+                    nodes=cluster["nodes"],
+                    entities_by_name=entities_by_name,
+                    relationships_by_subject=relationships_by_subject,
+                    collection_description=collection_description,
                     max_summary_input_length=max_summary_input_length,
                     generation_config=generation_config,
                     collection_id=collection_id,
@@ -4,7 +4,7 @@ import asyncio
 import logging
 import random
 import time
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 from uuid import UUID
 
 from core.base import AsyncState, CompletionProvider, EmbeddingProvider
@@ -54,7 +54,9 @@ class GraphDescriptionPipe(AsyncPipe):
         start_time = time.time()
 
         def truncate_info(info_list, max_length):
-            random.shuffle(info_list)
+            # Seed from the content so the sampled prompt, and so its cache
+            # key, is the same on every run
+            random.Random("\n".join(info_list)).shuffle(info_list)
             truncated_info = ""
             current_length = 0
             for info in info_list:
@@ -69,17 +71,8 @@ class GraphDescriptionPipe(AsyncPipe):
             entities,
             relationships,
             max_description_input_length,
-            document_id: UUID,
+            document_summary: Optional[str],
         ):
-            response = await self.database_provider.documents_handler.get_documents_overview(  # type: ignore
-                offset=0,
-                limit=1,
-                filter_document_ids=[document_id],
-            )
-            document_summary = (
-                response["results"][0].summary if response["results"] else None
-            )
-
             entity_info = [
                 f"{entity.name}, {entity.description}" for entity in entities
             ]
@@ -89,12 +82,6 @@ class GraphDescriptionPipe(AsyncPipe):
                 for i, relationship in enumerate(relationships)
             ]
 
-            # potentially slow at scale, but set to avoid duplicates
-            unique_chunk_ids = set()
-            for entity in entities:
-                for chunk_id in entity.chunk_ids:
-                    unique_chunk_ids.add(chunk_id)
-
             out_entity = entities[0]
             if not out_entity.description:
                 out_entity.description = (
@@ -115,6 +102,7 @@ class GraphDescriptionPipe(AsyncPipe):
                                 },
                             ),
                             generation_config=self.database_provider.config.graph_creation_settings.generation_config,
+                            use_cache=True,
                         )
                     )
                     .choices[0]
@@ -125,21 +113,25 @@ class GraphDescriptionPipe(AsyncPipe):
                     logger.error(
                         f"No description for entity {out_entity.name}"
                     )
-                    return out_entity.name
+                    return out_entity, False
 
-                out_entity.description_embedding = (
-                    await self.embedding_provider.async_get_embeddings(
-                        [out_entity.description]
-                    )
-                )[0]
+                return out_entity, True
 
-                # upsert the entity and its embedding
-                await self.database_provider.graphs_handler.add_entities(
-                    [out_entity],
-                    table_name="documents_entities",
-                )
+            return out_entity, False
 
-            return out_entity.name
+        async def store_entities(entities) -> list[str]:
+            # Embed the pooled descriptions together and upsert them at once
+            embeddings = await self.embedding_provider.async_get_embeddings(
+                [entity.description for entity in entities]
+            )
+            for entity, embedding in zip(entities, embeddings):
+                entity.description_embedding = embedding
+
+            await self.database_provider.graphs_handler.add_entities(
+                entities,
+                table_name="documents_entities",
+            )
+            return [entity.name for entity in entities]
 
         offset = input.message["offset"]
         limit = input.message["limit"]
@@ -161,6 +153,15 @@ class GraphDescriptionPipe(AsyncPipe):
             f"GraphDescriptionPipe: Got entity map for document {document_id}, total entities: {total_entities}, time from start: {time.time() - start_time:.2f} seconds",
         )
 
+        response = await self.database_provider.documents_handler.get_documents_overview(  # type: ignore
+            offset=0,
+            limit=1,
+            filter_document_ids=[document_id],
+        )
+        document_summary = (
+            response["results"][0].summary if response["results"] else None
+        )
+
         workflows = []
 
         for _, (entity_name, entity_info) in enumerate(entity_map.items()):
@@ -172,20 +173,35 @@ class GraphDescriptionPipe(AsyncPipe):
                         max_description_input_length=input.message[
                             "max_description_input_length"
                         ],
-                        document_id=document_id,
+                        document_summary=document_summary,
                     )
                 )
             except Exception as e:
                 logger.error(f"Error processing entity {entity_name}: {e}")
 
+        batch_size = max(1, self.embedding_provider.config.batch_size)
+        pending: list = []
         completed_entities = 0
         for result in asyncio.as_completed(workflows):
             if completed_entities % 100 == 0:
                 logger.info(
                     f"GraphDescriptionPipe: Completed {completed_entities+1} of {total_entities} entities for document {document_id}",
                 )
-            yield await result
+            entity, described = await result
             completed_entities += 1
+            if not described:
+                yield entity.name
+                continue
+
+            pending.append(entity)
+            if len(pending) >= batch_size:
+                for name in await store_entities(pending):
+                    yield name
+                pending = []
+
+        if pending:
+            for name in await store_entities(pending):
+                yield name
 
         logger.info(
             f"GraphDescriptionPipe: Processed {total_entities} entities for document {document_id}, time from start: {time.time() - start_time:.2f} seconds",
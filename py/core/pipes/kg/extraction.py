@@ -6,6 +6,7 @@ import time
 from typing import Any, AsyncGenerator, Optional, Union
 
 from core.base import (
+    DEFAULT_MAX_TOKENS_PER_EXTRACTION,
     AsyncState,
     CompletionProvider,
     DocumentChunk,
@@ -17,6 +18,7 @@ from core.base import (
     Relationship,
 )
 from core.base.pipes.base_pipe import AsyncPipe
+from core.base.utils import group_chunks, run_bounded, scale_group_limit
 
 from ...database.postgres import PostgresDatabaseProvider
 
@@ -97,6 +99,8 @@ class GraphExtractionPipe(AsyncPipe[dict]):
                 response = await self.llm_provider.aget_completion(
                     messages,
                     generation_config=generation_config,
+                    use_cache=True,
+                    refresh_cache=attempt > 0,
                 )
 
                 kg_extraction = response.choices[0].message.content
@@ -196,7 +200,7 @@ class GraphExtractionPipe(AsyncPipe[dict]):
         # add metadata to entities and relationships
 
         logger.info(
-            f"GraphExtractionPipe: Completed task number {task_id} of {total_tasks} for document {extractions[0].document_id}",
+            f"GraphExtractionPipe: Completed task number {task_id} for document {extractions[0].document_id}",
         )
 
         return KGExtraction(
@@ -227,6 +231,12 @@ class GraphExtractionPipe(AsyncPipe[dict]):
         filter_out_existing_chunks = input.message.get(
             "filter_out_existing_chunks", True
         )
+        max_tokens_per_extraction = input.message.get(
+            "max_tokens_per_extraction", DEFAULT_MAX_TOKENS_PER_EXTRACTION
+        )
+        max_concurrent_extractions = input.message.get(
+            "max_concurrent_extractions", 16
+        )
 
         logger = input.message.get("logger", logging.getLogger())
 
@@ -234,95 +244,65 @@ class GraphExtractionPipe(AsyncPipe[dict]):
             f"GraphExtractionPipe: Processing document {document_id} for KG extraction",
         )
 
-        # Then create the extractions from the results
-        extractions = [
-            DocumentChunk(
-                id=extraction["id"],
-                document_id=extraction["document_id"],
-                owner_id=extraction["owner_id"],
-                collection_ids=extraction["collection_ids"],
-                data=extraction["text"],
-                metadata=extraction["metadata"],
-            )
-            for extraction in (
-                await self.database_provider.documents_handler.list_document_chunks(  # FIXME: This was using the pagination defaults from before... We need to review if this is as intended.
-                    document_id=document_id,
-                    offset=0,
-                    limit=100,
-                )
-            )["results"]
-        ]
-
-        logger.info(
-            f"Found {len(extractions)} extractions for document {document_id}"
-        )
-
+        existing_chunk_ids: set = set()
         if filter_out_existing_chunks:
-            existing_chunk_ids = await self.database_provider.graphs_handler.get_existing_document_entity_chunk_ids(
-                document_id=document_id
-            )
-            extractions = [
-                extraction
-                for extraction in extractions
-                if extraction.id not in existing_chunk_ids
-            ]
-            logger.info(
-                f"Filtered out {len(existing_chunk_ids)} existing extractions, remaining {len(extractions)} extractions for document {document_id}"
+            existing_chunk_ids = set(
+                await self.database_provider.graphs_handler.get_existing_document_entity_chunk_ids(
+                    document_id=document_id
+                )
             )
 
-            if len(extractions) == 0:
-                logger.info(f"No extractions left for document {document_id}")
-                return
-
-        logger.info(
-            f"GraphExtractionPipe: Obtained {len(extractions)} extractions to process, time from start: {time.time() - start_time:.2f} seconds",
-        )
-
-        # sort the extractions accroding to chunk_order field in metadata in ascending order
-        extractions = sorted(
-            extractions,
-            key=lambda x: x.metadata.get("chunk_order", float("inf")),
-        )
-
-        # group these extractions into groups of chunk_merge_count
-        extractions_groups = [
-            extractions[i : i + chunk_merge_count]
-            for i in range(0, len(extractions), chunk_merge_count)
-        ]
-
-        logger.info(
-            f"GraphExtractionPipe: Extracting KG Relationships for document and created {len(extractions_groups)} tasks, time from start: {time.time() - start_time:.2f} seconds",
-        )
-
-        tasks = [
-            asyncio.create_task(
-                self.extract_kg(
-                    extractions=extractions_group,
-                    generation_config=generation_config,
-                    max_knowledge_relationships=max_knowledge_relationships,
-                    entity_types=entity_types,
-                    relation_types=relation_types,
-                    task_id=task_id,
-                    total_tasks=len(extractions_groups),
+        async def stream_extractions():
+            async for (
+                chunk
+            ) in self.database_provider.chunks_handler.iterate_document_chunks(
+                document_id=document_id
+            ):
+                if chunk["id"] in existing_chunk_ids:
+                    continue
+                yield DocumentChunk(
+                    id=chunk["id"],
+                    document_id=chunk["document_id"],
+                    owner_id=chunk["owner_id"],
+                    collection_ids=chunk["collection_ids"],
+                    data=chunk["text"],
+                    metadata=chunk["metadata"],
                 )
-            )
-            for task_id, extractions_group in enumerate(extractions_groups)
-        ]
 
-        completed_tasks = 0
-        total_tasks = len(tasks)
+        async def extract_group(task_id, extractions_group):
+            return await self.extract_kg(
+                extractions=extractions_group,
+                generation_config=generation_config,
+                max_knowledge_relationships=scale_group_limit(
+                    max_knowledge_relationships,
+                    len(extractions_group),
+                    chunk_merge_count,
+                ),
+                entity_types=entity_types,
+                relation_types=relation_types,
+                task_id=task_id,
+            )
 
         logger.info(
-            f"GraphExtractionPipe: Waiting for {total_tasks} KG extraction tasks to complete",
+            f"GraphExtractionPipe: Extracting KG Relationships for document {document_id}, time from start: {time.time() - start_time:.2f} seconds",
         )
 
-        for completed_task in asyncio.as_completed(tasks):
+        completed_tasks = 0
+        async for completed_task in run_bounded(
+            group_chunks(
+                stream_extractions(),
+                max_tokens=max_tokens_per_extraction,
+                max_chunks=chunk_merge_count,
+            ),
+            extract_group,
+            limit=max_concurrent_extractions,
+        ):
             try:
-                yield await completed_task
+                yield completed_task.result()
                 completed_tasks += 1
                 if completed_tasks % 100 == 0:
                     logger.info(
-                        f"GraphExtractionPipe: Completed {completed_tasks}/{total_tasks} KG extraction tasks",
+                        f"GraphExtractionPipe: Completed {completed_tasks} KG extraction tasks",
                     )
             except Exception as e:
                 logger.error(f"Error in Extracting KG Relationships: {e}")
@@ -332,5 +312,5 @@ class GraphExtractionPipe(AsyncPipe[dict]):
                 )
 
         logger.info(
-            f"GraphExtractionPipe: Completed {completed_tasks}/{total_tasks} KG extraction tasks, time from start: {time.time() - start_time:.2f} seconds",
+            f"GraphExtractionPipe: Completed {completed_tasks} KG extraction tasks, time from start: {time.time() - start_time:.2f} seconds",
         )
@@ -1,6 +1,7 @@
+import asyncio
 import json
 import logging
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 from uuid import UUID
 
 from core.base import (
@@ -46,6 +47,7 @@ class VectorSearchPipe(SearchPipe):
         message: str,
         search_settings: SearchSettings,
         *args: Any,
+        query_vector: Optional[list[float]] = None,
         **kwargs: Any,
     ) -> AsyncGenerator[ChunkSearchResult, None]:
         if search_settings.chunk_settings.enabled == False:
@@ -56,10 +58,11 @@ class VectorSearchPipe(SearchPipe):
         )
         search_settings.limit = search_settings.limit or self.config.limit
         results = []
-        query_vector = await self.embedding_provider.async_get_embedding(
-            message,
-            purpose=EmbeddingPurpose.QUERY,
-        )
+        if query_vector is None:
+            query_vector = await self.embedding_provider.async_get_embedding(
+                message,
+                purpose=EmbeddingPurpose.QUERY,
+            )
 
         if (
             search_settings.use_fulltext_search
@@ -108,6 +111,49 @@ class VectorSearchPipe(SearchPipe):
             results.append(result)
             yield result
 
+    async def search_batch(  # type: ignore
+        self,
+        queries: list[str],
+        search_settings: SearchSettings,
+        *args: Any,
+        **kwargs: Any,
+    ) -> list[list[ChunkSearchResult]]:
+        """
+        Search for several queries at once, e.g. the rewrites produced by a
+        query transform. The queries are embedded in a single call and then
+        searched concurrently.
+        """
+        if not queries or search_settings.chunk_settings.enabled == False:
+            return [[] for _ in queries]
+
+        query_vectors = await self.embedding_provider.async_get_embeddings(
+            queries,
+            purpose=EmbeddingPurpose.QUERY,
+        )
+
+        async def collect(
+            query: str, query_vector: list[float]
+        ) -> list[ChunkSearchResult]:
+            return [
+                result
+                async for result in self.search(
+                    query,
+                    search_settings,
+                    *args,
+                    query_vector=query_vector,
+                    **kwargs,
+                )
+            ]
+
+        return list(
+            await asyncio.gather(
+                *(
+                    collect(query, query_vector)
+                    for query, query_vector in zip(queries, query_vectors)
+                )
+            )
+        )
+
     async def _run_logic(  # type: ignore
         self,
         input: AsyncPipe.Input,
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from typing import Any, AsyncGenerator
@@ -106,29 +107,66 @@ class GraphSearchSearchPipe(GeneratorPipe):
                 await self.embedding_provider.async_get_embedding(message)
             )
 
-            # entity search
-            search_type = "entities"
-            base_limit = search_settings.limit
-
-            if search_type not in search_settings.graph_settings.limits:
-                logger.warning(
-                    f"No limit set for graph search type {search_type}, defaulting to global settings limit of {base_limit}"
-                )
-            async for search_result in self.database_provider.graphs_handler.graph_search(  # type: ignore
-                message,
-                search_type=search_type,
-                limit=search_settings.graph_settings.limits.get(
-                    search_type, base_limit
+            # The legs are independent, so run them concurrently
+            if search_settings.graph_settings.use_traversal:
+                legs = [
+                    self._search_traversal(
+                        message, query_embedding, search_settings
+                    )
+                ]
+            else:
+                legs = [
+                    self._search_entities(
+                        message, query_embedding, search_settings
+                    ),
+                    self._search_relationships(
+                        message, query_embedding, search_settings
+                    ),
+                ]
+            results = await asyncio.gather(
+                *legs,
+                self._search_communities(
+                    message, query_embedding, search_settings
                 ),
-                query_embedding=query_embedding,
-                property_names=[
-                    "name",
-                    "description",
-                    "chunk_ids",
-                ],
-                filters=search_settings.filters,
-            ):
-                yield GraphSearchResult(
+            )
+            for leg_results in results:
+                for result in leg_results:
+                    yield result
+
+    def _get_limit(
+        self, search_type: str, search_settings: SearchSettings
+    ) -> int:
+        base_limit = search_settings.limit
+        if search_type not in search_settings.graph_settings.limits:
+            logger.warning(
+                f"No limit set for graph search type {search_type}, defaulting to global settings limit of {base_limit}"
+            )
+        return search_settings.graph_settings.limits.get(
+            search_type, base_limit
+        )
+
+    async def _search_entities(
+        self,
+        message: str,
+        query_embedding: list[float],
+        search_settings: SearchSettings,
+    ) -> list[GraphSearchResult]:
+        search_type = "entities"
+        results = []
+        async for search_result in self.database_provider.graphs_handler.graph_search(  # type: ignore
+            message,
+            search_type=search_type,
+            limit=self._get_limit(search_type, search_settings),
+            query_embedding=query_embedding,
+            property_names=[
+                "name",
+                "description",
+                "chunk_ids",
+            ],
+            filters=search_settings.filters,
+        ):
+            results.append(
+                GraphSearchResult(
                     content=KGEntityResult(
                         name=search_result["name"],
                         description=search_result["description"],
@@ -149,41 +187,45 @@ class GraphSearchSearchPipe(GeneratorPipe):
                         else None
                     ),
                 )
+            )
+        return results
 
-            # # relationship search
-            # # disabled for now. We will check evaluations and see if we need it
-            search_type = "relationships"
-            if search_type not in search_settings.graph_settings.limits:
-                logger.warning(
-                    f"No limit set for graph search type {search_type}, defaulting to global settings limit of {base_limit}"
+    async def _search_relationships(
+        self,
+        message: str,
+        query_embedding: list[float],
+        search_settings: SearchSettings,
+    ) -> list[GraphSearchResult]:
+        search_type = "relationships"
+        results = []
+        # Search with the query text like the other legs; this leg used to
+        # pass the whole pipe input as the query
+        async for search_result in self.database_provider.graphs_handler.graph_search(  # type: ignore
+            message,
+            search_type=search_type,
+            limit=self._get_limit(search_type, search_settings),
+            query_embedding=query_embedding,
+            property_names=[
+                # "name",
+                "subject",
+                "predicate",
+                "object",
+                # "name",
+                "description",
+                # "chunk_ids",
+                # "document_ids",
+            ],
+        ):
+            try:
+                # TODO - remove this nasty hack
+                search_result["metadata"] = json.loads(
+                    search_result["metadata"]
                 )
-            async for search_result in self.database_provider.graphs_handler.graph_search(  # type: ignore
-                input,
-                search_type=search_type,
-                limit=search_settings.graph_settings.limits.get(
-                    search_type, base_limit
-                ),
-                query_embedding=query_embedding,
-                property_names=[
-                    # "name",
-                    "subject",
-                    "predicate",
-                    "object",
-                    # "name",
-                    "description",
-                    # "chunk_ids",
-                    # "document_ids",
-                ],
-            ):
-                try:
-                    # TODO - remove this nasty hack
-                    search_result["metadata"] = json.loads(
-                        search_result["metadata"]
-                    )
-                except:
-                    pass
+            except:
+                pass
 
-                yield GraphSearchResult(
+            results.append(
+                GraphSearchResult(
                     content=KGRelationshipResult(
                         # name=search_result["name"],
                         subject=search_result["subject"],
@@ -208,28 +250,109 @@ class GraphSearchSearchPipe(GeneratorPipe):
                         else None
                     ),
                 )
+            )
+        return results
 
-            # community search
-            search_type = "communities"
-            async for search_result in self.database_provider.graphs_handler.graph_search(  # type: ignore
-                message,
-                search_type=search_type,
-                limit=search_settings.graph_settings.limits.get(
-                    search_type, base_limit
-                ),
-                # embedding_type="embedding",
+    async def _search_traversal(
+        self,
+        message: str,
+        query_embedding: list[float],
+        search_settings: SearchSettings,
+    ) -> list[GraphSearchResult]:
+        graph_settings = search_settings.graph_settings
+        entities, relationships = (
+            await self.database_provider.graphs_handler.graph_traversal_search(
                 query_embedding=query_embedding,
-                property_names=[
-                    "community_id",
-                    "name",
-                    "findings",
-                    "rating",
-                    "rating_explanation",
-                    "summary",
-                ],
+                num_seeds=graph_settings.traversal_seeds,
+                max_hops=graph_settings.max_hops,
+                hop_decay=graph_settings.hop_decay,
+                entity_limit=self._get_limit("entities", search_settings),
+                relationship_limit=self._get_limit(
+                    "relationships", search_settings
+                ),
                 filters=search_settings.filters,
-            ):
-                yield GraphSearchResult(
+            )
+        )
+
+        results = [
+            GraphSearchResult(
+                content=KGEntityResult(
+                    name=entity["name"],
+                    description=entity["description"],
+                ),
+                result_type=KGSearchResultType.ENTITY,
+                score=(
+                    entity["similarity_score"]
+                    if search_settings.include_scores
+                    else None
+                ),
+                metadata=(
+                    {
+                        "associated_query": message,
+                        "hops": entity["hops"],
+                        **(entity["metadata"] or {}),
+                    }
+                    if search_settings.include_metadatas
+                    else None
+                ),
+            )
+            for entity in entities
+        ]
+        results.extend(
+            GraphSearchResult(
+                content=KGRelationshipResult(
+                    subject=relationship["subject"],
+                    predicate=relationship["predicate"],
+                    object=relationship["object"],
+                    description=relationship["description"],
+                ),
+                result_type=KGSearchResultType.RELATIONSHIP,
+                score=(
+                    relationship["similarity_score"]
+                    if search_settings.include_scores
+                    else None
+                ),
+                metadata=(
+                    {
+                        "associated_query": message,
+                        **(relationship["metadata"] or {}),
+                    }
+                    if search_settings.include_metadatas
+                    else None
+                ),
+            )
+            for relationship in relationships
+        )
+        return results
+
+    async def _search_communities(
+        self,
+        message: str,
+        query_embedding: list[float],
+        search_settings: SearchSettings,
+    ) -> list[GraphSearchResult]:
+        search_type = "communities"
+        results = []
+        async for search_result in self.database_provider.graphs_handler.graph_search(  # type: ignore
+            message,
+            search_type=search_type,
+            limit=search_settings.graph_settings.limits.get(
+                search_type, search_settings.limit
+            ),
+            # embedding_type="embedding",
+            query_embedding=query_embedding,
+            property_names=[
+                "community_id",
+                "name",
+                "findings",
+                "rating",
+                "rating_explanation",
+                "summary",
+            ],
+            filters=search_settings.filters,
+        ):
+            results.append(
+                GraphSearchResult(
                     content=KGCommunityResult(
                         name=search_result["name"],
                         summary=search_result["summary"],
@@ -252,6 +375,8 @@ class GraphSearchSearchPipe(GeneratorPipe):
                         else None
                     ),
                 )
+            )
+        return results
 
     async def _run_logic(  # type: ignore
         self,
@@ -1,4 +1,7 @@
-from copy import copy, deepcopy
+import heapq
+from collections import defaultdict
+from copy import copy
+from operator import itemgetter
 from typing import Any, AsyncGenerator, Optional
 from uuid import UUID
 
@@ -72,78 +75,70 @@ class MultiSearchPipe(AsyncPipe):
             **kwargs,
         )
 
-        if self.config.use_rrf:
-            search_settings.limit = (
-                self.config.expansion_factor * search_settings.limit
-            )
-            results = []
-            async for search_result in await self.vector_search_pipe.run(
-                self.vector_search_pipe.Input(message=query_generator),
-                state,
-                search_settings=search_settings,
-                *args,
-                **kwargs,
-            ):
-                results.append(search_result)
-
-            # Collection results by their associated queries
-            grouped_results: dict[str, list[ChunkSearchResult]] = {}
-            for result in results:
-                query = result.metadata["associated_query"]
-                if query not in grouped_results:
-                    grouped_results[query] = []
-                grouped_results[query].append(result)
-
-            fused_results = self.reciprocal_rank_fusion(grouped_results)
-            for result in fused_results[: search_settings.limit]:
-                yield result
-        else:
-            async for search_result in await self.vector_search_pipe.run(
-                self.vector_search_pipe.Input(message=query_generator),
-                state,
-                search_settings=search_settings,
-                *args,
-                **kwargs,
+        queries = [query async for query in query_generator]
+
+        if not self.config.use_rrf:
+            for results in await self.vector_search_pipe.search_batch(
+                queries, search_settings, *args, **kwargs
             ):
-                yield search_result
+                for result in results:
+                    yield result
+            return
+
+        limit = search_settings.limit
+        expanded_search_settings = search_settings.model_copy(
+            update={"limit": self.config.expansion_factor * limit}
+        )
+        results_per_query = await self.vector_search_pipe.search_batch(
+            queries, expanded_search_settings, *args, **kwargs
+        )
+        for result in self.reciprocal_rank_fusion(
+            dict(zip(queries, results_per_query)), limit
+        ):
+            yield result
 
     def reciprocal_rank_fusion(
-        self, all_results: dict[str, list[ChunkSearchResult]]
+        self,
+        all_results: dict[str, list[ChunkSearchResult]],
+        limit: Optional[int] = None,
     ) -> list[ChunkSearchResult]:
-        document_scores: dict[UUID, float] = {}
-        document_results: dict[UUID, ChunkSearchResult] = {}
-        document_queries: dict[UUID, set[str]] = {}
+        """
+        Fuse the rankings of several queries, scoring each chunk by the sum of
+        1 / (rank + rrf_k) over the queries that retrieved it.
+
+        Scoring only tracks chunk ids and ranks. The top `limit` chunks are
+        then materialized as shallow copies of their first occurrence, carrying
+        the fused score and the queries that retrieved them.
+        """
+        scores: dict[UUID, float] = defaultdict(float)
+        queries: dict[UUID, list[str]] = defaultdict(list)
+        first_seen: dict[UUID, tuple[str, int]] = {}
         for query, results in all_results.items():
             for rank, result in enumerate(results, 1):
-                doc_id = result.chunk_id
-                if doc_id not in document_scores:
-                    document_scores[doc_id] = 0
-                    document_results[doc_id] = result
-                    set_: set[str] = set()
-                    document_queries[doc_id] = set_
-                document_scores[doc_id] += 1 / (rank + self.config.rrf_k)
-                document_queries[doc_id].add(query)  # type: ignore
-
-        # Sort documents by their RRF score
-        sorted_docs = sorted(
-            document_scores.items(), key=lambda x: x[1], reverse=True
-        )
+                scores[result.id] += 1 / (rank + self.config.rrf_k)
+                queries[result.id].append(query)
+                first_seen.setdefault(result.id, (query, rank - 1))
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
 
-        # Reconstruct ChunkSearchResults with new ranking, RRF score, and associated queries
         fused_results = []
-        for doc_id, rrf_score in sorted_docs:
-            result = deepcopy(document_results[doc_id])
-            result.score = (
-                rrf_score  # Replace the original score with the RRF score
+        for chunk_id, rrf_score in ranked:
+            query, position = first_seen[chunk_id]
+            result = all_results[query][position]
+            metadata = {
+                key: value
+                for key, value in result.metadata.items()
+                if key != "associated_query"
+            }
+            metadata["associated_queries"] = queries[chunk_id]
+            metadata["is_rrf_score"] = True
+            fused_results.append(
+                result.model_copy(
+                    update={"score": rrf_score, "metadata": metadata}
+                )
             )
-            result.metadata["associated_queries"] = list(
-                document_queries[doc_id]  # type: ignore
-            )  # Add list of associated queries
-            result.metadata["is_rrf_score"] = True
-            if "associated_query" in result.metadata:
-                del result.metadata[
-                    "associated_query"
-                ]  # Remove the old single associated_query
-            fused_results.append(result)
 
         return fused_results
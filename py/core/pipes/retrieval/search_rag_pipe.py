@@ -7,7 +7,9 @@ from core.base import (
     AsyncState,
     CompletionProvider,
     DatabaseProvider,
-    KGSearchResultType,
+    PackedContext,
+    build_context,
+    count_tokens,
 )
 from core.base.abstractions import GenerationConfig, RAGCompletion
 
@@ -49,17 +51,19 @@ class RAGPipe(GeneratorPipe):
         **kwargs: Any,
     ) -> AsyncGenerator[RAGCompletion, None]:
         context = ""
-        search_iteration = 1
-        total_results = 0
+        citations: dict[int, dict[str, Any]] = {}
+        token_budget = self.llm_provider.config.max_context_tokens
         sel_query = None
         async for query, search_results in input.message:
-            if search_iteration == 1:
+            if sel_query is None:
                 sel_query = query
-            context_piece, total_results = await self._collect_context(
-                query, search_results, search_iteration, total_results
+            packed = await self._collect_context(
+                query, search_results, len(citations) + 1, token_budget
             )
-            context += context_piece
-            search_iteration += 1
+            context += packed.text
+            citations.update(packed.citations)
+            if token_budget is not None:
+                token_budget = max(0, token_budget - packed.num_tokens)
         messages = (
             await self.database_provider.prompts_handler.get_message_payload(
                 system_prompt_name=self.config.system_prompt,
@@ -71,7 +75,11 @@ class RAGPipe(GeneratorPipe):
         response = await self.llm_provider.aget_completion(
             messages=messages, generation_config=rag_generation_config
         )
-        yield RAGCompletion(completion=response, search_results=search_results)
+        yield RAGCompletion(
+            completion=response,
+            search_results=search_results,
+            citations=citations,
+        )
 
         if run_id:
             content = response.choices[0].message.content
@@ -82,40 +90,19 @@ class RAGPipe(GeneratorPipe):
         self,
         query: str,
         results: AggregateSearchResult,
-        iteration: int,
-        total_results: int,
-    ) -> Tuple[str, int]:
-        context = f"Query:\n{query}\n\n"
-        if results.chunk_search_results:
-            context += f"Vector Search Results({iteration}):\n"
-            it = total_results + 1
-            for result in results.chunk_search_results:
-                context += f"[{it}]: {result.text}\n\n"
-                it += 1
-            total_results = (
-                it - 1
-            )  # Update total_results based on the last index used
-        if results.graph_search_results:
-            context += f"Knowledge Graph ({iteration}):\n"
-            it = total_results + 1
-            for search_result in results.graph_search_results:  # [1]:
-                # if associated_query := search_results.metadata.get(
-                #     "associated_query"
-                # ):
-                #     context += f"Query: {associated_query}\n\n"
-                # context += f"Results:\n"
-                if search_result.result_type == KGSearchResultType.ENTITY:
-                    context += f"[{it}]: Entity Name - {search_result.content.name}\n\nDescription - {search_result.content.description}\n\n"
-                elif (
-                    search_result.result_type
-                    == KGSearchResultType.RELATIONSHIP
-                ):
-                    context += f"[{it}]: Relationship - {search_result.content.subject} - {search_result.content.predicate} - {search_result.content.object}\n\n"
-                else:
-                    context += f"[{it}]: Community Name - {search_result.content.name}\n\nDescription - {search_result.content.summary}\n\n"
-
-                it += 1
-            total_results = (
-                it - 1
-            )  # Update total_results based on the last index used
-        return context, total_results
+        start_index: int,
+        max_tokens: Optional[int],
+    ) -> PackedContext:
+        query_text = f"Query:\n{query}\n\n"
+        query_tokens = count_tokens(query_text)
+        if max_tokens is not None:
+            max_tokens = max(0, max_tokens - query_tokens)
+        packed = build_context(
+            results,
+            max_tokens=max_tokens,
+            similarity_threshold=self.llm_provider.config.context_similarity_threshold,
+            start_index=start_index,
+        )
+        packed.text = f"{query_text}{packed.text}\n\n"
+        packed.num_tokens += query_tokens
+        return packed
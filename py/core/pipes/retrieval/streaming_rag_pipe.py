@@ -1,5 +1,7 @@
+import asyncio
+import json
 import logging
-from typing import Any, AsyncGenerator, Generator
+from typing import Any, AsyncGenerator, Generator, Optional
 from uuid import UUID
 
 from core.base import (
@@ -7,7 +9,8 @@ from core.base import (
     CompletionProvider,
     DatabaseProvider,
     LLMChatCompletionChunk,
-    format_search_results_for_llm,
+    StreamingRAGTimings,
+    build_context,
     format_search_results_for_stream,
 )
 from core.base.abstractions import GenerationConfig
@@ -21,6 +24,7 @@ class StreamingRAGPipe(GeneratorPipe):
     CHUNK_SEARCH_STREAM_MARKER = (
         "search"  # TODO - change this to vector_search in next major release
     )
+    CITATIONS_STREAM_MARKER = "citations"
     COMPLETION_STREAM_MARKER = "completion"
 
     def __init__(
@@ -53,30 +57,70 @@ class StreamingRAGPipe(GeneratorPipe):
         *args: Any,
         **kwargs: Any,
     ) -> AsyncGenerator[str, None]:
+        timings: Optional[StreamingRAGTimings] = kwargs.get("rag_timings")
+        system_prompt_name = self.config.system_prompt or "default_system"
+        task_prompt_name = self.config.task_prompt or "default_rag"
+        # Load the prompt templates while the searches are still running
+        preload_prompts = asyncio.create_task(
+            self.database_provider.prompts_handler.preload_prompts(
+                [system_prompt_name, task_prompt_name]
+            )
+        )
+
         context = ""
-        async for query, search_results in input.message:
-            result = format_search_results_for_stream(search_results)
-            yield result
-            gen_context = format_search_results_for_llm(search_results)
-            context += gen_context
+        citations: dict[int, dict[str, Any]] = {}
+        token_budget = self.llm_provider.config.max_context_tokens
+        try:
+            async for query, search_results in input.message:
+                result = format_search_results_for_stream(search_results)
+                yield result
+                packed = build_context(
+                    search_results,
+                    max_tokens=token_budget,
+                    similarity_threshold=self.llm_provider.config.context_similarity_threshold,
+                    start_index=len(citations) + 1,
+                )
+                context += packed.text
+                citations.update(packed.citations)
+                if token_budget is not None:
+                    token_budget = max(0, token_budget - packed.num_tokens)
+        except BaseException:
+            preload_prompts.cancel()
+            raise
+        if timings:
+            timings.mark_retrieval_done()
+
+        yield f"<{self.CITATIONS_STREAM_MARKER}>"
+        yield json.dumps(citations)
+        yield f"</{self.CITATIONS_STREAM_MARKER}>"
+
+        try:
+            await preload_prompts
+        except Exception as e:
+            # Loading the prompts below raises the error that matters
+            logger.warning(f"Failed to preload RAG prompts: {e}")
 
         messages = (
             await self.database_provider.prompts_handler.get_message_payload(
-                system_prompt_name=self.config.system_prompt,
-                task_prompt_name=self.config.task_prompt,
+                system_prompt_name=system_prompt_name,
+                task_prompt_name=task_prompt_name,
                 task_inputs={"query": query, "context": context},
             )
         )
         yield f"<{self.COMPLETION_STREAM_MARKER}>"
         response = ""
-        for chunk in self.llm_provider.get_completion_stream(
+        async for chunk in self.llm_provider.aget_completion_stream(
             messages=messages, generation_config=rag_generation_config
         ):
             chunk_txt = StreamingRAGPipe._process_chunk(chunk)
+            if timings and chunk_txt:
+                timings.mark_first_token()
             response += chunk_txt
             yield chunk_txt
 
         yield f"</{self.COMPLETION_STREAM_MARKER}>"
+        if timings:
+            timings.mark_done()
 
     async def _yield_chunks(
         self,
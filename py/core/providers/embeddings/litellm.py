@@ -15,6 +15,7 @@ from core.base import (
     EmbeddingPurpose,
     R2RException,
 )
+from core.base.providers.embedding import RerankBatcher
 
 logger = logging.getLogger()
 
@@ -55,6 +56,9 @@ class LiteLLMEmbeddingProvider(EmbeddingProvider):
                     "LiteLLMEmbeddingProvider requires a valid reranking API url to be set via `embedding.rerank_url` in the r2r.toml, or via the environment variable `HUGGINGFACE_API_BASE`."
                 )
             self.rerank_url = url
+            self.rerank_batcher = RerankBatcher(
+                self._ascore_texts, window=config.rerank_batch_window
+            )
 
         self.base_model = config.base_model
         if "amazon" in self.base_model:
@@ -239,6 +243,27 @@ class LiteLLMEmbeddingProvider(EmbeddingProvider):
         else:
             return results[:limit]
 
+    async def _ascore_texts(self, query: str, texts: list[str]) -> list[float]:
+        """Score `texts` against `query` with a single rerank service call."""
+        payload = {
+            "query": query,
+            "texts": texts,
+            "model-id": self.config.rerank_model.split("huggingface/")[1],  # type: ignore
+        }
+        headers = {"Content-Type": "application/json"}
+
+        async with ClientSession() as session:
+            async with session.post(
+                self.rerank_url, json=payload, headers=headers  # type: ignore
+            ) as response:
+                response.raise_for_status()
+                reranked_results = await response.json()
+
+        scores = [0.0] * len(texts)
+        for rank_info in reranked_results:
+            scores[rank_info["index"]] = rank_info["score"]
+        return scores
+
     async def arerank(
         self,
         query: str,
@@ -249,6 +274,10 @@ class LiteLLMEmbeddingProvider(EmbeddingProvider):
         """
         Asynchronously rerank search results using the configured rerank model.
 
+        Scores for previously seen (query, chunk) pairs are served from the
+        rerank cache; only unscored pairs are sent to the rerank service,
+        batched together with concurrent requests for the same query.
+
         Args:
             query: The search query string
             results: List of ChunkSearchResult objects to rerank
@@ -264,35 +293,35 @@ class LiteLLMEmbeddingProvider(EmbeddingProvider):
                     "Error, `rerank_url` was expected to be set inside LiteLLMEmbeddingProvider"
                 )
 
-            texts = [result.text for result in results]
+            keys = [
+                self.rerank_cache.key(
+                    self.config.rerank_model, query, result.id, result.text
+                )
+                for result in results
+            ]
+            scores = [self.rerank_cache.get(key) for key in keys]
+            missing = [i for i, score in enumerate(scores) if score is None]
 
-            payload = {
-                "query": query,
-                "texts": texts,
-                "model-id": self.config.rerank_model.split("huggingface/")[1],
-            }
+            try:
+                if missing:
+                    new_scores = await self.rerank_batcher.score(
+                        query, [results[i].text for i in missing]
+                    )
+                    for i, score in zip(missing, new_scores):
+                        scores[i] = score
+                        self.rerank_cache.set(keys[i], score)
 
-            headers = {"Content-Type": "application/json"}
+                # Copy reranked results into new array
+                scored_results = []
+                for result, score in zip(results, scores):
+                    copied_result = copy(result)
+                    # Inject the reranking score into the result object
+                    copied_result.score = score  # type: ignore
+                    scored_results.append(copied_result)
+                scored_results.sort(key=lambda r: r.score, reverse=True)
 
-            try:
-                async with ClientSession() as session:
-                    async with session.post(
-                        self.rerank_url, json=payload, headers=headers
-                    ) as response:
-                        response.raise_for_status()
-                        reranked_results = await response.json()
-
-                        # Copy reranked results into new array
-                        scored_results = []
-                        for rank_info in reranked_results:
-                            original_result = results[rank_info["index"]]
-                            copied_result = copy(original_result)
-                            # Inject the reranking score into the result object
-                            copied_result.score = rank_info["score"]
-                            scored_results.append(copied_result)
-
-                        # Return only the ChunkSearchResult objects, limited to specified count
-                        return scored_results[:limit]
+                # Return only the ChunkSearchResult objects, limited to specified count
+                return scored_results[:limit]
 
             except (ClientError, Exception) as e:
                 logger.error(f"Error during async reranking: {str(e)}")
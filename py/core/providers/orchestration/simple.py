@@ -1,16 +1,65 @@
-from typing import Any
+import asyncio
+import logging
+import os
+import socket
+from typing import Any, Callable, Optional
 
 from core.base import OrchestrationConfig, OrchestrationProvider, Workflow
 
+logger = logging.getLogger()
+
 
 class SimpleOrchestrationProvider(OrchestrationProvider):
     def __init__(self, config: OrchestrationConfig):
         super().__init__(config)
         self.config = config
         self.messages: dict[str, str] = {}
+        self.ingestion_workflows: dict[str, Callable] = {}
+        self.kg_workflows: dict[str, Callable] = {}
+        # Set from the database provider once workflows are registered
+        self.jobs_handler: Optional[Any] = None
+        self.worker_tasks: list[asyncio.Task] = []
+        # Workflows started with `run_workflow_detached`, kept alive until
+        # they finish or the worker stops
+        self.detached_tasks: set[asyncio.Task] = set()
 
     async def start_worker(self):
-        pass
+        if not self.config.queue_workflows:
+            return
+        if self.jobs_handler is None:
+            raise ValueError(
+                "Job queue not initialized. Register workflows before starting workers."
+            )
+
+        default_workers = {
+            Workflow.INGESTION: self.config.ingestion_concurrency_limit,
+            Workflow.KG: self.config.kg_concurrency_limit,
+        }
+        host_id = f"{socket.gethostname()}-{os.getpid()}"
+        for workflow, default_count in default_workers.items():
+            count = self.config.queue_workers.get(
+                workflow.value, default_count
+            )
+            for i in range(count):
+                worker_id = f"{host_id}-{workflow.value}-{i}"
+                self.worker_tasks.append(
+                    asyncio.create_task(self._worker_loop(workflow, worker_id))
+                )
+        logger.info(
+            f"Started {len(self.worker_tasks)} simple orchestration queue workers."
+        )
+
+    async def stop_worker(self) -> None:
+        """
+        Cancel queue workers and detached workflows and wait for them to
+        unwind, so detached workflows can mark their documents as failed.
+        """
+        tasks = [*self.worker_tasks, *self.detached_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.worker_tasks.clear()
+        self.detached_tasks.clear()
 
     def get_worker(self, name: str, max_runs: int) -> Any:
         pass
@@ -30,6 +79,8 @@ class SimpleOrchestrationProvider(OrchestrationProvider):
         for key, msg in messages.items():
             self.messages[key] = msg
 
+        self.jobs_handler = service.providers.database.jobs_handler
+
         if workflow == Workflow.INGESTION:
             from core.main.orchestration import simple_ingestion_factory
 
@@ -46,12 +97,113 @@ class SimpleOrchestrationProvider(OrchestrationProvider):
         self, workflow_name: str, parameters: dict, options: dict
     ) -> dict[str, str]:
         if workflow_name in self.ingestion_workflows:
-            await self.ingestion_workflows[workflow_name](
-                parameters.get("request")
-            )
-            return {"message": self.messages[workflow_name]}
+            workflow = Workflow.INGESTION
         elif workflow_name in self.kg_workflows:
-            await self.kg_workflows[workflow_name](parameters.get("request"))
-            return {"message": self.messages[workflow_name]}
+            workflow = Workflow.KG
         else:
             raise ValueError(f"Workflow '{workflow_name}' not found.")
+
+        if self.config.queue_workflows:
+            job_id = await self.jobs_handler.enqueue_job(  # type: ignore
+                workflow_type=workflow.value,
+                workflow_name=workflow_name,
+                payload=parameters.get("request") or {},
+                max_attempts=self.config.queue_max_attempts,
+            )
+            return {
+                "task_id": str(job_id),
+                "message": "Workflow queued successfully.",
+            }
+
+        await self._get_workflows(workflow)[workflow_name](
+            parameters.get("request")
+        )
+        return {"message": self.messages[workflow_name]}
+
+    def run_workflow_detached(
+        self, workflow_name: str, parameters: dict
+    ) -> None:
+        """
+        Run an ingestion workflow in the background of this process without
+        waiting for it. The workflow is cancelled when the worker stops.
+        """
+        task = asyncio.create_task(
+            self.ingestion_workflows[workflow_name](parameters.get("request"))
+        )
+        self.detached_tasks.add(task)
+        task.add_done_callback(self.detached_tasks.discard)
+
+    def _get_workflows(self, workflow: Workflow) -> dict[str, Callable]:
+        if workflow == Workflow.INGESTION:
+            return self.ingestion_workflows
+        return self.kg_workflows
+
+    async def _worker_loop(self, workflow: Workflow, worker_id: str) -> None:
+        # Consecutive failed iterations, used to back off while the database
+        # is unavailable instead of spinning on errors
+        failures = 0
+        while True:
+            try:
+                job = await self.jobs_handler.lease_job(  # type: ignore
+                    workflow.value,
+                    worker_id,
+                    self.config.queue_visibility_timeout_seconds,
+                )
+                if job is not None:
+                    await self._run_job(workflow, job, worker_id)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.error(f"Worker {worker_id} iteration failed: {e}")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(
+                    self.config.queue_poll_interval_seconds
+                    * 2 ** min(failures, 6)
+                )
+
+    async def _run_job(
+        self, workflow: Workflow, job: dict, worker_id: str
+    ) -> None:
+        if job["attempts"] > job["max_attempts"]:
+            # The previous holder never reported back before its lease expired
+            await self.jobs_handler.fail_job(  # type: ignore
+                job["id"], worker_id, "Lease expired on the final attempt."
+            )
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"], worker_id))
+        try:
+            await self._get_workflows(workflow)[job["workflow_name"]](
+                job["payload"]
+            )
+        except Exception as e:
+            retry_after = None
+            if job["attempts"] < job["max_attempts"]:
+                retry_after = self.config.queue_retry_backoff_seconds * (
+                    2 ** (job["attempts"] - 1)
+                )
+            logger.error(
+                f"Job {job['id']} ({job['workflow_name']}) failed on attempt {job['attempts']}: {e}"
+            )
+            await self.jobs_handler.fail_job(  # type: ignore
+                job["id"], worker_id, str(e), retry_after=retry_after
+            )
+        else:
+            await self.jobs_handler.complete_job(job["id"], worker_id)  # type: ignore
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: Any, worker_id: str) -> None:
+        interval = self.config.queue_visibility_timeout_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.jobs_handler.extend_lease(  # type: ignore
+                    job_id,
+                    worker_id,
+                    self.config.queue_visibility_timeout_seconds,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to extend lease of job {job_id}: {e}")
@@ -1,4 +1,6 @@
 import json
+import os
+import tempfile
 from io import BytesIO
 from typing import Any, AsyncGenerator
 
@@ -101,6 +103,53 @@ class R2RAsyncClient(
                         except:  #  json.JSONDecodeError:
                             yield line
 
+    async def _make_download_request(
+        self,
+        method: str,
+        endpoint: str,
+        output_path: str,
+        version: str = "v2",
+        **kwargs,
+    ) -> int:
+        """
+        Stream a response body into `output_path`, returning its size.
+
+        The body is written to a temporary file next to `output_path` and
+        renamed into place once complete, so a failed download never leaves
+        a partial file behind.
+        """
+        url = self._get_full_url(endpoint, version)
+        request_args = self._prepare_request_args(endpoint, **kwargs)
+
+        written = 0
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(output_path)),
+            prefix=f".{os.path.basename(output_path)}.",
+            suffix=".part",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async with self.client.stream(
+                    method, url, **request_args
+                ) as response:
+                    if response.status_code >= 400:
+                        await response.aread()
+                    await self._handle_response(response)
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+                        written += len(chunk)
+            os.replace(tmp_path, output_path)
+        except httpx.RequestError as e:
+            os.unlink(tmp_path)
+            raise R2RException(
+                status_code=500,
+                message=f"Request failed: {str(e)}",
+            ) from e
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return written
+
     async def _handle_response(self, response):
         if response.status_code >= 400:
             try:
@@ -4,7 +4,11 @@ from typing import Any, Optional
 from uuid import UUID
 
 from shared.api.models.base import WrappedBooleanResponse
-from shared.api.models.ingestion.responses import WrappedIngestionResponse
+from shared.api.models.ingestion.responses import (
+    WrappedBulkIngestionResponse,
+    WrappedIngestionJobResponse,
+    WrappedIngestionResponse,
+)
 from shared.api.models.management.responses import (
     WrappedChunksResponse,
     WrappedCollectionsResponse,
@@ -117,6 +121,99 @@ class DocumentsSDK:
                 version="v3",
             )
 
+    async def create_bulk(
+        self,
+        file_paths: Optional[list[str]] = None,
+        raw_texts: Optional[list[str]] = None,
+        ids: Optional[list[str | UUID]] = None,
+        metadatas: Optional[list[dict]] = None,
+        ingestion_mode: Optional[str] = None,
+        collection_ids: Optional[list[str | UUID]] = None,
+        ingestion_config: Optional[dict | IngestionMode] = None,
+    ) -> WrappedBulkIngestionResponse:
+        """
+        Create many documents in one request from files and/or raw texts.
+
+        Args:
+            file_paths (Optional[list[str]]): The files to upload
+            raw_texts (Optional[list[str]]): Text documents to upload
+            ids (Optional[list[Union[str, UUID]]]): Optional IDs for the files, in the same order
+            metadatas (Optional[list[dict]]): Optional metadata for the files, in the same order
+            collection_ids (Optional[list[Union[str, UUID]]]): Collection IDs to associate with every document
+            ingestion_config (Optional[dict]): Optional ingestion configuration to use
+
+        Returns:
+            dict: The job ID, the accepted document IDs and any rejected files
+        """
+        if not file_paths and not raw_texts:
+            raise ValueError(
+                "Either `file_paths` or `raw_texts` must be provided"
+            )
+
+        data: dict[str, Any] = {}
+        if ids:
+            data["ids"] = json.dumps([str(id) for id in ids])
+        if metadatas:
+            data["metadatas"] = json.dumps(metadatas)
+        if raw_texts:
+            data["manifest"] = json.dumps(
+                [{"raw_text": raw_text} for raw_text in raw_texts]
+            )
+        if ingestion_config:
+            if not isinstance(ingestion_config, dict):
+                ingestion_config = ingestion_config.model_dump()
+            ingestion_config["app"] = {}
+            data["ingestion_config"] = json.dumps(ingestion_config)
+        if collection_ids:
+            data["collection_ids"] = json.dumps(
+                [str(collection_id) for collection_id in collection_ids]
+            )
+        if ingestion_mode is not None:
+            data["ingestion_mode"] = ingestion_mode
+
+        file_instances = [
+            open(file_path, "rb") for file_path in file_paths or []
+        ]
+        try:
+            return await self.client._make_request(
+                "POST",
+                "documents/bulk",
+                data=data,
+                files=[
+                    (
+                        "files",
+                        (file_path, file_instance, "application/octet-stream"),
+                    )
+                    for file_path, file_instance in zip(
+                        file_paths or [], file_instances
+                    )
+                ]
+                or None,
+                version="v3",
+            )
+        finally:
+            for file_instance in file_instances:
+                file_instance.close()
+
+    async def bulk_status(
+        self,
+        job_id: str | UUID,
+    ) -> WrappedIngestionJobResponse:
+        """
+        Get the per-file progress of a bulk ingestion job.
+
+        Args:
+            job_id (Union[str, UUID]): The job ID returned by `create_bulk`
+
+        Returns:
+            dict: The ingestion status of each file in the job
+        """
+        return await self.client._make_request(
+            "GET",
+            f"documents/bulk/{str(job_id)}",
+            version="v3",
+        )
+
     async def retrieve(
         self,
         id: str | UUID,
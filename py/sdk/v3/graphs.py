@@ -227,6 +227,42 @@ class GraphsSDK:
             version="v3",
         )
 
+    async def export(
+        self,
+        collection_id: str | UUID,
+        output_path: str,
+        export_type: str = "relationships",
+        format: str = "ndjson",
+        include_embeddings: bool = False,
+    ) -> int:
+        """
+        Export the entities, relationships or communities of a graph to a
+        file, writing it incrementally as it is streamed from the server.
+
+        Args:
+            collection_id (str | UUID): The collection ID corresponding to the graph
+            output_path (str): The file to write the export to
+            export_type (str): One of `entities`, `relationships` or `communities`. Defaults to `relationships`.
+            format (str): `ndjson` for newline-delimited JSON or `arrow` for an Arrow IPC stream. Defaults to `ndjson`.
+            include_embeddings (bool): Whether to include description embeddings as little-endian float32 bytes. Defaults to False.
+
+        Returns:
+            int: The number of bytes written
+        """
+        params: dict = {
+            "export_type": export_type,
+            "format": format,
+            "include_embeddings": include_embeddings,
+        }
+
+        return await self.client._make_download_request(
+            "GET",
+            f"graphs/{str(collection_id)}/export",
+            output_path,
+            params=params,
+            version="v3",
+        )
+
     async def get_relationship(
         self,
         collection_id: str | UUID,
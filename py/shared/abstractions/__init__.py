@@ -20,6 +20,7 @@ from .exception import (
 )
 from .graph import Community, Entity, KGExtraction, Relationship
 from .kg import (
+    DEFAULT_MAX_TOKENS_PER_EXTRACTION,
     GraphBuildSettings,
     GraphCommunitySettings,
     GraphEntitySettings,
@@ -123,6 +124,7 @@ __all__ = [
     "HybridSearchSettings",
     "SearchMode",
     # KG abstractions
+    "DEFAULT_MAX_TOKENS_PER_EXTRACTION",
     "KGCreationSettings",
     "KGEnrichmentSettings",
     "KGExtraction",
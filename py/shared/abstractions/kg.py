@@ -5,6 +5,9 @@ from pydantic import Field
 from .base import R2RSerializable
 from .llm import GenerationConfig
 
+# Approximate chunk tokens merged into a single KG extraction request
+DEFAULT_MAX_TOKENS_PER_EXTRACTION = 16_384
+
 
 class KGRunType(str, Enum):
     """Type of KG run."""
@@ -65,9 +68,19 @@ class KGCreationSettings(R2RSerializable):
         description="The number of extractions to merge into a single KG extraction.",
     )
 
+    max_tokens_per_extraction: int = Field(
+        default=DEFAULT_MAX_TOKENS_PER_EXTRACTION,
+        description="The approximate number of chunk tokens to merge into a single KG extraction. Set to 0 to merge a fixed `chunk_merge_count` chunks instead.",
+    )
+
+    max_concurrent_extractions: int = Field(
+        default=16,
+        description="The maximum number of KG extraction requests in flight per document.",
+    )
+
     max_knowledge_relationships: int = Field(
         default=100,
-        description="The maximum number of knowledge relationships to extract from each chunk.",
+        description="The maximum number of knowledge relationships to extract from each group of `chunk_merge_count` chunks. Larger token-budgeted groups get a proportionally larger limit.",
     )
 
     max_description_input_length: int = Field(
@@ -104,6 +117,16 @@ class KGEntityDeduplicationSettings(R2RSerializable):
         description="Configuration for text generation during graph entity deduplication.",
     )
 
+    similarity_threshold: float = Field(
+        default=0.9,
+        description="The minimum cosine similarity between two entity descriptions for them to be merged, when deduplicating by description.",
+    )
+
+    max_neighbors: int = Field(
+        default=10,
+        description="The number of nearest neighbours considered as duplicates of each entity, when deduplicating by description.",
+    )
+
 
 class KGEnrichmentSettings(R2RSerializable):
     """Settings for knowledge graph enrichment."""
@@ -134,6 +157,11 @@ class KGEnrichmentSettings(R2RSerializable):
         description="Parameters for the Leiden algorithm.",
     )
 
+    incremental_clustering: bool = Field(
+        default=False,
+        description="Only recluster the parts of the graph whose relationships changed since the last run, and only summarize communities whose membership changed.",
+    )
+
 
 class GraphEntitySettings(R2RSerializable):
     """Settings for knowledge graph entity creation."""
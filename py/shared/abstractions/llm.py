@@ -20,14 +20,17 @@ LLMChatCompletionChunk = ChatCompletionChunk
 class RAGCompletion:
     completion: LLMChatCompletion
     search_results: "AggregateSearchResult"
+    citations: dict[int, dict[str, Any]]
 
     def __init__(
         self,
         completion: LLMChatCompletion,
         search_results: "AggregateSearchResult",
+        citations: Optional[dict[int, dict[str, Any]]] = None,
     ):
         self.completion = completion
         self.search_results = search_results
+        self.citations = citations or {}
 
 
 class GenerationConfig(R2RSerializable):
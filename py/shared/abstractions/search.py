@@ -307,6 +307,26 @@ class GraphSearchSettings(R2RSerializable):
         default=True,
         description="Whether to enable graph search",
     )
+    use_traversal: bool = Field(
+        default=False,
+        description="Whether to expand the nearest entities over relationships, returning their multi-hop neighbourhood instead of only the nearest entities and relationships",
+    )
+    traversal_seeds: int = Field(
+        default=10,
+        description="Number of nearest entities to expand from during traversal",
+    )
+    max_hops: int = Field(
+        default=2,
+        ge=0,
+        le=5,
+        description="Maximum number of relationships to follow from a seed entity during traversal",
+    )
+    hop_decay: float = Field(
+        default=0.5,
+        gt=0,
+        le=1,
+        description="Factor applied to an entity's score for every hop away from its seed",
+    )
 
 
 class SearchSettings(R2RSerializable):
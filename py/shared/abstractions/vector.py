@@ -117,8 +117,7 @@ class VectorTableName(str, Enum):
     CHUNKS = "chunks"
     ENTITIES_DOCUMENT = "documents_entities"
     GRAPHS_ENTITIES = "graphs_entities"
-    # TODO: Add support for relationships
-    # TRIPLES = "relationship"
+    GRAPHS_RELATIONSHIPS = "graphs_relationships"
     COMMUNITIES = "graphs_communities"
 
     def __str__(self) -> str:
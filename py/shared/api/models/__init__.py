@@ -16,7 +16,11 @@ from shared.api.models.graph.responses import (
     WrappedGraphsResponse,
 )
 from shared.api.models.ingestion.responses import (
+    BulkIngestionResponse,
+    IngestionJobResponse,
     IngestionResponse,
+    WrappedBulkIngestionResponse,
+    WrappedIngestionJobResponse,
     WrappedIngestionResponse,
     WrappedMetadataUpdateResponse,
     WrappedUpdateResponse,
@@ -70,6 +74,10 @@ __all__ = [
     # Ingestion Responses
     "IngestionResponse",
     "WrappedIngestionResponse",
+    "BulkIngestionResponse",
+    "WrappedBulkIngestionResponse",
+    "IngestionJobResponse",
+    "WrappedIngestionJobResponse",
     "WrappedUpdateResponse",
     "WrappedMetadataUpdateResponse",
     # TODO: Need to review anything above this
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, Optional, TypeVar
 from uuid import UUID
 
@@ -56,6 +57,75 @@ class UpdateResponse(BaseModel):
         }
 
 
+class BulkIngestionResponse(BaseModel):
+    message: str = Field(
+        ...,
+        description="A message describing the result of the bulk ingestion request.",
+    )
+    job_id: Optional[UUID] = Field(
+        None,
+        description="The ID of the job tracking the accepted files.",
+    )
+    document_ids: list[UUID] = Field(
+        ...,
+        description="The IDs of the documents accepted for ingestion.",
+    )
+    rejected: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Files that were not accepted, with the reason for each.",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "message": "Bulk ingestion task queued successfully.",
+                "job_id": "c68dc72e-fc23-5452-8f49-d7bd46088a96",
+                "document_ids": ["9fbe403b-c11c-5aae-8ade-ef22980c3ad1"],
+                "rejected": [],
+            }
+        }
+
+
+class IngestionJobResponse(BaseModel):
+    job_id: UUID = Field(
+        ...,
+        description="The ID of the bulk ingestion job.",
+    )
+    owner_id: Optional[UUID] = Field(
+        None,
+        description="The ID of the user that submitted the job.",
+    )
+    created_at: Optional[datetime] = Field(
+        None,
+        description="When the job was submitted.",
+    )
+    status_counts: dict[str, int] = Field(
+        ...,
+        description="The number of files in each ingestion status.",
+    )
+    documents: list[dict[str, Any]] = Field(
+        ...,
+        description="The ingestion status of each file in the job.",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "c68dc72e-fc23-5452-8f49-d7bd46088a96",
+                "owner_id": "2acb499e-8428-543b-bd85-0d9098718220",
+                "created_at": "2024-01-01T00:00:00Z",
+                "status_counts": {"success": 1, "parsing": 1},
+                "documents": [
+                    {
+                        "document_id": "9fbe403b-c11c-5aae-8ade-ef22980c3ad1",
+                        "title": "pg_essay_1.html",
+                        "ingestion_status": "success",
+                    }
+                ],
+            }
+        }
+
+
 # TODO: This can probably be cleaner
 class ListVectorIndicesResponse(BaseModel):
     indices: list[dict[str, Any]]
@@ -64,6 +134,8 @@ class ListVectorIndicesResponse(BaseModel):
 WrappedIngestionResponse = R2RResults[IngestionResponse]
 WrappedMetadataUpdateResponse = R2RResults[IngestionResponse]
 WrappedUpdateResponse = R2RResults[UpdateResponse]
+WrappedBulkIngestionResponse = R2RResults[BulkIngestionResponse]
+WrappedIngestionJobResponse = R2RResults[IngestionJobResponse]
 
 WrappedListVectorIndicesResponse = PaginatedR2RResult[
     ListVectorIndicesResponse
@@ -37,6 +37,8 @@ class ServerStats(BaseModel):
     uptime_seconds: float
     cpu_usage: float
     memory_usage: float
+    # Per metric latency summary of recent streaming RAG requests, in seconds
+    streaming_rag_latency: dict[str, dict[str, float]] = {}
 
 
 class AnalyticsResponse(BaseModel):
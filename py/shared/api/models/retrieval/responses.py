@@ -39,6 +39,10 @@ class RAGResponse(BaseModel):
         ...,
         description="The search results used for the RAG process",
     )
+    citations: dict[int, dict[str, Any]] = Field(
+        default_factory=dict,
+        description="The search result behind each numbered source in the context",
+    )
 
     class Config:
         json_schema_extra = {
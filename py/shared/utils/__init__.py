@@ -11,17 +11,25 @@ from .base_utils import (
     generate_extraction_id,
     generate_id,
     generate_user_id,
+    group_chunks,
     increment_version,
     llm_cost_per_million_tokens,
+    run_bounded,
     run_pipeline,
+    scale_group_limit,
     to_async_generator,
     validate_uuid,
 )
+from .context_builder import PackedContext, build_context, count_tokens
 from .splitter.text import RecursiveCharacterTextSplitter, TextSplitter
 
 __all__ = [
     "format_search_results_for_stream",
     "format_search_results_for_llm",
+    # Context packing
+    "build_context",
+    "count_tokens",
+    "PackedContext",
     # ID generation
     "generate_id",
     "generate_document_id",
@@ -29,6 +37,10 @@ __all__ = [
     "generate_default_user_collection_id",
     "generate_user_id",
     "generate_default_prompt_id",
+    # Async helpers
+    "group_chunks",
+    "run_bounded",
+    "scale_group_limit",
     # Other
     "increment_version",
     "decrement_version",
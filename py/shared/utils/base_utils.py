@@ -7,103 +7,32 @@ from typing import (
     TYPE_CHECKING,
     Any,
     AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
     Iterable,
     Optional,
     TypeVar,
 )
 from uuid import NAMESPACE_DNS, UUID, uuid4, uuid5
 
-from ..abstractions.search import (
-    AggregateSearchResult,
-    KGCommunityResult,
-    KGEntityResult,
-    KGGlobalResult,
-    KGRelationshipResult,
-)
+from ..abstractions.search import AggregateSearchResult
 from ..abstractions.vector import VectorQuantizationType
+from .context_builder import DEFAULT_SIMILARITY_THRESHOLD, build_context
 
 logger = logging.getLogger()
 
 
-def format_search_results_for_llm(results: AggregateSearchResult) -> str:
-    formatted_results = []
-    source_counter = 1
-
-    if results.chunk_search_results:
-        formatted_results.append("Vector Search Results:")
-        for result in results.chunk_search_results:
-            formatted_results.extend(
-                (f"Source [{source_counter}]:", f"{result.text}")
-            )
-            source_counter += 1
-
-    if results.graph_search_results:
-        formatted_results.append("KG Search Results:")
-        for kg_result in results.graph_search_results:
-            try:
-                formatted_results.extend((f"Source [{source_counter}]:",))
-            except AttributeError:
-                raise ValueError(f"Invalid KG search result: {kg_result}")
-                # formatted_results.extend(
-                #     (
-                #         f"Source [{source_counter}]:",
-                #         f"Type: {kg_result.content.type}",
-                #     )
-                # )
-
-            if isinstance(kg_result.content, KGCommunityResult):
-                formatted_results.extend(
-                    (
-                        f"Name: {kg_result.content.name}",
-                        f"Summary: {kg_result.content.summary}",
-                        # f"Rating: {kg_result.content.rating}",
-                        # f"Rating Explanation: {kg_result.content.rating_explanation}",
-                        # "Findings:",
-                    )
-                )
-                # formatted_results.append(
-                #     f"- {finding}" for finding in kg_result.content.findings
-                # )
-            elif isinstance(
-                kg_result.content,
-                KGEntityResult,
-            ):
-                formatted_results.extend(
-                    [
-                        f"Name: {kg_result.content.name}",
-                        f"Description: {kg_result.content.description}",
-                    ]
-                )
-            elif isinstance(kg_result.content, KGRelationshipResult):
-                formatted_results.append(
-                    f"Relationship: {kg_result.content.subject} - {kg_result.content.predicate} - {kg_result.content.object}",
-                    # f"Description: {kg_result.content.description}"
-                )
-
-            if kg_result.metadata:
-                formatted_results.append("Metadata:")
-                formatted_results.extend(
-                    f"- {key}: {value}"
-                    for key, value in kg_result.metadata.items()
-                )
-
-            source_counter += 1
-    if results.web_search_results:
-        formatted_results.append("Web Search Results:")
-        for result in results.web_search_results:
-            formatted_results.extend(
-                (
-                    f"Source [{source_counter}]:",
-                    f"Title: {result.title}",
-                    f"Link: {result.link}",
-                    f"Snippet: {result.snippet}",
-                )
-            )
-            if result.date:
-                formatted_results.append(f"Date: {result.date}")
-            source_counter += 1
-
-    return "\n".join(formatted_results)
+def format_search_results_for_llm(
+    results: AggregateSearchResult,
+    max_tokens: Optional[int] = None,
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+) -> str:
+    return build_context(
+        results,
+        max_tokens=max_tokens,
+        similarity_threshold=similarity_threshold,
+    ).text
 
 
 def format_search_results_for_stream(result: AggregateSearchResult) -> str:
@@ -141,6 +70,7 @@ def format_search_results_for_stream(result: AggregateSearchResult) -> str:
 
 
 if TYPE_CHECKING:
+    from ..abstractions.document import DocumentChunk
     from ..pipeline.base_pipeline import AsyncPipeline
 
 
@@ -214,6 +144,94 @@ async def to_async_generator(
         yield item
 
 
+# Rough characters-per-token ratio for English text, used for budgeting only
+CHARS_PER_TOKEN = 4
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def group_chunks(
+    chunks: AsyncIterable["DocumentChunk"],
+    max_tokens: int,
+    max_chunks: int,
+) -> AsyncGenerator[list["DocumentChunk"], None]:
+    """
+    Merge consecutive chunks into groups of about `max_tokens` tokens.
+
+    A chunk larger than the budget forms a group on its own. With a budget of
+    0, groups of `max_chunks` chunks are formed instead.
+    """
+    group: list["DocumentChunk"] = []
+    group_tokens = 0
+    async for chunk in chunks:
+        tokens = len(chunk.data) // CHARS_PER_TOKEN  # type: ignore
+        if group and (
+            group_tokens + tokens > max_tokens
+            if max_tokens > 0
+            else len(group) >= max_chunks
+        ):
+            yield group
+            group, group_tokens = [], 0
+        group.append(chunk)
+        group_tokens += tokens
+    if group:
+        yield group
+
+
+def scale_group_limit(
+    limit: int, group_size: int, chunks_per_group: int
+) -> int:
+    """
+    Scale a per-extraction `limit` tuned for `chunks_per_group` chunks to a
+    group of `group_size` chunks.
+
+    Token-budgeted groups can hold many more chunks than the fixed groups the
+    limit was tuned for; without scaling, a capped extraction over a large
+    group would recall fewer relationships per chunk.
+    """
+    chunks_per_group = max(chunks_per_group, 1)
+    return limit * max(-(-group_size // chunks_per_group), 1)
+
+
+async def run_bounded(
+    items: AsyncIterable[T],
+    fn: Callable[[int, T], Awaitable[R]],
+    limit: int,
+) -> AsyncGenerator[asyncio.Task[R], None]:
+    """
+    Run `fn(index, item)` over `items` with at most `limit` calls in flight,
+    yielding each finished task as it completes.
+
+    Items are only pulled from `items` when a slot frees up, so producers are
+    never read ahead of the work. Calls still in flight are cancelled if
+    the caller stops iterating early or raises.
+    """
+    pending: set[asyncio.Task[R]] = set()
+    index = 0
+    try:
+        async for item in items:
+            if len(pending) >= limit:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task
+            pending.add(asyncio.create_task(fn(index, item)))  # type: ignore
+            index += 1
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task
+    finally:
+        # The consumer stopped early or failed; don't leave calls running
+        for task in pending:
+            task.cancel()
+
+
 def run_pipeline(pipeline: "AsyncPipeline", input: Any, *args, **kwargs):
     if not isinstance(input, AsyncGenerator):
         if not isinstance(input, list):
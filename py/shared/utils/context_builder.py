@@ -0,0 +1,293 @@
+"""
+Token-budgeted context packing for retrieval-augmented generation.
+
+Search results are rendered into numbered sources. Near-identical sources are
+dropped, and the highest ranked ones are kept until the token budget is
+spent. Sections score on different scales (fused or reranked chunk scores,
+cosine similarities for graph results), so sources are ranked by their
+percentile within their own section. The citation map records which search result each source number
+refers to, so answers citing `[n]` can be traced back to their chunks.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from ..abstractions.search import (
+    AggregateSearchResult,
+    KGCommunityResult,
+    KGEntityResult,
+    KGRelationshipResult,
+)
+
+logger = logging.getLogger()
+
+DEFAULT_TOKEN_ENCODING = "cl100k_base"
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+# Roughly covers the `Source [n]:` line that precedes every source
+SOURCE_OVERHEAD_TOKENS = 6
+SHINGLE_SIZE = 3
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(encoding_name: str) -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # tiktoken may be missing or unable to fetch its BPE ranks offline
+        logger.warning(
+            f"Tokenizer {encoding_name} unavailable, estimating token counts: {e}"
+        )
+        return None
+
+
+def count_tokens(
+    text: str, encoding_name: str = DEFAULT_TOKEN_ENCODING
+) -> int:
+    """Count the tokens in `text`, estimating four characters per token when no tokenizer is available."""
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@dataclass
+class PackedContext:
+    """Context text for the LLM along with the sources it cites."""
+
+    text: str
+    citations: dict[int, dict[str, Any]] = field(default_factory=dict)
+    num_tokens: int = 0
+    num_duplicates: int = 0
+    num_truncated: int = 0
+
+
+@dataclass
+class _Source:
+    section: int
+    position: int
+    body: str
+    score: Optional[float]
+    citation: dict[str, Any]
+    shingles: frozenset[int]
+
+
+def _shingles(text: str) -> frozenset[int]:
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return frozenset([hash(" ".join(words))])
+    return frozenset(
+        hash(" ".join(words[i : i + SHINGLE_SIZE]))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    )
+
+
+def _is_duplicate(
+    shingles: frozenset[int],
+    kept: list[frozenset[int]],
+    similarity_threshold: float,
+) -> bool:
+    for other in kept:
+        union = len(shingles | other)
+        if union and len(shingles & other) / union >= similarity_threshold:
+            return True
+    return False
+
+
+def _section_percentiles(sources: list[_Source]) -> dict[int, float]:
+    """
+    Map each scored source's position to its percentile within its section,
+    1.0 for the best. Equal scores share a percentile.
+    """
+    by_section: dict[int, list[_Source]] = {}
+    for source in sources:
+        if source.score is not None:
+            by_section.setdefault(source.section, []).append(source)
+
+    percentiles: dict[int, float] = {}
+    for section_sources in by_section.values():
+        section_sources.sort(key=lambda s: -s.score)  # type: ignore
+        previous_score, value = None, 1.0
+        for rank, source in enumerate(section_sources):
+            if source.score != previous_score:
+                previous_score = source.score
+                value = 1.0 - rank / len(section_sources)
+            percentiles[source.position] = value
+    return percentiles
+
+
+def _collect_sources(
+    results: AggregateSearchResult,
+) -> tuple[list[str], list[_Source]]:
+    headers: list[str] = []
+    sources: list[_Source] = []
+
+    def add(body: str, score: Optional[float], citation: dict[str, Any]):
+        sources.append(
+            _Source(
+                section=len(headers) - 1,
+                position=len(sources),
+                body=body,
+                score=score,
+                citation=citation,
+                shingles=_shingles(body),
+            )
+        )
+
+    if results.chunk_search_results:
+        headers.append("Vector Search Results:")
+        for chunk in results.chunk_search_results:
+            add(
+                chunk.text,
+                chunk.score,
+                {
+                    "type": "chunk",
+                    "id": str(chunk.id),
+                    "document_id": str(chunk.document_id),
+                },
+            )
+
+    if results.graph_search_results:
+        headers.append("KG Search Results:")
+        for graph_result in results.graph_search_results:
+            content = graph_result.content
+            citation: dict[str, Any] = {"type": "graph"}
+            if isinstance(content, KGCommunityResult):
+                lines = [
+                    f"Name: {content.name}",
+                    f"Summary: {content.summary}",
+                ]
+                citation.update(type="community", name=content.name)
+            elif isinstance(content, KGEntityResult):
+                lines = [
+                    f"Name: {content.name}",
+                    f"Description: {content.description}",
+                ]
+                citation.update(type="entity", name=content.name)
+            elif isinstance(content, KGRelationshipResult):
+                lines = [
+                    f"Relationship: {content.subject} - {content.predicate} - {content.object}"
+                ]
+                citation.update(
+                    type="relationship",
+                    subject=content.subject,
+                    predicate=content.predicate,
+                    object=content.object,
+                )
+            else:
+                raise ValueError(f"Invalid KG search result: {graph_result}")
+
+            if graph_result.metadata:
+                lines.append("Metadata:")
+                lines.extend(
+                    f"- {key}: {value}"
+                    for key, value in graph_result.metadata.items()
+                )
+            if graph_result.chunk_ids:
+                citation["chunk_ids"] = [
+                    str(chunk_id) for chunk_id in graph_result.chunk_ids
+                ]
+            add("\n".join(lines), graph_result.score, citation)
+
+    if results.web_search_results:
+        headers.append("Web Search Results:")
+        for web_result in results.web_search_results:
+            lines = [
+                f"Title: {web_result.title}",
+                f"Link: {web_result.link}",
+                f"Snippet: {web_result.snippet}",
+            ]
+            if web_result.date:
+                lines.append(f"Date: {web_result.date}")
+            add(
+                "\n".join(lines),
+                None,
+                {
+                    "type": "web",
+                    "title": web_result.title,
+                    "link": web_result.link,
+                },
+            )
+
+    return headers, sources
+
+
+def build_context(
+    results: AggregateSearchResult,
+    max_tokens: Optional[int] = None,
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    start_index: int = 1,
+    encoding_name: str = DEFAULT_TOKEN_ENCODING,
+) -> PackedContext:
+    """
+    Pack search results into numbered sources within `max_tokens`.
+
+    Sources are considered best first by their score's percentile within
+    their section, with unscored results following in search order. A source whose word shingles overlap an already kept one
+    by at least `similarity_threshold` (Jaccard) is dropped, as is any source
+    that no longer fits the budget. Kept sources are rendered in search order
+    and numbered from `start_index`.
+    """
+    headers, sources = _collect_sources(results)
+    percentiles = _section_percentiles(sources)
+    ranked = sorted(
+        sources,
+        key=lambda s: (
+            s.position not in percentiles,
+            -percentiles.get(s.position, 0.0),
+            s.position,
+        ),
+    )
+
+    kept: list[_Source] = []
+    kept_shingles: list[frozenset[int]] = []
+    used_sections: set[int] = set()
+    num_tokens = num_duplicates = num_truncated = 0
+    for source in ranked:
+        if _is_duplicate(source.shingles, kept_shingles, similarity_threshold):
+            num_duplicates += 1
+            continue
+
+        cost = (
+            count_tokens(source.body, encoding_name) + SOURCE_OVERHEAD_TOKENS
+        )
+        if source.section not in used_sections:
+            cost += count_tokens(headers[source.section], encoding_name)
+        if max_tokens is not None and num_tokens + cost > max_tokens:
+            num_truncated += 1
+            continue
+
+        kept.append(source)
+        kept_shingles.append(source.shingles)
+        used_sections.add(source.section)
+        num_tokens += cost
+
+    if num_duplicates or num_truncated:
+        logger.debug(
+            f"Packed {len(kept)} sources into {num_tokens} tokens, dropping {num_duplicates} duplicates and {num_truncated} over budget"
+        )
+
+    lines: list[str] = []
+    citations: dict[int, dict[str, Any]] = {}
+    section = None
+    for source in sorted(kept, key=lambda s: s.position):
+        if source.section != section:
+            section = source.section
+            lines.append(headers[section])
+        index = start_index + len(citations)
+        lines.extend((f"Source [{index}]:", source.body))
+        citations[index] = {**source.citation, "score": source.score}
+
+    return PackedContext(
+        text="\n".join(lines),
+        citations=citations,
+        num_tokens=num_tokens,
+        num_duplicates=num_duplicates,
+        num_truncated=num_truncated,
+    )
@@ -250,3 +250,37 @@ def test_error_handling(client):
         422,
         404,
     ], "Expected an error for invalid ID."
+
+
+def test_pull_relinks_relationships_to_graph_entities(client, test_collection):
+    collection_id = test_collection
+    doc_id = client.documents.create(
+        raw_text=(
+            "Aristotle was a student of Plato. Plato founded the Academy "
+            "in Athens, where Aristotle studied for twenty years."
+        ),
+        run_with_orchestration=False,
+    )["results"]["document_id"]
+    try:
+        client.documents.extract(id=doc_id, run_with_orchestration=False)
+        client.collections.add_document(id=collection_id, document_id=doc_id)
+        client.graphs.pull(collection_id=collection_id)
+
+        entity_ids = {
+            entity["id"]
+            for entity in client.graphs.list_entities(
+                collection_id=collection_id, limit=100
+            )["results"]
+        }
+        relationships = client.graphs.list_relationships(
+            collection_id=collection_id, limit=100
+        )["results"]
+        assert relationships, "Pull copied no relationships"
+        for relationship in relationships:
+            for key in ("subject_id", "object_id"):
+                if relationship.get(key) is not None:
+                    assert (
+                        relationship[key] in entity_ids
+                    ), f"{key} points outside the graph's entities"
+    finally:
+        client.documents.delete(id=doc_id)
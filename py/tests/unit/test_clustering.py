@@ -0,0 +1,162 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from core.database import clustering
+from core.database.clustering import (
+    GraphEdges,
+    GraphEdgesBuilder,
+    cluster_graph_edges,
+    decode_community_assignments,
+    encode_graph_edges,
+)
+
+
+def build(*edges) -> GraphEdges:
+    builder = GraphEdgesBuilder()
+    for edge in edges:
+        builder.add_edge(*edge)
+    return builder.build()
+
+
+def test_builder_interns_node_names():
+    edges = build(("a", "b"), ("b", "c"), ("c", "a"))
+
+    assert edges.nodes == ["a", "b", "c"]
+    assert edges.sources.tolist() == [0, 1, 2]
+    assert edges.targets.tolist() == [1, 2, 0]
+    assert edges.sources.dtype == edges.targets.dtype == np.int32
+    assert edges.weights.dtype == np.float32
+
+
+def test_builder_collapses_repeated_and_reversed_pairs():
+    edges = build(("a", "b", 0.5), ("b", "c"), ("b", "a", 2.0))
+
+    pairs = {
+        frozenset((edges.nodes[s], edges.nodes[t])): w
+        for s, t, w in zip(
+            edges.sources.tolist(),
+            edges.targets.tolist(),
+            edges.weights.tolist(),
+        )
+    }
+    assert len(edges) == 2
+    # The last occurrence wins, and a missing weight defaults to 1.0
+    assert pairs == {frozenset("ab"): 2.0, frozenset("bc"): 1.0}
+
+
+def test_empty_builder_builds_an_empty_graph():
+    edges = GraphEdgesBuilder().build()
+
+    assert len(edges) == 0
+    assert edges.nodes == []
+    assert edges.connected_components().tolist() == []
+
+
+def test_connected_components_label_by_smallest_node():
+    # A long path exercises the label shortcutting
+    path = [(f"p{i}", f"p{i + 1}") for i in range(50)]
+    edges = build(*path, ("x", "y"), ("y", "z"))
+
+    labels = edges.connected_components()
+
+    path_nodes = [edges.nodes.index(f"p{i}") for i in range(51)]
+    assert set(labels[path_nodes].tolist()) == {0}
+    assert labels[edges.nodes.index("z")] == edges.nodes.index("x")
+    assert len(set(labels.tolist())) == 2
+
+
+def test_connected_components_keep_isolated_nodes_apart():
+    edges = build(("a", "b"), ("c", "d"))
+    # Drop the (c, d) edge so both endpoints become isolated
+    edges = edges.subgraph(np.array([True, True, False, True]))
+
+    assert edges.connected_components().tolist() == [0, 0, 2, 3]
+
+
+def test_subgraph_keeps_edges_with_both_endpoints_selected():
+    edges = build(("a", "b", 0.5), ("b", "c", 1.5), ("c", "d", 2.5))
+
+    sub = edges.subgraph(np.array([False, True, True, True]))
+
+    assert sub.nodes is edges.nodes
+    assert sub.sources.tolist() == [1, 2]
+    assert sub.targets.tolist() == [2, 3]
+    assert sub.weights.tolist() == [1.5, 2.5]
+
+
+def test_encoded_graph_uses_a_portable_layout():
+    edges = build(("a", "b", 0.5), ("b", "c"))
+
+    payload = encode_graph_edges(edges, {"max_cluster_size": 10})
+
+    with np.load(BytesIO(payload), allow_pickle=False) as data:
+        assert data["num_nodes"].tolist() == [3]
+        assert data["sources"].dtype == np.dtype("<i4")
+        assert data["weights"].dtype == np.dtype("<f4")
+        assert data["sources"].tolist() == edges.sources.tolist()
+        assert data["weights"].tolist() == edges.weights.tolist()
+        params = data["leiden_params"].tobytes()
+    assert params == b'{"max_cluster_size": 10}'
+
+
+def test_decoded_assignments_refer_back_to_node_names():
+    buffer = BytesIO()
+    np.savez_compressed(
+        buffer,
+        node=np.array([0, 1, 2], dtype="<i4"),
+        cluster=np.array([0, 0, 1], dtype="<i4"),
+        level=np.array([0, 0, 0], dtype="<i4"),
+    )
+
+    assignments = decode_community_assignments(
+        buffer.getvalue(), ["a", "b", "c"]
+    )
+
+    assert assignments.num_communities == 2
+    assert assignments.clusters() == [(0, ["a", "b"]), (0, ["c"])]
+
+
+async def test_cluster_empty_graph_skips_the_process_pool(monkeypatch):
+    monkeypatch.setattr(clustering, "_get_executor", None)
+
+    assignments = await cluster_graph_edges(GraphEdgesBuilder().build(), {})
+
+    assert len(assignments) == 0
+    assert assignments.num_communities == 0
+
+
+def test_executor_spawns_worker_processes(monkeypatch):
+    monkeypatch.setattr(clustering, "_executor", None)
+
+    executor = clustering._get_executor()
+    try:
+        assert executor._mp_context.get_start_method() == "spawn"
+        assert clustering._get_executor() is executor
+    finally:
+        executor.shutdown()
+
+
+async def test_cluster_graph_edges_in_spawned_worker(monkeypatch):
+    pytest.importorskip("graspologic")
+    monkeypatch.setattr(clustering, "_executor", None)
+    # Two triangles joined by a single bridge
+    edges = build(
+        ("a", "b"),
+        ("b", "c"),
+        ("c", "a"),
+        ("x", "y"),
+        ("y", "z"),
+        ("z", "x"),
+        ("c", "x", 0.1),
+    )
+
+    try:
+        assignments = await cluster_graph_edges(edges, {"max_cluster_size": 3})
+    finally:
+        clustering._executor.shutdown()
+
+    clusters = sorted(sorted(names) for _, names in assignments.clusters())
+    assert clusters == [["a", "b", "c"], ["x", "y", "z"]]
+    assert assignments.nodes is edges.nodes
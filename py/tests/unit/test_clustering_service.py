@@ -0,0 +1,212 @@
+import asyncio
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+import numpy as np
+import pytest
+
+from core.base.abstractions import VectorQuantizationType
+from core.database import graphs
+from core.database.clustering import (
+    GraphEdgesBuilder,
+    decode_community_assignments,
+    encode_graph_edges,
+)
+
+pytest.importorskip("graspologic")
+pytest.importorskip("networkx")
+
+SERVICE_PATH = (
+    Path(__file__).parents[3] / "services" / "clustering" / "main.py"
+)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    spec = importlib.util.spec_from_file_location(
+        "clustering_service", SERVICE_PATH
+    )
+    service = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(service)
+    service.executor.shutdown()
+    # Threads keep the jobs observable from the test process
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(service, "executor", executor)
+    yield service
+    executor.shutdown(cancel_futures=True)
+
+
+@pytest.fixture
+def client(service):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=service.app),
+        base_url="http://clustering",
+    )
+
+
+@pytest.fixture
+def blocked(service, monkeypatch):
+    """Make every job wait until the returned event is set."""
+    release = threading.Event()
+
+    def cluster_edges(*args):
+        release.wait(timeout=10)
+        return b""
+
+    monkeypatch.setattr(service, "cluster_edges", cluster_edges)
+    yield release
+    release.set()
+
+
+def two_triangles():
+    builder = GraphEdgesBuilder()
+    for subject, object in [
+        ("a", "b"),
+        ("b", "c"),
+        ("c", "a"),
+        ("x", "y"),
+        ("y", "z"),
+        ("z", "x"),
+    ]:
+        builder.add_edge(subject, object)
+    builder.add_edge("c", "x", 0.1)
+    return builder.build()
+
+
+async def submit(client, edges=None, leiden_params=None) -> str:
+    payload = encode_graph_edges(
+        edges or two_triangles(), leiden_params or {"max_cluster_size": 3}
+    )
+    response = await client.post("/jobs", content=payload)
+    assert response.status_code == 200
+    return response.json()["job_id"]
+
+
+async def wait_for(client, job_id) -> dict:
+    for _ in range(500):
+        job = (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] != "running":
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+async def test_job_round_trips_npz_payloads(client):
+    edges = two_triangles()
+
+    job_id = await submit(client, edges)
+    job = await wait_for(client, job_id)
+    response = await client.get(f"/jobs/{job_id}/result")
+
+    assert job == {"job_id": job_id, "status": "completed", "error": None}
+    assert response.headers["content-type"] == "application/octet-stream"
+    assignments = decode_community_assignments(response.content, edges.nodes)
+    clusters = sorted(sorted(names) for _, names in assignments.clusters())
+    assert clusters == [["a", "b", "c"], ["x", "y", "z"]]
+
+
+async def test_submit_rejects_malformed_payloads(client):
+    response = await client.post("/jobs", content=b"not an npz")
+    assert response.status_code == 400
+
+    buffer = BytesIO()
+    np.savez_compressed(
+        buffer,
+        sources=np.array([0, 1], dtype="<i4"),
+        targets=np.array([1], dtype="<i4"),
+        weights=np.array([1.0], dtype="<f4"),
+        leiden_params=np.frombuffer(b"{}", dtype=np.uint8),
+    )
+    response = await client.post("/jobs", content=buffer.getvalue())
+    assert response.status_code == 400
+
+
+async def test_failed_job_reports_its_error(service, client, monkeypatch):
+    def cluster_edges(*args):
+        raise ValueError("bad graph")
+
+    monkeypatch.setattr(service, "cluster_edges", cluster_edges)
+
+    job_id = await submit(client)
+    job = await wait_for(client, job_id)
+
+    assert job["status"] == "failed"
+    assert job["error"] == "bad graph"
+    response = await client.get(f"/jobs/{job_id}/result")
+    assert response.status_code == 409
+
+
+async def test_result_of_running_job_is_a_conflict(client, blocked):
+    job_id = await submit(client)
+
+    response = await client.get(f"/jobs/{job_id}/result")
+
+    assert response.status_code == 409
+
+
+async def test_cancelled_queued_job_never_runs(service, client, blocked):
+    running = await submit(client)
+    queued = await submit(client)
+
+    response = await client.delete(f"/jobs/{queued}")
+    blocked.set()
+
+    assert response.json() == {"job_id": queued, "status": "cancelled"}
+    assert (await client.get(f"/jobs/{queued}")).status_code == 404
+    assert (await wait_for(client, running))["status"] == "completed"
+    assert list(service.jobs) == [running]
+
+
+async def test_cancelled_running_job_discards_its_result(
+    service, client, blocked
+):
+    job_id = await submit(client)
+    future = service.jobs[job_id]["future"]
+
+    response = await client.delete(f"/jobs/{job_id}")
+    blocked.set()
+    await asyncio.sleep(0.05)
+
+    assert response.status_code == 200
+    assert future.cancelled()
+    assert service.jobs == {}
+    assert (await client.delete(f"/jobs/{job_id}")).status_code == 404
+
+
+async def test_expired_jobs_are_forgotten(service, client, monkeypatch):
+    job_id = await submit(client)
+    await wait_for(client, job_id)
+    monkeypatch.setattr(service, "JOB_TTL_SECONDS", -1)
+
+    await submit(client)
+
+    assert job_id not in service.jobs
+
+
+async def test_client_cancels_job_after_timeout(service, blocked, monkeypatch):
+    transport = httpx.ASGITransport(app=service.app)
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        graphs.httpx,
+        "AsyncClient",
+        lambda **kwargs: async_client(transport=transport, **kwargs),
+    )
+    monkeypatch.setenv("CLUSTERING_SERVICE_URL", "http://clustering")
+    monkeypatch.setenv("CLUSTERING_SERVICE_JOB_TIMEOUT", "0")
+    handler = graphs.PostgresGraphsHandler(
+        project_name="test",
+        connection_manager=MagicMock(),
+        dimension=2,
+        quantization_type=VectorQuantizationType.FP32,
+        collections_handler=None,
+    )
+
+    with pytest.raises(TimeoutError):
+        await handler._call_clustering_service(two_triangles(), {})
+
+    assert service.jobs == {}
@@ -0,0 +1,132 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.base import AppConfig
+from core.base.abstractions import GenerationConfig, LLMChatCompletion
+from core.base.providers.llm import CompletionConfig, CompletionProvider
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "openai/gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "Hello"},
+        }
+    ],
+}
+
+
+class StaticCompletionProvider(CompletionProvider):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    async def _execute_task(self, task):
+        self.calls += 1
+        return LLMChatCompletion(**COMPLETION)
+
+    def _execute_task_sync(self, task):
+        raise NotImplementedError
+
+
+class DictCache:
+    def __init__(self):
+        self.entries = {}
+
+    async def get_completion(self, key):
+        return self.entries.get(key)
+
+    async def set_completion(self, key, model, response, ttl):
+        self.entries[key] = response
+
+    async def evict(self, max_entries):
+        pass
+
+
+@pytest.fixture
+def provider():
+    provider = StaticCompletionProvider(
+        CompletionConfig(provider="litellm", app=AppConfig())
+    )
+    provider.cache = DictCache()
+    return provider
+
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+def config(**kwargs):
+    return GenerationConfig(model="openai/gpt-4o-mini", **kwargs)
+
+
+async def test_cache_is_opt_in(provider):
+    await provider.aget_completion(MESSAGES, config(temperature=0))
+    await provider.aget_completion(MESSAGES, config(temperature=0))
+
+    assert provider.calls == 2
+    assert provider.cache.entries == {}
+
+
+async def test_cached_completion_is_reused(provider):
+    first = await provider.aget_completion(
+        MESSAGES, config(temperature=0), use_cache=True
+    )
+    second = await provider.aget_completion(
+        MESSAGES, config(temperature=0), use_cache=True
+    )
+
+    assert provider.calls == 1
+    assert second.choices[0].message.content == "Hello"
+    assert first.dict() == second.dict()
+
+
+async def test_refresh_cache_skips_lookup(provider):
+    await provider.aget_completion(MESSAGES, config(), use_cache=True)
+    await provider.aget_completion(
+        MESSAGES, config(), use_cache=True, refresh_cache=True
+    )
+
+    assert provider.calls == 2
+    assert len(provider.cache.entries) == 1
+
+
+def test_cache_key_ignores_key_order_and_streaming(provider):
+    first = provider._cache_key(
+        [{"role": "user", "content": "Hi"}], config(stream=False), {}
+    )
+    second = provider._cache_key(
+        [{"content": "Hi", "role": "user"}], config(stream=True), {}
+    )
+
+    assert first == second
+
+
+def test_cache_key_depends_on_generation_config(provider):
+    assert provider._cache_key(
+        MESSAGES, config(temperature=0), {}
+    ) != provider._cache_key(MESSAGES, config(temperature=0.5), {})
+
+
+async def test_uncanonical_kwargs_bypass_cache(provider):
+    await provider.aget_completion(
+        MESSAGES, config(), use_cache=True, callback=object()
+    )
+
+    assert provider.calls == 1
+    assert provider.cache.entries == {}
+
+
+async def test_cache_read_errors_fall_back_to_model(provider):
+    provider.cache.get_completion = AsyncMock(side_effect=OSError("down"))
+
+    completion = await provider.aget_completion(
+        MESSAGES, config(), use_cache=True
+    )
+
+    assert provider.calls == 1
+    assert completion.choices[0].message.content == "Hello"
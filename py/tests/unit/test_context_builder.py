@@ -0,0 +1,164 @@
+from uuid import uuid4
+
+from core.base.abstractions import (
+    AggregateSearchResult,
+    ChunkSearchResult,
+    GraphSearchResult,
+    KGEntityResult,
+)
+from shared.utils.context_builder import (
+    SOURCE_OVERHEAD_TOKENS,
+    build_context,
+    count_tokens,
+)
+
+
+def chunk(text: str, score: float) -> ChunkSearchResult:
+    return ChunkSearchResult(
+        id=uuid4(),
+        document_id=uuid4(),
+        owner_id=None,
+        collection_ids=[],
+        score=score,
+        text=text,
+        metadata={},
+    )
+
+
+def source_cost(text: str, header: str = "") -> int:
+    cost = count_tokens(text) + SOURCE_OVERHEAD_TOKENS
+    return cost + count_tokens(header) if header else cost
+
+
+def test_build_context_keeps_best_sources_within_budget():
+    """Test that lower scoring sources are dropped once the budget is spent, and kept ones stay in search order"""
+    texts = [
+        "Paris is the capital of France and its largest city.",
+        "The Eiffel Tower was completed in 1889 for the World's Fair.",
+        "Bananas are botanically berries while strawberries are not.",
+    ]
+    results = AggregateSearchResult(
+        chunk_search_results=[
+            chunk(texts[0], 0.5),
+            chunk(texts[1], 0.9),
+            chunk(texts[2], 0.2),
+        ]
+    )
+    budget = source_cost(texts[1], "Vector Search Results:") + source_cost(
+        texts[0]
+    )
+
+    context = build_context(results, max_tokens=budget)
+
+    assert context.num_truncated == 1
+    assert context.num_tokens <= budget
+    assert context.text == "\n".join(
+        [
+            "Vector Search Results:",
+            "Source [1]:",
+            texts[0],
+            "Source [2]:",
+            texts[1],
+        ]
+    )
+
+
+def test_build_context_drops_near_duplicates():
+    text = "The quick brown fox jumps over the lazy dog near the river bank"
+    results = AggregateSearchResult(
+        chunk_search_results=[
+            chunk(text, 0.8),
+            chunk(text + ".", 0.7),
+            chunk("An entirely different passage about astronomy.", 0.6),
+        ]
+    )
+
+    context = build_context(results)
+
+    assert context.num_duplicates == 1
+    assert [citation["score"] for citation in context.citations.values()] == [
+        0.8,
+        0.6,
+    ]
+
+
+def test_build_context_numbers_sources_from_start_index():
+    """Test that a continued context numbers its sources after the previous ones"""
+    results = AggregateSearchResult(
+        chunk_search_results=[
+            chunk("First passage about rivers.", 0.9),
+            chunk("Second passage about mountains.", 0.8),
+        ]
+    )
+
+    context = build_context(results, start_index=4)
+
+    assert list(context.citations) == [4, 5]
+    assert "Source [4]:" in context.text
+    assert "Source [5]:" in context.text
+    assert "Source [1]:" not in context.text
+
+
+def test_build_context_citation_map_traces_sources():
+    chunk_result = chunk("A passage about the Louvre museum.", 0.7)
+    chunk_id = uuid4()
+    graph_result = GraphSearchResult(
+        content=KGEntityResult(name="Louvre", description="An art museum"),
+        chunk_ids=[chunk_id],
+        score=0.6,
+    )
+    results = AggregateSearchResult(
+        chunk_search_results=[chunk_result],
+        graph_search_results=[graph_result],
+    )
+
+    context = build_context(results)
+
+    assert context.citations == {
+        1: {
+            "type": "chunk",
+            "id": str(chunk_result.id),
+            "document_id": str(chunk_result.document_id),
+            "score": 0.7,
+        },
+        2: {
+            "type": "entity",
+            "name": "Louvre",
+            "chunk_ids": [str(chunk_id)],
+            "score": 0.6,
+        },
+    }
+    assert context.text.index("Vector Search Results:") < context.text.index(
+        "KG Search Results:"
+    )
+
+
+def entity(name: str, score: float) -> GraphSearchResult:
+    return GraphSearchResult(
+        content=KGEntityResult(name=name, description=f"About {name}"),
+        score=score,
+    )
+
+
+def test_build_context_ranks_sections_on_their_own_scale():
+    """Test that small fused chunk scores are not crowded out by graph cosine similarities"""
+    texts = [
+        "Fused chunk scores are small reciprocal rank values.",
+        "A weaker chunk that should not make the cut.",
+    ]
+    results = AggregateSearchResult(
+        chunk_search_results=[chunk(texts[0], 0.03), chunk(texts[1], 0.01)],
+        graph_search_results=[entity("Paris", 0.8), entity("Lyon", 0.7)],
+    )
+    paris = "Name: Paris\nDescription: About Paris"
+    budget = source_cost(texts[0], "Vector Search Results:") + source_cost(
+        paris, "KG Search Results:"
+    )
+
+    context = build_context(results, max_tokens=budget)
+
+    assert [citation["score"] for citation in context.citations.values()] == [
+        0.03,
+        0.8,
+    ]
+    assert context.num_truncated == 2
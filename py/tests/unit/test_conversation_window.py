@@ -0,0 +1,172 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from core.base import Message
+from core.database.conversations import PostgresConversationsHandler
+from core.main.services.retrieval_service import RetrievalService
+from shared.api.models.management.responses import MessageResponse
+
+
+def row(role="user", content="hi", total=None):
+    result = {
+        "id": uuid4(),
+        "content": json.dumps({"role": role, "content": content}),
+        "metadata": "{}",
+    }
+    if total is not None:
+        result["total"] = total
+    return result
+
+
+def response(role="user", content="hi"):
+    return MessageResponse(
+        id=uuid4(), message=Message(role=role, content=content), metadata={}
+    )
+
+
+@pytest.fixture
+def handler():
+    handler = PostgresConversationsHandler("test", MagicMock())
+    handler.connection_manager.fetchrow_query = AsyncMock(
+        return_value={"summary": "Earlier", "summary_message_id": None}
+    )
+    return handler
+
+
+async def test_window_skips_pending_for_short_conversations(handler):
+    handler.connection_manager.fetch_query = AsyncMock(
+        return_value=[row(), row()]
+    )
+
+    window = await handler.get_conversation_window(uuid4(), 4, 2)
+
+    assert len(window["messages"]) == 2
+    assert window["pending"] == window["recent"] == []
+    assert window["omitted"] == 0
+    assert handler.connection_manager.fetch_query.await_count == 1
+
+
+async def test_window_loads_one_batch_of_pending_messages(handler):
+    pending = [row(content="p1", total=2), row(content="p2", total=2)]
+    handler.connection_manager.fetch_query = AsyncMock(
+        side_effect=[[row(), row()], pending]
+    )
+
+    window = await handler.get_conversation_window(uuid4(), 2, 3)
+
+    assert [m.message.content for m in window["pending"]] == ["p1", "p2"]
+    assert window["recent"] == window["pending"]
+    assert window["omitted"] == 0
+
+
+async def test_window_keeps_messages_leading_into_the_window(handler):
+    """Test that a long unsummarized backlog is not silently dropped"""
+    oldest = [row(content="p1", total=5), row(content="p2", total=5)]
+    # Fetched newest first
+    newest = [row(content="p5", total=5), row(content="p4", total=5)]
+    handler.connection_manager.fetch_query = AsyncMock(
+        side_effect=[[row(), row()], oldest, newest]
+    )
+
+    window = await handler.get_conversation_window(uuid4(), 2, 2)
+
+    assert [m.message.content for m in window["pending"]] == ["p1", "p2"]
+    assert [m.message.content for m in window["recent"]] == ["p4", "p5"]
+    assert window["omitted"] == 3
+    recent_query = handler.connection_manager.fetch_query.await_args.args[0]
+    assert "m.created_at DESC" in recent_query
+
+
+def service_for(window):
+    conversations_handler = SimpleNamespace(
+        get_conversation_window=AsyncMock(return_value=window)
+    )
+    return SimpleNamespace(
+        providers=SimpleNamespace(
+            database=SimpleNamespace(
+                conversations_handler=conversations_handler
+            )
+        ),
+        config=SimpleNamespace(
+            agent=SimpleNamespace(
+                max_conversation_messages=2,
+                conversation_summary_batch_size=2,
+            )
+        ),
+        _summarizing_conversations={uuid4()},
+        _update_conversation_summary=AsyncMock(),
+        _background_tasks=set(),
+    )
+
+
+async def test_prompt_marks_omitted_messages():
+    recent = [response(content="p4"), response(content="p5")]
+    messages = [response(content="m1"), response(content="m2")]
+    service = service_for(
+        {
+            "summary": "Earlier",
+            "pending": [],
+            "recent": recent,
+            "omitted": 3,
+            "messages": messages,
+        }
+    )
+
+    conversation, summary_message = (
+        await RetrievalService._get_conversation_window(service, uuid4())
+    )
+
+    assert conversation == recent + messages
+    assert summary_message.content == (
+        "Summary of the earlier conversation:\nEarlier\n\n"
+        "[3 earlier messages omitted]"
+    )
+
+
+async def test_prompt_does_not_start_with_tool_results():
+    messages = [
+        response(role="tool", content="result"),
+        response(role="function", content="result"),
+        response(role="assistant", content="answer"),
+        response(role="user", content="question"),
+    ]
+    service = service_for(
+        {
+            "summary": None,
+            "pending": [],
+            "recent": [],
+            "omitted": 0,
+            "messages": messages,
+        }
+    )
+
+    conversation, summary_message = (
+        await RetrievalService._get_conversation_window(service, uuid4())
+    )
+
+    assert conversation == messages[2:]
+    assert summary_message.content == "[2 earlier messages omitted]"
+
+
+async def test_prompt_without_summary_or_gap_has_no_system_message():
+    messages = [response(), response(role="assistant")]
+    service = service_for(
+        {
+            "summary": None,
+            "pending": [],
+            "recent": [],
+            "omitted": 0,
+            "messages": messages,
+        }
+    )
+
+    conversation, summary_message = (
+        await RetrievalService._get_conversation_window(service, uuid4())
+    )
+
+    assert conversation == messages
+    assert summary_message is None
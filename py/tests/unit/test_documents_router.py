@@ -0,0 +1,229 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from core.base import (
+    AppConfig,
+    DocumentResponse,
+    DocumentType,
+    IngestionStatus,
+    OrchestrationConfig,
+    R2RException,
+    User,
+    to_async_generator,
+)
+from core.main.api.v3 import documents_router
+from core.main.api.v3.documents_router import (
+    DocumentsRouter,
+    parse_range_header,
+)
+from core.main.orchestration.simple import ingestion_workflow
+
+
+@pytest.mark.parametrize(
+    "range_header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+    ],
+)
+def test_parse_range_header(range_header, expected):
+    assert parse_range_header(range_header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "range_header",
+    [None, "", "items=0-99", "bytes=0-99,200-299", "bytes=abc-", "bytes=-0"],
+)
+def test_parse_range_header_serves_whole_file(range_header):
+    """Test that absent, multi-range and malformed headers fall back to the whole file"""
+    assert parse_range_header(range_header, 1000) is None
+
+
+@pytest.mark.parametrize("range_header", ["bytes=1000-", "bytes=500-100"])
+def test_parse_range_header_unsatisfiable(range_header):
+    with pytest.raises(R2RException) as exc_info:
+        parse_range_header(range_header, 1000)
+    assert exc_info.value.status_code == 416
+
+
+@pytest.fixture
+def bulk_app():
+    user = User(id=uuid4(), email="admin@example.com", is_superuser=True)
+
+    async def auth_user():
+        return user
+
+    providers = MagicMock()
+    providers.auth.auth_wrapper = lambda: auth_user
+    providers.auth.config.app = AppConfig()
+    providers.orchestration.config = OrchestrationConfig(
+        provider="simple", app=AppConfig()
+    )
+    providers.database.limits_handler = AsyncMock()
+    stored = {}
+
+    async def store_file(document_id, file_name, file_content, file_type):
+        assert not isinstance(file_content, bytes)
+        stored[document_id] = (file_name, file_content.read())
+
+    providers.database.files_handler.store_file = store_file
+
+    async def ingress(files, user):
+        return {
+            "infos": [MagicMock(id=file["document_id"]) for file in files],
+            "rejected": [],
+        }
+
+    services = MagicMock()
+    services.ingestion.run_manager = AsyncMock()
+    services.ingestion.run_manager.set_run_info.return_value = (None, None)
+    services.ingestion.ingest_files_bulk_ingress = AsyncMock(
+        side_effect=ingress
+    )
+    services.ingestion.create_ingestion_job = AsyncMock(return_value=uuid4())
+
+    app = FastAPI()
+
+    @app.exception_handler(R2RException)
+    async def r2r_exception_handler(request: Request, exc: R2RException):
+        return JSONResponse(
+            status_code=exc.status_code, content={"message": exc.message}
+        )
+
+    app.include_router(
+        DocumentsRouter(providers, services).get_router(), prefix="/v3"
+    )
+    return TestClient(app), services, stored
+
+
+def test_bulk_create_streams_files_and_manifest(bulk_app):
+    client, services, stored = bulk_app
+    response = client.post(
+        "/v3/documents/bulk",
+        files=[
+            ("files", ("a.txt", b"first file", "text/plain")),
+            ("files", ("b.txt", b"second file", "text/plain")),
+        ],
+        data={
+            "manifest": json.dumps(
+                [{"raw_text": "a note", "metadata": {"title": "note"}}]
+            )
+        },
+    )
+
+    assert response.status_code == 202, response.text
+    results = response.json()["results"]
+    assert len(results["document_ids"]) == 3
+    entries = services.ingestion.ingest_files_bulk_ingress.await_args.kwargs[
+        "files"
+    ]
+    assert [entry["size_in_bytes"] for entry in entries] == [10, 11, 6]
+    assert [entry["metadata"] for entry in entries][2] == {"title": "note"}
+    assert sorted(stored.values()) == [
+        ("N/A", b"a note"),
+        ("a.txt", b"first file"),
+        ("b.txt", b"second file"),
+    ]
+
+
+def test_bulk_create_rejects_manifest_entries_without_text(bulk_app):
+    client, _, _ = bulk_app
+    response = client.post(
+        "/v3/documents/bulk",
+        data={"manifest": json.dumps([{"metadata": {}}])},
+    )
+
+    assert response.status_code == 422
+
+
+def test_bulk_create_limits_documents_per_request(bulk_app, monkeypatch):
+    client, services, _ = bulk_app
+    monkeypatch.setattr(documents_router, "MAX_FILES_PER_BULK_REQUEST", 2)
+    response = client.post(
+        "/v3/documents/bulk",
+        data={
+            "manifest": json.dumps(
+                [{"raw_text": f"note {i}"} for i in range(3)]
+            )
+        },
+    )
+
+    assert response.status_code == 413
+    services.ingestion.ingest_files_bulk_ingress.assert_not_awaited()
+
+
+async def test_bulk_ingestion_updates_statuses_per_window(monkeypatch):
+    """Test that statuses are written once per stage for each window of files"""
+    monkeypatch.setattr(ingestion_workflow, "BULK_INGESTION_WINDOW_SIZE", 2)
+    document_infos = [
+        DocumentResponse(
+            id=uuid4(),
+            collection_ids=[],
+            owner_id=uuid4(),
+            document_type=DocumentType.TXT,
+            metadata={},
+            title=f"doc {i}.txt",
+            version="v0",
+            size_in_bytes=1,
+        )
+        for i in range(3)
+    ]
+    failing_id = document_infos[1].id
+
+    async def parse_file(document_info, ingestion_config):
+        if document_info.id == failing_id:
+            raise ValueError("unparseable")
+        return to_async_generator([])
+
+    async def empty_generator(*args, **kwargs):
+        return to_async_generator([])
+
+    status_writes = []
+
+    async def update_documents_status_bulk(documents, status):
+        status_writes.append((status, [d.id for d in documents]))
+
+    service = AsyncMock()
+    service.providers.orchestration.config.ingestion_concurrency_limit = 4
+    service.parse_file = parse_file
+    service.embed_document = empty_generator
+    service.store_embeddings = empty_generator
+    service.update_documents_status_bulk = update_documents_status_bulk
+    workflows = ingestion_workflow.simple_ingestion_factory(service)
+
+    await workflows["ingest-files-bulk"](
+        {
+            "user": User(id=uuid4(), email="a@example.com").model_dump_json(),
+            "document_infos": [
+                document_info.model_dump(mode="json")
+                for document_info in document_infos
+            ],
+            "collection_ids": None,
+            "ingestion_config": {},
+        }
+    )
+
+    first, second, third = (
+        document_info.id for document_info in document_infos
+    )
+    windows = [
+        (status, ids)
+        for status, ids in status_writes
+        if ids and status != IngestionStatus.FAILED
+    ]
+    assert windows[0] == (IngestionStatus.PARSING, [first, second])
+    assert (IngestionStatus.FAILED, [second]) in status_writes
+    assert (IngestionStatus.SUCCESS, [first]) in status_writes
+    assert windows[-1] == (IngestionStatus.SUCCESS, [third])
+    assert windows.index((IngestionStatus.PARSING, [third])) > windows.index(
+        (IngestionStatus.SUCCESS, [first])
+    )
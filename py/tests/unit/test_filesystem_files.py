@@ -0,0 +1,173 @@
+import hashlib
+import io
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from core.base import R2RException
+from core.database.files import FilesystemFilesHandler
+
+
+class FakeConnection:
+    """Answers the queries issued by `FilesystemFilesHandler.store_file`"""
+
+    def __init__(self, previous_hash=None, referenced=False, fail=False):
+        self.previous_hash = previous_hash
+        self.referenced = referenced
+        self.fail = fail
+        self.locks: list[str] = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query, *args):
+        if "pg_advisory_xact_lock" in query:
+            self.locks.append(args[0])
+
+    async def fetchval(self, query, *args):
+        if "FOR UPDATE" in query:
+            return self.previous_hash
+        if "EXISTS" in query:
+            return self.referenced
+        if self.fail:
+            raise RuntimeError("insert failed")
+        return self.previous_hash
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = FilesystemFilesHandler(
+        project_name="test",
+        connection_manager=MagicMock(),
+        storage_path=str(tmp_path),
+    )
+    os.makedirs(os.path.join(handler.storage_path, "tmp"))
+    return handler
+
+
+def use_connection(handler, conn):
+    @asynccontextmanager
+    async def get_connection():
+        yield conn
+
+    handler.connection_manager.pool.get_connection = get_connection
+
+
+def sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def test_blob_path_is_sharded(handler):
+    content_hash = sha256(b"hello")
+    assert handler._blob_path(content_hash) == os.path.join(
+        handler.storage_path, content_hash[:2], content_hash[2:4], content_hash
+    )
+
+
+def test_write_temp_hashes_content(handler):
+    tmp_path, content_hash, size = handler._write_temp(io.BytesIO(b"hello"))
+
+    assert content_hash == sha256(b"hello")
+    assert size == 5
+    with open(tmp_path, "rb") as f:
+        assert f.read() == b"hello"
+
+
+def test_commit_blob_deduplicates_identical_content(handler):
+    first, content_hash, _ = handler._write_temp(io.BytesIO(b"hello"))
+    second, _, _ = handler._write_temp(io.BytesIO(b"hello"))
+
+    assert handler._commit_blob(first, content_hash) is True
+    assert handler._commit_blob(second, content_hash) is False
+    assert not os.path.exists(second)
+    assert os.path.exists(handler._blob_path(content_hash))
+
+
+async def test_store_file_locks_hashes_in_sorted_order(handler):
+    old_hash = "f" * 64
+    conn = FakeConnection(previous_hash=old_hash)
+    use_connection(handler, conn)
+
+    await handler.store_file(uuid4(), "a.txt", io.BytesIO(b"hello"))
+
+    new_hash = sha256(b"hello")
+    assert conn.locks == sorted([new_hash, old_hash])
+    assert os.path.exists(handler._blob_path(new_hash))
+
+
+async def test_store_file_removes_replaced_blob(handler):
+    old_blob, old_hash, _ = handler._write_temp(io.BytesIO(b"old"))
+    handler._commit_blob(old_blob, old_hash)
+    use_connection(handler, FakeConnection(previous_hash=old_hash))
+
+    await handler.store_file(uuid4(), "a.txt", io.BytesIO(b"new"))
+
+    assert not os.path.exists(handler._blob_path(old_hash))
+    assert os.path.exists(handler._blob_path(sha256(b"new")))
+
+
+async def test_store_file_discards_new_blob_on_rollback(handler):
+    use_connection(handler, FakeConnection(fail=True))
+
+    with pytest.raises(RuntimeError):
+        await handler.store_file(uuid4(), "a.txt", io.BytesIO(b"hello"))
+
+    assert not os.path.exists(handler._blob_path(sha256(b"hello")))
+    assert os.listdir(os.path.join(handler.storage_path, "tmp")) == []
+
+
+async def test_store_file_keeps_existing_blob_on_rollback(handler):
+    blob, content_hash, _ = handler._write_temp(io.BytesIO(b"hello"))
+    handler._commit_blob(blob, content_hash)
+    use_connection(handler, FakeConnection(fail=True))
+
+    with pytest.raises(RuntimeError):
+        await handler.store_file(uuid4(), "a.txt", io.BytesIO(b"hello"))
+
+    assert os.path.exists(handler._blob_path(content_hash))
+
+
+async def test_retrieve_file_returns_closeable_file(handler):
+    blob, content_hash, _ = handler._write_temp(io.BytesIO(b"hello"))
+    handler._commit_blob(blob, content_hash)
+    handler.connection_manager.fetchrow_query = AsyncMock(
+        return_value={"name": "a.txt", "content_hash": content_hash, "size": 5}
+    )
+
+    name, file_content, size = await handler.retrieve_file(uuid4())
+
+    with file_content:
+        assert file_content.read() == b"hello"
+    assert file_content.closed
+    assert (name, size) == ("a.txt", 5)
+
+
+async def test_retrieve_file_raises_when_blob_is_missing(handler):
+    handler.connection_manager.fetchrow_query = AsyncMock(
+        return_value={"name": "a.txt", "content_hash": "0" * 64, "size": 5}
+    )
+
+    with pytest.raises(R2RException) as exc_info:
+        await handler.retrieve_file(uuid4())
+    assert exc_info.value.status_code == 404
+
+
+async def test_retrieve_file_stream_reads_requested_range(handler):
+    blob, content_hash, _ = handler._write_temp(io.BytesIO(b"0123456789"))
+    handler._commit_blob(blob, content_hash)
+    handler.connection_manager.fetchrow_query = AsyncMock(
+        return_value={"content_hash": content_hash}
+    )
+
+    chunks = [
+        chunk
+        async for chunk in handler.retrieve_file_stream(
+            uuid4(), start=2, end=9, chunk_size=3
+        )
+    ]
+
+    assert chunks == [b"234", b"567", b"8"]
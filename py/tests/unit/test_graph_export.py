@@ -0,0 +1,174 @@
+import base64
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import httpx
+import numpy as np
+import pytest
+
+from core.base import R2RException
+from core.base.abstractions import VectorQuantizationType
+from core.database.graphs import PostgresGraphsHandler
+from core.main.services.graph_service import (
+    GraphService,
+    _arrow_export_stream,
+    _ndjson_export_stream,
+)
+from sdk.async_client import R2RAsyncClient
+
+COLUMNS = [("id", "text"), ("metadata", "json"), ("embedding", "vector")]
+
+
+@pytest.fixture
+def graphs_handler():
+    return PostgresGraphsHandler(
+        project_name="test",
+        connection_manager=MagicMock(),
+        dimension=2,
+        quantization_type=VectorQuantizationType.FP32,
+        collections_handler=None,
+    )
+
+
+async def batches_of(*batches):
+    for batch in batches:
+        yield batch
+
+
+def records():
+    return [
+        {"id": "a", "metadata": '{"k": 1}', "embedding": [1.0, 0.5]},
+        {"id": "b", "metadata": None, "embedding": None},
+    ]
+
+
+async def test_ndjson_export_decodes_metadata_and_packs_embeddings():
+    chunks = [
+        chunk
+        async for chunk in _ndjson_export_stream(
+            batches_of(records()[:1], records()[1:]), COLUMNS
+        )
+    ]
+
+    lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert len(chunks) == 2
+    assert lines[0]["metadata"] == {"k": 1}
+    assert np.frombuffer(
+        base64.b64decode(lines[0]["embedding"]), dtype="<f4"
+    ).tolist() == [1.0, 0.5]
+    assert lines[1] == {"id": "b", "metadata": None, "embedding": None}
+
+
+async def test_arrow_export_round_trips():
+    pa = pytest.importorskip("pyarrow")
+
+    stream = b"".join(
+        [
+            chunk
+            async for chunk in _arrow_export_stream(
+                batches_of(records()), COLUMNS
+            )
+        ]
+    )
+
+    table = pa.ipc.open_stream(stream).read_all()
+    assert table.column("id").to_pylist() == ["a", "b"]
+    assert table.column("metadata").to_pylist() == ['{"k": 1}', None]
+    embedding = table.column("embedding").to_pylist()[0]
+    assert np.frombuffer(embedding, dtype="<f4").tolist() == [1.0, 0.5]
+
+
+def test_export_rejects_unknown_type(graphs_handler):
+    with pytest.raises(R2RException) as exc_info:
+        graphs_handler.get_export_columns("documents")
+    assert exc_info.value.status_code == 400
+
+
+async def test_export_rejects_unknown_format_before_reading(graphs_handler):
+    graphs_handler.export_graph = MagicMock()
+    service = SimpleNamespace(
+        providers=SimpleNamespace(
+            database=SimpleNamespace(graphs_handler=graphs_handler)
+        )
+    )
+
+    with pytest.raises(R2RException) as exc_info:
+        await GraphService.export_graph.__wrapped__(
+            service, uuid4(), "entities", format="csv"
+        )
+    assert exc_info.value.status_code == 400
+    graphs_handler.export_graph.assert_not_called()
+
+
+async def test_export_reads_on_a_dedicated_connection(graphs_handler):
+    opened = []
+
+    class Connection:
+        @asynccontextmanager
+        async def transaction(self, **kwargs):
+            yield
+
+        async def cursor(self, query, *args, prefetch):
+            for i in range(5):
+                yield {"id": str(i)}
+
+    @asynccontextmanager
+    async def get_dedicated_connection(server_settings=None):
+        opened.append(server_settings)
+        yield Connection()
+
+    graphs_handler.connection_manager.pool.get_dedicated_connection = (
+        get_dedicated_connection
+    )
+
+    batches = [
+        batch
+        async for batch in graphs_handler.export_graph(
+            uuid4(), "entities", batch_size=2
+        )
+    ]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert list(opened[0]) == ["idle_in_transaction_session_timeout"]
+
+
+async def test_download_leaves_no_partial_file(tmp_path):
+    async def body():
+        yield b"partial"
+        raise httpx.ReadError("connection reset")
+
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=body())
+    )
+    client = R2RAsyncClient(
+        "http://test", custom_client=httpx.AsyncClient(transport=transport)
+    )
+    output_path = tmp_path / "export.ndjson"
+
+    with pytest.raises(R2RException):
+        await client._make_download_request(
+            "GET", "graphs/export", str(output_path), version="v3"
+        )
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_download_replaces_output_when_complete(tmp_path):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=b"line\n")
+    )
+    client = R2RAsyncClient(
+        "http://test", custom_client=httpx.AsyncClient(transport=transport)
+    )
+    output_path = tmp_path / "export.ndjson"
+    output_path.write_bytes(b"previous export")
+
+    written = await client._make_download_request(
+        "GET", "graphs/export", str(output_path), version="v3"
+    )
+
+    assert written == 5
+    assert output_path.read_bytes() == b"line\n"
+    assert list(tmp_path.iterdir()) == [output_path]
@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from core.base.abstractions import (
+    GraphSearchSettings,
+    KGSearchResultType,
+    SearchSettings,
+)
+from core.pipes.retrieval.graph_search_pipe import GraphSearchSearchPipe
+
+RESULTS = {
+    "entities": {"name": "Aristotle", "description": "Philosopher"},
+    "relationships": {
+        "subject": "Aristotle",
+        "predicate": "taught",
+        "object": "Alexander",
+        "description": "Tutor",
+    },
+    "communities": {
+        "community_id": 1,
+        "name": "Greek philosophy",
+        "summary": "Philosophers",
+        "rating": 8.0,
+        "rating_explanation": "Relevant",
+        "findings": [],
+    },
+}
+
+
+class Legs:
+    """A graphs handler whose searches all wait for each other to start."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.queries: dict[str, str] = {}
+        self.all_started = asyncio.Event()
+
+    async def _start(self, search_type, query):
+        self.queries[search_type] = query
+        if len(self.queries) == self.expected:
+            self.all_started.set()
+        # Sequential legs would never get here
+        await asyncio.wait_for(self.all_started.wait(), timeout=1)
+
+    async def graph_search(self, query, search_type, **kwargs):
+        await self._start(search_type, query)
+        yield {**RESULTS[search_type], "similarity_score": 0.5, "metadata": {}}
+
+    async def graph_traversal_search(self, **kwargs):
+        await self._start("traversal", None)
+        entity = {**RESULTS["entities"], "similarity_score": 0.5}
+        return [{**entity, "hops": 0, "metadata": {}}], []
+
+
+def pipe_for(legs: Legs) -> GraphSearchSearchPipe:
+    pipe = GraphSearchSearchPipe.__new__(GraphSearchSearchPipe)
+    pipe.database_provider = SimpleNamespace(graphs_handler=legs)
+    pipe.embedding_provider = SimpleNamespace(
+        async_get_embedding=AsyncMock(return_value=[0.1, 0.2])
+    )
+    return pipe
+
+
+async def messages(*queries):
+    for query in queries:
+        yield query
+
+
+async def search(pipe, settings):
+    return [
+        result
+        async for result in pipe.search(
+            GraphSearchSearchPipe.Input(message=messages("Who is Aristotle?")),
+            state=None,
+            run_id=uuid4(),
+            search_settings=settings,
+        )
+    ]
+
+
+async def test_legs_run_concurrently_and_keep_their_order():
+    legs = Legs(expected=3)
+
+    results = await search(pipe_for(legs), SearchSettings())
+
+    assert [result.result_type for result in results] == [
+        KGSearchResultType.ENTITY,
+        KGSearchResultType.RELATIONSHIP,
+        KGSearchResultType.COMMUNITY,
+    ]
+    # Every leg searches with the query text
+    assert set(legs.queries.values()) == {"Who is Aristotle?"}
+
+
+async def test_traversal_runs_alongside_community_search():
+    legs = Legs(expected=2)
+    settings = SearchSettings(
+        graph_settings=GraphSearchSettings(use_traversal=True)
+    )
+
+    results = await search(pipe_for(legs), settings)
+
+    assert set(legs.queries) == {"traversal", "communities"}
+    assert [result.result_type for result in results] == [
+        KGSearchResultType.ENTITY,
+        KGSearchResultType.COMMUNITY,
+    ]
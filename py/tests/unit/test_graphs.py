@@ -0,0 +1,216 @@
+import datetime
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from core.base import R2RException
+from core.base.abstractions import Entity, Relationship, VectorQuantizationType
+from core.database.clustering import (
+    CommunityAssignments,
+    GraphAdjacency,
+    GraphEdgesBuilder,
+)
+from core.database.graphs import PostgresGraphsHandler, _add_objects
+
+
+@pytest.fixture
+def graphs_handler():
+    connection_manager = MagicMock()
+    connection_manager.fetchrow_query = AsyncMock(
+        return_value={"now": datetime.datetime.now(datetime.timezone.utc)}
+    )
+    return PostgresGraphsHandler(
+        project_name="test",
+        connection_manager=connection_manager,
+        dimension=4,
+        quantization_type=VectorQuantizationType.FP32,
+        collections_handler=None,
+    )
+
+
+def two_community_graph():
+    builder = GraphEdgesBuilder()
+    builder.add_edge("a", "b")
+    builder.add_edge("c", "d")
+    edges = builder.build()
+    assignments = CommunityAssignments(
+        nodes=edges.nodes,
+        node=np.array([0, 1, 2, 3], dtype=np.int32),
+        cluster=np.array([0, 0, 1, 1], dtype=np.int32),
+        level=np.zeros(4, dtype=np.int32),
+    )
+    return edges, assignments
+
+
+async def test_full_rebuild_of_unchanged_graph_replaces_every_community(
+    graphs_handler,
+):
+    """Test that rerunning a full build on an unchanged graph summarizes every community again"""
+    edges, assignments = two_community_graph()
+    previous_clusters = [
+        {"community_id": uuid4(), "level": level, "nodes": nodes}
+        for level, nodes in assignments.clusters()
+    ]
+    graphs_handler.get_graph_edges = AsyncMock(return_value=edges)
+    graphs_handler._cluster_and_add_community_info = AsyncMock(
+        return_value=(2, assignments)
+    )
+    communities = graphs_handler.communities
+    communities.get_community_clusters = AsyncMock(
+        return_value=previous_clusters
+    )
+    communities.replace_community_clusters = AsyncMock()
+
+    num_communities, num_assignments = (
+        await graphs_handler.perform_graph_clustering(
+            collection_id=uuid4(),
+            leiden_params={},
+            clustering_mode="local",
+        )
+    )
+
+    assert num_communities == 2
+    assert num_assignments == 4
+    replaced = communities.replace_community_clusters.await_args.kwargs
+    assert replaced["kept_community_ids"] == []
+    assert sorted(replaced["stale_community_ids"]) == sorted(
+        cluster["community_id"] for cluster in previous_clusters
+    )
+    assert sorted(
+        (cluster["level"], sorted(cluster["nodes"]))
+        for cluster in replaced["new_clusters"]
+    ) == [(0, ["a", "b"]), (0, ["c", "d"])]
+
+
+async def test_graph_adjacency_is_rebuilt_only_when_the_version_changes(
+    graphs_handler,
+):
+    """Test that the cached adjacency is reused until the relationships version is bumped"""
+    edges, _ = two_community_graph()
+    graphs_handler.get_graph_edges = AsyncMock(return_value=edges)
+    versions = graphs_handler.connection_manager.fetchrow_query
+    collection_id = uuid4()
+
+    versions.return_value = {"version": 3, "relationship_count": 2}
+    first = await graphs_handler.get_graph_adjacency(collection_id)
+    second = await graphs_handler.get_graph_adjacency(collection_id)
+    assert second is first
+    assert graphs_handler.get_graph_edges.await_count == 1
+    assert "graphs_relationships_versions" in versions.await_args.args[0]
+
+    versions.return_value = {"version": 4, "relationship_count": 2}
+    third = await graphs_handler.get_graph_adjacency(collection_id)
+    assert third is not first
+    assert graphs_handler.get_graph_edges.await_count == 2
+
+
+async def test_recursive_expansion_matches_cached_adjacency(graphs_handler):
+    """Test that the per-hop queries for large graphs rank like the cached adjacency"""
+    edges = [
+        ("a", "b", 2.0),
+        ("b", "c", 4.0),
+        ("c", "d", 1.0),
+        ("a", "d", 0.5),
+    ]
+    builder = GraphEdgesBuilder()
+    for subject, object, weight in edges:
+        builder.add_edge(subject, object, weight)
+    adjacency = GraphAdjacency.from_edges(builder.build())
+
+    async def hop_query(query, params):
+        _, names, scores, hop_decay, max_weight = params
+        frontier = dict(zip(names, scores))
+        best: dict[str, float] = {}
+        for subject, object, weight in edges:
+            for source, target in ((subject, object), (object, subject)):
+                if source in frontier:
+                    score = frontier[source] * hop_decay * weight / max_weight
+                    best[target] = max(score, best.get(target, score))
+        return [{"name": name, "score": score} for name, score in best.items()]
+
+    graphs_handler.connection_manager.fetchrow_query = AsyncMock(
+        return_value={"max_weight": 4.0}
+    )
+    graphs_handler.connection_manager.fetch_query = AsyncMock(
+        side_effect=hop_query
+    )
+
+    seeds = {"a": 0.9}
+    expanded = await graphs_handler._expand_with_recursive_query(
+        uuid4(), seeds, max_hops=3, hop_decay=0.5, limit=10
+    )
+    expected = adjacency.expand(seeds, max_hops=3, hop_decay=0.5)
+
+    assert [(name, hops) for name, _, hops in expanded] == [
+        (name, hops) for name, _, hops in expected
+    ]
+    assert [score for _, score, _ in expanded] == pytest.approx(
+        [score for _, score, _ in expected]
+    )
+    hop_sql = graphs_handler.connection_manager.fetch_query.await_args.args[0]
+    assert "r.parent_id = $1 AND r.subject = f.name" in hop_sql
+    assert "r.parent_id = $1 AND r.object = f.name" in hop_sql
+
+
+async def test_add_objects_keeps_columns_missing_from_the_first_object():
+    """Test that a batch whose first object has None fields still inserts every column"""
+    connection_manager = MagicMock()
+    connection_manager.fetch_query = AsyncMock(return_value=[])
+    objects = [
+        {"name": "a", "description": None, "parent_id": uuid4()},
+        {"name": "b", "description": "the letter b", "parent_id": uuid4()},
+    ]
+
+    await _add_objects(
+        objects=objects,
+        full_table_name='"test"."documents_entities"',
+        connection_manager=connection_manager,
+    )
+
+    query, params = connection_manager.fetch_query.await_args.args
+    assert (
+        'INSERT INTO "test"."documents_entities" (name, parent_id, description)'
+        in query
+    )
+    assert "description text" in query
+    rows = json.loads(params[0])
+    assert "description" not in rows[0]
+    assert rows[1]["description"] == "the letter b"
+
+
+async def test_create_bulk_rejects_entities_without_a_parent(graphs_handler):
+    """Test that a missing parent_id is rejected instead of stored as None"""
+    with pytest.raises(R2RException) as exc_info:
+        await graphs_handler.entities.create_bulk(
+            [Entity(name="a", metadata={})], store_type="documents"
+        )
+    assert exc_info.value.status_code == 400
+
+
+async def test_create_extractions_bulk_writes_in_one_transaction(
+    graphs_handler,
+):
+    """Test that entities and relationships share one connection and transaction"""
+    parent_id = uuid4()
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    pool = graphs_handler.connection_manager.pool
+    pool.get_connection.return_value.__aenter__.return_value = conn
+
+    await graphs_handler.create_extractions_bulk(
+        [Entity(name="a", parent_id=parent_id, metadata={"source": uuid4()})],
+        [
+            Relationship(
+                subject="a", predicate="knows", object="b", parent_id=parent_id
+            )
+        ],
+        store_type="documents",
+    )
+
+    conn.transaction.assert_called_once()
+    assert conn.fetch.await_count == 2
+    entity_rows = json.loads(conn.fetch.await_args_list[0].args[1])
+    assert entity_rows[0]["parent_id"] == str(parent_id)
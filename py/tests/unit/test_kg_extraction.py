@@ -0,0 +1,185 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from core.base import DocumentChunk
+from core.base.abstractions import VectorQuantizationType
+from core.base.utils import group_chunks, run_bounded, scale_group_limit
+from core.database.chunks import PostgresChunksHandler
+
+
+def chunk(tokens: int) -> DocumentChunk:
+    return DocumentChunk(
+        id=uuid4(),
+        document_id=uuid4(),
+        collection_ids=[],
+        owner_id=uuid4(),
+        data="x" * (4 * tokens),
+        metadata={},
+    )
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+async def collect(groups) -> list[list]:
+    return [group async for group in groups]
+
+
+async def test_group_chunks_fills_token_budget():
+    chunks = [chunk(40), chunk(40), chunk(30), chunk(50), chunk(30)]
+
+    groups = await collect(group_chunks(stream(chunks), 100, 4))
+
+    assert groups == [chunks[:2], chunks[2:4], chunks[4:]]
+
+
+async def test_group_chunks_isolates_oversized_chunks():
+    chunks = [chunk(10), chunk(500), chunk(10)]
+
+    groups = await collect(group_chunks(stream(chunks), 100, 4))
+
+    assert groups == [[chunks[0]], [chunks[1]], [chunks[2]]]
+
+
+async def test_group_chunks_without_budget_uses_chunk_count():
+    chunks = [chunk(1000) for _ in range(5)]
+
+    groups = await collect(group_chunks(stream(chunks), 0, 2))
+
+    assert groups == [chunks[:2], chunks[2:4], chunks[4:]]
+
+
+async def test_group_chunks_of_empty_stream():
+    assert await collect(group_chunks(stream([]), 100, 4)) == []
+
+
+def test_scale_group_limit():
+    # Fixed-size groups keep the configured limit
+    assert scale_group_limit(100, 4, 4) == 100
+    assert scale_group_limit(100, 1, 4) == 100
+    # Larger groups get one limit per `chunks_per_group` chunks
+    assert scale_group_limit(100, 5, 4) == 200
+    assert scale_group_limit(100, 16, 4) == 400
+    assert scale_group_limit(100, 3, 0) == 300
+
+
+async def test_run_bounded_limits_calls_in_flight():
+    in_flight = 0
+    peak = 0
+    finished = 0
+
+    async def items():
+        for i in range(10):
+            # Items are only read once a slot is about to free up
+            assert i - finished <= 3
+            yield i
+
+    async def work(index, item):
+        nonlocal in_flight, peak, finished
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (item % 3))
+        in_flight -= 1
+        finished += 1
+        return index, item
+
+    results = [
+        task.result() async for task in run_bounded(items(), work, limit=3)
+    ]
+
+    assert peak == 3
+    assert sorted(results) == [(i, i) for i in range(10)]
+
+
+async def test_run_bounded_yields_failed_tasks():
+    async def work(index, item):
+        if item == 1:
+            raise ValueError("bad item")
+        return item
+
+    tasks = [task async for task in run_bounded(stream(range(3)), work, 2)]
+
+    failures = [task for task in tasks if task.exception()]
+    assert len(tasks) == 3
+    assert str(failures[0].exception()) == "bad item"
+
+
+async def test_run_bounded_cancels_calls_when_consumer_stops():
+    started = []
+
+    async def work(index, item):
+        started.append(asyncio.current_task())
+        if item == 0:
+            return item
+        await asyncio.Event().wait()
+
+    results = run_bounded(stream(range(4)), work, limit=3)
+    first = await results.__anext__()
+    await results.aclose()
+    await asyncio.sleep(0)
+
+    assert first.result() == 0
+    assert len(started) == 3
+    assert all(task.cancelled() for task in started[1:])
+
+
+@pytest.fixture
+def chunks_handler():
+    return PostgresChunksHandler(
+        project_name="test",
+        connection_manager=MagicMock(),
+        dimension=2,
+        quantization_type=VectorQuantizationType.FP32,
+    )
+
+
+async def test_iterate_document_chunks_pages_by_key(chunks_handler):
+    # Rows out of chunk order, with a tie and a chunk missing its order
+    rows = [
+        {"chunk_order": order, "id": UUID(int=i), "text": f"chunk {i}"}
+        for i, order in enumerate([2, 0, 1, 1, 2147483647, 3])
+    ]
+    rows = sorted(rows, key=lambda row: (row["chunk_order"], row["id"]))
+    pages = []
+
+    async def fetch_query(query, params):
+        _, last_order, last_id, limit = params
+        pages.append((last_order, last_id))
+        page = [
+            row
+            for row in rows
+            if (row["chunk_order"], row["id"]) > (last_order, last_id)
+        ][:limit]
+        return [
+            {
+                **row,
+                "document_id": None,
+                "owner_id": None,
+                "collection_ids": [],
+                "metadata": json.dumps({}),
+            }
+            for row in page
+        ]
+
+    chunks_handler.connection_manager.fetch_query = fetch_query
+
+    chunks = [
+        chunk["text"]
+        async for chunk in chunks_handler.iterate_document_chunks(
+            uuid4(), batch_size=2
+        )
+    ]
+
+    assert chunks == [row["text"] for row in rows]
+    assert pages == [
+        (-1, UUID(int=0)),
+        (1, UUID(int=2)),
+        (2, UUID(int=0)),
+        (2147483647, UUID(int=4)),
+    ]
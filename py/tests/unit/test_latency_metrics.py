@@ -0,0 +1,104 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from core.base import LatencyTracker, StreamingRAGTimings
+
+
+def test_percentiles_of_uniform_samples():
+    tracker = LatencyTracker()
+    samples = [float(value) for value in range(1, 101)]
+    random.Random(0).shuffle(samples)
+    for value in samples:
+        tracker.record({"total_time": value})
+
+    summary = tracker.summary()["total_time"]
+
+    assert summary["count"] == 100
+    assert summary["mean"] == pytest.approx(50.5)
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (
+        51.0,
+        95.0,
+        99.0,
+    )
+
+
+def test_percentiles_of_a_single_sample():
+    tracker = LatencyTracker()
+    tracker.record({"total_time": 0.25})
+
+    summary = tracker.summary()["total_time"]
+
+    assert summary == {
+        "count": 1,
+        "mean": 0.25,
+        "p50": 0.25,
+        "p95": 0.25,
+        "p99": 0.25,
+    }
+
+
+def test_p99_tracks_the_tail():
+    tracker = LatencyTracker()
+    for _ in range(197):
+        tracker.record({"total_time": 1.0})
+    for _ in range(3):
+        tracker.record({"total_time": 30.0})
+
+    summary = tracker.summary()["total_time"]
+
+    assert summary["p50"] == summary["p95"] == 1.0
+    assert summary["p99"] == 30.0
+
+
+def test_window_keeps_recent_samples_but_counts_all():
+    tracker = LatencyTracker(window_size=3)
+    for value in [100.0, 1.0, 2.0, 3.0]:
+        tracker.record({"total_time": value})
+
+    summary = tracker.summary()["total_time"]
+
+    assert summary["count"] == 4
+    assert summary["mean"] == pytest.approx(2.0)
+    assert summary["p99"] == 3.0
+
+
+def test_missing_metrics_are_skipped():
+    tracker = LatencyTracker()
+    tracker.record({"total_time": 1.0, "time_to_first_token": None})
+
+    assert list(tracker.summary()) == ["total_time"]
+    assert LatencyTracker().summary() == {}
+
+
+def test_streaming_timings_mark_each_stage_once():
+    timings = StreamingRAGTimings(start=10.0)
+    clock = iter([10.5, 11.0, 14.0])
+    with patch(
+        "core.base.logger.metrics.time.perf_counter",
+        side_effect=lambda: next(clock),
+    ):
+        timings.mark_retrieval_done()
+        timings.mark_first_token()
+        # Later tokens and retrievals don't move the first marks
+        timings.mark_first_token()
+        timings.mark_retrieval_done()
+        timings.mark_done()
+
+    assert timings.as_dict() == pytest.approx(
+        {
+            "retrieval_time": 0.5,
+            "time_to_first_token": 1.0,
+            "generation_time": 3.5,
+            "total_time": 4.0,
+        }
+    )
+
+
+def test_generation_time_needs_both_marks():
+    timings = StreamingRAGTimings()
+    timings.mark_done()
+
+    assert timings.generation_time is None
+    assert timings.as_dict()["retrieval_time"] is None
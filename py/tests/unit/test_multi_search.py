@@ -0,0 +1,83 @@
+from uuid import UUID, uuid4
+
+import pytest
+
+from core.base.abstractions import ChunkSearchResult
+from core.pipes.retrieval.multi_search import MultiSearchPipe
+
+
+def result(chunk_id: int, query: str, score: float = 0.5):
+    return ChunkSearchResult(
+        id=UUID(int=chunk_id),
+        document_id=uuid4(),
+        owner_id=None,
+        collection_ids=[],
+        score=score,
+        text=f"chunk {chunk_id}",
+        metadata={"associated_query": query, "page": chunk_id},
+    )
+
+
+@pytest.fixture
+def pipe():
+    pipe = MultiSearchPipe.__new__(MultiSearchPipe)
+    pipe._config = MultiSearchPipe.PipeConfig(rrf_k=60)
+    return pipe
+
+
+def results_for(query: str, *chunk_ids: int) -> list[ChunkSearchResult]:
+    return [result(chunk_id, query) for chunk_id in chunk_ids]
+
+
+def test_fused_scores_sum_reciprocal_ranks(pipe):
+    fused = pipe.reciprocal_rank_fusion(
+        {"q1": results_for("q1", 1, 2), "q2": results_for("q2", 2, 3)}
+    )
+
+    scores = {result.id.int: result.score for result in fused}
+    assert scores == pytest.approx({1: 1 / 61, 2: 1 / 62 + 1 / 61, 3: 1 / 62})
+    assert [result.id.int for result in fused] == [2, 1, 3]
+
+
+def test_fused_results_record_every_retrieving_query(pipe):
+    fused = pipe.reciprocal_rank_fusion(
+        {"q1": results_for("q1", 1), "q2": results_for("q2", 1)}
+    )
+
+    assert len(fused) == 1
+    assert fused[0].metadata == {
+        "page": 1,
+        "associated_queries": ["q1", "q2"],
+        "is_rrf_score": True,
+    }
+    assert fused[0].text == "chunk 1"
+
+
+def test_fusion_keeps_inputs_unchanged(pipe):
+    original = result(1, "q1", score=0.9)
+
+    fused = pipe.reciprocal_rank_fusion({"q1": [original]})
+
+    assert fused[0] is not original
+    assert original.score == 0.9
+    assert original.metadata == {"associated_query": "q1", "page": 1}
+
+
+def test_limit_keeps_the_best_fused_results(pipe):
+    all_results = {
+        "q1": results_for("q1", *range(10)),
+        "q2": results_for("q2", *reversed(range(10))),
+        "q3": results_for("q3", 9, 8),
+    }
+
+    fused = pipe.reciprocal_rank_fusion(all_results, limit=2)
+    unlimited = pipe.reciprocal_rank_fusion(all_results)
+
+    assert [result.id for result in fused] == [
+        result.id for result in unlimited[:2]
+    ]
+    assert [result.id.int for result in fused] == [9, 8]
+
+
+def test_fusion_of_no_results(pipe):
+    assert pipe.reciprocal_rank_fusion({"q1": [], "q2": []}, limit=5) == []
@@ -0,0 +1,91 @@
+import asyncio
+import random
+
+import pytest
+
+from core.base.pipeline import AsyncPipeline
+from core.base.pipes import AsyncPipe
+from core.base.utils import to_async_generator
+
+
+class EchoPipe(AsyncPipe):
+    """Yields its messages back and records them as its output"""
+
+    async def _run_logic(self, input, state, run_id, *args, **kwargs):
+        messages = []
+        async for message in input.message:
+            await asyncio.sleep(random.random() / 1_000)
+            messages.append(message)
+            yield message
+        await state.update(
+            self.config.name, {"output": {"messages": messages}}
+        )
+
+
+class CollectPipe(AsyncPipe):
+    """Gathers its input alongside the upstream output it was given"""
+
+    class Input(AsyncPipe.Input):
+        upstream_messages: list[str]
+
+    async def _run_logic(self, input, state, run_id, *args, **kwargs):
+        messages = [message async for message in input.message]
+        await asyncio.sleep(random.random() / 1_000)
+        yield {
+            "messages": messages,
+            "upstream_messages": input.upstream_messages,
+        }
+
+
+@pytest.fixture
+def pipeline():
+    """A pipeline shared by every run, as the factory builds them"""
+    pipeline = AsyncPipeline()
+    pipeline.add_pipe(EchoPipe(AsyncPipe.PipeConfig(name="echo")))
+    pipeline.add_pipe(
+        CollectPipe(AsyncPipe.PipeConfig(name="collect")),
+        add_upstream_outputs=[
+            {
+                "prev_pipe_name": "echo",
+                "prev_output_field": "messages",
+                "input_field": "upstream_messages",
+            }
+        ],
+    )
+    return pipeline
+
+
+def run_messages(run: int) -> list[str]:
+    return [f"run-{run}-message-{i}" for i in range(3)]
+
+
+async def test_pipeline_run(pipeline):
+    """Test that a single run passes messages and upstream outputs along"""
+    results = await pipeline.run(to_async_generator(run_messages(0)))
+
+    assert results == [
+        {
+            "messages": run_messages(0),
+            "upstream_messages": run_messages(0),
+        }
+    ]
+
+
+async def test_concurrent_pipeline_runs_are_isolated(pipeline):
+    """Test that concurrent runs of a shared pipeline never see each other's results"""
+    num_runs = 500
+
+    results = await asyncio.gather(
+        *(
+            pipeline.run(to_async_generator(run_messages(run)))
+            for run in range(num_runs)
+        )
+    )
+
+    for run, result in enumerate(results):
+        assert result == [
+            {
+                "messages": run_messages(run),
+                "upstream_messages": run_messages(run),
+            }
+        ]
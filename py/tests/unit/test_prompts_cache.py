@@ -0,0 +1,123 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.database.prompts_handler import Cache, PostgresPromptsHandler
+
+
+def test_cache_evicts_least_recently_used():
+    cache = Cache[int](max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_overwrite_refreshes_recency():
+    cache = Cache[int](max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_cache_expires_entries_after_ttl():
+    cache = Cache[int](ttl=timedelta(seconds=60))
+    start = datetime(2024, 1, 1)
+    with patch("core.database.prompts_handler.datetime") as clock:
+        clock.now.return_value = start
+        cache.set("a", 1)
+        clock.now.return_value = start + timedelta(seconds=30)
+        assert cache.get("a") == 1
+        clock.now.return_value = start + timedelta(seconds=61)
+        assert cache.get("a") is None
+    assert "a" not in cache._cache
+
+
+def test_cache_invalidate_and_clear():
+    cache = Cache[int]()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+@pytest.fixture
+def handler():
+    return PostgresPromptsHandler("test", MagicMock())
+
+
+def invalidation(name: str) -> str:
+    return json.dumps({"name": name, "origin": "another-worker"})
+
+
+async def test_read_racing_an_invalidation_is_not_cached(handler):
+    """Test that a template fetched before a NOTIFY arrives is not written back"""
+    fetched = asyncio.Event()
+    release = asyncio.Event()
+
+    async def fetchrow_query(query, params):
+        fetched.set()
+        await release.wait()
+        return {"template": "old {x}", "input_types": {"x": "str"}}
+
+    handler.connection_manager.fetchrow_query = fetchrow_query
+    read = asyncio.create_task(handler._get_template_info("greeting"))
+    await fetched.wait()
+    handler._on_invalidation(invalidation("greeting"))
+    release.set()
+
+    assert (await read)["template"] == "old {x}"
+    assert handler._template_cache.get("greeting") is None
+
+
+async def test_formatted_prompt_racing_a_reconnect_is_not_cached(handler):
+    fetched = asyncio.Event()
+    release = asyncio.Event()
+
+    async def fetchrow_query(query, params):
+        fetched.set()
+        await release.wait()
+        return {"template": "Hello {x}", "input_types": {"x": "str"}}
+
+    handler.connection_manager.fetchrow_query = fetchrow_query
+    read = asyncio.create_task(
+        handler.get_cached_prompt("greeting", {"x": "there"})
+    )
+    await fetched.wait()
+    # Invalidations may have been missed while disconnected
+    handler._on_invalidation(None)
+    release.set()
+
+    assert await read == "Hello there"
+    assert handler._prompt_cache.get("greeting:[('x', 'there')]") is None
+
+
+async def test_reads_of_other_prompts_are_still_cached(handler):
+    async def fetchrow_query(query, params):
+        handler._on_invalidation(invalidation("other"))
+        return {"template": "Hi", "input_types": {}}
+
+    handler.connection_manager.fetchrow_query = fetchrow_query
+
+    await handler._get_template_info("greeting")
+
+    assert handler._template_cache.get("greeting") == {
+        "template": "Hi",
+        "input_types": {},
+    }
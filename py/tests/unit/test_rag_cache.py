@@ -0,0 +1,216 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from core.base.abstractions import GenerationConfig, SearchSettings
+from core.database.collections import PostgresCollectionsHandler
+from core.database.rag_cache import PostgresRAGCacheHandler
+from core.main.services.retrieval_service import (
+    RAGCacheEntry,
+    RetrievalService,
+)
+
+COLLECTION_A = UUID(int=1)
+COLLECTION_B = UUID(int=2)
+
+
+def scope_key(
+    collection_ids=(COLLECTION_A, COLLECTION_B),
+    generation_config=None,
+    search_settings=None,
+    **kwargs,
+) -> str:
+    return RetrievalService._rag_cache_scope_key(
+        None,
+        generation_config or GenerationConfig(model="openai/gpt-4o-mini"),
+        search_settings or SearchSettings(),
+        list(collection_ids),
+        kwargs,
+    )
+
+
+def test_scope_key_ignores_collection_order():
+    assert scope_key((COLLECTION_A, COLLECTION_B)) == scope_key(
+        (COLLECTION_B, COLLECTION_A)
+    )
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"collection_ids": (COLLECTION_A,)},
+        {"generation_config": GenerationConfig(model="openai/gpt-4o")},
+        {"search_settings": SearchSettings(limit=3)},
+        {"task_prompt_override": "Answer in French"},
+        {"include_title_if_available": True},
+    ],
+)
+def test_scope_key_covers_everything_that_shapes_the_answer(changes):
+    assert scope_key(**changes) != scope_key()
+
+
+def test_scope_key_ignores_unrelated_kwargs():
+    assert scope_key(conversation_id=uuid4()) == scope_key()
+
+
+def cache_service(enabled=True, get_response=None):
+    rag_cache_handler = SimpleNamespace(
+        get_response=get_response
+        or AsyncMock(return_value=(None, '{"0": 1}')),
+        set_response=AsyncMock(),
+        evict=AsyncMock(),
+    )
+    return SimpleNamespace(
+        providers=SimpleNamespace(
+            llm=SimpleNamespace(
+                config=SimpleNamespace(
+                    rag_cache_enabled=enabled,
+                    rag_cache_similarity_threshold=0.97,
+                    rag_cache_ttl_seconds=60,
+                    rag_cache_max_entries=2,
+                )
+            ),
+            embedding=SimpleNamespace(
+                async_get_embedding=AsyncMock(return_value=[0.1, 0.2])
+            ),
+            database=SimpleNamespace(
+                collections_handler=PostgresCollectionsHandler,
+                rag_cache_handler=rag_cache_handler,
+            ),
+        ),
+        _rag_cache_scope_key=lambda *args: "scope",
+        _rag_cache_writes=0,
+    )
+
+
+async def get_entry(service, collection_ids=None):
+    return await RetrievalService._get_rag_cache_entry(
+        service,
+        "What is R2R?",
+        GenerationConfig(),
+        SearchSettings(),
+        collection_ids,
+        {},
+    )
+
+
+async def test_disabled_cache_is_not_read():
+    service = cache_service(enabled=False)
+
+    assert await get_entry(service) is None
+    service.providers.embedding.async_get_embedding.assert_not_called()
+
+
+async def test_superusers_are_scoped_to_the_global_version():
+    service = cache_service()
+
+    entry = await get_entry(service)
+
+    get_response = service.providers.database.rag_cache_handler.get_response
+    assert get_response.await_args.args == (
+        "scope",
+        [PostgresCollectionsHandler.GLOBAL_VERSION_ID],
+        [0.1, 0.2],
+        0.97,
+    )
+    assert entry == RAGCacheEntry(
+        scope_key="scope",
+        collection_versions='{"0": 1}',
+        query_embedding=[0.1, 0.2],
+        response=None,
+    )
+
+
+async def test_cache_read_errors_are_treated_as_misses():
+    service = cache_service(get_response=AsyncMock(side_effect=OSError()))
+
+    assert await get_entry(service, [COLLECTION_A]) is None
+
+
+async def test_writes_periodically_evict(monkeypatch):
+    monkeypatch.setattr(
+        "core.main.services.retrieval_service.RAG_CACHE_EVICTION_INTERVAL", 2
+    )
+    service = cache_service()
+    entry = RAGCacheEntry("scope", '{"0": 1}', [0.1, 0.2], None)
+
+    for _ in range(3):
+        await RetrievalService._set_rag_cache_entry(
+            service, entry, "What is R2R?", {"completion": "..."}
+        )
+
+    rag_cache_handler = service.providers.database.rag_cache_handler
+    assert rag_cache_handler.set_response.await_count == 3
+    rag_cache_handler.evict.assert_awaited_once_with(2)
+
+
+@pytest.fixture
+def collections_handler():
+    handler = PostgresCollectionsHandler("test", MagicMock(), MagicMock())
+    handler.connection_manager.execute_query = AsyncMock()
+    return handler
+
+
+def normalized(query: str) -> str:
+    return " ".join(query.split())
+
+
+async def test_version_bump_includes_the_global_version(collections_handler):
+    await collections_handler.increment_collection_versions([COLLECTION_A])
+
+    query, params = (
+        collections_handler.connection_manager.execute_query.await_args.args
+    )
+    query = normalized(query)
+    assert params == [[COLLECTION_A]]
+    assert "SELECT unnest($1::uuid[]) AS id" in query
+    assert (
+        f"UNION SELECT '{PostgresCollectionsHandler.GLOBAL_VERSION_ID}'::uuid"
+        in query
+    )
+    # Rows are locked in a fixed order so concurrent bumps cannot deadlock
+    assert "ORDER BY id ON CONFLICT (collection_id) DO UPDATE" in query
+    assert "test.collection_versions.version + 1" in query
+
+
+async def test_document_version_bump_reads_document_collections(
+    collections_handler,
+):
+    document_id = uuid4()
+
+    await collections_handler.increment_document_collection_versions(
+        [document_id]
+    )
+
+    query, params = (
+        collections_handler.connection_manager.execute_query.await_args.args
+    )
+    query = normalized(query)
+    assert params == [[document_id]]
+    assert "SELECT unnest(collection_ids) AS id FROM test.documents" in query
+    assert "WHERE id = ANY($1::uuid[])" in query
+
+
+async def test_lookup_only_matches_current_collection_versions():
+    handler = PostgresRAGCacheHandler("test", MagicMock(), dimension=2)
+    handler.connection_manager.fetchrow_query = AsyncMock(
+        return_value={
+            "versions": '{"1": 4}',
+            "response": json.dumps({"completion": "cached"}),
+        }
+    )
+
+    response, versions = await handler.get_response(
+        "scope", [COLLECTION_A], [0.1, 0.2], 0.97
+    )
+
+    query, params = handler.connection_manager.fetchrow_query.await_args.args
+    query = normalized(query)
+    assert (response, versions) == ({"completion": "cached"}, '{"1": 4}')
+    assert params[:3] == ["scope", [COLLECTION_A], "[0.1, 0.2]"]
+    assert params[3] == pytest.approx(0.03)
+    assert "cache.collection_versions = versions.versions" in query
+    assert "test.collection_versions WHERE collection_id = ANY" in query
@@ -0,0 +1,56 @@
+import asyncio
+
+from core.base.providers.embedding import RerankBatcher
+
+
+async def test_rerank_batcher_coalesces_requests_for_a_query():
+    calls = []
+
+    async def score_fn(query, texts):
+        calls.append((query, texts))
+        return [float(len(text)) for text in texts]
+
+    batcher = RerankBatcher(score_fn, window=0.01)
+    first, second = await asyncio.gather(
+        batcher.score("q", ["a", "bb"]),
+        batcher.score("q", ["bb", "ccc"]),
+    )
+
+    assert first == [1.0, 2.0]
+    assert second == [2.0, 3.0]
+    assert calls == [("q", ["a", "bb", "ccc"])]
+
+
+async def test_rerank_batcher_flushes_requests_arriving_during_a_batch():
+    """Test that a request made while a batch is being scored is not stranded"""
+    release = asyncio.Event()
+    calls = []
+
+    async def score_fn(query, texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            await release.wait()
+        return [1.0 for _ in texts]
+
+    batcher = RerankBatcher(score_fn, window=0.01)
+    first = asyncio.create_task(batcher.score("q", ["a"]))
+    while not calls:
+        await asyncio.sleep(0.005)
+
+    second = asyncio.create_task(batcher.score("q", ["b"]))
+    assert await asyncio.wait_for(second, timeout=1) == [1.0]
+    release.set()
+    assert await asyncio.wait_for(first, timeout=1) == [1.0]
+    assert calls == [["a"], ["b"]]
+
+
+async def test_rerank_batcher_propagates_scoring_errors():
+    async def score_fn(query, texts):
+        raise RuntimeError("rerank service unavailable")
+
+    batcher = RerankBatcher(score_fn, window=0.01)
+    results = await asyncio.gather(
+        batcher.score("q", ["a"]), return_exceptions=True
+    )
+
+    assert isinstance(results[0], RuntimeError)
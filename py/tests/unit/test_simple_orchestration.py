@@ -0,0 +1,158 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from core.base import AppConfig, OrchestrationConfig, Workflow
+from core.database.jobs import PostgresJobsHandler
+from core.providers.orchestration.simple import SimpleOrchestrationProvider
+
+
+@pytest.fixture
+def provider():
+    config = OrchestrationConfig(
+        provider="simple",
+        queue_workflows=True,
+        queue_max_attempts=3,
+        queue_retry_backoff_seconds=10.0,
+        queue_poll_interval_seconds=0.001,
+        app=AppConfig(),
+    )
+    provider = SimpleOrchestrationProvider(config)
+    provider.jobs_handler = AsyncMock()
+    return provider
+
+
+def make_job(attempts=1, max_attempts=3):
+    return {
+        "id": uuid4(),
+        "workflow_name": "ingest-files",
+        "payload": {"document_id": "doc"},
+        "attempts": attempts,
+        "max_attempts": max_attempts,
+    }
+
+
+async def test_lease_job_returns_claimed_job():
+    connection_manager = MagicMock()
+    job_id = uuid4()
+    connection_manager.fetchrow_query = AsyncMock(
+        return_value={
+            "id": job_id,
+            "workflow_name": "ingest-files",
+            "payload": json.dumps({"document_id": "doc"}),
+            "attempts": 1,
+            "max_attempts": 3,
+        }
+    )
+    handler = PostgresJobsHandler("test", connection_manager)
+
+    job = await handler.lease_job("ingestion", "worker-0", 30)
+
+    assert job == {
+        "id": job_id,
+        "workflow_name": "ingest-files",
+        "payload": {"document_id": "doc"},
+        "attempts": 1,
+        "max_attempts": 3,
+    }
+    query, params = connection_manager.fetchrow_query.call_args.args
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert params == ["ingestion", "worker-0", 30.0]
+
+
+async def test_lease_job_returns_none_when_queue_is_empty():
+    connection_manager = MagicMock()
+    connection_manager.fetchrow_query = AsyncMock(return_value=None)
+    handler = PostgresJobsHandler("test", connection_manager)
+
+    assert await handler.lease_job("ingestion", "worker-0", 30) is None
+
+
+async def test_run_job_completes_successful_job(provider):
+    workflow = AsyncMock()
+    provider.ingestion_workflows = {"ingest-files": workflow}
+    job = make_job()
+
+    await provider._run_job(Workflow.INGESTION, job, "worker-0")
+
+    workflow.assert_awaited_once_with({"document_id": "doc"})
+    provider.jobs_handler.complete_job.assert_awaited_once_with(
+        job["id"], "worker-0"
+    )
+    provider.jobs_handler.fail_job.assert_not_awaited()
+
+
+async def test_run_job_requeues_failed_attempt_with_backoff(provider):
+    provider.ingestion_workflows = {
+        "ingest-files": AsyncMock(side_effect=RuntimeError("boom"))
+    }
+    job = make_job(attempts=2)
+
+    await provider._run_job(Workflow.INGESTION, job, "worker-0")
+
+    provider.jobs_handler.fail_job.assert_awaited_once_with(
+        job["id"], "worker-0", "boom", retry_after=20.0
+    )
+    provider.jobs_handler.complete_job.assert_not_awaited()
+
+
+async def test_run_job_fails_final_attempt_permanently(provider):
+    provider.ingestion_workflows = {
+        "ingest-files": AsyncMock(side_effect=RuntimeError("boom"))
+    }
+    job = make_job(attempts=3)
+
+    await provider._run_job(Workflow.INGESTION, job, "worker-0")
+
+    provider.jobs_handler.fail_job.assert_awaited_once_with(
+        job["id"], "worker-0", "boom", retry_after=None
+    )
+
+
+async def test_run_job_fails_job_whose_last_lease_expired(provider):
+    workflow = AsyncMock()
+    provider.ingestion_workflows = {"ingest-files": workflow}
+    job = make_job(attempts=4)
+
+    await provider._run_job(Workflow.INGESTION, job, "worker-0")
+
+    workflow.assert_not_awaited()
+    provider.jobs_handler.fail_job.assert_awaited_once_with(
+        job["id"], "worker-0", "Lease expired on the final attempt."
+    )
+
+
+async def test_worker_loop_survives_job_handler_errors(provider):
+    """Test that a failure to record a job's outcome does not kill the worker"""
+    provider.ingestion_workflows = {"ingest-files": AsyncMock()}
+    first, second = make_job(), make_job()
+    leased = asyncio.Event()
+    jobs = [first, second]
+
+    async def lease_job(*args):
+        if jobs:
+            return jobs.pop(0)
+        leased.set()
+        return None
+
+    provider.jobs_handler.lease_job.side_effect = lease_job
+    provider.jobs_handler.complete_job.side_effect = [
+        ConnectionError("connection lost"),
+        None,
+    ]
+
+    worker = asyncio.create_task(
+        provider._worker_loop(Workflow.INGESTION, "worker-0")
+    )
+    await asyncio.wait_for(leased.wait(), timeout=5)
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+    assert [
+        call.args[0]
+        for call in provider.jobs_handler.complete_job.await_args_list
+    ] == [first["id"], second["id"]]
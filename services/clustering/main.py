@@ -1,7 +1,15 @@
+import asyncio
+import io
+import json
 import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, Response
 
 # Make sure graspologic and networkx are installed
 # Requires that "graspologic[leiden]" extras are installed if needed.
@@ -12,6 +20,16 @@ app = FastAPI()
 logger = logging.getLogger("graspologic_service")
 logger.setLevel(logging.INFO)
 
+# Job state lives in this process's memory, so the service must run as a
+# single process (one uvicorn worker, one replica). Jobs are lost on restart
+# and clients see a 404 when polling them, which they report as a failure.
+# Finished jobs are kept around this long for clients to collect results
+JOB_TTL_SECONDS = int(os.getenv("CLUSTERING_JOB_TTL_SECONDS", "3600"))
+executor = ProcessPoolExecutor(
+    max_workers=int(os.getenv("CLUSTERING_MAX_WORKERS", "1"))
+)
+jobs: dict[str, dict] = {}
+
 class Relationship(BaseModel):
     id: str
     subject: str
@@ -42,8 +60,15 @@ class ClusterResponse(BaseModel):
     communities: list[CommunityAssignment]
 
 
-@app.post("/cluster", response_model=ClusterResponse)
+@app.post("/cluster", response_model=ClusterResponse, deprecated=True)
 def cluster_graph(request: ClusterRequest):
+    """
+    Deprecated: cluster a JSON relationship list synchronously.
+
+    R2R submits compressed edge arrays to `/jobs` instead; this endpoint is
+    kept for older clients and will be removed in a future release.
+    """
+    logger.warning("/cluster is deprecated; submit graphs to /jobs instead")
     try:
         # Build graph from relationships
         G = nx.Graph()
@@ -81,6 +106,143 @@ def cluster_graph(request: ClusterRequest):
         logger.error(f"Error clustering graph: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def cluster_edges(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    leiden_params: dict,
+) -> bytes:
+    """
+    Run hierarchical Leiden over an integer edge list and return the
+    assignments as a compressed `.npz` of `node`, `cluster` and `level`.
+    """
+    params = LeidenParams(**leiden_params).model_dump()
+    params.pop("weight_attribute")
+    edges = list(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+    communities = hierarchical_leiden(edges, **params)
+
+    count = len(communities)
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        node=np.fromiter((c.node for c in communities), "<i4", count=count),
+        cluster=np.fromiter(
+            (c.cluster for c in communities), "<i4", count=count
+        ),
+        level=np.fromiter((c.level for c in communities), "<i4", count=count),
+    )
+    return buffer.getvalue()
+
+
+def _expire_jobs() -> None:
+    now = time.monotonic()
+    for job_id in [
+        job_id
+        for job_id, job in jobs.items()
+        if job.get("finished_at") and now - job["finished_at"] > JOB_TTL_SECONDS
+    ]:
+        del jobs[job_id]
+
+
+def _finish_job(job_id: str, future: asyncio.Future) -> None:
+    job = jobs.get(job_id)
+    if job is None:
+        return
+    job["finished_at"] = time.monotonic()
+    # exception() raises CancelledError on a cancelled future
+    if future.cancelled():
+        logger.error(f"Clustering job {job_id} was cancelled")
+        job["status"] = "failed"
+        job["error"] = "Job was cancelled."
+    elif future.exception() is not None:
+        logger.error(f"Clustering job {job_id} failed: {future.exception()}")
+        job["status"] = "failed"
+        job["error"] = str(future.exception())
+    else:
+        logger.info(f"Clustering job {job_id} complete")
+        job["status"] = "completed"
+        job["result"] = future.result()
+
+
+@app.post("/jobs")
+async def submit_job(request: Request):
+    """
+    Accept a compressed `.npz` graph (`sources`, `targets`, `weights`,
+    `leiden_params`) and start clustering it in the background.
+    """
+    _expire_jobs()
+    try:
+        with np.load(io.BytesIO(await request.body()), allow_pickle=False) as data:
+            sources = data["sources"]
+            targets = data["targets"]
+            weights = data["weights"]
+            leiden_params = json.loads(data["leiden_params"].tobytes())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid payload: {e}")
+
+    if not (len(sources) == len(targets) == len(weights)):
+        raise HTTPException(
+            status_code=400, detail="Edge arrays must have the same length."
+        )
+
+    job_id = uuid.uuid4().hex
+    logger.info(f"Starting clustering job {job_id} with {len(sources)} edges")
+    future = asyncio.get_running_loop().run_in_executor(
+        executor, cluster_edges, sources, targets, weights, leiden_params
+    )
+    jobs[job_id] = {
+        "status": "running",
+        "num_edges": len(sources),
+        "future": future,
+    }
+    future.add_done_callback(lambda f: _finish_job(job_id, f))
+    return {"job_id": job_id, "status": "running"}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "error": job.get("error"),
+    }
+
+
+@app.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=409, detail=f"Job is {job['status']}."
+        )
+    return Response(
+        content=job["result"], media_type="application/octet-stream"
+    )
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """
+    Cancel a job and forget it.
+
+    Jobs still queued behind others never start. A job that is already
+    running cannot be interrupted; its worker finishes and the result is
+    discarded.
+    """
+    job = jobs.pop(job_id, None)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job["status"] == "running":
+        logger.info(f"Cancelling clustering job {job_id}")
+        job["future"].cancel()
+    return {"job_id": job_id, "status": "cancelled"}
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}